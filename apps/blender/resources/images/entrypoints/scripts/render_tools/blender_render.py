@@ -183,6 +183,77 @@ def render(parameters: dict,
     return output_info
 
 
+def format_blender_batch_cmd(scene_file,
+                             script_file,
+                             output_format,
+                             num_threads=cpu_count()) -> List[str]:
+    # The script renders the crops itself, so the output format and the
+    # number of threads have to be set before it runs
+    return [
+        "{}".format(BLENDER_COMMAND),
+        "-b", "{}".format(scene_file),
+        "-y",  # enable scripting by default
+        "-noaudio",
+        "-F", "{}".format(output_format.upper()),
+        "-t", "{}".format(num_threads),
+        "--python-exit-code", "1",
+        "-P", "{}".format(script_file)
+    ]
+
+
+def render_batch(parameters: dict,
+                 mounted_paths: dict,
+                 script_name: str = "scriptfile-batch.py") -> List[dict]:
+    """ Renders all the crops with a single Blender invocation and returns
+    the same output info as render(). A crop may set its own "frames" and
+    "output_dir", which lets the crops of several subtasks of one scene be
+    rendered together. """
+
+    output_format = parameters["output_format"].lower()
+    output_info = list()
+    batch = list()
+
+    for crop in parameters["crops"]:
+        frames = crop.get("frames", parameters["frames"])
+        output_dir = crop.get("output_dir", mounted_paths["OUTPUT_DIR"])
+        batch.append({
+            "borders_x": crop["borders_x"],
+            "borders_y": crop["borders_y"],
+            "frames": frames,
+            "filepath": os.path.join(output_dir, crop["outfilebasename"]),
+        })
+
+        results_list = list()
+        for frame in frames:
+            filename = crop["outfilebasename"] \
+                       + "{:04d}.".format(frame) \
+                       + output_format
+            results_list.append(filename)
+
+        crop_info = dict()
+        crop_info["crop"] = crop
+        crop_info["results"] = results_list
+
+        output_info.append(crop_info)
+
+    script_file = scenefileeditor.generate_blender_batch_file(
+        script_name,
+        parameters["resolution"],
+        batch,
+        parameters["use_compositing"],
+        parameters["samples"],
+        mounted_paths)
+    cmd = format_blender_batch_cmd(parameters["scene_file"], script_file,
+                                   output_format)
+
+    print(cmd, file=sys.stderr)
+    exit_code = exec_cmd(cmd)
+    if exit_code != 0:
+        sys.exit(exit_code)
+
+    return output_info
+
+
 # pylint: disable-msg=too-many-locals
 def gen_render_shell_scripts(parameters: dict,
                              mounted_paths: dict,
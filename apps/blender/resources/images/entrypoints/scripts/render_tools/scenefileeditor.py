@@ -4,6 +4,10 @@ BLENDER_CROP_TEMPLATE_PATH \
     = os.path.join(os.path.dirname(os.path.realpath(__file__)),
                    "templates",
                    "blendercrop.py.template")
+BLENDER_BATCH_TEMPLATE_PATH \
+    = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                   "templates",
+                   "blendercrop_batch.py.template")
 
 
 def get_generated_files_path(mounted_paths: dict):
@@ -39,6 +43,44 @@ def generate_blender_crop_file(script_file_out,
     return blender_script_path
 
 
+# pylint: disable-msg=too-many-arguments
+def generate_blender_batch_file(script_file_out,
+                                resolution,
+                                crops,
+                                use_compositing,
+                                samples,
+                                mounted_paths):
+    """ Crops are dicts with "borders_x", "borders_y", "frames" and the
+    "filepath" the frames are written to, without the frame number """
+    crops = [
+        {
+            "borders_x": [float(border) for border in crop["borders_x"]],
+            "borders_y": [float(border) for border in crop["borders_y"]],
+            "frames": [int(frame) for frame in crop["frames"]],
+            "filepath": crop["filepath"],
+        }
+        for crop in crops
+    ]
+    content = _generate_blender_crop_file(BLENDER_CROP_TEMPLATE_PATH,
+                                          resolution,
+                                          crops[0]["borders_x"],
+                                          crops[0]["borders_y"],
+                                          use_compositing,
+                                          samples)
+    with open(BLENDER_BATCH_TEMPLATE_PATH) as f:
+        content += f.read() % {'crops': crops}
+
+    scripts_dir = get_generated_files_path(mounted_paths)
+    if not os.path.isdir(scripts_dir):
+        os.mkdir(scripts_dir)
+
+    blender_script_path = os.path.join(scripts_dir, script_file_out)
+    with open(blender_script_path, "w+") as script_file:
+        script_file.write(content)
+
+    return blender_script_path
+
+
 # pylint: disable-msg=too-many-arguments
 def _generate_blender_crop_file(template_path, resolution, borders_x, borders_y,
                                 use_compositing, samples, override_output=None):
@@ -5,9 +5,9 @@ import OpenEXR
 
 import Imath
 
-# converting .exr file to .png if user gave .exr file as a rendered scene
-def ConvertEXRToPNG(exrfile, pngfile):
-    File = OpenEXR.InputFile(exrfile)
+
+# decoding an opened .exr file into an 8-bit sRGB image
+def DecodeEXR(File):
     PixType = Imath.PixelType(Imath.PixelType.FLOAT)
     DW = File.header()['dataWindow']
     Size = (DW.max.x - DW.min.x + 1, DW.max.y - DW.min.y + 1)
@@ -17,8 +17,14 @@ def ConvertEXRToPNG(exrfile, pngfile):
         rgb[i] = np.where(rgb[i] <= 0.0031308,
                           (rgb[i] * 12.92) * 255.0,
                           (1.055 * (rgb[i] ** (1.0 / 2.4)) - 0.055) * 255.0)
-    rgb8 = [Image.frombytes("F", Size, c.tostring()).convert("L") for c in rgb]
-    Image.merge("RGB", rgb8).save(pngfile, "PNG")
+    rgb8 = [Image.frombytes("F", Size, c.tobytes()).convert("L") for c in rgb]
+    return Image.merge("RGB", rgb8)
+
+
+# converting .exr file to .png if user gave .exr file as a rendered scene
+def ConvertEXRToPNG(exrfile, pngfile):
+    DecodeEXR(OpenEXR.InputFile(exrfile)).save(pngfile, "PNG")
+
 
 # converting .tga file to .png if user gave .tga file as a rendered scene
 def ConvertTGAToPNG(tgafile, pngfile):
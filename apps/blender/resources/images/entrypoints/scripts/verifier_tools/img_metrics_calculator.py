@@ -1,14 +1,16 @@
 import itertools
+import multiprocessing
 import os
 import sys
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterator, Optional, Tuple
 
 import OpenEXR
 from PIL import Image
 
 from . import decision_tree
-from .img_format_converter import ConvertTGAToPNG, ConvertEXRToPNG
+from .img_format_converter import DecodeEXR
 from .imgmetrics import ImgMetrics
 
 CROP_NAME = "scene_crop.png"
@@ -17,12 +19,17 @@ VERIFICATION_FAIL = "FALSE"
 PKT_FILENAME = "tree35_[crr=87.71][frr=0.92].pkl"
 TREE_PATH = Path(os.path.dirname(os.path.realpath(__file__))) / PKT_FILENAME
 
+# Images and functions used by the crop scoring workers. The workers are
+# forked, so they inherit the decoded images instead of unpickling them.
+_WORKER_STATE = dict()  # type: Dict
+
 
 def calculate_metrics(reference_img_path,
                       result_img_path,
                       xres,
                       yres,
-                      metrics_output_filename='metrics.txt'):
+                      metrics_output_filename='metrics.txt',
+                      processes=None):
     """
     This is the entry point for calculation of metrics between the
     rendered_scene and the sample(cropped_img) generated for comparison.
@@ -31,6 +38,7 @@ def calculate_metrics(reference_img_path,
     :param xres: x position of crop (left, top)
     :param yres: y position of crop (left, top)
     :param metrics_output_filename:
+    :param processes: number of processes scoring the offset crops
     :return:
     """
 
@@ -50,7 +58,9 @@ def calculate_metrics(reference_img_path,
     # First try not offset crop
     # TODO this shouldn't depend on the crops' ordering
     default_crop = scene_crops[0]
-    default_metrics = compare_images(cropped_img, default_crop, available_metrics)
+    # Only the metrics the classifier uses are computed
+    default_metrics = compare_images(cropped_img, default_crop,
+                                     effective_metrics)
     try:
         label = classify_with_tree(default_metrics, classifier, labels)
         default_metrics['Label'] = label
@@ -61,14 +71,13 @@ def calculate_metrics(reference_img_path,
         default_crop.save(CROP_NAME)
         return ImgMetrics(default_metrics).write_to_file(metrics_output_filename)
     else:
-        # Try offset crops
-        for crop in scene_crops[1:]:
-            try:
-                img_metrics = compare_images(cropped_img, crop, available_metrics)
-                img_metrics['Label'] = classify_with_tree(img_metrics, classifier, labels)
-            except Exception as e:
-                print("There were error %r" % e, file=sys.stderr)
-                img_metrics['Label'] = VERIFICATION_FAIL
+        # Try offset crops, the first one that matches (in the crops'
+        # order) wins
+        classify = partial(classify_with_tree, classifier=classifier,
+                           feature_labels=labels)
+        for crop, img_metrics in score_crops(cropped_img, scene_crops[1:],
+                                             effective_metrics, classify,
+                                             processes):
             if img_metrics['Label'] == VERIFICATION_SUCCESS:
                 best_img_metrics = img_metrics
                 best_crop = crop
@@ -89,6 +98,7 @@ def calculate_metrics(reference_img_path,
     return path_to_metrics
 
 
+@lru_cache(maxsize=1)
 def load_classifier():
     data = decision_tree.DecisionTree.load(TREE_PATH)
     return data[0], data[1]
@@ -117,8 +127,8 @@ def _load_and_prepare_images_for_comparison(reference_img_path,
     :param yres: y position of crop (left, top)
     :return:
     """
-    rendered_scene = convert_to_png_if_needed(result_img_path)
-    reference_img = convert_to_png_if_needed(reference_img_path)
+    rendered_scene = load_image(result_img_path)
+    reference_img = load_image(reference_img_path)
     (crop_width, crop_height) = reference_img.size
     crops = get_crops(rendered_scene, xres, yres, crop_width, crop_height)
     return reference_img, crops, rendered_scene
@@ -128,20 +138,20 @@ def get_file_extension_lowercase(file_path):
     return os.path.splitext(file_path)[1][1:].lower()
 
 
-def convert_to_png_if_needed(img_path):
+def load_image(img_path):
+    """
+    Decodes the image in memory. EXR files are converted to 8-bit sRGB,
+    the same way they used to be converted to PNG files.
+    """
     extension = get_file_extension_lowercase(img_path)
-    name = os.path.basename(img_path)
-    file_name = os.path.join("/tmp/", name)
     if extension == "exr":
-        channels = OpenEXR.InputFile(img_path).header()['channels']
-        if 'RenderLayer.Combined.R' in channels:
+        exr_file = OpenEXR.InputFile(img_path)
+        if 'RenderLayer.Combined.R' in exr_file.header()['channels']:
             sys.exit("There is no support for OpenEXR multilayer")
-        ConvertEXRToPNG(img_path, file_name)
-    elif extension == "tga":
-        ConvertTGAToPNG(img_path, file_name)
-    else:
-        file_name = img_path
-    return Image.open(file_name)
+        return DecodeEXR(exr_file)
+    image = Image.open(img_path)
+    image.load()
+    return image
 
 
 def get_crops(rendered_scene, x, y, width, height):
@@ -153,6 +163,61 @@ def get_crops(rendered_scene, x, y, width, height):
     return crops
 
 
+def score_crops(reference, crops, metrics, classify,
+                processes: Optional[int] = None) \
+        -> Iterator[Tuple[Image.Image, Dict]]:
+    """
+    Yields the crops in their order together with their metrics and label.
+    The crops are compared with the reference concurrently, on a pool of
+    forked processes; breaking out of the loop terminates the pool.
+    :param reference: image the crops are compared with
+    :param crops: candidate crops of the rendered scene
+    :param metrics: metric classes to compute
+    :param classify: function returning the label of the computed metrics
+    :param processes: size of the pool, the number of CPU cores this process
+        may run on by default
+    """
+    if processes is None:
+        processes = available_cpus()
+    processes = min(processes, len(crops))
+
+    _WORKER_STATE.update(reference=reference, crops=crops, metrics=metrics,
+                         classify=classify)
+    try:
+        if processes <= 1:
+            for index, crop in enumerate(crops):
+                yield crop, _score_crop(index)
+            return
+
+        with multiprocessing.get_context('fork').Pool(processes) as pool:
+            results = pool.imap(_score_crop, range(len(crops)))
+            for crop, img_metrics in zip(crops, results):
+                yield crop, img_metrics
+    finally:
+        _WORKER_STATE.clear()
+
+
+def available_cpus() -> int:
+    """ os.cpu_count() reports all the cores of the host, also in
+    a container limited to a CPU set """
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except AttributeError:  # Not available on this platform
+        return os.cpu_count() or 1
+
+
+def _score_crop(index: int) -> Dict:
+    try:
+        img_metrics = compare_images(_WORKER_STATE['reference'],
+                                     _WORKER_STATE['crops'][index],
+                                     _WORKER_STATE['metrics'])
+        img_metrics['Label'] = _WORKER_STATE['classify'](img_metrics)
+    except Exception as e:
+        print("There were error %r" % e, file=sys.stderr)
+        img_metrics = {'Label': VERIFICATION_FAIL}
+    return img_metrics
+
+
 def get_metrics():
     classifier, feature_labels = load_classifier()
     available_metrics = ImgMetrics.get_metric_classes()
@@ -55,13 +55,16 @@ class ImgMetrics:
         self.crop_resolution = None
         self.variance_difference = None
 
-        # ensure that the keys are correct
-        keys = ImgMetrics.get_metric_names()
-        keys.append('Label')
+        # ensure that the keys are correct, metrics which were not
+        # computed are left as None
+        keys = set(vars(self))
+        keys.update(ImgMetrics.get_metric_names())
 
-        for key in keys:
-            if key not in dictionary:
-                raise KeyError("missing metric:" + key)
+        if 'Label' not in dictionary:
+            raise KeyError("missing metric: Label")
+        for key in dictionary:
+            if key not in keys and key != 'Label':
+                raise KeyError("unknown metric:" + key)
 
         # read into ImgMetrics object
         for key in dictionary:
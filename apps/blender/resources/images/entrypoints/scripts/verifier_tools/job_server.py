@@ -0,0 +1,121 @@
+import contextlib
+import json
+import os
+import time
+import traceback
+from typing import List, Optional, Tuple
+
+from .crop_generator import WORK_DIR
+from .verificator import verify_many
+
+JOBS_DIR = os.path.join(WORK_DIR, "jobs")
+JOB_EXTENSION = ".json"
+DONE_EXTENSION = ".done"
+POLL_INTERVAL = 0.2
+MAX_BATCH_SIZE = 8
+
+
+def pending_jobs(jobs_dir: str) -> List[str]:
+    """ Ids of the jobs waiting in the jobs directory, oldest first. Job files
+    are named after their sequence number and are removed once they are done
+    or cancelled. """
+    return [name[:-len(JOB_EXTENSION)] for name in sorted(os.listdir(jobs_dir))
+            if name.endswith(JOB_EXTENSION)]
+
+
+def load_job(jobs_dir: str, job_id: str) -> Optional[dict]:
+    """ None if the job was cancelled """
+    try:
+        with open(os.path.join(jobs_dir, job_id + JOB_EXTENSION), 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def batch_key(job: dict) -> tuple:
+    """ Jobs with the same key are rendered by one Blender invocation """
+    return (job['scene_path'], tuple(job['resolution']), job['samples'],
+            job['output_format'])
+
+
+def next_batch(jobs_dir: str,
+               max_batch_size: int) -> List[Tuple[str, dict]]:
+    """ The oldest job and the jobs which can be verified together with it.
+    Jobs which can't be read are failed on their own. """
+    key = None
+    batch: List[Tuple[str, dict]] = []
+    for job_id in pending_jobs(jobs_dir):
+        try:
+            job = load_job(jobs_dir, job_id)
+            if job is None:
+                continue
+            job_key = batch_key(job)
+        except Exception as e:  # pylint: disable=broad-except
+            traceback.print_exc()
+            finish_job(jobs_dir, job_id, {'error': repr(e)})
+            continue
+
+        if key is None:
+            key = job_key
+        if job_key == key:
+            batch.append((job_id, job))
+            if len(batch) >= max_batch_size:
+                break
+    return batch
+
+
+def finish_job(jobs_dir: str, job_id: str, result: dict) -> None:
+    """ Writes the result of a job, unless the job was cancelled """
+    job_path = os.path.join(jobs_dir, job_id + JOB_EXTENSION)
+    done_path = os.path.join(jobs_dir, job_id + DONE_EXTENSION)
+    if not os.path.exists(job_path):
+        return
+    with open(done_path + '.tmp', 'w') as f:
+        json.dump(result, f)
+    os.replace(done_path + '.tmp', done_path)
+    try:
+        os.remove(job_path)
+    except FileNotFoundError:
+        # Cancelled meanwhile
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(done_path)
+
+
+def serve(jobs_dir: str = JOBS_DIR,
+          idle_timeout: float = 300.,
+          max_batch_size: int = MAX_BATCH_SIZE) -> None:
+
+    """ Verifies the jobs written to jobs_dir until none arrives for
+    idle_timeout seconds. The jobs waiting for the same scene are verified
+    together, with the crops of all of them rendered by one Blender
+    invocation. The verdict of a job is written to <job id>.done, as
+    {"verdict": bool} or {"error": str} when the job or its batch failed.
+    Jobs removed before they are done are cancelled. """
+
+    os.makedirs(jobs_dir, exist_ok=True)
+    last_job = time.time()
+
+    while True:
+        if not pending_jobs(jobs_dir):
+            if time.time() - last_job > idle_timeout:
+                return
+            time.sleep(POLL_INTERVAL)
+            continue
+
+        batch = next_batch(jobs_dir, max_batch_size)
+        last_job = time.time()
+        if not batch:
+            continue
+
+        try:
+            verdicts = verify_many([job for _, job in batch],
+                                   "scriptfile-batch-{}.py".format(batch[0][0]))
+            results = [{'verdict': verdict} for verdict in verdicts]
+        # Blender failures end with sys.exit
+        except (Exception, SystemExit) as e:  # pylint: disable=broad-except
+            traceback.print_exc()
+            results = [{'error': repr(e)}] * len(batch)
+
+        for (job_id, _), result in zip(batch, results):
+            finish_job(jobs_dir, job_id, result)
+        last_job = time.time()
@@ -1,3 +1,4 @@
+import numpy
 from PIL import Image
 import sys
 
@@ -30,35 +31,29 @@ class MetricMassCenterDistance:
 
     @staticmethod
     def compute_mass_centers(image):
-        image = image.convert('RGB')
-        pixels = image.load()
-        width, height = image.size
+        pixels = numpy.asarray(image.convert('RGB'), dtype=numpy.int64)
+        height, width = pixels.shape[:2]
+        # Integer sums are exact, the result does not depend on the
+        # summation order
+        total_mass = pixels.sum(axis=(0, 1))
+        mass_x = numpy.arange(width).dot(pixels.sum(axis=0))
+        mass_y = numpy.arange(height).dot(pixels.sum(axis=1))
         results = dict()
-        for channel_index in range(len(pixels[0, 0])):
-            mass_center_x = 0
-            mass_center_y = 0
-            total_mass = 0
-            for x in range(width):
-                for y in range(height):
-                    mass = pixels[x, y][channel_index]
-                    mass_center_x += mass * x
-                    mass_center_y += mass * y
-                    total_mass += mass
-                    
-            divisor_x = (float(total_mass) * width)
-            divisor_y = (float(total_mass) * height)
-               
+        for channel_index in range(pixels.shape[2]):
+            divisor_x = float(total_mass[channel_index]) * width
+            divisor_y = float(total_mass[channel_index]) * height
+
             if divisor_x == 0:
                 mass_center_x = 0.5
             else:
-                mass_center_x = mass_center_x / divisor_x
-                
+                mass_center_x = int(mass_x[channel_index]) / divisor_x
+
             if divisor_y == 0:
                 mass_center_y = 0.5
             else:
-                mass_center_y = mass_center_y / divisor_y
-            
-            results[channel_index] = mass_center_x, mass_center_y        
+                mass_center_y = int(mass_y[channel_index]) / divisor_y
+
+            results[channel_index] = mass_center_x, mass_center_y
         return results
 
 
@@ -65,7 +65,8 @@ def prepare_params(mounted_paths, subtask_border, scene_file_path, resolution, s
     return crops, params
 
 
-def make_verdict( subtask_file_paths, crops, results ):
+def make_verdict( subtask_file_paths, crops, results, output_dir=OUTPUT_DIR,
+                  processes=None ):
     verdict = True
 
     for crop_data in results:
@@ -77,20 +78,23 @@ def make_verdict( subtask_file_paths, crops, results ):
         print("top " + str(top))
 
         for crop, subtask in zip(crop_data['results'], subtask_file_paths):
-            crop_path = os.path.join(OUTPUT_DIR, crop)
-            results_path = calculate_metrics(crop_path,
-                                subtask,
-                                left, top,
-                                metrics_output_filename=os.path.join(OUTPUT_DIR, crop_data['crop']['outfilebasename'] + "metrics.txt"))
+            crop_path = os.path.join(output_dir, crop)
+            metrics_path = os.path.join(
+                output_dir,
+                crop_data['crop']['outfilebasename'] + "metrics.txt")
+            results_path = calculate_metrics(
+                crop_path, subtask, left, top,
+                metrics_output_filename=metrics_path, processes=processes)
 
             with open(results_path, 'r') as f:
                 data = json.load(f)
             if data['Label'] != "TRUE":
                 verdict = False
 
-    with open(os.path.join(OUTPUT_DIR, 'verdict.json'), 'w') as f:
+    with open(os.path.join(output_dir, 'verdict.json'), 'w') as f:
         json.dump({'verdict': verdict}, f)
 
+    return verdict
 
 
 def verify(subtask_file_paths, subtask_border, scene_file_path, resolution, samples, frames, output_format, basefilename,
@@ -121,8 +125,59 @@ def verify(subtask_file_paths, subtask_border, scene_file_path, resolution, samp
                                     resolution, samples, frames, output_format,
                                     basefilename, crops_count, crops_borders)
 
-    results = blender.render(params, mounted_paths)
+    results = blender.render_batch(params, mounted_paths)
 
     print(results)
 
     make_verdict( subtask_file_paths, crops, results )
+
+
+def verify_many(jobs, script_name="scriptfile-batch.py"):
+
+    """ Verifies the results of several subtasks of the same scene, rendering
+    the crops of all of them with one Blender invocation.
+
+    jobs - list of dicts with the verify() arguments of a subtask and the
+           output_dir its crops, metrics and verdict.json are written to.
+           The optional processes is the number of processes comparing
+           the crops, all the cores available to the container by default.
+           scene_path, resolution, samples and output_format have to be the
+           same for all of them.
+
+    Returns the verdicts of the jobs.
+    """
+    mounted_paths = dict()
+    mounted_paths["WORK_DIR"] = WORK_DIR
+    mounted_paths["OUTPUT_DIR"] = OUTPUT_DIR
+
+    prepared = []
+    crops_render_data = []
+    params = None
+
+    for job in jobs:
+        crops, params = prepare_params(
+            mounted_paths, job['subtask_borders'], job['scene_path'],
+            job['resolution'], job['samples'], job['frames'],
+            job['output_format'], job['basefilename'],
+            job.get('crops_count', 3), job.get('crops_borders'))
+        os.makedirs(job['output_dir'], exist_ok=True)
+        for crop in params['crops']:
+            crop['frames'] = job['frames']
+            crop['output_dir'] = job['output_dir']
+        crops_render_data.extend(params['crops'])
+        prepared.append((job, crops, len(params['crops'])))
+
+    params['crops'] = crops_render_data
+    results = blender.render_batch(params, mounted_paths, script_name)
+
+    print(results)
+
+    verdicts = []
+    offset = 0
+    for job, crops, count in prepared:
+        verdicts.append(make_verdict(job['subtask_paths'], crops,
+                                     results[offset:offset + count],
+                                     job['output_dir'],
+                                     job.get('processes')))
+        offset += count
+    return verdicts
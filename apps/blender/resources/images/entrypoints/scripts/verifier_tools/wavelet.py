@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import pywt
 import numpy
 from PIL import Image
@@ -5,7 +7,7 @@ from PIL import Image
 import sys
 
 def calculate_sum( coeff ):
-    return sum( sum( coeff ** 2 ) )
+    return numpy.sum( numpy.square( coeff ) )
 
 def calculate_size( coeff ):
     shape = coeff.shape
@@ -21,9 +23,8 @@ def calculate_mse( coeff1, coeff2, low, high ):
     num = 0
     for i in range( low, high ):
         if type( coeff1[ i ] ) is tuple:
-            suma += calculate_sum( coeff1[ i ][ 0 ] - coeff2[ i ][ 0 ] )
-            suma += calculate_sum( coeff1[ i ][ 1 ] - coeff2[ i ][ 1 ] )
-            suma += calculate_sum( coeff1[ i ][ 2 ] - coeff2[ i ][ 2 ] )
+            for detail1, detail2 in zip( coeff1[ i ], coeff2[ i ] ):
+                suma += calculate_sum( detail1 - detail2 )
             num += 3 * coeff1[ i ][ 0 ].size
         else:
             suma += calculate_sum(coeff1[i] - coeff2[i] )
@@ -43,12 +44,9 @@ def calculate_frequencies( coeff1, coeff2 ):
     freq_list = list()
     
     for i in range( start_level, num_levels ):
-        
-        abs_coeff1 = numpy.absolute( coeff1[ i ] )
-        abs_coeff2 = numpy.absolute( coeff2[ i ] )
-        
-        sum_coeffs1 = sum( sum( sum( abs_coeff1 ) ) )
-        sum_coeffs2 = sum( sum( sum( abs_coeff2 ) ) )
+
+        sum_coeffs1 = sum( numpy.sum( numpy.absolute( detail ) ) for detail in coeff1[ i ] )
+        sum_coeffs2 = sum( numpy.sum( numpy.absolute( detail ) ) for detail in coeff2[ i ] )
         
         diff = numpy.absolute( sum_coeffs2 - sum_coeffs1 ) / ( 3 * coeff1[ i ][ 0 ].size )
         
@@ -58,6 +56,53 @@ def calculate_frequencies( coeff1, coeff2 ):
     return freq_list
         
         
+## ======================= ##
+##
+@lru_cache( maxsize=9 )
+def _decompose_reference( data, shape, wavelet ):
+    channel = numpy.frombuffer( data, dtype=numpy.float64 ).reshape( shape )
+    return pywt.wavedec2( channel, wavelet )
+
+def decompose_reference( channel, wavelet ):
+    """ wavedec2 of a channel of the reference crop. The reference is
+    compared with several offset crops of the result, its decompositions
+    (3 wavelets of 3 channels) are computed once. """
+    return _decompose_reference( channel.tobytes(), channel.shape, wavelet )
+
+## ======================= ##
+##
+def wavelet_metrics( np_image1, np_image2, wavelet, frequencies=False ):
+    """ MSE of the base, low, mid and high frequency levels of a wavelet
+    decomposition (and the frequency metrics), summed over the channels """
+    prefix = "wavelet_" + wavelet
+    result = dict()
+    for level in ( "_base", "_low", "_mid", "_high" ):
+        result[ prefix + level ] = 0
+    if frequencies:
+        for x in range( 1, 4 ):
+            result[ prefix + "_freq_x" + str( x ) ] = 0
+
+    for i in range( np_image1.shape[ 2 ] ):
+        coeff1 = decompose_reference( np_image1[ ..., i ], wavelet )
+        coeff2 = pywt.wavedec2( np_image2[ ..., i ], wavelet )
+
+        len_total = len( coeff1 ) - 1
+        len_div_3 = int( len_total / 3 )
+        len_two_thirds = int( len_total * 2 / 3 )
+
+        result[ prefix + "_base" ] += calculate_mse( coeff1, coeff2, 0, 1 )
+        result[ prefix + "_low" ] += calculate_mse( coeff1, coeff2, 1, 1 + len_div_3 )
+        result[ prefix + "_mid" ] += calculate_mse( coeff1, coeff2, 1 + len_div_3, 1 + len_two_thirds )
+        result[ prefix + "_high" ] += calculate_mse( coeff1, coeff2, 1 + len_two_thirds, 1 + len_total )
+
+        if frequencies:
+            freqs = calculate_frequencies( coeff1, coeff2 )
+            for x in range( 3 ):
+                result[ prefix + "_freq_x" + str( x + 1 ) ] += freqs[ x ]
+
+    return result
+
+
 ## ======================= ##
 ##
 class MetricWavelet:
@@ -70,76 +115,15 @@ class MetricWavelet:
         image1 = image1.convert("RGB")
         image2 = image2.convert("RGB")
 
-        np_image1 = numpy.array(image1)
-        np_image2 = numpy.array(image2)
+        # wavedec2 works on float64, convert once instead of per wavelet
+        np_image1 = numpy.asarray(image1, dtype=numpy.float64)
+        np_image2 = numpy.asarray(image2, dtype=numpy.float64)
 
         result = dict()
-        result["wavelet_db4_base"] = 0
-        result["wavelet_db4_low"] = 0
-        result["wavelet_db4_mid"] = 0
-        result["wavelet_db4_high"] = 0
-
-        for i in range(0,3):
-            coeff1 = pywt.wavedec2( np_image1[...,i], "db4" )
-            coeff2 = pywt.wavedec2( np_image2[...,i], "db4" )
-
-            len_total = len( coeff1 ) - 1
-            len_div_3 = int( len_total / 3 )
-            len_two_thirds = int( len_total * 2 / 3 )
-
-            result[ "wavelet_db4_base" ] += calculate_mse( coeff1, coeff2, 0, 1 )
-            result[ "wavelet_db4_low" ] = result[ "wavelet_db4_low" ] + calculate_mse( coeff1, coeff2, 1, 1 + len_div_3 )
-            result[ "wavelet_db4_mid" ] = result[ "wavelet_db4_mid" ] + calculate_mse( coeff1, coeff2, 1 + len_div_3, 1 + len_two_thirds )
-            result[ "wavelet_db4_high" ] = result[ "wavelet_db4_high" ] + calculate_mse( coeff1, coeff2, 1 + len_two_thirds, 1 + len_total )
-
-        #
-        result["wavelet_sym2_base"] = 0
-        result["wavelet_sym2_low"] = 0
-        result["wavelet_sym2_mid"] = 0
-        result["wavelet_sym2_high"] = 0
-
-        for i in range(0,3):
-            coeff1 = pywt.wavedec2( np_image1[...,i], "sym2" )
-            coeff2 = pywt.wavedec2( np_image2[...,i], "sym2" )
-
-            len_total = len( coeff1 ) - 1
-            len_div_3 = int( len_total / 3 )
-            len_two_thirds = int( len_total * 2 / 3 )
-
-            result[ "wavelet_sym2_base" ] += calculate_mse( coeff1, coeff2, 0, 1 )
-            result[ "wavelet_sym2_low" ] = result[ "wavelet_sym2_low" ] + calculate_mse( coeff1, coeff2, 1, 1 + len_div_3 )
-            result[ "wavelet_sym2_mid" ] = result[ "wavelet_sym2_mid" ] + calculate_mse( coeff1, coeff2, 1 + len_div_3, 1 + len_two_thirds )
-            result[ "wavelet_sym2_high" ] = result[ "wavelet_sym2_high" ] + calculate_mse( coeff1, coeff2, 1 + len_two_thirds, 1 + len_total )
-            
-            
+        result.update( wavelet_metrics( np_image1, np_image2, "db4" ) )
+        result.update( wavelet_metrics( np_image1, np_image2, "sym2" ) )
         # Frequency metrics based on haar wavlets
-        result[ "wavelet_haar_freq_x1" ] = 0
-        result[ "wavelet_haar_freq_x2" ] = 0
-        result[ "wavelet_haar_freq_x3" ] = 0
-
-        result["wavelet_haar_base"] = 0
-        result["wavelet_haar_low"] = 0
-        result["wavelet_haar_mid"] = 0
-        result["wavelet_haar_high"] = 0
-
-        for i in range(0,3):
-            coeff1 = pywt.wavedec2( np_image1[...,i], "haar" )
-            coeff2 = pywt.wavedec2( np_image2[...,i], "haar" )  
-            
-            freqs = calculate_frequencies( coeff1, coeff2 )
-            
-            result[ "wavelet_haar_freq_x1" ] = result[ "wavelet_haar_freq_x1" ] + freqs[ 0 ]
-            result[ "wavelet_haar_freq_x2" ] = result[ "wavelet_haar_freq_x2" ] + freqs[ 1 ]
-            result[ "wavelet_haar_freq_x3" ] = result[ "wavelet_haar_freq_x3" ] + freqs[ 2 ]
-
-            len_total = len( coeff1 ) - 1
-            len_div_3 = int( len_total / 3 )
-            len_two_thirds = int( len_total * 2 / 3 )
-
-            result[ "wavelet_haar_base" ] += calculate_mse( coeff1, coeff2, 0, 1 )
-            result[ "wavelet_haar_low" ] += calculate_mse( coeff1, coeff2, 1, 1 + len_div_3 )
-            result[ "wavelet_haar_mid" ] += calculate_mse( coeff1, coeff2, 1 + len_div_3, 1 + len_two_thirds )
-            result[ "wavelet_haar_high" ] += calculate_mse( coeff1, coeff2, 1 + len_two_thirds, 1 + len_total )
+        result.update( wavelet_metrics( np_image1, np_image2, "haar", frequencies=True ) )
 
         return result
 
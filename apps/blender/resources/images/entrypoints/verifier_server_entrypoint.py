@@ -0,0 +1,11 @@
+import json
+
+from scripts.verifier_tools.job_server import serve
+
+with open('params.json', 'r') as params_file:
+    params = json.load(params_file)
+
+serve(
+    idle_timeout=params['idle_timeout'],
+    max_batch_size=params['max_batch_size'],
+)
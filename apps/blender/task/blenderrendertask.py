@@ -4,7 +4,6 @@ import math
 import os
 import random
 import time
-from collections import OrderedDict
 from copy import copy
 from typing import Optional, Type
 
@@ -13,8 +12,7 @@ from apps.blender.blenderenvironment import BlenderEnvironment, \
     BlenderNVGPUEnvironment
 from apps.core.task.coretask import CoreTaskTypeInfo
 from apps.rendering.resources.imgrepr import OpenCVImgRepr
-from apps.rendering.resources.renderingtaskcollector import \
-    RenderingTaskCollector
+from apps.rendering.resources.previewcompositor import PreviewCompositor
 from apps.rendering.resources.utils import handle_opencv_image_error
 from apps.rendering.task.framerenderingtask import FrameRenderingTask, \
     FrameRenderingTaskBuilder, FrameRendererOptions
@@ -49,7 +47,7 @@ class BlenderNVGPUDefaults(BlenderDefaults):
 
 class PreviewUpdater(object):
     def __init__(self, preview_file_path, preview_res_x, preview_res_y,
-                 expected_offsets):
+                 expected_offsets, compositor=None):
         # pairs of (subtask_number, its_image_filepath)
         # careful: chunks' numbers start from 1
         self.chunks = {}
@@ -57,6 +55,9 @@ class PreviewUpdater(object):
         self.preview_res_y = preview_res_y
         self.preview_file_path = preview_file_path
         self.expected_offsets = expected_offsets
+        # by default the preview is written to disk on every update
+        self.compositor = compositor or PreviewCompositor(PREVIEW_EXT,
+                                                          interval=0)
 
         # where the match ends - since the chunks have unexpectable sizes, we
         # don't know where to paste new chunk unless all of the above are in
@@ -86,20 +87,20 @@ class PreviewUpdater(object):
                                                      chunk_height)
 
             def open_or_create_image():
-                if not os.path.exists(self.preview_file_path) \
+                if not self.compositor.exists(self.preview_file_path) \
                         or len(self.chunks) == 1:
                     chunk_channels = subtask_img.get_channels()
                     return OpenCVImgRepr.empty(self.preview_res_x,
                                                self.preview_res_y,
                                                channels=chunk_channels)
-                return OpenCVImgRepr.from_image_file(self.preview_file_path)
+                return self.compositor.open(self.preview_file_path)
 
             preview_img = open_or_create_image()
 
             subtask_img_resized.try_adjust_type(OpenCVImgRepr.IMG_U8)
 
             preview_img.paste_image(subtask_img_resized, 0, offset)
-            preview_img.save_with_extension(self.preview_file_path, PREVIEW_EXT)
+            self.compositor.put(self.preview_file_path, preview_img)
 
         if not handler_result.success:
             return
@@ -113,10 +114,10 @@ class PreviewUpdater(object):
         self.chunks = {}
         self.perfect_match_area_y = 0
         self.perfectly_placed_subtasks = 0
-        if os.path.exists(self.preview_file_path):
-            with handle_opencv_image_error(logger):
-                OpenCVImgRepr.empty(self.preview_res_x, self.preview_res_y)\
-                    .save_with_extension(self.preview_file_path, PREVIEW_EXT)
+        if self.compositor.exists(self.preview_file_path):
+            self.compositor.put(
+                self.preview_file_path,
+                OpenCVImgRepr.empty(self.preview_res_x, self.preview_res_y))
 
     def _get_height(self, subtask_number):
         next_offset = \
@@ -128,6 +129,9 @@ class RenderingTaskTypeInfo(CoreTaskTypeInfo):
 
     @classmethod
     def get_preview(cls, task, single=False):
+        if task:
+            # write the previews updated in memory, the caller reads the files
+            task.preview_compositor.flush()
         result = None
         if not task:
             pass
@@ -343,18 +347,16 @@ class BlenderRenderTask(FrameRenderingTask):
                                                                   PREVIEW_EXT)
                 preview_path = os.path.join(self.tmp_dir, preview_name)
                 self.preview_file_path.append(preview_path)
-                self.preview_updaters.append(PreviewUpdater(preview_path,
-                                                            preview_x,
-                                                            preview_y,
-                                                            expected_offsets))
+                self.preview_updaters.append(PreviewUpdater(
+                    preview_path, preview_x, preview_y, expected_offsets,
+                    compositor=self.preview_compositor))
         else:
             preview_name = "current_preview.{}".format(PREVIEW_EXT)
             self.preview_file_path = "{}".format(os.path.join(self.tmp_dir,
                                                               preview_name))
-            self.preview_updater = PreviewUpdater(self.preview_file_path,
-                                                  preview_x,
-                                                  preview_y,
-                                                  expected_offsets)
+            self.preview_updater = PreviewUpdater(
+                self.preview_file_path, preview_x, preview_y,
+                expected_offsets, compositor=self.preview_compositor)
 
     # pylint: disable-msg=too-many-locals
     def query_extra_data(self, perf_index: float,
@@ -538,78 +540,35 @@ class BlenderRenderTask(FrameRenderingTask):
 
                 img.try_adjust_type(OpenCVImgRepr.IMG_U8)
 
-                img.save_with_extension(preview_task_file_path, PREVIEW_EXT)
-                img.save_with_extension(self._get_preview_file_path(num),
-                                        PREVIEW_EXT)
+                self.preview_compositor.put(preview_task_file_path, img)
+                self.preview_compositor.put(self._get_preview_file_path(num),
+                                            img.copy())
         else:
             self.preview_updaters[num].update_preview(new_chunk_file_path, part)
             self._update_frame_task_preview()
 
-    def _put_image_together(self):
-        output_file_name = "{}".format(self.output_file, self.output_format)
-        logger.debug('_put_image_together() out: %r', output_file_name)
-        self.collected_file_names = OrderedDict(
-            sorted(self.collected_file_names.items()))
-        if not self._use_outer_task_collector():
-            collector = CustomCollector(width=self.res_x,
-                                        height=self.res_y)
-            for file in self.collected_file_names.values():
-                collector.add_img_file(file)
-            with handle_opencv_image_error(logger):
-                image = collector.finalize()
-                image.save_with_extension(output_file_name, self.output_format)
-        else:
-            self._put_collected_files_together(
-                os.path.join(self.tmp_dir, output_file_name),
-                list(self.collected_file_names.values()), "paste")
-
     @staticmethod
     def mark_part_on_preview(part, img_task, color, preview_updater):
         lower = preview_updater.get_offset(part)
         upper = preview_updater.get_offset(part + 1)
         res_x = preview_updater.preview_res_x
-        for i in range(0, res_x):
-            for j in range(lower, upper):
-                img_task.set_pixel((i, j), color)
+        img_task.fill(0, lower, res_x, upper, color)
 
     def _mark_task_area(self, subtask, img_task, color, frame_index=0):
         if not self.use_frames:
             self.mark_part_on_preview(subtask['start_task'], img_task, color,
                                       self.preview_updater)
         elif self.total_tasks <= len(self.frames):
-            for i in range(0, int(math.floor(self.res_x * self.scale_factor))):
-                for j in range(0,
-                               int(math.floor(self.res_y * self.scale_factor))):
-                    img_task.set_pixel((i, j), color)
+            img_task.fill(0, 0,
+                          int(math.floor(self.res_x * self.scale_factor)),
+                          int(math.floor(self.res_y * self.scale_factor)),
+                          color)
         else:
             parts = int(self.total_tasks / len(self.frames))
             pu = self.preview_updaters[frame_index]
             part = (subtask['start_task'] - 1) % parts + 1
             self.mark_part_on_preview(part, img_task, color, pu)
 
-    def _put_frame_together(self, frame_num, num_start):
-        directory = os.path.dirname(self.output_file)
-        output_file_name = os.path.join(directory,
-                                        self._get_output_name(frame_num))
-        frame_key = str(frame_num)
-        collected = self.frames_given[frame_key]
-        collected = OrderedDict(sorted(collected.items()))
-        if not self._use_outer_task_collector():
-            collector = CustomCollector(width=self.res_x,
-                                        height=self.res_y)
-            for file in collected.values():
-                collector.add_img_file(file)
-            with handle_opencv_image_error(logger):
-                image = collector.finalize()
-                image.save_with_extension(output_file_name, self.output_format)
-        else:
-            self._put_collected_files_together(output_file_name,
-                                               list(collected.values()),
-                                               "paste")
-        self.collected_file_names[frame_num] = output_file_name
-        self._update_frame_preview(output_file_name, frame_num, final=True)
-        self._update_frame_task_preview()
-
 
 class BlenderNVGPURenderTask(BlenderRenderTask):
     ENVIRONMENT_CLASS: Type[BlenderEnvironment] = BlenderNVGPUEnvironment
@@ -653,20 +612,6 @@ class BlenderNVGPURenderTaskBuilder(BlenderRenderTaskBuilder):
     DEFAULTS: Type[BlenderDefaults] = BlenderNVGPUDefaults
 
 
-class CustomCollector(RenderingTaskCollector):
-    def __init__(self, width=1, height=1):
-        RenderingTaskCollector.__init__(self, width, height)
-        self.current_offset = 0
-
-    def _paste_image(self, final_img, new_part, num):
-        img_offset = OpenCVImgRepr.empty(self.width, self.height)
-        img_offset.paste_image(new_part, 0, self.current_offset)
-        new_img_res_y = new_part.get_height()
-        self.current_offset += new_img_res_y
-        img_offset.add(final_img)
-        return img_offset
-
-
 def generate_expected_offsets(parts, res_x, res_y):
     logger.debug('generate_expected_offsets(%r, %r, %r)', parts, res_x, res_y)
     # returns expected offsets for preview; the highest value is preview's
@@ -91,6 +91,8 @@ class CoreTaskTypeInfo(TaskTypeInfo):
 class CoreTask(Task):
     VERIFIER_CLASS: Type[CoreVerifier] = CoreVerifier
     VERIFICATION_QUEUE = VerificationQueue()
+    JOURNALED_ATTRS = ('last_task', 'num_tasks_received',
+                       'num_failed_subtasks', 'counting_nodes')
 
     ENVIRONMENT_CLASS: 'Type[Environment]'
 
@@ -217,6 +219,7 @@ class CoreTask(Task):
             subtask_id,
             self._deadline,
             verification_finished_,
+            task_id=self.header.task_id,
             subtask_info={**self.subtasks_given[subtask_id],
                           **{'owner': self.header.task_owner.key}},
             results=result_files,
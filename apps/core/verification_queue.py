@@ -1,9 +1,15 @@
+import heapq
+import itertools
 import logging
-import queue
+import math
+import os
+import time
+from collections import Counter, deque
 from functools import partial
 from types import FunctionType
-from typing import Optional, Type, Dict, Tuple
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Type
 
+from golem.core.common import summarize
 from golem.verificator.verifier import Verifier
 from twisted.internet.defer import Deferred, gatherResults
 
@@ -11,8 +17,28 @@ from apps.core.verification_task import VerificationTask
 
 logger = logging.getLogger(__name__)
 
+# (deadline, sequence number, entry, verifier class, submit time)
+QueueItem = Tuple[int, int, VerificationTask, Type[Verifier], float]
+
+
+def default_concurrency(num_cores: Optional[int] = None) -> int:
+    """ Verifications run Blender in Docker and are CPU bound, use half of
+    the cores given to Golem (of the machine if not known) and leave the
+    rest for the node """
+    return max(1, (num_cores or os.cpu_count() or 1) // 2)
+
 
 class VerificationQueue:
+    """ Runs verifications on a pool of workers. Entries of a task are
+    ordered by deadline; while several tasks are waiting, each
+    of them gets a fair share of the workers before the earliest deadline
+    across tasks is picked.
+
+    Each running verification takes one of the worker slots. With
+    `get_slot_host_config` set, its container gets the CPU set and memory
+    limit of that slot, so that the verifications together stay within
+    the cores and memory given to Golem.
+    """
 
     #  We assume that after 30 minutes verification tasks is stalled (possibly
     #  to bugs in third party docker api). After this period we finish
@@ -20,30 +46,64 @@ class VerificationQueue:
     #  configurable from config, and will be relative to nodes benchmark
     #  results.
     VERIFICATION_TIMEOUT = 1800
-
-    def __init__(self, concurrency: int = 1) -> None:
-        self._concurrency = concurrency
-        self._queue: queue.Queue = queue.Queue()
+    # Number of the latest verifications the wait time statistics cover
+    STATS_WINDOW = 1000
+
+    def __init__(self, concurrency: Optional[int] = None) -> None:
+        self._num_cores: Optional[int] = None
+        self._concurrency = concurrency or default_concurrency()
+        # (slot, slots) -> docker host config of the slot's container
+        self.get_slot_host_config: \
+            Optional[Callable[[int, int], Dict[str, Any]]] = None
+        # subtask id -> worker slot
+        self._slots: Dict[str, int] = dict()
+        self._queues: Dict[Optional[str], List[QueueItem]] = dict()
+        self._running: Counter = Counter()
         self._jobs: Dict[str, Deferred] = dict()
         self.callbacks: Dict[VerificationTask, FunctionType] = dict()
         self._paused = False
+        self._sequence = itertools.count()
+        self._wait_times: Deque[float] = deque(maxlen=self.STATS_WINDOW)
+        self._run_times: Deque[float] = deque(maxlen=self.STATS_WINDOW)
+        self._finished = 0
+
+    @property
+    def concurrency(self) -> int:
+        return self._concurrency
+
+    def set_concurrency(self, concurrency: Optional[int],
+                        num_cores: Optional[int] = None) -> None:
+        """ Change the size of the worker pool, 0 or None sizes it to
+        `num_cores`. Running verifications over the new limit are not
+        stopped. """
+        if num_cores is not None:
+            self._num_cores = num_cores
+        self._concurrency = concurrency or \
+            default_concurrency(self._num_cores)
+        self._process_queue()
 
+    # pylint: disable=too-many-arguments
     def submit(self,
                verifier_class: Type[Verifier],
                subtask_id: str,
                deadline: int,
                cb: FunctionType,
+               task_id: Optional[str] = None,
                **kwargs) -> None:
 
         logger.debug(
             "Verification Queue submit: "
-            "(verifier_class: %s, subtask: %s, deadline: %s, kwargs: %s)",
-            verifier_class, subtask_id, deadline, kwargs
+            "(verifier_class: %s, subtask: %s, task: %s, deadline: %s, "
+            "kwargs: %s)",
+            verifier_class, subtask_id, task_id, deadline, kwargs
         )
 
         entry = VerificationTask(subtask_id, deadline, kwargs)
         self.callbacks[entry] = cb
-        self._queue.put((entry, verifier_class))
+        heapq.heappush(
+            self._queues.setdefault(task_id, []),
+            (deadline, next(self._sequence), entry,
+             verifier_class, time.monotonic()))
         self._process_queue()
 
     def pause(self) -> Deferred:
@@ -59,31 +119,73 @@ class VerificationQueue:
     def can_run(self) -> bool:
         return not self._paused and len(self._jobs) < self._concurrency
 
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'concurrency': self._concurrency,
+            'paused': self._paused,
+            'running': len(self._jobs),
+            'queued': sum(len(q) for q in self._queues.values()),
+            'queued_by_task': {task_id: len(q)
+                               for task_id, q in self._queues.items()},
+            'running_by_task': {task_id: count
+                                for task_id, count in self._running.items()
+                                if count},
+            'finished': self._finished,
+            'wait_time': summarize(self._wait_times),
+            'verification_time': summarize(self._run_times),
+        }
+
     def _process_queue(self) -> None:
-        if self.can_run:
-            entry, verifier_cls = self._next()
-            if entry and verifier_cls:
-                self._run(entry, verifier_cls)
-
-    def _next(self) -> Tuple[Optional[VerificationTask], Optional[Verifier]]:
-        try:
-            return self._queue.get(block=False)
-        except queue.Empty:
-            return None, None
-
-    def _run(self, entry: VerificationTask,
-             verifier_cls: Type[Verifier]) -> None:
+        while self.can_run:
+            item = self._next()
+            if not item:
+                return
+            self._run(item)
+
+    def _next(self) -> Optional[Tuple[Optional[str], QueueItem]]:
+        """ Pick the most urgent entry among the tasks below their fair
+        share of workers, or among all the tasks when none of them is """
+        if not self._queues:
+            return None
+
+        active = set(self._queues) | {task_id for task_id, count
+                                      in self._running.items() if count}
+        share = math.ceil(self._concurrency / len(active))
+        candidates = [task_id for task_id in self._queues
+                      if self._running[task_id] < share] or list(self._queues)
+
+        task_id = min(candidates, key=lambda t: self._queues[t][0][:2])
+        task_queue = self._queues[task_id]
+        item = heapq.heappop(task_queue)
+        if not task_queue:
+            del self._queues[task_id]
+        return task_id, item
+
+    def _run(self, queued: Tuple[Optional[str], QueueItem]) -> None:
+        task_id, (_, _, entry, verifier_cls, submitted) = queued
         subtask_id = entry.subtask_id
+        started = time.monotonic()
+        self._wait_times.append(started - submitted)
 
         logger.info("Running verification of subtask %r", subtask_id)
+        slot = self._free_slot()
+        entry.kwargs['host_config'] = self._slot_host_config(slot)
 
         def callback(*args):
             logger.info("Finished verification of subtask %r", subtask_id)
             try:
-                self.callbacks[entry](subtask_id=args[0][0], verdict=args[0][1],
+                self.callbacks[entry](subtask_id=args[0][0],
+                                      verdict=args[0][1],
                                       result=args[0][2])
             finally:
-                self._jobs.pop(subtask_id, None)
+                self.callbacks.pop(entry, None)
+                self._finished += 1
+                self._run_times.append(time.monotonic() - started)
+                if self._jobs.pop(subtask_id, None) is not None:
+                    self._slots.pop(subtask_id, None)
+                    self._running[task_id] -= 1
+                    if self._running[task_id] <= 0:
+                        del self._running[task_id]
                 self._process_queue()
 
         def errback(_):
@@ -94,6 +196,10 @@ class VerificationQueue:
         from twisted.internet import reactor
         result = entry.start(verifier_cls)
         if result:
+            self._jobs[subtask_id] = result
+            self._slots[subtask_id] = slot
+            self._running[task_id] += 1
+
             result.addCallback(partial(reactor.callFromThread, callback))
             result.addErrback(partial(reactor.callFromThread, errback))
 
@@ -102,7 +208,15 @@ class VerificationQueue:
 
             result.addTimeout(VerificationQueue.VERIFICATION_TIMEOUT, reactor,
                               onTimeoutCancel=fn_timeout)
-            self._jobs[subtask_id] = result
+
+    def _free_slot(self) -> int:
+        used = set(self._slots.values())
+        return next(slot for slot in itertools.count() if slot not in used)
+
+    def _slot_host_config(self, slot: int) -> Dict[str, Any]:
+        if self.get_slot_host_config is None:
+            return dict()
+        return self.get_slot_host_config(slot, self._concurrency)
 
     @staticmethod
     def _verification_timed_out(_result, _timeout, task, event,
@@ -111,6 +225,11 @@ class VerificationQueue:
         task.stop(event)
 
     def _reset(self) -> None:
-        self._queue = queue.Queue()
+        self._queues = dict()
+        self._running = Counter()
         self._jobs = dict()
+        self._slots = dict()
         self.callbacks = dict()
+        self._wait_times.clear()
+        self._run_times.clear()
+        self._finished = 0
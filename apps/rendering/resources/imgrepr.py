@@ -58,6 +58,20 @@ class OpenCVImgRepr:
             bgr_color = bgr_color + (255,)
         self.img[xy] = bgr_color
 
+    def fill(self, left, top, right, bottom, color):
+        """ Set the color of the pixels in the [left, right) x [top, bottom)
+        rectangle, as set_pixel does for a single one """
+        bgr_color = tuple(reversed(color))
+        if self.img.shape[2] == 4 and len(bgr_color) == 3:
+            bgr_color = bgr_color + (255,)
+        self.img[max(0, top):max(0, bottom), max(0, left):max(0, right)] = \
+            bgr_color
+
+    def copy(self):
+        img_repr = OpenCVImgRepr()
+        img_repr.img = self.img.copy()
+        return img_repr
+
     def get_pixel(self, xy):
         # reverse because OpenCV stores colors as BGR
         return tuple(reversed(self.img[xy[1], xy[0]]))
@@ -201,6 +215,22 @@ class EXRImgRepr(ImgRepr):
         opencv_img[:, :, 2] = r
         return opencv_img
 
+    @staticmethod
+    def read_float_bgr(file_):
+        """ Read the RGB channels of an EXR file as float32 BGR pixels, the
+        way OpenCV stores them, without converting them to 8 bits """
+        exr = OpenEXR.InputFile(file_)
+        try:
+            dw = exr.header()['dataWindow']
+            width = dw.max.x - dw.min.x + 1
+            channels = exr.channels("BGR",
+                                    Imath.PixelType(Imath.PixelType.FLOAT))
+        finally:
+            exr.close()
+        return numpy.dstack([
+            numpy.frombuffer(channel, dtype=numpy.float32).reshape(-1, width)
+            for channel in channels])
+
     def load_from_file(self, file_):
         self.img = OpenEXR.InputFile(file_)
         self.dw = self.img.header()['dataWindow']
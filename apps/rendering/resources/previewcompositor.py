@@ -0,0 +1,81 @@
+import logging
+import os
+from typing import Dict, Optional, Set
+
+from apps.rendering.resources.imgrepr import OpenCVError, OpenCVImgRepr
+
+logger = logging.getLogger("apps.rendering")
+
+# Seconds between a change to a preview and writing it to disk. Changes
+# made in the meantime are written together.
+PREVIEW_SAVE_INTERVAL = 2.0
+
+
+class PreviewCompositor:
+    """ Keeps changed task previews in memory, keyed by the path of their
+    file.
+
+    Chunks are pasted into the buffers in place and a changed buffer is
+    written to its file once the save interval passes, or when the file is
+    requested with flush(). With an interval of 0 every change is written
+    immediately. Previews without pending changes are read from disk.
+    """
+
+    def __init__(self, extension: str,
+                 interval: float = PREVIEW_SAVE_INTERVAL) -> None:
+        self.extension = extension
+        self.interval = interval
+        self._buffers: Dict[str, OpenCVImgRepr] = dict()
+        self._changed: Set[str] = set()
+        self._flush_call = None
+
+    def exists(self, path: Optional[str]) -> bool:
+        """ Whether there are changes not written yet or a file on disk """
+        if path is None:
+            return False
+        return path in self._changed or os.path.exists(path)
+
+    def open(self, path: str) -> OpenCVImgRepr:
+        """ The buffer of the preview, read from its file unless it has
+        pending changes. Call changed() after modifying it. """
+        if path not in self._changed:
+            self._buffers[path] = OpenCVImgRepr.from_image_file(path)
+        return self._buffers[path]
+
+    def put(self, path: str, img: OpenCVImgRepr) -> None:
+        """ Replace the preview """
+        self._buffers[path] = img
+        self.changed(path)
+
+    def changed(self, path: str) -> None:
+        self._changed.add(path)
+        if self.interval <= 0:
+            self.flush()
+        elif self._flush_call is None:
+            from twisted.internet import reactor
+            self._flush_call = reactor.callLater(self.interval, self._flush)
+
+    def flush(self) -> None:
+        """ Write all the changed previews to disk """
+        if self._flush_call is not None:
+            if self._flush_call.active():
+                self._flush_call.cancel()
+            self._flush_call = None
+        self._flush()
+
+    def _flush(self) -> None:
+        self._flush_call = None
+        changed, self._changed = self._changed, set()
+        for path in changed:
+            try:
+                self._buffers[path].save_with_extension(path, self.extension)
+            except (OpenCVError, OSError):
+                logger.warning('Cannot save preview %r', path, exc_info=True)
+        self._buffers = dict()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_buffers'] = dict()
+        state['_changed'] = set()
+        state['_flush_call'] = None
+        return state
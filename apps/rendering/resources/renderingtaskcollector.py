@@ -1,11 +1,20 @@
 import logging
 import math
-from typing import Optional
+import os
+from typing import Dict, List, Optional
 
-from apps.rendering.resources.imgrepr import OpenCVImgRepr
+import numpy
+
+from apps.rendering.resources.imgrepr import (EXRImgRepr, OpenCVError,
+                                              OpenCVImgRepr)
+from golem.core.fileshelper import has_ext
 
 logger = logging.getLogger("apps.rendering")
 
+# Canvases of at least this many bytes are memory-mapped to a file, when the
+# collector is given a path for it
+MMAP_MIN_BYTES = 128 * 1024 * 1024
+
 
 class RenderingTaskCollector(object):
     def __init__(self, width=None, height=None):
@@ -63,3 +72,170 @@ class RenderingTaskCollector(object):
         img_offset.paste_image(new_part, 0, offset)
         img_offset.add(final_img)
         return img_offset
+
+
+class StreamingTaskCollector:
+    """ Pastes the parts of an image into a canvas as they are accepted.
+
+    Parts are stacked top to bottom in the order of their positions, each
+    as high as the image it was rendered to, like RenderingTaskCollector
+    does. Every part is decoded once: a part which arrives before the parts
+    above it waits in memory until they do. EXR parts are read as 32-bit
+    floats through EXRImgRepr.
+    """
+
+    def __init__(self, parts: int, width: Optional[int] = None,
+                 height: Optional[int] = None,
+                 mmap_path: Optional[str] = None) -> None:
+        """
+        :param parts: number of parts of the image
+        :param width: expected width of the image
+        :param height: expected height of the image, the canvas is
+        preallocated to it
+        :param mmap_path: file to map a canvas of MMAP_MIN_BYTES or more to
+        """
+        self.parts = parts
+        self.width = width
+        self.height = height
+        self.mmap_path = mmap_path
+        self.accepted_img_files: Dict[int, str] = dict()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._canvas: Optional[numpy.ndarray] = None
+        self._pending: Dict[int, numpy.ndarray] = dict()
+        # where the pasted parts begin, followed by where the last one ends
+        self._offsets: List[int] = [0]
+
+    @property
+    def finished(self) -> bool:
+        """ Whether all the parts are pasted """
+        return self._pasted() == self.parts
+
+    def holds(self, img_files: List[str]) -> bool:
+        """ Whether the parts are exactly these files, in this order """
+        return len(img_files) == self.parts and all(
+            self.accepted_img_files.get(position) == img_file
+            for position, img_file in enumerate(img_files))
+
+    def add_img_file(self, img_file: str, position: int) -> None:
+        """
+        Decode the part and paste it, if the parts above it are pasted
+        :param str img_file: path to the file with subtask result
+        :param int position: position of the part, counted from the top
+        starting at 0
+        """
+        self._restore()
+        img = self._load(img_file)
+        self.accepted_img_files[position] = img_file
+        if position >= self._pasted():
+            self._pending[position] = img
+            self._paste_pending()
+            return
+
+        top, bottom = self._offsets[position], self._offsets[position + 1]
+        if bottom - top == img.shape[0]:
+            self._paste(img, top)
+        else:
+            # the parts below have to move
+            self._reset()
+            self._restore()
+
+    def finalize(self) -> Optional[OpenCVImgRepr]:
+        """
+        Return the image pasted so far. Parts still waiting for the parts
+        above them are stacked right below the pasted ones.
+        :return OpenCV Image Representation or None
+        """
+        if not self.accepted_img_files:
+            return None
+        self._restore()
+        for position in sorted(self._pending):
+            self._append(self._pending.pop(position))
+
+        image = OpenCVImgRepr()
+        image.img = self._canvas[:self._offsets[-1]]
+        return image
+
+    def close(self) -> None:
+        """ Release the canvas and remove the file it was mapped to """
+        self._reset()
+        if self.mmap_path and os.path.exists(self.mmap_path):
+            os.remove(self.mmap_path)
+
+    def _pasted(self) -> int:
+        return len(self._offsets) - 1
+
+    def _restore(self) -> None:
+        """ Decode again the parts which were dropped when the collector was
+        pickled """
+        if len(self.accepted_img_files) == \
+                self._pasted() + len(self._pending):
+            return
+        for position in sorted(self.accepted_img_files):
+            if position >= self._pasted() and position not in self._pending:
+                self._pending[position] = \
+                    self._load(self.accepted_img_files[position])
+        self._paste_pending()
+
+    def _paste_pending(self) -> None:
+        while self._pasted() in self._pending:
+            self._append(self._pending.pop(self._pasted()))
+
+    def _append(self, img: numpy.ndarray) -> None:
+        top = self._offsets[-1]
+        self._allocate(img, top + img.shape[0])
+        self._paste(img, top)
+        self._offsets.append(top + img.shape[0])
+
+    def _paste(self, img: numpy.ndarray, top: int) -> None:
+        try:
+            self._canvas[top:top + img.shape[0]] = img
+        except ValueError as e:
+            raise OpenCVError('Pasting image failed') from e
+
+    def _allocate(self, img: numpy.ndarray, rows: int) -> None:
+        """ Make room in the canvas for `rows` rows of parts like `img` """
+        if self._canvas is not None and rows <= self._canvas.shape[0]:
+            return
+
+        shape = (max(rows, self.height or 0),) + img.shape[1:]
+        size = int(numpy.prod(shape)) * img.dtype.itemsize
+        filled = self._offsets[-1]
+        if self.mmap_path is None or size < MMAP_MIN_BYTES:
+            canvas = numpy.zeros(shape, img.dtype)
+        elif isinstance(self._canvas, numpy.memmap):
+            # rows are appended at the end of the file, the ones filled
+            # so far stay in place
+            self._canvas.flush()
+            self._canvas = None
+            with open(self.mmap_path, 'r+b') as f:
+                f.truncate(size)
+            self._canvas = numpy.memmap(self.mmap_path, img.dtype, 'r+',
+                                        shape=shape)
+            return
+        else:
+            canvas = numpy.memmap(self.mmap_path, img.dtype, 'w+',
+                                  shape=shape)
+        if self._canvas is not None:
+            canvas[:filled] = self._canvas[:filled]
+        self._canvas = canvas
+
+    @staticmethod
+    def _load(img_file: str) -> numpy.ndarray:
+        if has_ext(img_file, '.exr'):
+            try:
+                return EXRImgRepr.read_float_bgr(img_file)
+            except Exception as e:
+                raise OpenCVError('Cannot read image: {}'.format(e)) from e
+        return OpenCVImgRepr.from_image_file(img_file).img
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for key in ('_canvas', '_pending', '_offsets'):
+            del state[key]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__ = state
+        self._reset()
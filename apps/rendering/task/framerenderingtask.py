@@ -10,7 +10,7 @@ from apps.core.task.coretask import CoreTask
 from apps.core.task.coretaskstate import Options
 from apps.rendering.resources.imgrepr import OpenCVImgRepr
 from apps.rendering.resources.renderingtaskcollector import \
-    RenderingTaskCollector
+    StreamingTaskCollector
 from apps.rendering.resources.utils import handle_opencv_image_error
 from apps.rendering.task.renderingtask import (RenderingTask,
                                                RenderingTaskBuilder,
@@ -94,6 +94,8 @@ class FrameState(object):
 class FrameRenderingTask(RenderingTask):
 
     VERIFIER_CLASS = FrameRenderingVerifier
+    JOURNALED_ATTRS = RenderingTask.JOURNALED_ATTRS + (
+        'frames_state', 'frames_subtasks')
 
     ################
     # Task methods #
@@ -122,6 +124,13 @@ class FrameRenderingTask(RenderingTask):
             self.preview_file_path = [None] * len(self.frames)
             self.preview_task_file_path = [None] * len(self.frames)
         self.last_preview_path = None
+        # accepted parts of the image or of each frame, pasted as they arrive
+        self.collectors = {}
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        if 'collectors' not in state:
+            self.collectors = {}
 
     @CoreTask.handle_key_error
     def computation_failed(self, subtask_id: str, ban_node: bool = True):
@@ -146,6 +155,12 @@ class FrameRenderingTask(RenderingTask):
         if self.use_frames:
             self._update_subtask_frame_status(subtask_id)
 
+    def restart(self):
+        super().restart()
+        for collector in self.collectors.values():
+            collector.close()
+        self.collectors = {}
+
     def restart_subtask(self, subtask_id):
         super(FrameRenderingTask, self).restart_subtask(subtask_id)
         self._update_subtask_frame_status(subtask_id)
@@ -229,7 +244,6 @@ class FrameRenderingTask(RenderingTask):
         empty_color = (0, 0, 0)
         sub = self.subtasks_given[subtask_id]
         for frame in sub['frames']:
-            # __mark_sub_frame() also saves preview_file_path(num)
             self.__mark_sub_frame(sub, frame, empty_color)
 
     def _update_frame_preview(self, new_chunk_file_path, frame_num, part=1,
@@ -245,8 +259,8 @@ class FrameRenderingTask(RenderingTask):
                 img.resize(int(round(self.scale_factor * img.get_width())),
                            int(round(self.scale_factor * img.get_height())))
 
-                img.save_with_extension(self._get_preview_file_path(num),
-                                        PREVIEW_EXT)
+                self.preview_compositor.put(self._get_preview_file_path(num),
+                                            img)
 
             if not final:
                 img_pasted = self._paste_new_chunk(
@@ -311,7 +325,7 @@ class FrameRenderingTask(RenderingTask):
             img_offset = None
 
         with handle_opencv_image_error(logger):
-            existing_frame_preview = OpenCVImgRepr.from_image_file(
+            existing_frame_preview = self.preview_compositor.open(
                 preview_file_path)
             if img_offset:
                 existing_frame_preview.add(img_offset)
@@ -334,14 +348,14 @@ class FrameRenderingTask(RenderingTask):
 
     def _open_frame_preview(self, preview_file_path):
 
-        if not os.path.exists(preview_file_path):
+        if not self.preview_compositor.exists(preview_file_path):
             with handle_opencv_image_error(logger):
                 img = OpenCVImgRepr.empty(
                     int(round(self.res_x * self.scale_factor)),
                     int(round(self.res_y * self.scale_factor)))
                 img.save_with_extension(preview_file_path, PREVIEW_EXT)
 
-        return OpenCVImgRepr.from_image_file(preview_file_path)
+        return self.preview_compositor.open(preview_file_path)
 
     def _mark_task_area(self, subtask, img_task, color, frame_index=0):
         if not self.use_frames:
@@ -359,9 +373,7 @@ class FrameRenderingTask(RenderingTask):
             upper_y = int(math.ceil(part_height) * ((subtask['start_task'] - 1) % parts))
             lower_y = int(math.floor(part_height) * ((subtask['start_task'] - 1) % parts + 1))
 
-        for i in range(lower_x, upper_x):
-            for j in range(upper_y, lower_y):
-                img_task.set_pixel((i, j), color)
+        img_task.fill(lower_x, upper_y, upper_x, lower_y, color)
 
     def _choose_frames(self, frames, start_task, total_tasks):
         if total_tasks <= len(frames):
@@ -377,13 +389,8 @@ class FrameRenderingTask(RenderingTask):
         output_file_name = self.output_file
         self.collected_file_names = OrderedDict(sorted(self.collected_file_names.items()))
         if not self._use_outer_task_collector():
-            collector = RenderingTaskCollector(width=self.res_x,
-                                               height=self.res_y)
-            for file in self.collected_file_names.values():
-                collector.add_img_file(file)
-            with handle_opencv_image_error(logger):
-                image = collector.finalize()
-                image.save_with_extension(output_file_name, self.output_format)
+            self._save_collected('image', self.collected_file_names.values(),
+                                 output_file_name)
         else:
             self._put_collected_files_together(os.path.join(self.tmp_dir, output_file_name),
                                                list(self.collected_file_names.values()), "paste")
@@ -395,13 +402,8 @@ class FrameRenderingTask(RenderingTask):
         collected = self.frames_given[frame_key]
         collected = OrderedDict(sorted(collected.items()))
         if not self._use_outer_task_collector():
-            collector = RenderingTaskCollector(width=self.res_x,
-                                               height=self.res_y)
-            for file in collected.values():
-                collector.add_img_file(file)
-            with handle_opencv_image_error(logger):
-                image = collector.finalize()
-                image.save_with_extension(output_file_name, self.output_format)
+            self._save_collected(frame_key, collected.values(),
+                                 output_file_name)
         else:
             self._put_collected_files_together(output_file_name, list(collected.values()), "paste")
 
@@ -411,9 +413,44 @@ class FrameRenderingTask(RenderingTask):
 
     def _collect_image_part(self, num_start, tr_file):
         self.collected_file_names[num_start] = tr_file
+        self._collect_part('image', self.total_tasks, num_start - 1, tr_file)
         self._update_preview(tr_file, num_start)
         self._update_task_preview()
 
+    def _new_collector(self, key, parts):
+        mmap_path = os.path.join(self.tmp_dir, 'collected_{}.raw'.format(key))
+        return StreamingTaskCollector(parts, width=self.res_x,
+                                      height=self.res_y, mmap_path=mmap_path)
+
+    def _collect_part(self, key, parts, position, tr_file):
+        """ Paste the accepted part into the image, or the frame, it belongs
+        to, so that it is ready when the last part arrives """
+        if self._use_outer_task_collector():
+            return
+        if key not in self.collectors:
+            self.collectors[key] = self._new_collector(key, parts)
+        with handle_opencv_image_error(logger):
+            self.collectors[key].add_img_file(tr_file, position)
+
+    def _save_collected(self, key, files, output_file_name):
+        """ Save the parts stacked top to bottom, using the ones pasted as
+        they were accepted if they are the same files """
+        files = list(files)
+        collector = self.collectors.pop(key, None)
+        if collector is None or not collector.holds(files):
+            if collector is not None:
+                collector.close()
+            collector = self._new_collector(key, len(files))
+        try:
+            with handle_opencv_image_error(logger):
+                for position, img_file in enumerate(files):
+                    if collector.accepted_img_files.get(position) != img_file:
+                        collector.add_img_file(img_file, position)
+                image = collector.finalize()
+                image.save_with_extension(output_file_name, self.output_format)
+        finally:
+            collector.close()
+
     def _collect_frames(self, num_start, tr_file, frames_list):
         frame_key = str(frames_list[0])
         self.frames_given[frame_key][0] = tr_file
@@ -426,6 +463,7 @@ class FrameRenderingTask(RenderingTask):
         frame_key = str(frame_num)
         part = self._count_part(num_start, parts)
         self.frames_given[frame_key][part] = tr_file
+        self._collect_part(frame_key, parts, part - 1, tr_file)
 
         self._update_frame_preview(tr_file, frame_num, part)
 
@@ -443,7 +481,7 @@ class FrameRenderingTask(RenderingTask):
         preview_task_file_path = self._get_preview_task_file_path(idx)
         img_task = self._open_frame_preview(preview_task_file_path)
         self._mark_task_area(sub, img_task, color, idx)
-        img_task.save_with_extension(preview_task_file_path, PREVIEW_EXT)
+        self.preview_compositor.changed(preview_task_file_path)
 
     def _get_subtask_file_path(self, subtask_dir_list, name_dir, num):
         if subtask_dir_list[num] is None:
@@ -7,6 +7,7 @@ from pathlib import Path
 
 from apps.core.task.coretask import CoreTask, CoreTaskBuilder
 from apps.rendering.resources.imgrepr import OpenCVImgRepr
+from apps.rendering.resources.previewcompositor import PreviewCompositor
 from apps.rendering.resources.utils import handle_opencv_image_error
 from apps.rendering.task.renderingtaskstate import RendererDefaults
 from golem.verificator.rendering_verifier import RenderingVerifier
@@ -71,6 +72,8 @@ class RenderingTask(CoreTask):
 
         self.preview_file_path = None
         self.preview_task_file_path = None
+        # previews are updated in memory and written to disk periodically
+        self.preview_compositor = PreviewCompositor(PREVIEW_EXT)
 
         self.collected_file_names = {}
 
@@ -87,6 +90,11 @@ class RenderingTask(CoreTask):
 
         self.test_task_res_path = None
 
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        if 'preview_compositor' not in state:
+            self.preview_compositor = PreviewCompositor(PREVIEW_EXT)
+
     @CoreTask.handle_key_error
     def computation_failed(self, subtask_id: str, ban_node: bool = True):
         super().computation_failed(subtask_id, ban_node)
@@ -103,6 +111,7 @@ class RenderingTask(CoreTask):
         super().restart_subtask(subtask_id)
 
     def update_task_state(self, task_state):
+        self.preview_compositor.flush()
         if not self.finished_computation() and self.preview_task_file_path:
             task_state.extra_data['result_preview'] \
                 = self.preview_task_file_path
@@ -122,6 +131,7 @@ class RenderingTask(CoreTask):
         pass
 
     def get_preview_file_path(self):
+        self.preview_compositor.flush()
         return self.preview_file_path
 
     @handle_opencv_image_error(logger)
@@ -129,7 +139,7 @@ class RenderingTask(CoreTask):
             img = OpenCVImgRepr.from_image_file(new_chunk_file_path)
             img_current = self._open_preview()
             img_current.add(img)
-            img_current.save_with_extension(self.preview_file_path, PREVIEW_EXT)
+            self.preview_compositor.changed(self.preview_file_path)
 
     @CoreTask.handle_key_error
     def _remove_from_preview(self, subtask_id):
@@ -138,7 +148,7 @@ class RenderingTask(CoreTask):
         with handle_opencv_image_error(logger):
             img = self._open_preview()
             self._mark_task_area(subtask, img, empty_color)
-            img.save_with_extension(self.preview_file_path, PREVIEW_EXT)
+            self.preview_compositor.changed(self.preview_file_path)
 
     def _update_task_preview(self):
         sent_color = (0, 255, 0)
@@ -149,7 +159,7 @@ class RenderingTask(CoreTask):
                                                           preview_name))
 
         with handle_opencv_image_error(logger):
-            img_task = self._open_preview()
+            img_task = self._open_preview().copy()
             subtasks_given = dict(self.subtasks_given)
             for sub in subtasks_given.values():
                 if sub['status'].is_active():
@@ -158,7 +168,7 @@ class RenderingTask(CoreTask):
                                      SubtaskStatus.restarted]:
                     self._mark_task_area(sub, img_task, failed_color)
 
-            img_task.save_with_extension(preview_task_file_path, PREVIEW_EXT)
+            self.preview_compositor.put(preview_task_file_path, img_task)
 
         self._update_preview_task_file_path(preview_task_file_path)
 
@@ -175,9 +185,7 @@ class RenderingTask(CoreTask):
             int(math.floor(y / self.total_tasks * (subtask['start_task']))),
             y,
         )
-        for i in range(0, x):
-            for j in range(upper, lower):
-                img_task.set_pixel((i, j), color)
+        img_task.fill(0, upper, x, lower, color)
 
     def _put_collected_files_together(self, output_file_name, files, arg):
         task_collector_path = self._get_task_collector_path()
@@ -223,8 +231,7 @@ class RenderingTask(CoreTask):
     def _open_preview(self, mode=OpenCVImgRepr.RGB, ext=PREVIEW_EXT):
         """ If preview file doesn't exist create a new empty one with given mode
          and extension. Extension should be compatible with selected mode. """
-        if self.preview_file_path is None or not os.path.exists(
-                self.preview_file_path):
+        if not self.preview_compositor.exists(self.preview_file_path):
             preview_name = "current_preview.{}".format(ext)
             self.preview_file_path = "{}".format(os.path.join(self.tmp_dir,
                                                               preview_name))
@@ -236,12 +243,8 @@ class RenderingTask(CoreTask):
                 logger.debug('Saving new preview: %r', self.preview_file_path)
                 img.save_with_extension(self.preview_file_path, ext)
 
-        logger.debug(
-            'Opening preview: %r, exists?: %s',
-            self.preview_file_path,
-            os.path.exists(self.preview_file_path)
-        )
-        return OpenCVImgRepr.from_image_file(self.preview_file_path)
+        logger.debug('Opening preview: %r', self.preview_file_path)
+        return self.preview_compositor.open(self.preview_file_path)
 
     def _use_outer_task_collector(self):
         unsupported_formats = ['EXR', 'EPS']
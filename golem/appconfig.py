@@ -51,6 +51,20 @@ NETWORK_CHECK_INTERVAL = 10.0
 MASK_UPDATE_INTERVAL = 30.0
 MAX_SENDING_DELAY = 360
 OFFER_POOLING_INTERVAL = 15.0
+# Threads decrypting and verifying messages off the reactor thread
+# (0 keeps the work in the reactor thread)
+CRYPTO_WORKERS = 0
+# Number of subtasks computed at the same time, each one gets an equal share
+# of the CPU cores and memory
+MAX_CONCURRENT_SUBTASKS = 1
+# Number of results verified at the same time (0 sizes the pool to half of
+# num_cores); the cores and memory given to Golem are split among them
+MAX_CONCURRENT_VERIFICATIONS = 0
+# How long a Blender verifier container waits for more results of its task
+# before it exits (0 starts a container for every verified subtask)
+VERIFIER_CONTAINER_IDLE_TIMEOUT = 0
+# How long subtask updates are collected before being written to disk
+TASK_DUMP_COALESCE_INTERVAL = 2.0
 # How frequently task archive should be saved to disk (in seconds)
 TASKARCHIVE_MAINTENANCE_INTERVAL = 30
 # Filename for task archive disk file
@@ -175,6 +189,11 @@ class AppConfig:
             mask_update_interval=MASK_UPDATE_INTERVAL,
             max_results_sending_delay=MAX_SENDING_DELAY,
             offer_pooling_interval=OFFER_POOLING_INTERVAL,
+            task_dump_coalesce_interval=TASK_DUMP_COALESCE_INTERVAL,
+            crypto_workers=CRYPTO_WORKERS,
+            max_concurrent_subtasks=MAX_CONCURRENT_SUBTASKS,
+            max_concurrent_verifications=MAX_CONCURRENT_VERIFICATIONS,
+            verifier_container_idle_timeout=VERIFIER_CONTAINER_IDLE_TIMEOUT,
             # timeouts
             p2p_session_timeout=P2P_SESSION_TIMEOUT,
             task_session_timeout=TASK_SESSION_TIMEOUT,
@@ -18,6 +18,7 @@ from twisted.internet.defer import (
     Deferred)
 
 from apps.appsmanager import AppsManager
+from apps.core.task.coretask import CoreTask
 import golem
 from golem.appconfig import TASKARCHIVE_MAINTENANCE_INTERVAL, AppConfig
 from golem.clientconfigdescriptor import ConfigApprover, ClientConfigDescriptor
@@ -56,8 +57,10 @@ from golem.network.p2p.local_node import LocalNode
 from golem.network.p2p.p2pservice import P2PService
 from golem.network.p2p.peersession import PeerSessionInfo
 from golem.network.transport import msg_queue
+from golem.network.transport.cryptopool import CryptoPool
 from golem.network.transport.tcpnetwork import SocketAddress
 from golem.network.upnp.mapper import PortMapperManager
+from golem.ranking.manager import database_manager as dm
 from golem.ranking.ranking import Ranking
 from golem.report import Component, Stage, StatusPublisher, report_calls
 from golem.resource.base.resourceserver import BaseResourceServer
@@ -141,6 +144,7 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
 
         self.p2pservice = None
         self.diag_service = None
+        self.crypto_pool: Optional[CryptoPool] = None
 
         if not transaction_system.deposit_contract_available:
             logger.warning(
@@ -353,6 +357,10 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
             self.concent_filetransfers.stop()
         if self.task_server:
             self.task_server.task_computer.quit()
+            self.task_server.task_manager.quit()
+        if self.crypto_pool:
+            self.crypto_pool.stop()
+            self.crypto_pool = None
         if self.use_monitor and self.monitor:
             self.stop_monitor()
             self.monitor = None
@@ -365,6 +373,11 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
 
         logger.debug("Is super node? %s", self.node.is_super_node())
 
+        if self.config_desc.crypto_workers and not self.crypto_pool:
+            self.crypto_pool = CryptoPool(
+                workers=int(self.config_desc.crypto_workers))
+            self.crypto_pool.start()
+
         self.p2pservice = P2PService(
             self.node,
             self.config_desc,
@@ -384,6 +397,8 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
             apps_manager=self.apps_manager,
             task_finished_cb=self._task_finished_cb,
         )
+        self.p2pservice.crypto_pool = self.crypto_pool
+        self.task_server.crypto_pool = self.crypto_pool
 
         # Pause p2p and task sessions to prevent receiving messages before
         # the node is ready
@@ -810,6 +825,18 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
             return 0
         return self.p2pservice.cur_port
 
+    @rpc_utils.expose('net.crypto.stats')
+    def get_crypto_stats(self) -> Optional[Dict[str, Any]]:
+        if not self.crypto_pool:
+            return None
+        return self.crypto_pool.get_stats()
+
+    @rpc_utils.expose('net.dial.stats')
+    def get_dial_stats(self) -> Dict[str, Any]:
+        servers = {'p2p': self.p2pservice, 'tasks': self.task_server}
+        return {name: server.get_dial_stats() if server else None
+                for name, server in servers.items()}
+
     @rpc_utils.expose('net.tasks.port')
     def get_task_server_port(self) -> int:
         if not self.task_server:
@@ -907,6 +934,19 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
             'subtasks_with_timeout': self.get_comp_stat('tasks_with_timeout'),
         }
 
+    @rpc_utils.expose('comp.tasks.slots')
+    def get_compute_slots(self) -> List[Dict[str, Any]]:
+        """ State, progress and resource share of the subtasks computed
+        at the same time """
+        if self.task_server is None:
+            return []
+        return self.task_server.task_computer.get_slots_stats()
+
+    @rpc_utils.expose('comp.tasks.verification.stats')
+    def get_verification_stats(self) -> Dict[str, Any]:
+        """ Depth, wait times and worker pool of the verification queue """
+        return CoreTask.VERIFICATION_QUEUE.get_stats()
+
     def get_supported_task_count(self) -> int:
         if self.task_server:
             return len(self.task_server.task_keeper.supported_tasks)
@@ -1001,24 +1041,49 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
             interval = timedelta(seconds=last_seconds)
         return self.transaction_system.get_payments_list(num, interval)
 
+    @rpc_utils.expose('pay.payments.page')
+    def get_payments_page(
+            self,
+            limit: int = 100,
+            after: Optional[List[Any]] = None,
+    ) -> Dict[str, Any]:
+        """ Payments, the newest first. Pass `next` of the returned page as
+        `after` to get the following one. """
+        return self.transaction_system.get_payments_page(limit, after)
+
     @rpc_utils.expose('pay.incomes')
     def get_incomes_list(self) -> List[Dict[str, Any]]:
         incomes = self.transaction_system.get_incomes_list()
+        return [self._income_to_dict(income) for income in incomes]
 
-        def item(o):
-            status = "confirmed" if o.transaction else "awaiting"
+    @rpc_utils.expose('pay.incomes.page')
+    def get_incomes_page(
+            self,
+            limit: int = 100,
+            after: Optional[List[Any]] = None,
+    ) -> Dict[str, Any]:
+        """ Incomes, the newest first. Pass `next` of the returned page as
+        `after` to get the following one. """
+        incomes, cursor = self.transaction_system.get_incomes_page(
+            limit, after)
+        return {
+            "incomes": [self._income_to_dict(income) for income in incomes],
+            "next": cursor,
+        }
 
-            return {
-                "subtask": to_unicode(o.subtask),
-                "payer": to_unicode(o.sender_node),
-                "value": to_unicode(o.value),
-                "status": to_unicode(status),
-                "transaction": to_unicode(o.transaction),
-                "created": datetime_to_timestamp_utc(o.created_date),
-                "modified": datetime_to_timestamp_utc(o.modified_date)
-            }
+    @staticmethod
+    def _income_to_dict(o) -> Dict[str, Any]:
+        status = "confirmed" if o.transaction else "awaiting"
 
-        return [item(income) for income in incomes]
+        return {
+            "subtask": to_unicode(o.subtask),
+            "payer": to_unicode(o.sender_node),
+            "value": to_unicode(o.value),
+            "status": to_unicode(status),
+            "transaction": to_unicode(o.transaction),
+            "created": datetime_to_timestamp_utc(o.created_date),
+            "modified": datetime_to_timestamp_utc(o.modified_date)
+        }
 
     @rpc_utils.expose('pay.deposit_payments')
     @classmethod
@@ -1085,6 +1150,11 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
             return self.ranking.get_requesting_trust(node_id)
         return None
 
+    @rpc_utils.expose('rep.cache.stats')
+    @staticmethod
+    def get_rank_cache_stats() -> Dict[str, Any]:
+        return dm.local_rank_cache.get_stats()
+
     @rpc_utils.expose('env.use_ranking')
     def use_ranking(self):
         return bool(self.ranking)
@@ -43,6 +43,11 @@ class ClientConfigDescriptor(object):
         self.clean_tasks_older_than_seconds = 0
         self.cleaning_enabled = 0
         self.offer_pooling_interval = 0.0
+        self.task_dump_coalesce_interval = 0.0
+        self.crypto_workers = 0
+        self.max_concurrent_subtasks = 1
+        self.max_concurrent_verifications = 0
+        self.verifier_container_idle_timeout = 0
 
         self.node_snapshot_interval = 0.0
         self.network_check_interval = 0.0
@@ -106,14 +111,15 @@ class ConfigApprover(object):
     to_int_opt = {
         'seed_port', 'num_cores', 'opt_peer_num', 'p2p_session_timeout',
         'task_session_timeout', 'pings_interval', 'max_results_sending_delay',
-        'key_difficulty',
+        'key_difficulty', 'crypto_workers', 'max_concurrent_subtasks',
+        'max_concurrent_verifications', 'verifier_container_idle_timeout',
     }
     to_big_int_opt = {
         'min_price', 'max_price',
     }
     to_float_opt = {
         'getting_peers_interval', 'getting_tasks_interval', 'computing_trust',
-        'requesting_trust'
+        'requesting_trust', 'task_dump_coalesce_interval'
     }
     max_opt = {'key_difficulty': KEY_DIFFICULTY}
 
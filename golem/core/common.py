@@ -6,7 +6,7 @@ import sys
 from calendar import timegm
 from datetime import datetime
 from functools import wraps
-from typing import Any, Callable, cast, List, TypeVar
+from typing import Any, Callable, cast, Dict, Iterable, List, TypeVar
 
 import pytz
 
@@ -164,6 +164,19 @@ def short_node_id(node_id):
     return f'{node_id[:8]}..{node_id[-8:]}'
 
 
+def summarize(samples: Iterable[float]) -> Dict[str, float]:
+    """ Average, 95th percentile and maximum of the samples, as reported
+    in the RPC stats; zeros when there are no samples """
+    ordered = sorted(samples)
+    if not ordered:
+        return {'avg': 0.0, 'p95': 0.0, 'max': 0.0}
+    return {
+        'avg': sum(ordered) / len(ordered),
+        'p95': ordered[int(0.95 * (len(ordered) - 1))],
+        'max': ordered[-1],
+    }
+
+
 class HandleError(object):
     def __init__(self, error, handle_error):
         self.handle_error = handle_error
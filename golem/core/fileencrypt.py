@@ -1,4 +1,5 @@
 import abc
+import io
 from hashlib import sha256
 from Crypto.Cipher import AES
 from Crypto import Random
@@ -60,6 +61,8 @@ class AESFileEncryptor(FileEncryptor):
     aes_mode = AES.MODE_CBC
     block_size = AES.block_size
     chunk_size = 1024
+    # Size of the chunks encrypted / decrypted at once by the streams
+    stream_buffer_size = 2 ** 16
     salt_prefix = b'salt_'
     salt_prefix_len = len(salt_prefix)
 
@@ -79,6 +82,16 @@ class AESFileEncryptor(FileEncryptor):
 
         return digest[:key_len], digest[key_len:total_len]
 
+    @classmethod
+    def writer(cls, file_out, secret, key_len=32):
+        """ Return a write-only stream encrypting into file_out """
+        return AESEncryptingWriter(file_out, secret, key_len)
+
+    @classmethod
+    def reader(cls, file_in, secret, key_len=32):
+        """ Return a seekable stream of data decrypted from file_in """
+        return AESDecryptingReader(file_in, secret, key_len)
+
     @classmethod
     def encrypt(cls, file_in, file_out, secret, key_len=32):
 
@@ -131,3 +144,160 @@ class AESFileEncryptor(FileEncryptor):
                     working = False
 
                 dst.write(chunk)
+
+
+class AESEncryptingWriter(io.RawIOBase):
+    """ Write-only stream producing the same output as
+    AESFileEncryptor.encrypt, for data that is generated on the fly.
+    The output is padded and completed on close.
+    """
+
+    encryptor = AESFileEncryptor
+
+    def __init__(self, dst, secret, key_len=32):
+        super().__init__()
+        block_size = self.encryptor.block_size
+        salt = self.encryptor.gen_salt(block_size)
+        key, iv = self.encryptor.get_key_and_iv(secret, salt, key_len,
+                                                block_size)
+        self._cipher = AES.new(key, self.encryptor.aes_mode, iv)
+        self._dst = dst
+        self._buffer = []
+        self._buffered = 0
+        self._position = 0
+
+        dst.write(self.encryptor.salt_prefix + salt)
+
+    def writable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def write(self, data):
+        data = bytes(data)
+        self._buffer.append(data)
+        self._buffered += len(data)
+        self._position += len(data)
+
+        if self._buffered >= self.encryptor.stream_buffer_size:
+            self._encrypt(final=False)
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self._encrypt(final=True)
+        super().close()
+
+    def _encrypt(self, final):
+        data = b''.join(self._buffer)
+        block_size = self.encryptor.block_size
+        tail = len(data) % block_size
+
+        if final:
+            pad_len = block_size - tail
+            data += bytes([pad_len]) * pad_len
+            tail = 0
+
+        self._dst.write(self._cipher.encrypt(data[:len(data) - tail]
+                                             if tail else data))
+        self._buffer = [data[len(data) - tail:]] if tail else []
+        self._buffered = tail
+
+
+class AESDecryptingReader(io.RawIOBase):
+    """ Seekable stream of data encrypted by AESFileEncryptor, decrypted
+    on demand. CBC blocks only depend on the preceding ciphertext block,
+    so any part of the data can be read without decrypting the whole
+    file first (e.g. the central directory of a zip archive).
+    """
+
+    encryptor = AESFileEncryptor
+
+    def __init__(self, src, secret, key_len=32):
+        super().__init__()
+        block_size = self.encryptor.block_size
+
+        src.seek(0, io.SEEK_END)
+        total_size = src.tell()
+        if total_size < 2 * block_size or total_size % block_size:
+            raise ValueError("Invalid encrypted data size: {}"
+                             .format(total_size))
+
+        src.seek(0)
+        salt = src.read(block_size)[self.encryptor.salt_prefix_len:]
+        self._key, self._iv = self.encryptor.get_key_and_iv(
+            secret, salt, key_len, block_size)
+        self._src = src
+
+        last_block = self._decrypt(total_size - 2 * block_size, block_size)
+        pad_len = last_block[-1]
+        if not 0 < pad_len <= block_size:
+            raise ValueError("Invalid padding")
+
+        self._size = total_size - block_size - pad_len
+        self._position = 0
+        self._buffer = b''
+        self._buffer_start = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._size
+        elif whence != io.SEEK_SET:
+            raise ValueError("Invalid whence: {}".format(whence))
+        if offset < 0:
+            raise ValueError("Negative seek position: {}".format(offset))
+        self._position = offset
+        return offset
+
+    def read(self, size=-1):
+        end = self._size
+        if size is not None and size >= 0:
+            end = min(end, self._position + size)
+
+        chunks = []
+        while self._position < end:
+            offset = self._position - self._buffer_start
+            if not 0 <= offset < len(self._buffer):
+                self._fill()
+                offset = self._position - self._buffer_start
+            chunk = memoryview(self._buffer)[
+                offset:offset + end - self._position]
+            chunks.append(chunk)
+            self._position += len(chunk)
+        return b''.join(chunks)
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def _fill(self):
+        block_size = self.encryptor.block_size
+        start = self._position - self._position % block_size
+        self._buffer = self._decrypt(start, self.encryptor.stream_buffer_size)
+        self._buffer_start = start
+
+    def _decrypt(self, offset, length):
+        """ Decrypt length bytes of data starting at a block aligned
+        offset """
+        block_size = self.encryptor.block_size
+        if offset:
+            self._src.seek(offset)
+            iv = self._src.read(block_size)
+        else:
+            self._src.seek(block_size)
+            iv = self._iv
+        cipher = AES.new(self._key, self.encryptor.aes_mode, iv)
+        return cipher.decrypt(self._src.read(length))
@@ -4,14 +4,18 @@ import math
 import os
 import sys
 import time
+from functools import partial
 from hashlib import sha256
-from typing import Optional, Tuple, Union
+from multiprocessing import cpu_count
+from typing import Callable, Optional, Tuple, Union
 
 from eth_keyfile import create_keyfile_json, decode_keyfile_json
 from eth_utils import encode_hex, decode_hex
 from golem_messages.cryptography import ECCx, mk_privkey, ecdsa_verify, \
     privtopub
 
+from golem.core.powsearch import search, SearchAborted
+
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +54,18 @@ class WrongPassword(Exception):
     pass
 
 
+def _find_key(difficulty: int, _start: int, _step: int,
+              count: int) -> Optional[Tuple[bytes, bytes]]:
+    """ Make up to `count` random key pairs, return the first one which is
+    difficult enough """
+    for _ in range(count):
+        priv_key = mk_privkey(str(get_random_float()))
+        pub_key = privtopub(priv_key)
+        if KeysAuth.is_pubkey_difficult(pub_key, difficulty):
+            return priv_key, pub_key
+    return None
+
+
 class KeysAuth:
     """
     Elliptical curves cryptographic authorization manager. Generates
@@ -58,6 +74,10 @@ class KeysAuth:
     broken or contain key below requested difficulty new key is generated.
     """
     KEYS_SUBDIR = 'keys'
+    # Difficulty from which keys are generated by all the cores
+    PARALLEL_DIFFICULTY = 10
+    # Key pairs made between the checks for cancellation
+    KEYGEN_CHUNK_SIZE = 16
 
     _private_key: bytes = b''
     public_key: bytes = b''
@@ -65,7 +85,8 @@ class KeysAuth:
     ecc: ECCx = None
 
     def __init__(self, datadir: str, private_key_name: str, password: str,
-                 difficulty: int = 0) -> None:
+                 difficulty: int = 0,
+                 progress: Optional[Callable[[int], None]] = None) -> None:
         """
         Create new ECC keys authorization manager, load or create keys.
 
@@ -76,10 +97,12 @@ class KeysAuth:
             desired key difficulty level. It's a number of leading zeros in
             binary representation of public key. Value in range <0, 255>.
             0 accepts all keys, 255 is nearly impossible.
+        :param progress: called now and then with the number of key pairs
+            tried while new keys are generated
         """
 
         prv, pub = KeysAuth._load_or_generate_keys(
-            datadir, private_key_name, password, difficulty)
+            datadir, private_key_name, password, difficulty, progress)
 
         self._private_key = prv
         self.ecc = ECCx(prv)
@@ -94,8 +117,10 @@ class KeysAuth:
         return os.path.isfile(priv_key_path)
 
     @staticmethod
-    def _load_or_generate_keys(datadir: str, filename: str, password: str,
-                               difficulty: int) -> Tuple[bytes, bytes]:
+    def _load_or_generate_keys(
+            datadir: str, filename: str, password: str, difficulty: int,
+            progress: Optional[Callable[[int], None]] = None) \
+            -> Tuple[bytes, bytes]:
         keys_dir = KeysAuth._get_or_create_keys_dir(datadir)
         priv_key_path = os.path.join(keys_dir, filename)
 
@@ -110,7 +135,8 @@ class KeysAuth:
             priv_key, pub_key = loaded_keys
         else:
             logger.debug('No keys found, generating new one')
-            priv_key, pub_key = KeysAuth._generate_keys(difficulty)
+            priv_key, pub_key = KeysAuth._generate_keys(
+                difficulty, progress=progress)
             logger.debug('Generation completed, saving keys')
             KeysAuth._save_private_key(priv_key, priv_key_path, password)
             logger.debug('Keys stored succesfully')
@@ -148,21 +174,47 @@ class KeysAuth:
         return priv_key, pub_key
 
     @staticmethod
-    def _generate_keys(difficulty: int) -> Tuple[bytes, bytes]:
+    def _generate_keys(
+            difficulty: int,
+            workers: Optional[int] = None,
+            progress: Optional[Callable[[int], None]] = None) \
+            -> Tuple[bytes, bytes]:
+        """
+        :param workers: number of worker processes, all the cores by default
+            if the difficulty is at least PARALLEL_DIFFICULTY
+        :param progress: called now and then with the number of key pairs
+            tried so far
+        """
         from twisted.internet import reactor
         reactor_started = reactor.running
+
+        # lets be responsive to reactor stop (eg. ^C hit by user)
+        def should_stop():
+            return reactor_started and not reactor.running
+
+        def log_progress(tried):
+            logger.debug("Generating new key pair. tried=%d, expected=%d",
+                         tried, 2 ** difficulty)
+            if progress:
+                progress(tried)
+
+        if workers is None:
+            workers = cpu_count() \
+                if difficulty >= KeysAuth.PARALLEL_DIFFICULTY else 1
+
         logger.info("Generating new key pair")
         started = time.time()
-        while True:
-            priv_key = mk_privkey(str(get_random_float()))
-            pub_key = privtopub(priv_key)
-            if KeysAuth.is_pubkey_difficult(pub_key, difficulty):
-                break
-
-            # lets be responsive to reactor stop (eg. ^C hit by user)
-            if reactor_started and not reactor.running:
-                logger.warning("reactor stopped, aborting key generation ..")
-                raise Exception("aborting key generation")
+        try:
+            priv_key, pub_key = search(
+                partial(_find_key, difficulty),
+                KeysAuth.KEYGEN_CHUNK_SIZE,
+                workers,
+                should_stop=should_stop,
+                progress=log_progress,
+            )
+        except SearchAborted:
+            logger.warning("reactor stopped, aborting key generation ..")
+            raise Exception("aborting key generation")
 
         logger.info("Keys generated in %.2fs", time.time() - started)
         return priv_key, pub_key
@@ -0,0 +1,128 @@
+""" Searches for a candidate that meets a difficulty, such as a key pair
+or a challenge solution, split across worker processes """
+
+import multiprocessing as mp
+import queue
+import time
+from typing import Any, Callable, Optional
+
+# Seconds between the checks for cancellation and a found result
+POLL_INTERVAL = 0.005
+# Seconds between two progress reports
+PROGRESS_INTERVAL = 1.0
+
+# find(start, step, count) tries the candidates start, start + step, ...
+# (count of them) and returns the first one that meets the difficulty
+Find = Callable[[int, int, int], Optional[Any]]
+# Called with the number of candidates tried so far
+Progress = Callable[[int], None]
+
+
+class SearchAborted(Exception):
+    pass
+
+
+def search(find: Find,
+           chunk_size: int,
+           workers: int = 1,
+           should_stop: Optional[Callable[[], bool]] = None,
+           progress: Optional[Progress] = None) -> Any:
+    """
+    Try the candidates until one is found. Each of the workers tries every
+    `workers`-th candidate and the workers are terminated as soon as one of
+    them finds it. With a single worker the search runs in this process,
+    checking for cancellation every `chunk_size` candidates.
+    :param find: a picklable function, e.g. a partial of a module level one
+    :param chunk_size: candidates tried at once by a worker
+    :param workers: number of worker processes
+    :param should_stop: polled by the caller's process; the search is
+        aborted with SearchAborted once it returns True
+    :param progress: called every PROGRESS_INTERVAL in the caller's process
+    :return: the candidate found first
+    """
+    if workers <= 1:
+        return _search_in_process(find, chunk_size, should_stop, progress)
+    return _search_in_workers(find, chunk_size, workers, should_stop,
+                              progress)
+
+
+def _search_in_process(find: Find,
+                       chunk_size: int,
+                       should_stop: Optional[Callable[[], bool]],
+                       progress: Optional[Progress]) -> Any:
+    start = 0
+    reported = time.monotonic()
+    while True:
+        found = find(start, 1, chunk_size)
+        if found is not None:
+            return found
+        start += chunk_size
+
+        if should_stop and should_stop():
+            raise SearchAborted()
+        if progress and time.monotonic() - reported >= PROGRESS_INTERVAL:
+            reported = time.monotonic()
+            progress(start)
+
+
+def _search_in_workers(find: Find,  # pylint: disable=too-many-arguments
+                       chunk_size: int,
+                       workers: int,
+                       should_stop: Optional[Callable[[], bool]],
+                       progress: Optional[Progress]) -> Any:
+    tried = mp.Value('Q', 0)
+    results: mp.Queue = mp.Queue()
+    processes = [
+        mp.Process(target=_work,
+                   args=(find, index, workers, chunk_size, tried, results),
+                   daemon=True)
+        for index in range(workers)
+    ]
+    reported = time.monotonic()
+    try:
+        for process in processes:
+            process.start()
+            if should_stop and should_stop():
+                raise SearchAborted()
+
+        while True:
+            try:
+                return results.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                pass
+
+            if should_stop and should_stop():
+                raise SearchAborted()
+            if progress and time.monotonic() - reported >= PROGRESS_INTERVAL:
+                reported = time.monotonic()
+                progress(tried.value)
+            if not any(process.is_alive() for process in processes) \
+                    and results.empty():
+                raise RuntimeError("Search workers exited without a result")
+    finally:
+        # The workers only compute, there is nothing to clean up after them
+        started = [process for process in processes if process.pid]
+        for process in started:
+            process.terminate()
+        for process in started:
+            process.join()
+        results.close()
+
+
+def _work(find: Find,  # pylint: disable=too-many-arguments
+          index: int,
+          workers: int,
+          chunk_size: int,
+          tried,
+          results) -> None:
+    """ Runs in a worker process until it is terminated """
+    start = index
+    step = workers
+    while True:
+        found = find(start, step, chunk_size)
+        with tried.get_lock():
+            tried.value += chunk_size
+        if found is not None:
+            results.put(found)
+            return
+        start += step * chunk_size
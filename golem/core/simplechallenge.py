@@ -1,14 +1,22 @@
 # Generating, solving and checking solutions of crypto-puzzles for proof of work system
 
+from functools import partial
+from multiprocessing import cpu_count
 from random import sample
 import time
 
 from golem.core.keysauth import get_random, sha2
+from golem.core.powsearch import search
 
 __author__ = 'Magda.Stasiewicz'
 
 CHALLENGE_HISTORY_LIMIT = 100
 MAX_RANDINT = 100000000000000000000000000
+# Difficulty from which a challenge is solved by all the cores; easier ones
+# are solved before the worker processes would start
+PARALLEL_DIFFICULTY = 18
+# Solutions tried by a worker between the checks for cancellation
+CHUNK_SIZE = 4096
 
 
 def create_challenge(history, prev):
@@ -27,20 +35,31 @@ def create_challenge(history, prev):
     return concat
 
 
-def solve_challenge(challenge, difficulty):
+def solve_challenge(challenge, difficulty, workers=None, progress=None):
     """
     Solves the puzzle given in string challenge difficulty is required number of zeros in the beginning of binary
     representation of solution's hash returns solution and computation time in seconds
+    :param int workers: number of worker processes, all the cores by default
+        if the challenge is difficult enough
+    :param progress: called now and then with the number of solutions tried
     """
+    if workers is None:
+        workers = cpu_count() if difficulty >= PARALLEL_DIFFICULTY else 1
     start = time.time()
-    min_hash = pow(2, 256 - difficulty)     # could be done prettier
-    solution = 0
-    while sha2(challenge + str(solution)) > min_hash:
-        solution += 1
+    solution = search(partial(_find_solution, challenge, difficulty),
+                      CHUNK_SIZE, workers, progress=progress)
     end = time.time()
     return solution, end - start
 
 
+def _find_solution(challenge, difficulty, start, step, count):
+    min_hash = pow(2, 256 - difficulty)     # could be done prettier
+    for solution in range(start, start + step * count, step):
+        if sha2(challenge + str(solution)) <= min_hash:
+            return solution
+    return None
+
+
 def accept_challenge(challenge, solution, difficulty):
     """ Returns true if solution is valid for given challenge and difficulty, false otherwise
     :param challenge:
@@ -1,12 +1,12 @@
 import functools
 import logging
 from threading import Lock
-from typing import Type, Any, Optional
+from typing import Any, Dict, Optional, Tuple, Type
 
 from peewee import DatabaseError
 
 from golem.core.common import HandleAttributeError, HandleError
-from golem.model import Stats
+from golem.model import Stats, db
 
 logger = logging.getLogger(__name__)
 
@@ -16,15 +16,34 @@ def log_error(*args, **_kwargs):
 
 
 class StatsKeeper:
+    """ Keeps the session and the global stats in memory. Changes of the
+    global stats are written behind to the database, every
+    `FLUSH_INTERVAL` seconds and on reactor shutdown, in a single
+    transaction. A crash loses at most the changes of the last interval.
+
+    Increments are written as deltas to the stored values, so that
+    keepers of the same stats in one database do not overwrite each
+    other's counts.
+    """
+
+    # Seconds for which the changed stats are kept in memory only
+    FLUSH_INTERVAL = 5.0
 
     handle_attribute_error = HandleAttributeError(log_error)
 
     def __init__(self, stat_class: Type, default_value: str = '') -> None:
         self._lock = Lock()
+        self._flush_lock = Lock()
         self.session_stats = stat_class()
         self.global_stats = stat_class()
         self.default_value = default_value
 
+        # name -> (value set or None, increment since then or None)
+        self._pending: Dict[str, Tuple[Any, Any]] = {}
+        self._flush_scheduled = False
+        self._flush_call = None
+        self._shutdown_trigger = None
+
         for stat in vars(self.global_stats):
             val = self._get_or_create(stat)
             if val is not None:
@@ -37,11 +56,15 @@ class StatsKeeper:
             session_val = self._cast_type(session_val + increment, name)
             setattr(self.session_stats, name, session_val)
 
-            global_val = self._get_or_create(name)
+            global_val = getattr(self.global_stats, name)
             global_val = self._cast_type(global_val + increment, name)
             setattr(self.global_stats, name, global_val)
 
-            self._update_stat(name, global_val)
+            value, pending = self._pending.get(name, (None, None))
+            if pending is not None:
+                increment = self._cast_type(pending + increment, name)
+            self._pending[name] = (value, increment)
+            self._schedule_flush()
 
     @handle_attribute_error
     def set_stat(self, name: str, value: Any) -> None:
@@ -49,17 +72,40 @@ class StatsKeeper:
             setattr(self.session_stats, name, value)
             setattr(self.global_stats, name, value)
 
-            self._update_stat(name, value)
-
-    @staticmethod
-    def _update_stat(name: str, value: Any) -> None:
-        try:
-            Stats.update(value=f"{value}") \
-                .where(Stats.name == name) \
-                .execute()
-        except DatabaseError as err:
-            logger.error("Exception occurred while updating stat %r: "
-                         "%r", name, err)
+            self._pending[name] = (value, None)
+            self._schedule_flush()
+
+    def flush(self) -> None:
+        """ Write the changed stats to the database now """
+        with self._flush_lock:
+            with self._lock:
+                if self._flush_call and self._flush_call.active():
+                    self._flush_call.cancel()
+                self._flush_call = None
+                self._flush_scheduled = False
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return
+
+            try:
+                stored = self._write(pending)
+            except DatabaseError as err:
+                logger.error("Exception occurred while updating stats %r: "
+                             "%r", list(pending), err)
+                self._restore(pending)
+                return
+
+            with self._lock:
+                for name, value in stored.items():
+                    # Other keepers might have changed the stored value
+                    self._apply_pending(name, value)
+
+    def quit(self) -> None:
+        self.flush()
+        if self._shutdown_trigger:
+            from twisted.internet import reactor
+            reactor.removeSystemEventTrigger(self._shutdown_trigger)
+            self._shutdown_trigger = None
 
     def get_stats(self, name):
         return self._get_stats(name) or (None, None)
@@ -71,7 +117,71 @@ class StatsKeeper:
             getattr(self.global_stats, name),
         )
 
-    def _get_or_create(self, name: str) -> Optional[Stats]:
+    def _write(self, pending: Dict[str, Tuple[Any, Any]]) -> Dict[str, Any]:
+        stored = {}
+        with db.transaction():
+            for name, (value, increment) in pending.items():
+                if value is None:
+                    value = self._get_or_create(name, raise_db_errors=True)
+                    if value is None:
+                        value = getattr(self.global_stats, name)
+                        increment = None
+                if increment is not None:
+                    value = self._cast_type(value + increment, name)
+                Stats.update(value=f"{value}") \
+                    .where(Stats.name == name) \
+                    .execute()
+                stored[name] = value
+        return stored
+
+    def _restore(self, pending: Dict[str, Tuple[Any, Any]]) -> None:
+        """ Put back the changes which could not be written, the ones made
+        in the meantime are applied on top of them """
+        with self._lock:
+            for name, (value, increment) in pending.items():
+                newer_value, newer_increment = \
+                    self._pending.get(name, (None, None))
+                if newer_value is not None:
+                    continue
+                if increment is None:
+                    increment = newer_increment
+                elif newer_increment is not None:
+                    increment = self._cast_type(
+                        increment + newer_increment, name)
+                self._pending[name] = (value, increment)
+            if self._pending:
+                self._schedule_flush()
+
+    def _apply_pending(self, name: str, stored: Any) -> None:
+        value, increment = self._pending.get(name, (None, None))
+        if value is not None:
+            return
+        if increment is not None:
+            stored = self._cast_type(stored + increment, name)
+        setattr(self.global_stats, name, stored)
+
+    def _schedule_flush(self) -> None:
+        """ Called with the lock held, from any thread """
+        if self._flush_scheduled:
+            return
+        self._flush_scheduled = True
+        from twisted.internet import reactor
+        reactor.callFromThread(self._call_flush_later)
+
+    def _call_flush_later(self) -> None:
+        from twisted.internet import reactor
+
+        if not self._shutdown_trigger:
+            self._shutdown_trigger = reactor.addSystemEventTrigger(
+                'before', 'shutdown', self.flush)
+        with self._lock:
+            if not self._flush_scheduled or self._flush_call:
+                return
+            self._flush_call = reactor.callLater(self.FLUSH_INTERVAL,
+                                                 self.flush)
+
+    def _get_or_create(self, name: str,
+                       raise_db_errors: bool = False) -> Optional[Any]:
         try:
             defaults = {'value': self.default_value}
             stat, _ = Stats.get_or_create(name=name, defaults=defaults)
@@ -79,6 +189,8 @@ class StatsKeeper:
         except (AttributeError, ValueError, TypeError):
             logger.warning("Wrong stat '%s' format:", name, exc_info=True)
         except DatabaseError:
+            if raise_db_errors:
+                raise
             logger.warning("Cannot retrieve '%s' from the database:", name,
                            exc_info=True)
         return None
@@ -0,0 +1,53 @@
+import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from peewee import DateTimeField, Field, SelectQuery
+
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+
+def newest_first(query: SelectQuery,
+                 keys: Sequence[Field],
+                 limit: int,
+                 after: Optional[Sequence[Any]] = None) \
+        -> Tuple[List[Any], Optional[List[Any]]]:
+    """
+    Returns a page of rows ordered by `keys`, descending, and the cursor of
+    the next page. Rows are located through the keys of the last row of the
+    previous page instead of an OFFSET, so reading a page costs the same no
+    matter how far it is.
+    :param query: Rows to read, selecting at least the keys
+    :param keys: Fields which identify a row, the most significant first
+    :param limit: Maximum number of rows in the page
+    :param after: Cursor returned with the previous page, None for the first
+    :return: The rows and the cursor of the next page, None for the last page
+    """
+    if after:
+        query = query.where(_before(keys, after))
+    rows = list(query.order_by(*[key.desc() for key in keys]).limit(limit + 1))
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    cursor = [_dump(getattr(rows[-1], key.name)) for key in keys]
+    return rows, cursor
+
+
+def _before(keys: Sequence[Field], values: Sequence[Any]):
+    key, value = keys[0], _load(keys[0], values[0])
+    clause = key < value
+    if len(keys) > 1:
+        clause = clause | ((key == value) & _before(keys[1:], values[1:]))
+    return clause
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, datetime.datetime):
+        return value.strftime(DATETIME_FORMAT)
+    return value
+
+
+def _load(key: Field, value: Any) -> Any:
+    if isinstance(key, DateTimeField) and isinstance(value, str):
+        return datetime.datetime.strptime(value, DATETIME_FORMAT)
+    return value
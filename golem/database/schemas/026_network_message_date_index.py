@@ -0,0 +1,12 @@
+# pylint: disable=no-member
+# pylint: disable=unused-argument
+
+SCHEMA_VERSION = 26
+
+
+def migrate(migrator, database, fake=False, **kwargs):
+    migrator.add_index('networkmessage', 'msg_date', unique=False)
+
+
+def rollback(migrator, database, fake=False, **kwargs):
+    migrator.drop_index('networkmessage', 'msg_date')
@@ -0,0 +1,14 @@
+# pylint: disable=no-member
+# pylint: disable=unused-argument
+
+SCHEMA_VERSION = 27
+
+
+def migrate(migrator, database, fake=False, **kwargs):
+    migrator.add_index('payment', 'created_date', unique=False)
+    migrator.add_index('income', 'created_date', unique=False)
+
+
+def rollback(migrator, database, fake=False, **kwargs):
+    migrator.drop_index('income', 'created_date')
+    migrator.drop_index('payment', 'created_date')
@@ -0,0 +1,59 @@
+# pylint: disable=no-member
+# pylint: disable=unused-argument
+# pylint: disable=too-few-public-methods
+import datetime
+import json
+
+import peewee as pw
+
+SCHEMA_VERSION = 28
+
+
+def _copy_performance(database):
+    """ Move the performance out of the metadata of the known hosts """
+    now = datetime.datetime.now()
+    cursor = database.execute_sql("SELECT id, metadata FROM knownhosts")
+    for host_id, metadata in cursor.fetchall():
+        try:
+            performance = json.loads(metadata).get('performance')
+            rows = [(host_id, str(env_id), float(value), now, now)
+                    for env_id, value in performance.items()
+                    if float(value) == float(value)]  # not NaN
+        except (AttributeError, TypeError, ValueError):
+            continue
+        for row in rows:
+            database.execute_sql(
+                "INSERT INTO knownhostperformance "
+                "(host_id, environment, value, created_date, modified_date) "
+                "VALUES (?, ?, ?, ?, ?)",
+                row,
+            )
+
+
+def migrate(migrator, database, fake=False, **kwargs):
+    @migrator.create_model  # pylint: disable=unused-variable
+    class KnownHostPerformance(pw.Model):
+        host = pw.ForeignKeyField(
+            db_column='host_id',
+            rel_model=migrator.orm['knownhosts'],
+            related_name='performance',
+            to_field='id',
+            on_delete='CASCADE',
+        )
+        environment = pw.CharField(max_length=255)
+        value = pw.FloatField()
+        created_date = pw.DateTimeField(default=datetime.datetime.now)
+        modified_date = pw.DateTimeField(default=datetime.datetime.now)
+
+        class Meta:
+            db_table = "knownhostperformance"
+            indexes = (
+                (('host', 'environment'), True),
+                (('environment', 'value'), False),
+            )
+
+    migrator.python(_copy_performance, database)
+
+
+def rollback(migrator, database, fake=False, **kwargs):
+    migrator.remove_model("knownhostperformance")
@@ -1,6 +1,6 @@
 import logging
 import os
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from golem import hardware
 from golem.core.common import get_golem_path
@@ -53,6 +53,8 @@ class DockerConfigManager(object):
 
     def __init__(self):
         self._container_host_config = dict(DEFAULT_HOST_CONFIG)
+        self._cpu_set: List[str] = []
+        self._mem_limit: Optional[int] = None
         self.hypervisor: Optional['Hypervisor'] = None
 
     def build_config(self, config_desc) -> None:
@@ -66,16 +68,36 @@ class DockerConfigManager(object):
                 cpu_cores = hardware.cpus()
                 cpu_set = [str(c) for c in cpu_cores[:num_cores]]
                 host_config['cpuset_cpus'] = ','.join(cpu_set)
+                self._cpu_set = cpu_set
             except Exception as exc:  # pylint: disable=broad-except
                 logger.warning('Cannot set the CPU set: %r', exc)
 
             try:
-                host_config['mem_limit'] = str(int(max_memory_size) * 1024)
+                self._mem_limit = int(max_memory_size) * 1024
+                host_config['mem_limit'] = str(self._mem_limit)
             except (TypeError, ValueError) as exc:
                 logger.warning('Cannot set the memory limit: %r', exc)
 
         self._container_host_config.update(host_config)
 
+    def get_slot_host_config(self, slot: int, slots: int) -> dict:
+        """ CPU set and memory limit of a container computing one of
+        `slots` subtasks at the same time. Cores are split into disjoint
+        sets as long as there are enough of them, the memory limit is
+        divided equally. """
+        if slots <= 1:
+            return dict()
+
+        host_config = dict()
+        if self._cpu_set:
+            per_slot = max(1, len(self._cpu_set) // slots)
+            start = (slot * per_slot) % len(self._cpu_set)
+            host_config['cpuset_cpus'] = \
+                ','.join(self._cpu_set[start:start + per_slot])
+        if self._mem_limit:
+            host_config['mem_limit'] = str(self._mem_limit // slots)
+        return host_config
+
     @classmethod
     def install(cls, *args, **kwargs):
         if not DockerTaskThread.docker_manager:
@@ -1,13 +1,6 @@
-import logging
 from typing import Dict, Union, Tuple
 
-import requests.exceptions
-
-from docker.errors import NotFound, APIError
-
-from .client import local_client
-
-log = logging.getLogger(__name__)
+from .imagecatalogue import ImageCatalogue
 
 
 class DockerImage(object):
@@ -43,24 +36,4 @@ class DockerImage(object):
         return di
 
     def is_available(self):
-        client = local_client()
-        try:
-            if self.id:
-                info = client.inspect_image(self.id)
-                return self.name in info["RepoTags"]
-            info = client.inspect_image(self.name)
-            return self.id is None or info["Id"] == self.id
-        except NotFound:
-            log.debug('DockerImage NotFound', exc_info=True)
-            return False
-        except APIError:
-            log.debug('DockerImage APIError', exc_info=True)
-            if self.tag is not None:
-                return False
-            raise
-        except ValueError:
-            log.debug('DockerImage ValueError', exc_info=True)
-            return False
-        except requests.exceptions.ConnectionError:
-            log.debug("DockerImage Can't connect", exc_info=True)
-            return False
+        return ImageCatalogue.instance().is_available(self.name, self.id)
@@ -0,0 +1,142 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, Set
+
+import requests.exceptions
+
+from docker.errors import DockerException
+
+from .client import local_client
+
+log = logging.getLogger(__name__)
+
+
+class ImageCatalogue(object):
+    """ Local images of the Docker daemon, listed at once with `images()`.
+    The listing is refreshed when the daemon reports an image event (pull,
+    tag, untag, delete, ...). While the event stream is not available, the
+    listing is refreshed once it is older than `ttl` seconds.
+    """
+
+    # Seconds for which the listing is used without the event stream
+    TTL = 60
+    # Image events which change the listing
+    IMAGE_ACTIONS = frozenset(
+        ['pull', 'tag', 'untag', 'delete', 'import', 'load'])
+
+    _instance: Optional['ImageCatalogue'] = None
+
+    def __init__(self,
+                 client_factory: Callable = local_client,
+                 ttl: float = TTL) -> None:
+        self.client_factory = client_factory
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        # repository:tag -> image id
+        self._tags: Dict[str, str] = {}
+        # image id -> repository:tags
+        self._ids: Dict[str, Set[str]] = {}
+        self._listed_at: Optional[float] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._watching = False
+        self._watch_started_at: Optional[float] = None
+
+    @classmethod
+    def instance(cls) -> 'ImageCatalogue':
+        if not cls._instance:
+            cls._instance = cls()
+        return cls._instance
+
+    def is_available(self, name: str, image_id: Optional[str] = None) -> bool:
+        """ Whether the image is tagged as `name` (repository:tag), with
+        the given id if there is one """
+        if not self._ensure_listed():
+            return False
+        if image_id:
+            return name in self._ids.get(self._find_id(image_id), ())
+        return name in self._tags
+
+    def refresh(self) -> bool:
+        """ List the images again; False if the daemon is not available """
+        try:
+            images = self.client_factory().images()
+        except (DockerException, ValueError,
+                requests.exceptions.ConnectionError):
+            log.debug("Can't list Docker images", exc_info=True)
+            with self._lock:
+                self._listed_at = None
+            return False
+
+        tags: Dict[str, str] = {}
+        ids: Dict[str, Set[str]] = {}
+        for image in images:
+            repo_tags = set(image.get('RepoTags') or ())
+            repo_tags.discard('<none>:<none>')
+            ids[image['Id']] = repo_tags
+            for repo_tag in repo_tags:
+                tags[repo_tag] = image['Id']
+
+        with self._lock:
+            self._tags = tags
+            self._ids = ids
+            self._listed_at = time.monotonic()
+        return True
+
+    def invalidate(self) -> None:
+        """ List the images again with the next check """
+        with self._lock:
+            self._listed_at = None
+
+    def _find_id(self, image_id: str) -> Optional[str]:
+        if image_id in self._ids:
+            return image_id
+        # A short id or an id without the digest algorithm
+        short_id = image_id.split(':')[-1]
+        if not short_id:
+            return None
+        for full_id in self._ids:
+            if full_id.split(':')[-1].startswith(short_id):
+                return full_id
+        return None
+
+    def _ensure_listed(self) -> bool:
+        now = time.monotonic()
+        if not self._watching and (
+                self._watch_started_at is None
+                or now - self._watch_started_at > self.ttl):
+            self._watch()
+
+        listed_at = self._listed_at
+        if listed_at is not None and (
+                self._watching or now - listed_at <= self.ttl):
+            return True
+        return self.refresh()
+
+    def _watch(self) -> None:
+        with self._lock:
+            if self._watcher and self._watcher.is_alive():
+                return
+            self._watch_started_at = time.monotonic()
+            self._watcher = threading.Thread(target=self._watch_events,
+                                             name='ImageCatalogue',
+                                             daemon=True)
+            self._watcher.start()
+
+    def _watch_events(self) -> None:
+        try:
+            events = self.client_factory().events(
+                decode=True, filters={'type': 'image'})
+            # Changes made before the stream was opened
+            self.invalidate()
+            self._watching = True
+            for event in events:
+                action = event.get('Action') or event.get('status')
+                if action in self.IMAGE_ACTIONS:
+                    log.debug('Docker image event: %r', event)
+                    self.refresh()
+        except Exception:  # pylint: disable=broad-except
+            log.debug("Docker image events are not available", exc_info=True)
+        finally:
+            self._watching = False
@@ -16,6 +16,7 @@ from golem.docker.hypervisor.docker_for_mac import DockerForMac
 from golem.docker.hypervisor.hyperv import HyperVHypervisor
 from golem.docker.hypervisor.virtualbox import VirtualBoxHypervisor
 from golem.docker.hypervisor.xhyve import XhyveHypervisor
+from golem.docker.imagecatalogue import ImageCatalogue
 from golem.docker.task_thread import DockerBind
 from golem.report import report_calls, Component
 
@@ -251,6 +252,8 @@ class DockerManager(DockerConfigManager):
             finally:
                 os.chdir(cwd)
 
+        ImageCatalogue.instance().invalidate()
+
     def pull_images(self):
         entries = []
 
@@ -272,6 +275,8 @@ class DockerManager(DockerConfigManager):
             version = self._image_version(entry)
             self._pull_image(version)
 
+        ImageCatalogue.instance().invalidate()
+
     @report_calls(Component.docker, 'images.pull')
     def _pull_image(self, version):
         logger.warning('Docker: pulling image %r', version)
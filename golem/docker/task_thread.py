@@ -81,7 +81,8 @@ class DockerTaskThread(TaskThread):
                  extra_data: Dict,
                  dir_mapping: DockerDirMapping,
                  timeout: int,
-                 check_mem: bool = False) -> None:
+                 check_mem: bool = False,
+                 host_config: Optional[Dict] = None) -> None:
 
         if not docker_images:
             raise AttributeError("docker images is None")
@@ -104,6 +105,9 @@ class DockerTaskThread(TaskThread):
         self.job: Optional[DockerJob] = None
         self.check_mem = check_mem
         self.dir_mapping = dir_mapping
+        # Overrides the container limits, e.g. the CPU and memory share of
+        # a subtask computed concurrently with others
+        self.host_config = host_config or dict()
 
     @staticmethod
     def specify_dir_mapping(resources: str, temporary: str, work: str,
@@ -186,6 +190,7 @@ class DockerTaskThread(TaskThread):
         # PyLint still thinks docker_manager is of type DockerConfigManager
         # pylint: disable=no-member
         host_config = self.docker_manager.get_host_config_for_task(binds)
+        host_config.update(self.host_config)
         host_config['devices'] = devices
         host_config['runtime'] = runtime
 
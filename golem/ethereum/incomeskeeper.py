@@ -1,16 +1,39 @@
 # -*- coding: utf-8 -*-
+from collections import defaultdict
 from datetime import datetime, timedelta
 import logging
 import time
+from typing import Any, List, Optional, Sequence, Tuple
 
 from ethereum.utils import denoms
 from pydispatch import dispatcher
 
 from golem.core.variables import PAYMENT_DEADLINE
-from golem.model import Income
+from golem.database.pagination import newest_first
+from golem.model import Income, db
 
 logger = logging.getLogger(__name__)
 
+# Incomes updated by one statement, stays below SQLite's limit of bound
+# variables
+UPDATE_BATCH_SIZE = 500
+
+
+def _update_incomes(incomes: List[Income], **update) -> None:
+    """ Update the given incomes with one statement per chunk of incomes
+    from the same node. Call inside a transaction. """
+    subtasks: defaultdict = defaultdict(list)
+    for income in incomes:
+        subtasks[income.sender_node].append(income.subtask)
+
+    for sender_node, node_subtasks in subtasks.items():
+        for start in range(0, len(node_subtasks), UPDATE_BATCH_SIZE):
+            Income.update(**update).where(
+                Income.sender_node == sender_node,
+                Income.subtask.in_(
+                    node_subtasks[start:start + UPDATE_BATCH_SIZE]),
+            ).execute()
+
 
 class IncomesKeeper:
     """Keeps information about payments received from other nodes
@@ -41,21 +64,33 @@ class IncomesKeeper:
                 amount / denoms.ether)
 
         amount_left = amount
+        # Incomes received in full are updated together
+        paid = []
+        partially_paid = []
 
         for e in expected:
             received = min(amount_left, e.value_expected)
             e.value_received += received
             amount_left -= received
             e.transaction = tx_hash[2:]
-            e.save()
-
             if e.value_expected == 0:
-                dispatcher.send(
-                    signal='golem.income',
-                    event='confirmed',
-                    node_id=e.sender_node,
-                    amount=e.value_received,
-                )
+                paid.append(e)
+            else:
+                partially_paid.append(e)
+
+        with db.atomic():
+            _update_incomes(paid, value_received=Income.value,
+                            transaction=tx_hash[2:])
+            for e in partially_paid:
+                e.save()
+
+        for e in paid:
+            dispatcher.send(
+                signal='golem.income',
+                event='confirmed',
+                node_id=e.sender_node,
+                amount=e.value_received,
+            )
 
     def received_forced_payment(
             self,
@@ -140,7 +175,6 @@ class IncomesKeeper:
         )
 
     def get_list_of_all_incomes(self):
-        # TODO: pagination. issue #2402
         return Income.select(
             Income.created_date,
             Income.sender_node,
@@ -149,6 +183,27 @@ class IncomesKeeper:
             Income.value
         ).order_by(Income.created_date.desc())
 
+    @staticmethod
+    def get_incomes_page(limit: int, after: Optional[Sequence[Any]] = None) \
+            -> Tuple[List[Income], Optional[List[Any]]]:
+        """
+        Returns up to `limit` incomes, the newest first, and the cursor of
+        the next page, to be passed as `after`. None for the last page.
+        """
+        return newest_first(
+            Income.select(
+                Income.created_date,
+                Income.modified_date,
+                Income.sender_node,
+                Income.subtask,
+                Income.transaction,
+                Income.value,
+            ),
+            keys=[Income.created_date, Income.sender_node, Income.subtask],
+            limit=limit,
+            after=after,
+        )
+
     @staticmethod
     def update_overdue_incomes() -> None:
         """
@@ -156,19 +211,22 @@ class IncomesKeeper:
         :return: Updated incomes
         """
         accepted_ts_deadline = int(time.time()) - PAYMENT_DEADLINE
-
-        incomes = list(Income.select().where(
+        overdue = (
             Income.overdue == False,   # noqa pylint: disable=singleton-comparison
             Income.transaction.is_null(True),
             Income.accepted_ts < accepted_ts_deadline,
-        ))
+        )
+
+        with db.atomic():
+            incomes = list(Income.select().where(*overdue))
+            if incomes:
+                Income.update(overdue=True).where(*overdue).execute()
 
         if not incomes:
             return
 
         for income in incomes:
             income.overdue = True
-            income.save()
             dispatcher.send(
                 signal='golem.income',
                 event='overdue_single',
@@ -15,12 +15,15 @@ from twisted.internet import threads
 import golem_sci
 
 from golem.core.variables import PAYMENT_DEADLINE
-from golem.model import Payment, PaymentStatus
+from golem.model import Payment, PaymentStatus, db
 
 log = logging.getLogger(__name__)
 
 # We reserve 30 minutes for the payment to go through
 PAYMENT_MAX_DELAY = PAYMENT_DEADLINE - 30 * 60
+# Payments updated by one statement, stays below SQLite's limit of bound
+# variables
+UPDATE_BATCH_SIZE = 500
 
 
 def get_timestamp() -> int:
@@ -38,6 +41,27 @@ def _make_batch_payments(payments: List[Payment]) -> List[golem_sci.Payment]:
     return res
 
 
+def _update_payments(payments: List[Payment], status: PaymentStatus) -> None:
+    """ Save the new status and details of the payments in one transaction,
+    with one UPDATE per chunk of payments with the same details """
+    same_details: defaultdict = defaultdict(list)
+    for p in payments:
+        p.status = status
+        same_details[Payment.details.db_value(p.details)].append(p)
+
+    with db.atomic():
+        for group in same_details.values():
+            subtasks = [p.subtask for p in group]
+            for start in range(0, len(subtasks), UPDATE_BATCH_SIZE):
+                Payment.update(
+                    status=status,
+                    details=group[0].details,
+                ).where(
+                    Payment.subtask.in_(
+                        subtasks[start:start + UPDATE_BATCH_SIZE]),
+                ).execute()
+
+
 class PaymentProcessor:
     CLOSURE_TIME_DELAY = 2
     # Don't try to use more than 75% of block gas limit
@@ -90,9 +114,8 @@ class PaymentProcessor:
     def _on_batch_confirmed(self, payments: List[Payment], receipt) -> None:
         if not receipt.status:
             log.critical("Failed batch transfer: %s", receipt)
+            _update_payments(payments, PaymentStatus.awaiting)
             for p in payments:
-                p.status = PaymentStatus.awaiting  # type: ignore
-                p.save()
                 self._awaiting.add(p)
             return
 
@@ -106,11 +129,11 @@ class PaymentProcessor:
             fee / denoms.ether,
         )
         for p in payments:
-            p.status = PaymentStatus.confirmed  # type: ignore
             p.details.block_number = receipt.block_number
             p.details.block_hash = receipt.block_hash[2:]
             p.details.fee = fee
-            p.save()
+        _update_payments(payments, PaymentStatus.confirmed)
+        for p in payments:
             self._gntb_reserved -= p.value
             self._payment_confirmed(p, block.timestamp)
 
@@ -233,9 +256,9 @@ class PaymentProcessor:
         del self._awaiting[:payments_count]
 
         for payment in payments:
-            payment.status = PaymentStatus.sent
             payment.details.tx = tx_hash[2:]
-            payment.save()
+        _update_payments(payments, PaymentStatus.sent)
+        for payment in payments:
             log.debug("- {} send to {} ({:.18f} GNTB)".format(
                 payment.subtask,
                 encode_hex(payment.payee),
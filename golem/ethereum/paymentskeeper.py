@@ -1,10 +1,11 @@
 import logging
 from datetime import datetime, timedelta
-from typing import Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
 from eth_utils import encode_hex
 
 from golem.core.common import to_unicode, datetime_to_timestamp_utc
+from golem.database.pagination import newest_first
 from golem.model import Payment
 
 logger = logging.getLogger(__name__)
@@ -102,7 +103,29 @@ class PaymentsKeeper:
     def get_list_of_all_payments(self, num: Optional[int] = None,
                                  interval: Optional[timedelta] = None):
         # This data is used by UI.
-        return [{
+        return [self._payment_to_dict(payment)
+                for payment in self.db.get_newest_payment(num, interval)]
+
+    def get_payments_page(self, limit: int,
+                          after: Optional[Sequence[Any]] = None) \
+            -> Dict[str, Any]:
+        """ Return up to `limit` payments, the newest first, and the cursor
+        of the next page, to be passed as `after`. None for the last page.
+        """
+        payments, cursor = newest_first(
+            Payment.select(),
+            keys=[Payment.created_date, Payment.subtask],
+            limit=limit,
+            after=after,
+        )
+        return {
+            "payments": [self._payment_to_dict(p) for p in payments],
+            "next": cursor,
+        }
+
+    @staticmethod
+    def _payment_to_dict(payment: Payment) -> Dict[str, Any]:
+        return {
             "subtask": to_unicode(payment.subtask),
             "payee": to_unicode(encode_hex(payment.payee)),
             "value": to_unicode(payment.value),
@@ -112,7 +135,7 @@ class PaymentsKeeper:
             "transaction": to_unicode(payment.details.tx),
             "created": datetime_to_timestamp_utc(payment.created_date),
             "modified": datetime_to_timestamp_utc(payment.modified_date)
-        } for payment in self.db.get_newest_payment(num, interval)]
+        }
 
     def finished_subtasks(
             self,
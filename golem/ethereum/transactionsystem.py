@@ -15,6 +15,7 @@ from typing import (
     Iterable,
     List,
     Optional,
+    Sequence,
     Tuple,
 )
 
@@ -338,6 +339,14 @@ class TransactionSystem(LoopingCallService):
         """
         return self._payments_keeper.get_list_of_all_payments(num, interval)
 
+    def get_payments_page(self, limit: int,
+                          after: Optional[Sequence[Any]] = None) \
+            -> Dict[str, Any]:
+        """ Return a page of planned and made payments, the newest first
+        :return dict: payments and the cursor of the next page
+        """
+        return self._payments_keeper.get_payments_page(limit, after)
+
     @classmethod
     def get_deposit_payments_list(cls, limit: int = 1000, offset: int = 0) \
             -> List[model.DepositPayment]:
@@ -358,6 +367,14 @@ class TransactionSystem(LoopingCallService):
         """
         return self._incomes_keeper.get_list_of_all_incomes()
 
+    def get_incomes_page(self, limit: int,
+                         after: Optional[Sequence[Any]] = None) \
+            -> Tuple[List[model.Income], Optional[List[Any]]]:
+        """ Return a page of expected and received incomes, the newest first,
+        and the cursor of the next page
+        """
+        return self._incomes_keeper.get_incomes_page(limit, after)
+
     def get_available_eth(self) -> int:
         return self._eth_balance - self.get_locked_eth()
 
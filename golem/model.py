@@ -21,6 +21,7 @@ from peewee import (
     DateTimeField,
     Field,
     FloatField,
+    ForeignKeyField,
     IntegerField,
     Model,
     SmallIntegerField,
@@ -29,6 +30,7 @@ from peewee import (
 import semantic_version
 
 from golem.core import common
+from golem.core.compress import compress, decompress
 from golem.core.simpleserializer import DictSerializable
 from golem.database import GolemSqliteDatabase
 from golem.ranking.helper.trust_const import NEUTRAL_TRUST
@@ -289,6 +291,12 @@ class Payment(BaseModel):
     details = PaymentDetailsField()
     processed_ts = IntegerField(null=True)
 
+    class Meta:
+        database = db
+        indexes = (
+            (('created_date',), False),
+        )
+
     def __init__(self, *args, **kwargs):
         super(Payment, self).__init__(*args, **kwargs)
         # For convenience always have .details as a dictionary
@@ -341,6 +349,9 @@ class Income(BaseModel):
     class Meta:
         database = db
         primary_key = CompositeKey('sender_node', 'subtask')
+        indexes = (
+            (('created_date',), False),
+        )
 
     def __repr__(self):
         return "<Income: {!r} v:{:.3f} accepted_ts:{!r} tid:{!r}>"\
@@ -424,6 +435,22 @@ class KnownHosts(BaseModel):
         )
 
 
+class KnownHostPerformance(BaseModel):
+    """ The performance a known host reported for an environment, kept
+    out of its metadata so it can be read back without decoding it """
+    host = ForeignKeyField(KnownHosts, related_name='performance',
+                           on_delete='CASCADE')
+    environment = CharField()
+    value = FloatField()
+
+    class Meta:
+        database = db
+        indexes = (
+            (('host', 'environment'), True),  # unique index
+            (('environment', 'value'), False),
+        )
+
+
 ##################
 # ACCOUNT MODELS #
 ##################
@@ -530,12 +557,23 @@ class NetworkMessage(BaseModel):
     task = CharField(null=True, index=True)
     subtask = CharField(null=True, index=True)
 
-    msg_date = DateTimeField(null=False)
+    msg_date = DateTimeField(null=False, index=True)
     msg_cls = CharField(null=False)
     msg_data = BlobField(null=False)
 
+    @staticmethod
+    def pack_data(msg_data: Optional[bytes]) -> Optional[bytes]:
+        """ Compress a pickled message before it is stored """
+        if msg_data is None:
+            return None
+        return compress(msg_data)
+
     def as_message(self) -> message.base.Message:
-        msg = pickle.loads(self.msg_data)
+        msg_data = bytes(self.msg_data)
+        # Messages stored by older versions are not compressed
+        if not msg_data.startswith(b'\x80'):
+            msg_data = decompress(msg_data)
+        msg = pickle.loads(msg_data)
         return msg
 
 
@@ -566,6 +604,11 @@ class QueuedMessage(BaseModel):
             None,
             check_time=False,
         )
+        return self.refresh_message(msg)
+
+    @staticmethod
+    def refresh_message(msg: message.base.Message) -> message.base.Message:
+        """ Prepare a queued message to be signed and sent again """
         msg.header = msg_dt.MessageHeader(
             msg.header[0],
             int(time.time()),
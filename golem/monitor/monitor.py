@@ -1,7 +1,7 @@
 import logging
-import queue
 import threading
 import time
+from collections import deque
 from typing import Optional, Dict
 from urllib.parse import urljoin
 
@@ -23,34 +23,132 @@ log = logging.getLogger('golem.monitor')
 
 
 class SenderThread(threading.Thread):
-    def __init__(self, node_info, monitor_host, monitor_request_timeout,
-                 monitor_sender_thread_timeout, proto_ver):
+    """ Sends the queued messages in batches, over a persistent connection.
+    A batch is sent once it reaches `batch_max_bytes` of messages or its
+    first message has waited `batch_max_age` seconds. Failed batches are
+    retried with an exponential backoff. At most `max_queued` messages
+    wait to be sent, the oldest ones are dropped first.
+    """
+
+    # Attempts to send a batch before it is dropped
+    MAX_ATTEMPTS = 5
+    # Seconds before the first retry, doubled with every next one
+    RETRY_DELAY = 1.0
+    RETRY_MAX_DELAY = 60.0
+    # Seconds between two warnings about dropped messages
+    DROP_WARNING_INTERVAL = 60 * 10
+
+    def __init__(self,  # pylint: disable=too-many-arguments
+                 node_info, monitor_host, monitor_request_timeout,
+                 monitor_sender_thread_timeout, proto_ver,
+                 batch_max_bytes=64 * 1024, batch_max_age=5.0,
+                 max_queued=1000):
         super(SenderThread, self).__init__()
-        self.queue = queue.Queue()
+        self.queue = deque(maxlen=max_queued)
+        self.queue_ready = threading.Condition()
         self.stop_request = threading.Event()
         self.node_info = node_info
         self.sender = Sender(monitor_host, monitor_request_timeout, proto_ver)
         self.monitor_sender_thread_timeout = monitor_sender_thread_timeout
+        self.batch_max_bytes = batch_max_bytes
+        self.batch_max_age = batch_max_age
+        self.dropped = 0
+        self.last_drop_warning_time = 0
 
     def send(self, o):
-        self.queue.put(o)
+        with self.queue_ready:
+            if len(self.queue) == self.queue.maxlen:
+                self._dropped(1)
+            self.queue.append((time.monotonic(), o))
+            self.queue_ready.notify()
 
     def run(self):
         while not self.stop_request.isSet():
-            try:
-                msg = self.queue.get(True, self.monitor_sender_thread_timeout)
-                if msg is None:
-                    continue
-                self.sender.send(msg)
-            except queue.Empty:
+            batch = self._collect_batch()
+            if batch:
+                self._send_batch(batch, self.MAX_ATTEMPTS)
+            elif not self.stop_request.isSet():
                 # send ping message
                 self.sender.send(self.node_info)
 
+        # One attempt for the messages queued before stopping, e.g. logout
+        with self.queue_ready:
+            queued = [o for _, o in self.queue]
+            self.queue.clear()
+        if queued:
+            self._send_batch([self.sender.prepare(o) for o in queued], 1)
+        self.sender.close()
+
     def join(self, timeout=None):
         self.stop_request.set()
-        self.queue.put(None)
+        with self.queue_ready:
+            self.queue_ready.notify()
         super(SenderThread, self).join(timeout)
 
+    def _collect_batch(self):
+        with self.queue_ready:
+            if not self.queue:
+                self.queue_ready.wait(self.monitor_sender_thread_timeout)
+            if not self.queue:
+                return []
+            deadline = self.queue[0][0] + self.batch_max_age
+
+        batch = []
+        size = 0
+        while True:
+            with self.queue_ready:
+                timeout = deadline - time.monotonic()
+                if not self.queue and timeout > 0 \
+                        and not self.stop_request.isSet():
+                    self.queue_ready.wait(timeout)
+                queued = [o for _, o in self.queue]
+                self.queue.clear()
+
+            for i, o in enumerate(queued):
+                msg = self.sender.prepare(o)
+                batch.append(msg)
+                size += len(msg)
+                if size >= self.batch_max_bytes:
+                    self._requeue(queued[i + 1:])
+                    return batch
+
+            if deadline <= time.monotonic() or self.stop_request.isSet():
+                return batch
+
+    def _requeue(self, queued):
+        """ Put the messages which did not fit in a batch back in front of
+        the queue """
+        if not queued:
+            return
+        now = time.monotonic()
+        with self.queue_ready:
+            newer = list(self.queue)
+            self.queue.clear()
+            self.queue.extend((now, o) for o in queued)
+            for item in newer:
+                if len(self.queue) == self.queue.maxlen:
+                    self._dropped(1)
+                self.queue.append(item)
+
+    def _send_batch(self, batch, attempts):
+        delay = self.RETRY_DELAY
+        for attempt in range(1, attempts + 1):
+            if self.sender.send_batch(batch):
+                return True
+            if attempt == attempts or self.stop_request.wait(delay):
+                break
+            delay = min(2 * delay, self.RETRY_MAX_DELAY)
+        self._dropped(len(batch))
+        return False
+
+    def _dropped(self, count):
+        """ Called with the number of messages which will not be sent """
+        self.dropped += count
+        if time.time() - self.last_drop_warning_time \
+                > self.DROP_WARNING_INTERVAL:
+            log.warning('Monitor messages dropped: %d', self.dropped)
+            self.last_drop_warning_time = time.time()
+
 
 class SystemMonitor(object):
     def __init__(self,
@@ -74,7 +172,10 @@ class SystemMonitor(object):
                 host,
                 request_timeout,
                 sender_thread_timeout,
-                proto_ver
+                proto_ver,
+                batch_max_bytes=self.config['BATCH_MAX_BYTES'],
+                batch_max_age=self.config['BATCH_MAX_AGE'],
+                max_queued=self.config['MAX_QUEUED'],
             )
         return self._sender_thread
 
@@ -1,3 +1,4 @@
+import gzip
 import logging
 import requests
 import time
@@ -10,13 +11,19 @@ class DefaultHttpSender(object):
         self.url = url
         self.timeout = request_timeout
         self.json_headers = {'content-type': 'application/json'}
+        self.gzip_json_headers = {
+            'content-type': 'application/json',
+            'content-encoding': 'gzip',
+        }
         self.last_exception_time = 0
+        # Keeps the connection alive between the requests
+        self.session = requests.Session()
 
     def _post(self, headers, payload):
         try:
             log.debug(f'sending msg {payload}')
-            r = requests.post(self.url, data=payload, headers=headers,
-                              timeout=self.timeout)
+            r = self.session.post(self.url, data=payload, headers=headers,
+                                  timeout=self.timeout)
             log.debug(f'result {r}')
             return r.status_code == 200
         except requests.exceptions.RequestException as e:
@@ -29,3 +36,12 @@ class DefaultHttpSender(object):
 
     def post_json(self, json_payload):
         return self._post(self.json_headers, json_payload)
+
+    def post_json_batch(self, json_payloads):
+        """ Post the JSON documents as a single gzip-compressed JSON list """
+        payload = '[' + ','.join(json_payloads) + ']'
+        return self._post(self.gzip_json_headers,
+                          gzip.compress(payload.encode('utf-8')))
+
+    def close(self):
+        self.session.close()
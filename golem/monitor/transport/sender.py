@@ -7,6 +7,15 @@ class DefaultJSONSender(object):
         self.transport = DefaultHttpSender(host, timeout)
         self.proto = DefaultProto(proto_ver)
 
+    def prepare(self, o):
+        return self.proto.prepare_json_message(o.dict_repr())
+
     def send(self, o):
-        msg = self.proto.prepare_json_message(o.dict_repr())
-        return self.transport.post_json(msg)
+        return self.transport.post_json(self.prepare(o))
+
+    def send_batch(self, msgs):
+        """ Send the messages returned by prepare() in a single request """
+        return self.transport.post_json_batch(msgs)
+
+    def close(self):
+        self.transport.close()
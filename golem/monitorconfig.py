@@ -8,9 +8,16 @@ MONITOR_CONFIG = {
     ],
     'REQUEST_TIMEOUT': 10,
 
+    # Messages are sent in gzip-compressed batches of up to BATCH_MAX_BYTES
+    # (before compression), waiting at most BATCH_MAX_AGE seconds
+    'BATCH_MAX_BYTES': 64 * 1024,
+    'BATCH_MAX_AGE': 5,
+    # The oldest messages are dropped when more are waiting to be sent
+    'MAX_QUEUED': 1000,
+
     # Increase this number every time any change is made to the protocol
     # (e.g. message object representation changes)
-    'PROTO_VERSION': 1,
+    'PROTO_VERSION': 2,
 }
 
 # so that the queue will not get filled up
@@ -4,16 +4,19 @@ import operator
 import pickle
 import queue
 import threading
+import time
+from collections import deque
 from functools import reduce, wraps
-from typing import List
+from typing import Any, Deque, Dict, List
 from typing import Optional
 
 from golem_messages import message
 from peewee import (PeeweeException, DataError, ProgrammingError,
                     NotSupportedError, Field, IntegrityError)
 
+from golem.core.common import summarize
 from golem.core.service import IService
-from golem.model import NetworkMessage, Actor
+from golem.model import NetworkMessage, Actor, db
 
 logger = logging.getLogger('golem.network.history')
 
@@ -25,10 +28,11 @@ class MessageNotFound(Exception):
 class MessageHistoryService(IService):
     """
     The purpose of this class is to:
-    - save NetworkMessages (in background)
+    - save NetworkMessages (in background), queued messages are saved
+      together in a single transaction
     - remove given NetworkMessages (in background)
     - sweep NetworkMessages past their MESSAGE_LIFETIME every ~ SWEEP_INTERVAL
-      (in background)
+      (in background), at most SWEEP_BATCH_SIZE of them per loop iteration
     - retrieve, save and remove NetworkMessages in-place via *_sync methods
 
     Assumptions:
@@ -40,8 +44,17 @@ class MessageHistoryService(IService):
     """
 
     MESSAGE_LIFETIME = datetime.timedelta(days=1)
-    SWEEP_INTERVAL = datetime.timedelta(hours=12)
+    SWEEP_INTERVAL = datetime.timedelta(minutes=10)
+    SWEEP_BATCH_SIZE = 1000
     QUEUE_TIMEOUT = datetime.timedelta(seconds=2).total_seconds()
+    # Messages saved in one transaction and the time to wait for them
+    # after the first one is queued
+    BATCH_SIZE = 500
+    BATCH_LATENCY = datetime.timedelta(milliseconds=100).total_seconds()
+    # Rows per INSERT statement, stays below SQLite's limit of bound variables
+    INSERT_BATCH_SIZE = 90
+    # Queue lags kept for get_stats
+    STATS_WINDOW = 1000
 
     # Decorators (at the end of this file) need to access an instance
     # of MessageHistoryService
@@ -55,10 +68,14 @@ class MessageHistoryService(IService):
 
         self._thread = None  # set in start
         self._queue_timeout = None  # set in start
+        self._batch_latency = 0  # set in start
         self._stop_event = threading.Event()
         self._save_queue = queue.Queue()
         self._remove_queue = queue.Queue()
         self._sweep_ts = datetime.datetime.now()
+        self._saved = 0
+        # seconds between msg_date and saving the message
+        self._lags: Deque[float] = deque(maxlen=self.STATS_WINDOW)
 
     def run(self) -> None:
         """
@@ -84,6 +101,7 @@ class MessageHistoryService(IService):
 
         self._stop_event.clear()
         self._queue_timeout = self.QUEUE_TIMEOUT
+        self._batch_latency = self.BATCH_LATENCY
         self._thread = threading.Thread(target=self.run, daemon=True)
         self._thread.start()
 
@@ -95,6 +113,7 @@ class MessageHistoryService(IService):
         self.instance = None
 
         self._queue_timeout = 0
+        self._batch_latency = 0
         while not self._save_queue.empty():
             self._loop()
 
@@ -135,8 +154,9 @@ class MessageHistoryService(IService):
         :param msg_dict: Message to save
         """
         try:
-            msg = NetworkMessage(**msg_dict)
+            msg = NetworkMessage(**self._to_row(msg_dict))
             msg.save()
+            self._record_saved([msg_dict])
         except (DataError, ProgrammingError, NotSupportedError,
                 TypeError, IntegrityError) as exc:
             # Unrecoverable error
@@ -147,6 +167,48 @@ class MessageHistoryService(IService):
             logger.warning("Message '%s' save queued", msg_dict.get('msg_cls'))
             self._save_queue.put(msg_dict)
 
+    def add_many_sync(self, msg_dicts: List[dict]) -> None:
+        """
+        Saves messages in the database synchronously, in a single
+        transaction.
+        :param msg_dicts: Messages to save
+        """
+        now = datetime.datetime.now()
+        try:
+            rows = [dict(self._to_row(msg_dict),
+                         created_date=now, modified_date=now)
+                    for msg_dict in msg_dicts]
+            with db.atomic():
+                for start in range(0, len(rows), self.INSERT_BATCH_SIZE):
+                    NetworkMessage.insert_many(
+                        rows[start:start + self.INSERT_BATCH_SIZE],
+                    ).execute()
+        except (DataError, ProgrammingError, NotSupportedError,
+                TypeError, IntegrityError) as exc:
+            # Unrecoverable error, keep the valid messages
+            logger.warning("Cannot save %d messages to database at once, "
+                           "saving them one by one: %r", len(msg_dicts), exc)
+            for msg_dict in msg_dicts:
+                self.add_sync(msg_dict)
+        except PeeweeException:
+            # Temporary error
+            logger.warning("%d messages save queued", len(msg_dicts))
+            for msg_dict in msg_dicts:
+                self._save_queue.put(msg_dict)
+        else:
+            self._record_saved(msg_dicts)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns the number of messages waiting to be saved and how long
+        the last saved ones waited, in seconds.
+        """
+        return {
+            'queued': self._save_queue.qsize(),
+            'saved': self._saved,
+            'lag': summarize(self._lags),
+        }
+
     def remove(self, task: str, **properties) -> None:
         """
         Appends task id to the removal queue. Has lower priority than adding
@@ -199,20 +261,56 @@ class MessageHistoryService(IService):
 
         return clauses
 
+    @staticmethod
+    def _to_row(msg_dict: dict) -> dict:
+        return dict(msg_dict,
+                    msg_data=NetworkMessage.pack_data(
+                        msg_dict.get('msg_data')))
+
+    def _record_saved(self, msg_dicts: List[dict]) -> None:
+        now = datetime.datetime.now()
+        self._saved += len(msg_dicts)
+        for msg_dict in msg_dicts:
+            msg_date = msg_dict.get('msg_date')
+            if isinstance(msg_date, datetime.datetime):
+                self._lags.append((now - msg_date).total_seconds())
+
+    def _get_batch(self) -> List[dict]:
+        """
+        Waits QUEUE_TIMEOUT for a message to save, then BATCH_LATENCY
+        for up to BATCH_SIZE messages in total.
+        """
+        try:
+            batch = [self._save_queue.get(True, self._queue_timeout)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self._batch_latency
+        while len(batch) < self.BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout > 0:
+                    batch.append(self._save_queue.get(True, timeout))
+                else:
+                    batch.append(self._save_queue.get(False))
+            except queue.Empty:
+                break
+        return batch
+
     def _loop(self) -> None:
         """
         Main service loop.
-        - calls _sweep every SWEEP_INTERVAL
-        - saves queued (1) messages to database (FIFO)
+        - calls _sweep every SWEEP_INTERVAL, and on every iteration while
+          there are old messages left
+        - saves queued (1) messages to database (FIFO), in batches
         - removes queued (2) messages from database
         """
 
-        # Sweep messages.
-        # With big enough SWEEP_INTERVAL, _sweep time becomes negligible
+        # Sweep messages
         now = datetime.datetime.now()
         if now >= self._sweep_ts:
-            self._sweep()
             self._sweep_ts = now + self.SWEEP_INTERVAL
+            self._sweep()
 
         # Remove messages
         try:
@@ -223,26 +321,37 @@ class MessageHistoryService(IService):
             self.remove_sync(task, **parameters)
 
         # Save messages
-        try:
-            msg_dict = self._save_queue.get(True, self._queue_timeout)
-        except queue.Empty:
-            pass
-        else:
-            self.add_sync(msg_dict)
+        batch = self._get_batch()
+        if len(batch) == 1:
+            self.add_sync(batch[0])
+        elif batch:
+            self.add_many_sync(batch)
 
     def _sweep(self) -> None:
         """
-        Removes messages older than MESSAGE_LIFETIME.
+        Removes up to SWEEP_BATCH_SIZE messages older than MESSAGE_LIFETIME,
+        the oldest first. Schedules the next sweep for the next loop
+        iteration if there may be more of them.
         """
-        logger.info("Sweeping messages")
+        logger.debug("Sweeping messages")
         oldest = datetime.datetime.now() - self.MESSAGE_LIFETIME
+        expired = NetworkMessage.select(NetworkMessage.id) \
+            .where(NetworkMessage.msg_date <= oldest) \
+            .order_by(+NetworkMessage.msg_date) \
+            .limit(self.SWEEP_BATCH_SIZE)
 
         try:
-            NetworkMessage.delete() \
-                .where(NetworkMessage.msg_date <= oldest) \
+            removed = NetworkMessage.delete() \
+                .where(NetworkMessage.id << expired) \
                 .execute()
         except PeeweeException as exc:
             logger.error("Message sweep failed: %r", exc)
+            return
+
+        if removed:
+            logger.info("Swept %d messages", removed)
+        if removed >= self.SWEEP_BATCH_SIZE:
+            self._sweep_ts = datetime.datetime.now()
 
 
 # SHORTCUTS #
@@ -1,7 +1,6 @@
 import ipaddress
 import itertools
 import logging
-import socket
 import random
 import time
 from collections import deque
@@ -16,19 +15,22 @@ from typing import (
 from golem_messages import message
 from golem_messages.datastructures import p2p as dt_p2p
 from golem_messages.datastructures import tasks as dt_tasks
+from twisted.internet.defer import Deferred, DeferredList
 
 from golem.config.active import P2P_SEEDS
 from golem.core import simplechallenge
 from golem.core.variables import MAX_CONNECT_SOCKET_ADDRESSES
 from golem.core.common import node_info_str
 from golem.diag.service import DiagnosticsProvider
-from golem.model import KnownHosts, db
+from golem.model import KnownHostPerformance, KnownHosts, db
 from golem.network.p2p.peersession import PeerSession, PeerSessionInfo
 from golem.network.transport import tcpnetwork
 from golem.network.transport import tcpserver
 from golem.network.transport.network import ProtocolFactory, SessionFactory
 from golem.ranking.manager.gossip_manager import GossipManager
 from .peerkeeper import PeerKeeper, key_distance
+from .performanceindex import PerformanceIndex
+from .seedresolver import SeedResolver
 
 logger = logging.getLogger(__name__)
 
@@ -93,6 +95,7 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
         self.gossip_keeper = GossipManager()
         self.manager_session = None
         self.metadata_providers: Dict[str, Callable[[], Any]] = {}
+        self.performance_index = PerformanceIndex()
 
         # Useful config options
         self.node_name = self.config_desc.node_name
@@ -115,11 +118,13 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
         self.seeds = set()
         self.used_seeds = set()
         self.bootstrap_seeds = P2P_SEEDS
+        self.seed_resolver = SeedResolver()
 
         self._peer_lock = Lock()
 
         try:
             self.__remove_redundant_hosts_from_db()
+            self._load_performance_index()
             self._sync_seeds()
         except Exception as exc:
             logger.error("Error reading seed addresses: {}".format(exc))
@@ -214,7 +219,9 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
                 host.last_connected = time.time()
                 host.metadata = metadata or {}
                 host.save()
+                performance = self._save_host_performance(host)
 
+            self.performance_index.update(host.id, performance)
             self.__remove_redundant_hosts_from_db()
             self._sync_seeds()
 
@@ -284,24 +291,45 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
         logger.info('Estimated network size: %r', size)
         return size
 
-    @staticmethod
-    def get_performance_percentile_rank(perf: float, env_id: str) -> float:
-        # Hosts which don't support the given env at all shouldn't be counted
-        # even if perf equals 0. Therefore -1 is the default value.
-        hosts_perf = [
-            host.metadata['performance'].get(env_id, -1.0)
-            for host in KnownHosts.select()
-            if 'performance' in host.metadata
-        ]
-        if not hosts_perf:
+    def get_performance_percentile_rank(self, perf: float,
+                                        env_id: str) -> float:
+        rank = self.performance_index.percentile_rank(perf, env_id)
+        if rank is None:
             logger.warning('Cannot compute percentile rank. No host '
                            'performance info is available')
             return 1.0
 
-        rank = sum(1 for x in hosts_perf if x < perf) / len(hosts_perf)
         logger.info(f'Performance for env `{env_id}`: rank({perf}) = {rank}')
         return rank
 
+    def _load_performance_index(self) -> None:
+        self.performance_index.load(
+            KnownHostPerformance.select(
+                KnownHostPerformance.host,
+                KnownHostPerformance.environment,
+                KnownHostPerformance.value,
+            ).order_by(
+                KnownHostPerformance.environment,
+                KnownHostPerformance.value,
+            ).tuples()
+        )
+
+    @staticmethod
+    def _save_host_performance(host: KnownHosts) -> Dict[str, float]:
+        """ Store the performance from the metadata of the host in its own
+        indexed rows """
+        performance = PerformanceIndex.valid_performance(
+            host.metadata.get('performance'))
+        KnownHostPerformance.delete() \
+            .where(KnownHostPerformance.host == host) \
+            .execute()
+        if performance:
+            KnownHostPerformance.insert_many([
+                {'host': host, 'environment': env_id, 'value': value}
+                for env_id, value in performance.items()
+            ]).execute()
+        return performance
+
     def ping_peers(self, interval):
         """ Send ping to all peers with whom this peer has open connection
         :param int interval: will send ping only if time from last ping
@@ -974,7 +1002,11 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
         if peers_to_find:
             self.send_find_nodes(peers_to_find)
 
-    def _sync_seeds(self, known_hosts=None):
+    def _sync_seeds(self, known_hosts=None) -> Deferred:
+        """ Resolve the seeds in the background, the previous seeds are used
+        until all the lookups are done
+        :return: Deferred fired with the new seeds
+        """
         self.last_seeds_sync = time.time()
         if not known_hosts:
             known_hosts = KnownHosts.select().where(KnownHosts.is_seed)
@@ -988,30 +1020,20 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
                     host,
                     port,
                 )
-                return
+                return None
             if not (host and port):
                 logger.debug(
                     "Ignoring incomplete seed. host=%r port=%r",
                     host,
                     port,
                 )
-                return
-            try:
-                for addrinfo in socket.getaddrinfo(host, port):
-                    yield addrinfo[4]  # (ip, port)
-            except OSError as e:
-                logger.error(
-                    "Can't resolve %s:%s. %s",
-                    host,
-                    port,
-                    e,
-                )
-
-        self.seeds = set()
+                return None
+            return self.seed_resolver.resolve(host, port)
 
         ip_address = self.config_desc.seed_host or ''
         port = self.config_desc.seed_port
 
+        lookups = []
         for hostport in itertools.chain(
                 ((kh.ip_address, kh.port) for kh in known_hosts if kh.is_seed),
                 self.bootstrap_seeds,
@@ -1021,7 +1043,22 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
                         None,
                     )
                 )):
-            self.seeds.update(_resolve_hostname(*hostport))
+            lookup = _resolve_hostname(*hostport)
+            if lookup is not None:
+                lookups.append(lookup)
+
+        def _update_seeds(results):
+            seeds = set()
+            for _, addresses in results:
+                seeds.update(addresses)
+            previous, self.seeds = self.seeds, seeds
+            if seeds and not previous and not self.peers \
+                    and self.last_time_tried_connect_with_seed:
+                # The seeds were not resolved yet when connecting to them
+                self.connect_to_seeds()
+            return seeds
+
+        return DeferredList(lookups).addCallback(_update_seeds)
 
     def _get_next_random_seed(self):
         # this loop won't execute more than twice
@@ -1051,14 +1088,20 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
                 message.base.Disconnect.REASON.Refresh
             )
 
-    @staticmethod
-    def __remove_redundant_hosts_from_db():
-        to_delete = KnownHosts.select() \
-            .order_by(KnownHosts.last_connected.desc()) \
+    def __remove_redundant_hosts_from_db(self):
+        to_delete = [
+            host.id for host in KnownHosts.select(KnownHosts.id)
+            .order_by(KnownHosts.last_connected.desc())
             .offset(MAX_STORED_HOSTS)
+        ]
+        if not to_delete:
+            return
+        # Their performance rows are deleted in cascade
         KnownHosts.delete() \
             .where(KnownHosts.id << to_delete) \
             .execute()
+        for host_id in to_delete:
+            self.performance_index.remove(host_id)
 
 
 class P2PConnTypes(object):
@@ -0,0 +1,75 @@
+import bisect
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class PerformanceIndex:
+    """ Performance of the known hosts in every environment, kept sorted
+    so that a percentile rank is a bisection instead of a scan of all the
+    hosts. Only the hosts which reported their performance are counted. """
+
+    def __init__(self) -> None:
+        self._hosts: Dict[int, Dict[str, float]] = {}
+        self._values: Dict[str, List[float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._hosts)
+
+    def load(self, rows: Iterable[Tuple[int, str, float]]) -> None:
+        """ Replace the index with (host id, environment, performance) rows,
+        preferably ordered by environment and performance """
+        self._hosts = {}
+        self._values = {}
+        for host_id, env_id, value in rows:
+            self._hosts.setdefault(host_id, {})[env_id] = value
+            self._values.setdefault(env_id, []).append(value)
+        for values in self._values.values():
+            # Linear for the rows which are sorted already
+            values.sort()
+
+    def update(self, host_id: int, performance: Dict[str, Any]) -> None:
+        self.remove(host_id)
+        performance = self.valid_performance(performance)
+        if not performance:
+            return
+        self._hosts[host_id] = performance
+        for env_id, value in performance.items():
+            bisect.insort(self._values.setdefault(env_id, []), value)
+
+    def remove(self, host_id: int) -> None:
+        performance = self._hosts.pop(host_id, None)
+        if not performance:
+            return
+        for env_id, value in performance.items():
+            values = self._values[env_id]
+            del values[bisect.bisect_left(values, value)]
+            if not values:
+                del self._values[env_id]
+
+    def percentile_rank(self, perf: float, env_id: str) -> Optional[float]:
+        """ Fraction of the hosts slower than perf in the environment, None
+        if no host reported its performance """
+        if not self._hosts:
+            return None
+        values = self._values.get(env_id, [])
+        below = bisect.bisect_left(values, perf)
+        # Hosts which don't support the environment count as -1
+        if perf > -1.0:
+            below += len(self._hosts) - len(values)
+        return below / len(self._hosts)
+
+    @staticmethod
+    def valid_performance(performance: Any) -> Dict[str, float]:
+        """ Skip the values which are not numbers, the metadata comes from
+        other nodes """
+        if not isinstance(performance, dict):
+            return {}
+        valid = {}
+        for env_id, value in performance.items():
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                continue
+            if not math.isnan(value):
+                valid[str(env_id)] = value
+        return valid
@@ -0,0 +1,124 @@
+import ipaddress
+import logging
+import socket
+import time
+from functools import partial
+from typing import Callable, Dict, List, Set, Tuple
+
+from twisted.internet.defer import Deferred, succeed
+from twisted.internet.threads import deferToThreadPool
+from twisted.python.failure import Failure
+from twisted.python.threadpool import ThreadPool
+
+logger = logging.getLogger(__name__)
+
+# (ip, port)
+Address = Tuple[str, int]
+
+
+class SeedResolver:
+    """ Resolves the host names of the seeds on a bounded pool of worker
+    threads, so that a slow or unreachable DNS server does not stall the
+    reactor thread. Resolved addresses are reused for `ttl` seconds and
+    the last ones resolved are returned when a later lookup fails.
+    """
+
+    # Number of host names resolved at once
+    WORKERS = 8
+    # Seconds for which the resolved addresses are reused
+    TTL = 10 * 60
+
+    def __init__(self,
+                 workers: int = WORKERS,
+                 ttl: float = TTL,
+                 getaddrinfo: Callable = socket.getaddrinfo) -> None:
+        """
+        :param workers: number of resolver threads
+        :param ttl: seconds for which the resolved addresses are reused
+        :param getaddrinfo: blocking resolver, socket.getaddrinfo compatible
+        """
+        self.workers = max(1, workers)
+        self.ttl = ttl
+        self._getaddrinfo = getaddrinfo
+
+        self._pool = ThreadPool(minthreads=0, maxthreads=self.workers,
+                                name='SeedResolver')
+        self._shutdown_trigger = None
+        # (host, port) -> (expiry time, addresses)
+        self._cache: Dict[Address, Tuple[float, Set[Address]]] = {}
+        # (host, port) -> callers waiting for the lookup in progress
+        self._lookups: Dict[Address, List[Deferred]] = {}
+
+    def start(self) -> None:
+        from twisted.internet import reactor
+
+        if self._pool.started:
+            return
+        self._pool.start()
+        self._shutdown_trigger = reactor.addSystemEventTrigger(
+            'during', 'shutdown', self.stop)
+
+    def stop(self) -> None:
+        from twisted.internet import reactor
+
+        if self._shutdown_trigger:
+            reactor.removeSystemEventTrigger(self._shutdown_trigger)
+            self._shutdown_trigger = None
+        if self._pool.started:
+            self._pool.stop()
+
+    def resolve(self, host: str, port: int) -> Deferred:
+        """ Fires in the reactor thread with the set of addresses of the
+        host. Never fails; an empty set is returned for the hosts which
+        could not be resolved yet """
+        try:
+            # IP addresses do not need a lookup
+            return succeed({(str(ipaddress.ip_address(host)), port)})
+        except ValueError:
+            pass
+
+        key = (host, port)
+        cached = self._cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return succeed(set(cached[1]))
+
+        deferred = Deferred()
+        if key in self._lookups:
+            self._lookups[key].append(deferred)
+        else:
+            self._lookups[key] = [deferred]
+            self._lookup(host, port)
+        return deferred
+
+    def _lookup(self, host: str, port: int) -> None:
+        from twisted.internet import reactor
+
+        self.start()
+        deferred = deferToThreadPool(reactor, self._pool,
+                                     self._getaddrinfo, host, port)
+        deferred.addCallbacks(
+            partial(self._resolved, host, port),
+            partial(self._failed, host, port),
+        )
+
+    def _resolved(self, host: str, port: int, addrinfo: List) -> None:
+        addresses = {info[4][:2] for info in addrinfo}
+        self._cache[(host, port)] = (time.monotonic() + self.ttl, addresses)
+        self._finish(host, port, addresses)
+
+    def _failed(self, host: str, port: int, failure: Failure) -> None:
+        logger.error(
+            "Can't resolve %s:%s. %s",
+            host,
+            port,
+            failure.getErrorMessage(),
+        )
+        _, addresses = self._cache.get((host, port), (None, set()))
+        if addresses:
+            logger.info("Using the last known addresses of %s:%s",
+                        host, port)
+        self._finish(host, port, addresses)
+
+    def _finish(self, host: str, port: int, addresses: Set[Address]) -> None:
+        for deferred in self._lookups.pop((host, port), []):
+            deferred.callback(set(addresses))
@@ -0,0 +1,141 @@
+import logging
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Set
+
+from twisted.internet.defer import Deferred
+from twisted.internet.threads import deferToThreadPool
+from twisted.python.failure import Failure
+from twisted.python.threadpool import ThreadPool
+
+from golem.core.common import summarize
+
+logger = logging.getLogger(__name__)
+
+
+class CryptoPool:
+    """ Runs message serialization, encryption and signature checks
+    (golem_messages.load / dump) on a bounded pool of worker threads,
+    so that peers sending large messages do not stall the reactor thread.
+    The ECIES and ECDSA primitives release the GIL, so threads are enough
+    and keys do not have to be shipped to other processes.
+    """
+
+    # Number of the most recent timings kept for the metrics
+    LATENCY_SAMPLES = 1000
+
+    def __init__(self,
+                 workers: int = 2,
+                 max_queue: int = 256,
+                 max_pending_per_connection: int = 32) -> None:
+        """
+        :param workers: number of crypto worker threads
+        :param max_queue: number of queued jobs after which connections
+            stop reading from their sockets
+        :param max_pending_per_connection: number of not yet delivered
+            messages after which a single connection stops reading
+        """
+        self.workers = max(1, workers)
+        self.max_queue = max_queue
+        self.max_pending_per_connection = max_pending_per_connection
+
+        self._pool = ThreadPool(minthreads=1, maxthreads=self.workers,
+                                name='CryptoPool')
+        self._shutdown_trigger = None
+        self._queued = 0
+        self._max_queued = 0
+        self._processed = 0
+        self._failed = 0
+        self._latencies: Deque[float] = deque(maxlen=self.LATENCY_SAMPLES)
+        self._waits: Deque[float] = deque(maxlen=self.LATENCY_SAMPLES)
+        self._waiting: Set[Callable[[], None]] = set()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queued
+
+    @property
+    def saturated(self) -> bool:
+        return self._queued >= self.max_queue
+
+    @property
+    def drained(self) -> bool:
+        return self._queued <= self.max_queue // 2
+
+    def start(self) -> None:
+        from twisted.internet import reactor
+
+        if self._pool.started:
+            return
+        self._pool.start()
+        self._shutdown_trigger = reactor.addSystemEventTrigger(
+            'during', 'shutdown', self.stop)
+
+    def stop(self) -> None:
+        from twisted.internet import reactor
+
+        if self._shutdown_trigger:
+            reactor.removeSystemEventTrigger(self._shutdown_trigger)
+            self._shutdown_trigger = None
+        if self._pool.started:
+            self._pool.stop()
+        self._waiting.clear()
+
+    def run(self, fn: Callable, *args, **kwargs) -> Deferred:
+        """ Call fn(*args, **kwargs) in a worker thread. The result is
+        delivered in the reactor thread """
+        from twisted.internet import reactor
+
+        self._queued += 1
+        self._max_queued = max(self._max_queued, self._queued)
+        enqueued = time.monotonic()
+        timing = []
+
+        def timed():
+            started = time.monotonic()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                timing.extend((started, time.monotonic()))
+
+        def done(result):
+            self._queued -= 1
+            if timing:
+                started, finished = timing
+                self._waits.append(started - enqueued)
+                self._latencies.append(finished - started)
+            if isinstance(result, Failure):
+                self._failed += 1
+            else:
+                self._processed += 1
+            if self._waiting and self.drained:
+                self._wake()
+            return result
+
+        deferred = deferToThreadPool(reactor, self._pool, timed)
+        deferred.addBoth(done)
+        return deferred
+
+    def wait_for_capacity(self, callback: Callable[[], None]) -> None:
+        """ Call back once the queue has drained below the low watermark """
+        self._waiting.add(callback)
+
+    def forget(self, callback: Callable[[], None]) -> None:
+        self._waiting.discard(callback)
+
+    def get_stats(self) -> Dict:
+        return {
+            'workers': self.workers,
+            'queue_depth': self._queued,
+            'max_queue_depth': self._max_queued,
+            'paused_connections': len(self._waiting),
+            'processed': self._processed,
+            'failed': self._failed,
+            'latency': summarize(self._latencies),
+            'queue_wait': summarize(self._waits),
+        }
+
+    def _wake(self) -> None:
+        waiting, self._waiting = self._waiting, set()
+        for callback in waiting:
+            callback()
@@ -1,3 +1,4 @@
+import collections
 import datetime
 import logging
 import threading
@@ -19,44 +20,145 @@ if typing.TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 READ_LOCK = threading.Lock()
 
+# Rows read from the database at once when draining a queue
+BATCH_SIZE = 100
+# Rows per INSERT statement, stays below SQLite's limit of bound variables
+INSERT_BATCH_SIZE = 100
+# Deserialized messages kept for the ones that were not acknowledged
+CACHE_SIZE = 1000
+
+# row id -> (created_date, message), the oldest entries first
+_cache: collections.OrderedDict = collections.OrderedDict()
+_draining: typing.Set[str] = set()
+
 
 def put(node_id: str, msg: 'message.base.Base') -> None:
     db_model = model.QueuedMessage.from_message(node_id, msg)
     db_model.save()
 
 
+def put_many(node_id: str,
+             msgs: typing.Iterable['message.base.Base']) -> None:
+    """Queue messages for a node in as few INSERT statements as possible"""
+    now = datetime.datetime.now()
+    rows = []
+    for msg in msgs:
+        db_model = model.QueuedMessage.from_message(node_id, msg)
+        rows.append({
+            model.QueuedMessage.node: db_model.node,
+            model.QueuedMessage.msg_version: db_model.msg_version,
+            model.QueuedMessage.msg_cls: db_model.msg_cls,
+            model.QueuedMessage.msg_data: db_model.msg_data,
+            model.QueuedMessage.created_date: now,
+            model.QueuedMessage.modified_date: now,
+        })
+    if not rows:
+        return
+    with model.db.atomic():
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            model.QueuedMessage.insert_many(
+                rows[start:start + INSERT_BATCH_SIZE],
+            ).execute()
+
+
 def get(node_id: str) -> typing.Iterator['message.base.Base']:
-    while True:
+    """Yield messages queued for the node, oldest first.
+
+    Messages are read in batches of BATCH_SIZE. A message is acknowledged
+    when the consumer asks for the next one and acknowledged messages are
+    deleted with a single statement per batch, so messages left over by
+    an interrupted send stay in the queue.
+    """
+    with READ_LOCK:
+        if node_id in _draining:
+            logger.debug('Queue is already being drained. node_id=%r',
+                         node_id)
+            return
+        _draining.add(node_id)
+
+    acked: typing.List[int] = []
+    cursor = None
+    try:
+        while True:
+            with READ_LOCK:
+                _ack(acked)
+                db_models = _fetch(node_id, cursor)
+                if not db_models:
+                    return
+                cursor = (db_models[-1].created_date, db_models[-1].id)
+                batch = [(db_model.id, _load(db_model))
+                         for db_model in db_models]
+
+            for row_id, msg in batch:
+                if msg is not None:
+                    yield msg
+                acked.append(row_id)
+    finally:
         with READ_LOCK:
-            try:
-                db_model = model.QueuedMessage.select()\
-                .where(
-                    model.QueuedMessage.node == node_id,
-                ).order_by(model.QueuedMessage.created_date).get()
-            except model.QueuedMessage.DoesNotExist:
-                return
-            try:
-                msg = db_model.as_message()
-            except msg_exceptions.VersionMismatchError:
-                logger.info(
-                    'Dropping message with mismatched GM version.'
-                    ' db_model=%s, gm_version=%s, msg=%s',
-                    db_model,
-                    golem_messages.__version__,
-                    db_model.msg_data,
-                )
-                continue
-            except msg_exceptions.MessageError:
-                logger.info(
-                    'Invalid message in queue.'
-                    ' db_model=%s',
-                    db_model,
-                    exc_info=True,
-                )
-                continue
-            finally:
-                db_model.delete_instance()
-        yield msg
+            _ack(acked)
+            _draining.discard(node_id)
+
+
+def _fetch(node_id: str, cursor) -> typing.List[model.QueuedMessage]:
+    query = model.QueuedMessage.select().where(
+        model.QueuedMessage.node == node_id,
+    )
+    if cursor is not None:
+        created_date, row_id = cursor
+        query = query.where(
+            (model.QueuedMessage.created_date > created_date) | (
+                (model.QueuedMessage.created_date == created_date) &
+                (model.QueuedMessage.id > row_id)
+            ),
+        )
+    return list(query.order_by(
+        model.QueuedMessage.created_date,
+        model.QueuedMessage.id,
+    ).limit(BATCH_SIZE))
+
+
+def _load(
+        db_model: model.QueuedMessage,
+) -> typing.Optional['message.base.Base']:
+    created_date, msg = _cache.pop(db_model.id, (None, None))
+    if msg is not None and created_date == db_model.created_date:
+        msg = model.QueuedMessage.refresh_message(msg)
+    else:
+        try:
+            msg = db_model.as_message()
+        except msg_exceptions.VersionMismatchError:
+            logger.info(
+                'Dropping message with mismatched GM version.'
+                ' db_model=%s, gm_version=%s, msg=%s',
+                db_model,
+                golem_messages.__version__,
+                db_model.msg_data,
+            )
+            return None
+        except msg_exceptions.MessageError:
+            logger.info(
+                'Invalid message in queue.'
+                ' db_model=%s',
+                db_model,
+                exc_info=True,
+            )
+            return None
+
+    _cache[db_model.id] = (db_model.created_date, msg)
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return msg
+
+
+def _ack(row_ids: typing.List[int]) -> None:
+    if not row_ids:
+        return
+    model.QueuedMessage.delete().where(
+        model.QueuedMessage.id.in_(row_ids),
+    ).execute()
+    for row_id in row_ids:
+        _cache.pop(row_id, None)
+    row_ids.clear()
 
 
 def waiting() -> typing.Iterator[str]:
@@ -75,5 +177,6 @@ def sweep() -> None:
         count = model.QueuedMessage.delete().where(
             model.QueuedMessage.created_date < oldest_allowed,
         ).execute()
+        _cache.clear()
     if count:
         logger.info('Sweeped ancient messages from queue. count=%d', count)
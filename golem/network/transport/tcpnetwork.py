@@ -1,18 +1,24 @@
+import copy
 import logging
 import struct
 import time
+from collections import deque
+from typing import Deque, List, Optional, Set
 
 import golem_messages
 from golem_messages import message
-from twisted.internet.defer import maybeDeferred
+from twisted.internet.defer import Deferred, maybeDeferred
 from twisted.internet.endpoints import TCP4ServerEndpoint, \
     TCP4ClientEndpoint, TCP6ServerEndpoint, TCP6ClientEndpoint, \
     HostnameEndpoint
+from twisted.internet.interfaces import IDelayedCall
 from twisted.internet.protocol import connectionDone
+from twisted.python.failure import Failure
 
 from golem.core.databuffer import DataBuffer
 from golem.core.hostaddress import get_host_addresses
 from golem.network.transport.limiter import CallRateLimiter
+from .cryptopool import CryptoPool
 from .network import Network, SessionProtocol, IncomingProtocolFactoryWrapper, \
     OutgoingProtocolFactoryWrapper
 from .spamprotector import SpamProtector
@@ -33,6 +39,10 @@ MAX_MESSAGE_SIZE = 2 * 1024 * 1024
 
 class TCPNetwork(Network):
 
+    # Delay after which the next address of a peer is dialled while
+    # the previous attempts are still in progress (RFC 8305)
+    CONNECTION_ATTEMPT_DELAY = 0.25
+
     def __init__(self, protocol_factory, use_ipv6=False, timeout=5,
                  limit_connection_rate=False):
         """
@@ -133,68 +143,83 @@ class TCPNetwork(Network):
 
         if self.rate_limiter:
             self.rate_limiter.call(self.__try_to_connect_to_address,
-                                   connect_info)
+                                   connect_info, addresses)
         else:
-            self.__try_to_connect_to_address(connect_info)
+            self.__try_to_connect_to_address(connect_info, addresses)
+
+    def __try_to_connect_to_address(self, connect_info: TCPConnectInfo,
+                                    addresses: List[SocketAddress]):
+        """ Dial the addresses one after another, each one
+        CONNECTION_ATTEMPT_DELAY after the previous one or as soon as the
+        previous one fails. The first connection established wins and
+        the remaining attempts are cancelled """
+        self.__dial_next(ConnectionRace(connect_info, addresses))
+
+    def __dial_next(self, race: 'ConnectionRace'):
+        race.cancel_timer()
+        if race.won:
+            return
+
+        if not race.addresses:
+            if not race.attempts:
+                TCPNetwork.__call_failure_callback(
+                    race.connect_info.failure_callback)
+            return
 
-    def __try_to_connect_to_address(self, connect_info: TCPConnectInfo):
-        address = connect_info.socket_addresses[0].address
-        port = connect_info.socket_addresses[0].port
+        defer = self.__dial(race.addresses.popleft())
+        race.attempts.add(defer)
+        defer.addCallbacks(
+            self.__attempt_established, self.__attempt_failure,
+            callbackArgs=(race, defer), errbackArgs=(race, defer))
+
+        # The attempt may have failed already and dialled the next address
+        if race.addresses and not race.timer and not race.won:
+            race.timer = self.reactor.callLater(
+                self.CONNECTION_ATTEMPT_DELAY, self.__dial_next, race)
+
+    def __dial(self, socket_address: SocketAddress):
+        address = socket_address.address
+        port = socket_address.port
 
         logger.debug("Connection to host %r: %r", address, port)
 
-        use_ipv6 = connect_info.socket_addresses[0].ipv6
-        use_hostname = connect_info.socket_addresses[0].hostname
-        if use_ipv6:
+        if socket_address.ipv6:
             endpoint = TCP6ClientEndpoint(self.reactor, address, port,
                                           self.timeout)
-        elif use_hostname:
+        elif socket_address.hostname:
             endpoint = HostnameEndpoint(self.reactor, address, port,
                                         self.timeout)
         else:
             endpoint = TCP4ClientEndpoint(self.reactor, address, port,
                                           self.timeout)
 
-        defer = endpoint.connect(self.outgoing_protocol_factory)
+        return endpoint.connect(self.outgoing_protocol_factory)
 
-        defer.addCallback(self.__connection_established,
-                          self.__connection_to_address_established,
-                          connect_info)
-        defer.addErrback(self.__connection_failure,
-                         self.__connection_to_address_failure,
-                         connect_info)
+    def __attempt_established(self, conn, race: 'ConnectionRace', defer):
+        race.attempts.discard(defer)
+        if race.won:
+            # Connected before the attempt could be cancelled
+            conn.transport.loseConnection()
+            return
+
+        race.won = True
+        race.cancel_timer()
+        for attempt in list(race.attempts):
+            attempt.cancel()
 
-    @staticmethod
-    def __connection_established(conn, established_callback,
-                                 connect_info: TCPConnectInfo):
         pp = conn.transport.getPeer()
         logger.debug("Connection established %r %r", pp.host, pp.port)
         TCPNetwork.__call_established_callback(
-            established_callback,
+            race.connect_info.established_callback,
             conn.session,
-            connect_info,
         )
 
-    @staticmethod
-    def __connection_failure(err_desc, failure_callback,
-                             connect_info: TCPConnectInfo):
+    def __attempt_failure(self, err_desc, race: 'ConnectionRace', defer):
+        race.attempts.discard(defer)
+        if race.won:
+            return
         logger.debug("Connection failure. %r", err_desc)
-        TCPNetwork.__call_failure_callback(failure_callback, connect_info)
-
-    @staticmethod
-    def __connection_to_address_established(conn,
-                                            connect_info: TCPConnectInfo):
-        TCPNetwork.__call_established_callback(
-            connect_info.established_callback,
-            conn,
-        )
-
-    def __connection_to_address_failure(self, connect_info: TCPConnectInfo):
-        if len(connect_info.socket_addresses) > 1:
-            connect_info.socket_addresses.pop(0)
-            self.__try_to_connect_to_addresses(connect_info)
-        else:
-            TCPNetwork.__call_failure_callback(connect_info.failure_callback)
+        self.__dial_next(race)
 
     def __try_to_listen_on_port(self, listen_info: TCPListenInfo):
         if self.use_ipv6:
@@ -258,6 +283,24 @@ class TCPNetwork(Network):
         logger.error("Can't stop listening %r", fail)
         TCPNetwork.__call_failure_callback(errback)
 
+
+class ConnectionRace:
+    """ Attempts to connect to one of the addresses of a peer """
+
+    def __init__(self, connect_info: TCPConnectInfo,
+                 addresses: List[SocketAddress]) -> None:
+        self.connect_info = connect_info
+        self.addresses: Deque[SocketAddress] = deque(addresses)
+        self.attempts: Set[Deferred] = set()
+        self.timer: Optional[IDelayedCall] = None
+        self.won = False
+
+    def cancel_timer(self) -> None:
+        if self.timer and self.timer.active():
+            self.timer.cancel()
+        self.timer = None
+
+
 #############
 # Protocols #
 #############
@@ -362,6 +405,22 @@ class BasicProtocol(SessionProtocol):
     def _data_to_messages(self):
         messages = []
 
+        for data in self._received_frames():
+            try:
+                msg = self._load_message(data)
+            except (golem_messages.exceptions.HeaderError,
+                    golem_messages.exceptions.VersionMismatchError,
+                    golem_messages.exceptions.MessageError) as e:
+                if not self._handle_message_error(e, data):
+                    return []
+                continue
+
+            messages.append(msg)
+
+        return messages
+
+    def _received_frames(self):
+        """ Yield complete frames which pass the size and spam checks """
         for data in self.db.get_len_prefixed_bytes():
             if len(data) > MAX_MESSAGE_SIZE:
                 logger.info(
@@ -374,46 +433,51 @@ class BasicProtocol(SessionProtocol):
             try:
                 if not self.spam_protector.check_msg(data):
                     continue
-                msg = self._load_message(data)
-            except golem_messages.exceptions.HeaderError as e:
-                logger.debug(
-                    "Invalid message header: %s from %s. Ignoring.",
-                    e,
-                    self.transport.getPeer(),
-                )
-                continue
-            except golem_messages.exceptions.VersionMismatchError as e:
-                logger.debug(
-                    "Message version mismatch: %s from %s. Closing.",
-                    e,
-                    self.transport.getPeer(),
-                )
-                msg = message.base.Disconnect(
-                    reason=message.base.Disconnect.REASON.ProtocolVersion,
-                )
-                self.send_message(msg)
-                self.close()
-                return []
-            except golem_messages.exceptions.MessageError as e:
-                logger.debug(
-                    "Failed to deserialize message: %(e)s from %(peer)s."
-                    " data=%(data)r",
-                    {
-                        'e': e,
-                        'peer': self.transport.getPeer(),
-                        'data': data,
-                    },
-                )
-                logger.debug(
-                    "BasicProtocol._data_to_messages() failed %r",
-                    data,
-                    exc_info=True,
-                )
+            except (golem_messages.exceptions.HeaderError,
+                    golem_messages.exceptions.VersionMismatchError,
+                    golem_messages.exceptions.MessageError) as e:
+                if not self._handle_message_error(e, data):
+                    return
                 continue
 
-            messages.append(msg)
+            yield data
 
-        return messages
+    def _handle_message_error(self, e, data) -> bool:
+        """ :return bool: False if the connection is being closed """
+        if isinstance(e, golem_messages.exceptions.HeaderError):
+            logger.debug(
+                "Invalid message header: %s from %s. Ignoring.",
+                e,
+                self.transport.getPeer(),
+            )
+            return True
+        if isinstance(e, golem_messages.exceptions.VersionMismatchError):
+            logger.debug(
+                "Message version mismatch: %s from %s. Closing.",
+                e,
+                self.transport.getPeer(),
+            )
+            msg = message.base.Disconnect(
+                reason=message.base.Disconnect.REASON.ProtocolVersion,
+            )
+            self.send_message(msg)
+            self.close()
+            return False
+        logger.debug(
+            "Failed to deserialize message: %(e)s from %(peer)s."
+            " data=%(data)r",
+            {
+                'e': e,
+                'peer': self.transport.getPeer(),
+                'data': data,
+            },
+        )
+        logger.debug(
+            "BasicProtocol._data_to_messages() failed %r",
+            data,
+            exc_info=e,
+        )
+        return True
 
 
 class ServerProtocol(BasicProtocol):
@@ -449,9 +513,174 @@ class ServerProtocol(BasicProtocol):
 
 class SafeProtocol(ServerProtocol):
     """More advanced version of server protocol, support for serialization,
-       encryption, decryption and signing messages
+       encryption, decryption and signing messages.
+
+       If the server has a crypto pool, messages are loaded and dumped
+       in its worker threads and delivered in the order they were received
+       or sent. The transport stops reading when too many frames wait
+       for the pool. Until the session knows the peer's public key, which
+       comes with its Hello, frames are loaded one at a time, each after
+       the previous one has been interpreted. Messages are signed before
+       send_message returns; one which the pool fails to dump is logged
+       and not sent.
     """
 
+    def __init__(self, server):
+        super().__init__(server)
+        pool = getattr(server, 'crypto_pool', None)
+        self.crypto_pool = pool if isinstance(pool, CryptoPool) else None
+        # Received frames not yet handed to the pool
+        self._frames: Deque[bytes] = deque()
+        # [done, result] entries kept in the wire order
+        self._incoming: Deque[List] = deque()
+        self._outgoing: Deque[List] = deque()
+        self._paused = False
+        self._close_when_sent = False
+
+    def send_message(self, msg):
+        if self.crypto_pool is None:
+            return super().send_message(msg)
+
+        if not self.opened:
+            logger.warning("Send message %s failed - connection closed", msg)
+            return False
+        if self.session is None:
+            logger.error("Wrong session, not sending message")
+            return False
+
+        logger.debug(
+            'Sending: %r, using session: %r', msg.__class__, self.session)
+        # Callers keep using the message, so it is signed here and the pool
+        # only serializes and encrypts a copy of it. Signing serializes the
+        # payload, so a message which can't be serialized fails right away.
+        try:
+            msg.sign_message(self.session.my_private_key)
+        except golem_messages.exceptions.SerializationError:
+            logger.exception('Cannot serialize message: %s', msg)
+            raise
+
+        entry = [False, None]
+        self._outgoing.append(entry)
+        deferred = self.crypto_pool.run(
+            golem_messages.dump,
+            copy.copy(msg),
+            None,
+            self.session.theirs_public_key,
+        )
+        deferred.addBoth(self._message_dumped, entry, msg)
+        return True
+
+    def close(self):
+        if self._outgoing:
+            # Disconnect messages are usually sent right before closing
+            self._close_when_sent = True
+            return
+        super().close()
+
+    def connectionLost(self, reason=connectionDone):
+        self._frames.clear()
+        self._incoming.clear()
+        self._outgoing.clear()
+        if self.crypto_pool is not None:
+            self.crypto_pool.forget(self._apply_backpressure)
+        super().connectionLost(reason)
+
+    def _interpret(self, data):
+        if self.crypto_pool is None:
+            super()._interpret(data)
+            return
+
+        self.session.last_message_time = time.time()
+        self.db.append_bytes(data)
+        self._frames.extend(self._received_frames())
+        self._load_frames()
+        self._apply_backpressure()
+
+    def _load_frames(self):
+        """ Hand the received frames to the pool. The key of a frame is
+        picked when it is handed over, so without the peer's key only one
+        frame is loaded at a time """
+        while self._frames:
+            session = getattr(self, 'session', None)
+            if not self.opened or session is None:
+                self._frames.clear()
+                return
+            if session.theirs_public_key is None and self._incoming:
+                return
+            frame = self._frames.popleft()
+            entry = [False, None]
+            self._incoming.append(entry)
+            deferred = self.crypto_pool.run(
+                golem_messages.load,
+                frame,
+                session.my_private_key,
+                session.theirs_public_key,
+            )
+            deferred.addBoth(self._message_loaded, entry, frame)
+
+    def _message_loaded(self, result, entry, frame):
+        entry[0] = True
+        if not isinstance(result, Failure):
+            logger.debug('SafeProtocol._load_message(): received %r', result)
+            entry[1] = result
+        elif result.check(golem_messages.exceptions.HeaderError,
+                          golem_messages.exceptions.VersionMismatchError,
+                          golem_messages.exceptions.MessageError):
+            if not self._handle_message_error(result.value, frame):
+                self._frames.clear()
+                self._incoming.clear()
+                return None
+        else:
+            logger.error("Cannot load message from %r: %s",
+                         self.transport.getPeer(), result.getTraceback())
+
+        while self._incoming and self._incoming[0][0]:
+            _, msg = self._incoming.popleft()
+            session = getattr(self, 'session', None)
+            if msg is not None and self.opened and session:
+                session.interpret(msg)
+        self._load_frames()
+        self._apply_backpressure()
+        return None
+
+    def _message_dumped(self, result, entry, msg):
+        entry[0] = True
+        if isinstance(result, Failure):
+            logger.error('Cannot serialize message: %s: %s',
+                         msg, result.getTraceback())
+        else:
+            entry[1] = struct.pack("!L", len(result)) + result
+
+        while self._outgoing and self._outgoing[0][0]:
+            _, data = self._outgoing.popleft()
+            if data is not None and self.transport:
+                self.transport.write(data)
+        if self._close_when_sent and not self._outgoing:
+            self._close_when_sent = False
+            super().close()
+        return None
+
+    def _apply_backpressure(self):
+        """ Stop reading from the socket when this connection or the whole
+        pool has too many frames in flight, resume past the low watermarks
+        """
+        if not self.opened:
+            return
+
+        pool = self.crypto_pool
+        pending = len(self._frames) + len(self._incoming)
+        if not self._paused:
+            if pending >= pool.max_pending_per_connection or pool.saturated:
+                self._paused = True
+                self.transport.pauseProducing()
+        elif pending <= pool.max_pending_per_connection // 2 \
+                and pool.drained:
+            self._paused = False
+            self.transport.resumeProducing()
+
+        if self._paused and not pool.drained:
+            pool.wait_for_capacity(self._apply_backpressure)
+
     def _prepare_msg_to_send(self, msg):
         logger.debug('SafeProtocol._prepare_msg_to_send(%r)', msg)
         if self.session is None:
@@ -1,14 +1,20 @@
+import heapq
+import itertools
 import logging
+import random
 import time
-from typing import Callable, Dict, List, Optional, Set
+from collections import deque
+from functools import partial
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
 
 from golem.clientconfigdescriptor import ClientConfigDescriptor
-from golem.core.common import node_info_str
+from golem.core.common import node_info_str, summarize
 from golem.core.types import Kwargs
 from golem.core.hostaddress import ip_address_private, ip_network_contains, \
     ipv4_networks
 from golem.core.variables import MAX_CONNECT_SOCKET_ADDRESSES
 
+from .cryptopool import CryptoPool
 from .session import BasicSession
 from .tcpnetwork import TCPNetwork, TCPListeningInfo, TCPListenInfo, \
     SocketAddress, TCPConnectInfo
@@ -33,6 +39,8 @@ class TCPServer:
         self.cur_port = 0  # current listening port
         self.use_ipv6 = config_desc.use_ipv6 if config_desc else False
         self.ipv4_networks = ipv4_networks()
+        # Shared by the SafeProtocol connections when set
+        self.crypto_pool: Optional[CryptoPool] = None
 
     def change_config(self, config_desc: ClientConfigDescriptor):
         """ Change configuration descriptor. If listening port is changed, than stop listening on old port and start
@@ -99,7 +107,26 @@ class TCPServer:
 
 class PendingConnectionsServer(TCPServer):
     """ TCP Server that keeps a list of pending connections and tries different methods
-    if connection attempt is unsuccessful."""
+    if connection attempt is unsuccessful.
+
+    Connections are dialled in the order of their next attempt time, at most
+    MAX_CONCURRENT_DIALS at once. A node which failed to connect is not
+    dialled again until its backoff, doubled with every failure and
+    jittered, has passed."""
+
+    # Connections being dialled at the same time
+    MAX_CONCURRENT_DIALS = 32
+    # Seconds after which a dial which did not report back frees its slot
+    DIAL_TIMEOUT = 60.0
+    # Failed dials after which a pending connection is given up
+    MAX_DIAL_ATTEMPTS = 3
+    # Backoff of a node after its first failed dial, and the longest one
+    BACKOFF_BASE = 5.0
+    BACKOFF_MAX = 600.0
+    # Number of failing nodes after which the expired backoffs are dropped
+    MAX_BACKOFF_NODES = 10000
+    # Number of the most recent dials kept for the metrics
+    STATS_WINDOW = 1000
 
     def __init__(self,
                  config_desc: ClientConfigDescriptor,
@@ -120,6 +147,17 @@ class PendingConnectionsServer(TCPServer):
         #  Reactions for final connection attempts failure
         self.conn_final_failure_for_type: Dict[int, Callable] = {}
 
+        # Dial scheduler
+        #  A min-heap of (next attempt time, sequence number, connection id)
+        self._dial_schedule: List[Tuple[float, int, str]] = []
+        self._dial_sequence = itertools.count()
+        #  Connection id -> (dial start time, node key)
+        self._dialing: Dict[str, Tuple[float, str]] = {}
+        #  Node key -> (failed dials in a row, time of the next dial)
+        self._backoff: Dict[str, Tuple[int, float]] = {}
+        self._dial_latencies: Deque[float] = deque(maxlen=self.STATS_WINDOW)
+        self._dial_results: Deque[bool] = deque(maxlen=self.STATS_WINDOW)
+
         # Set reactions
         self._set_conn_established()
         self._set_conn_failure()
@@ -172,11 +210,17 @@ class PendingConnectionsServer(TCPServer):
 
         pc = PendingConnection(request_type,
                                sockets,
-                               self.conn_established_for_type[request_type],
-                               self.conn_failure_for_type[request_type],
+                               partial(self._dial_established,
+                                       self.conn_established_for_type[
+                                           request_type]),
+                               partial(self._dial_failure,
+                                       self.conn_failure_for_type[
+                                           request_type]),
                                self.conn_final_failure_for_type[request_type],
-                               args)
+                               args,
+                               node_key=node.key)
         self.pending_connections[pc.id] = pc
+        self._schedule(pc, time.monotonic())
         return True
 
     def _is_address_accessible(self, socket_addr):
@@ -206,18 +250,134 @@ class PendingConnectionsServer(TCPServer):
         return any(ip_network_contains(net, mask, addr) for net, mask in networks)
 
     def _sync_pending(self):
-        conns = [pen for pen in list(self.pending_connections.values()) if
-                 pen.status in PendingConnection.connect_statuses]
-
-        for conn in conns:
-            if len(conn.socket_addresses) == 0:
-                conn.status = PenConnStatus.WaitingAlt
-                conn.failure()
-                # TODO Implement proper way to deal with failures. Issue #2412
-            else:
-                conn.status = PenConnStatus.Waiting
-                conn.last_try_time = time.time()
-                self.network.connect(conn.connect_info)
+        """ Dial the connections which are due, as long as there are free
+        dial slots """
+        now = time.monotonic()
+        if len(self._dialing) >= self.MAX_CONCURRENT_DIALS:
+            self._expire_dials(now)
+
+        while self._dial_schedule \
+                and len(self._dialing) < self.MAX_CONCURRENT_DIALS:
+            next_attempt, _, conn_id = self._dial_schedule[0]
+            if next_attempt > now:
+                break
+            heapq.heappop(self._dial_schedule)
+
+            conn = self.pending_connections.get(conn_id)
+            # Entries of removed or rescheduled connections are left
+            # in the heap and skipped here
+            if conn is None or conn.next_attempt != next_attempt \
+                    or conn.status not in PendingConnection.connect_statuses:
+                continue
+
+            retry_time = self._node_retry_time(conn.node_key)
+            if retry_time > now:
+                self._schedule(conn, retry_time)
+                continue
+
+            self._dial(conn, now)
+
+    def _dial(self, conn: 'PendingConnection', now: float):
+        if len(conn.socket_addresses) == 0:
+            conn.status = PenConnStatus.WaitingAlt
+            conn.failure()
+            # TODO Implement proper way to deal with failures. Issue #2412
+            return
+
+        conn.status = PenConnStatus.Waiting
+        conn.last_try_time = time.time()
+        conn.attempts += 1
+        self._dialing[conn.id] = (now, conn.node_key)
+        self.network.connect(conn.connect_info)
+
+    def _schedule(self, conn: 'PendingConnection', next_attempt: float):
+        conn.next_attempt = next_attempt
+        heapq.heappush(self._dial_schedule,
+                       (next_attempt, next(self._dial_sequence), conn.id))
+
+    def _dial_established(self, established: Callable, *args,
+                          conn_id: str, **kwargs):
+        self._dial_finished(conn_id, success=True)
+        return established(*args, conn_id=conn_id, **kwargs)
+
+    def _dial_failure(self, failure: Callable, *args, conn_id: str, **kwargs):
+        dialled = self._dial_finished(conn_id, success=False)
+        result = failure(*args, conn_id=conn_id, **kwargs)
+        if dialled:
+            self._retry(conn_id)
+        return result
+
+    def _dial_finished(self, conn_id: str, success: bool) -> bool:
+        """ Record the outcome of a dial. Returns False if the connection
+        was not being dialled """
+        try:
+            started, node_key = self._dialing.pop(conn_id)
+        except KeyError:
+            return False
+
+        now = time.monotonic()
+        self._dial_results.append(success)
+        if success:
+            self._dial_latencies.append(now - started)
+            self._backoff.pop(node_key, None)
+            return True
+
+        failures, retry_time = self._backoff.get(node_key, (0, now))
+        if now - retry_time > self.BACKOFF_MAX:
+            # The node has not failed for a long time
+            failures = 0
+        failures += 1
+        delay = min(self.BACKOFF_MAX, self.BACKOFF_BASE * 2 ** (failures - 1))
+        self._backoff[node_key] = \
+            (failures, now + random.uniform(delay / 2, delay))
+        if len(self._backoff) > self.MAX_BACKOFF_NODES:
+            self._forget_backoffs(now)
+
+        conn = self.pending_connections.get(conn_id)
+        if conn and conn.status == PenConnStatus.Waiting:
+            conn.status = PenConnStatus.Failure
+        return True
+
+    def _retry(self, conn_id: str):
+        """ Schedule the next dial, unless the failure callback decided
+        otherwise or there were too many attempts """
+        conn = self.pending_connections.get(conn_id)
+        if conn is None or conn.status != PenConnStatus.Failure:
+            return
+        if conn.attempts >= self.MAX_DIAL_ATTEMPTS:
+            self.final_conn_failure(conn_id)
+            return
+        self._schedule(conn, self._node_retry_time(conn.node_key))
+
+    def _node_retry_time(self, node_key: str) -> float:
+        _, retry_time = self._backoff.get(node_key, (0, 0.))
+        return retry_time
+
+    def _expire_dials(self, now: float):
+        for conn_id, (started, _) in list(self._dialing.items()):
+            if now - started > self.DIAL_TIMEOUT:
+                logger.debug("Dial timed out. conn_id=%s", conn_id)
+                del self._dialing[conn_id]
+
+    def _forget_backoffs(self, now: float):
+        self._backoff = {
+            node_key: (failures, retry_time)
+            for node_key, (failures, retry_time) in self._backoff.items()
+            if now - retry_time <= self.BACKOFF_MAX
+        }
+
+    def get_dial_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        results = self._dial_results
+        return {
+            'scheduled': len(self._dial_schedule),
+            'dialing': len(self._dialing),
+            'backing_off': sum(1 for _, retry_time in self._backoff.values()
+                               if retry_time > now),
+            'dials': len(results),
+            'success_rate': sum(results) / len(results) if results else 0.0,
+            'latency': summarize(self._dial_latencies),
+        }
 
     def get_socket_addresses(self, node_info, prv_port=None, pub_port=None):
         addresses = []
@@ -309,7 +469,8 @@ class PendingConnection:
                  established: Optional[Callable] = None,
                  failure: Optional[Callable] = None,
                  final_failure: Optional[Callable] = None,
-                 kwargs: Kwargs = {}) -> None:
+                 kwargs: Kwargs = {},
+                 node_key: Optional[str] = None) -> None:
         """ Create new pending connection
         :param type_: connection type that allows to select proper reactions
         :param socket_addresses: list of socket_addresses that the node should
@@ -318,12 +479,17 @@ class PendingConnection:
         :param failure: connection errback
         :param kwargs: arguments that should be passed to established or
                        failure function
+        :param node_key: key of the node, which shares its dial backoff
+                         with the other connections to the node
         """
         self.connect_info = TCPConnectInfo(socket_addresses, established,
                                            failure, final_failure, kwargs)
         self.last_try_time = time.time()
         self.type = type_
         self.status = PenConnStatus.Inactive
+        self.node_key = node_key or self.connect_info.id
+        self.attempts = 0
+        self.next_attempt = 0.
 
     @property
     def id(self):
@@ -0,0 +1,225 @@
+import abc
+import logging
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from golem.ranking.helper.trust_const import MAX_TRUST, MIN_TRUST
+
+logger = logging.getLogger(__name__)
+
+COMPUTING = 0
+REQUESTING = 1
+
+
+class NodeIndex:
+    """ Dense node id -> row mapping shared by the vectors of a gossip
+    stage """
+
+    def __init__(self) -> None:
+        self.node_ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def get(self, node_id: str) -> int:
+        return self._rows.get(node_id, -1)
+
+    def row(self, node_id: str) -> int:
+        row = self._rows.get(node_id)
+        if row is None:
+            row = self._rows[node_id] = len(self.node_ids)
+            self.node_ids.append(node_id)
+        return row
+
+    def rows(self, node_ids: Sequence[str]) -> np.ndarray:
+        get = self._rows.get
+        rows = [get(node_id, -1) for node_id in node_ids]
+        if -1 in rows:
+            rows = [self.row(node_id) for node_id in node_ids]
+        return np.array(rows, dtype=np.intp)
+
+
+class _IndexedVector(abc.ABC):
+
+    def __init__(self, index: NodeIndex) -> None:
+        self.index = index
+        self.present = np.zeros(0, dtype=bool)
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.present[:len(self.index)]))
+
+    def __contains__(self, node_id) -> bool:
+        row = self.index.get(node_id)
+        return 0 <= row < len(self.present) and bool(self.present[row])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __getitem__(self, node_id):
+        if node_id not in self:
+            raise KeyError(node_id)
+        return self._item(self.index.get(node_id))
+
+    def keys(self) -> List[str]:
+        node_ids = self.index.node_ids
+        return [node_ids[row] for row in self.rows()]
+
+    def values(self) -> list:
+        return [self._item(row) for row in self.rows()]
+
+    def items(self) -> list:
+        node_ids = self.index.node_ids
+        return [(node_ids[row], self._item(row)) for row in self.rows()]
+
+    def rows(self) -> np.ndarray:
+        return np.flatnonzero(self.present)
+
+    @abc.abstractmethod
+    def _item(self, row: int):
+        pass
+
+    def _arrays(self) -> Sequence[str]:
+        return ('present',)
+
+    def _fit(self) -> None:
+        """ Make room for all the rows of the index """
+        size = len(self.index)
+        capacity = len(self.present)
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity, 16)
+        for name in self._arrays():
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+
+class RankVector(_IndexedVector):
+    """ Gossiped (value, weight) pairs of computing and requesting trust.
+    Reads like the previous dict of [[value, weight], [value, weight]]
+    lists keyed by node id.
+    """
+
+    def __init__(self, index: NodeIndex) -> None:
+        super().__init__(index)
+        self.value = np.zeros((0, 2))
+        self.weight = np.zeros((0, 2))
+
+    def set(self, node_id: str, computing: Sequence[float],
+            requesting: Sequence[float]) -> None:
+        row = self.index.row(node_id)
+        self._fit()
+        self.value[row] = computing[0], requesting[0]
+        self.weight[row] = computing[1], requesting[1]
+        self.present[row] = True
+
+    def add_gossip(self, gossip_vec: list) -> None:
+        """ Sum [node_id, [[value, weight], [value, weight]]] entries into
+        the vector """
+        if not gossip_vec:
+            return
+        try:
+            pairs = np.array([gossip[1] for gossip in gossip_vec],
+                             dtype=float)
+            if pairs.shape[1:] != (2, 2):
+                raise ValueError(pairs.shape)
+            rows = self.index.rows([gossip[0] for gossip in gossip_vec])
+        except (TypeError, ValueError, IndexError):
+            rows, pairs = self._parse_gossip(gossip_vec)
+        if not len(rows):  # pylint: disable=len-as-condition
+            return
+
+        self._fit()
+        np.add.at(self.value, rows, pairs[:, :, 0])
+        np.add.at(self.weight, rows, pairs[:, :, 1])
+        self.present[rows] = True
+
+    def trust(self) -> np.ndarray:
+        """ Trust values of all the rows, min_max_utility.vec_to_trust """
+        trust = np.zeros_like(self.value)
+        known = (self.value != 0.) & (self.weight != 0.)
+        np.divide(self.value, self.weight, out=trust, where=known)
+        np.clip(trust, MIN_TRUST, MAX_TRUST, out=trust)
+        trust[~known] = 0.
+        return trust
+
+    def gossip(self, scale: float) -> list:
+        """ [node_id, [[value, weight], [value, weight]]] entries divided
+        by scale """
+        rows = self.rows()
+        pairs = np.stack((self.value[rows], self.weight[rows]), axis=2)
+        pairs /= scale
+        node_ids = self.index.node_ids
+        return [[node_ids[row], pair]
+                for row, pair in zip(rows.tolist(), pairs.tolist())]
+
+    def _item(self, row: int) -> List[List[float]]:
+        return [[float(self.value[row, COMPUTING]),
+                 float(self.weight[row, COMPUTING])],
+                [float(self.value[row, REQUESTING]),
+                 float(self.weight[row, REQUESTING])]]
+
+    def _arrays(self) -> Sequence[str]:
+        return ('present', 'value', 'weight')
+
+    def _parse_gossip(self, gossip_vec: list) \
+            -> Tuple[np.ndarray, np.ndarray]:
+        node_ids, pairs = [], []
+        for gossip in gossip_vec:
+            try:
+                node_id, [comp, req] = gossip
+                pair = [[float(comp[0]), float(comp[1])],
+                        [float(req[0]), float(req[1])]]
+                hash(node_id)
+            except Exception as err:  # pylint: disable=broad-except
+                logger.error("Wrong gossip {}, {}".format(gossip, err))
+                continue
+            node_ids.append(node_id)
+            pairs.append(pair)
+        return (self.index.rows(node_ids),
+                np.array(pairs, dtype=float).reshape(-1, 2, 2))
+
+
+class TrustVector(_IndexedVector):
+    """ Computing and requesting trust values keyed by node id """
+
+    def __init__(self, index: NodeIndex) -> None:
+        super().__init__(index)
+        self.trust = np.zeros((0, 2))
+
+    def set(self, node_id: str, computing: float, requesting: float) -> None:
+        row = self.index.row(node_id)
+        self._fit()
+        self.trust[row] = computing, requesting
+        self.present[row] = True
+
+    def update(self, rank_vector: RankVector) -> None:
+        """ Store trust of the nodes in the rank vector, keep the others """
+        self._fit()
+        rank_vector._fit()  # pylint: disable=protected-access
+        size = len(self.index)
+        rows = rank_vector.present[:size]
+        self.trust[:size][rows] = rank_vector.trust()[:size][rows]
+        self.present[:size] |= rows
+
+    def distance(self, rank_vector: RankVector) -> float:
+        """ Sum of trust differences over the nodes in the rank vector,
+        nodes missing here count as 0 """
+        self._fit()
+        rank_vector._fit()  # pylint: disable=protected-access
+        size = len(self.index)
+        rows = rank_vector.present[:size]
+        previous = np.where(self.present[:size, None],
+                            self.trust[:size], 0.)
+        return float(np.abs(
+            rank_vector.trust()[:size][rows] - previous[rows]).sum())
+
+    def _item(self, row: int) -> List[float]:
+        return [float(self.trust[row, COMPUTING]),
+                float(self.trust[row, REQUESTING])]
+
+    def _arrays(self) -> Sequence[str]:
+        return ('present', 'trust')
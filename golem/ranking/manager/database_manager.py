@@ -5,6 +5,7 @@ from peewee import IntegrityError
 
 from golem.model import LocalRank, GlobalRank, NeighbourLocRank, db
 from golem.ranking import ProviderEfficacy
+from golem.ranking.manager.rank_cache import RankCache
 from golem.task.taskstate import SubtaskOp
 
 logger = logging.getLogger(__name__)
@@ -13,6 +14,26 @@ logger = logging.getLogger(__name__)
 REQUESTOR_FORGETTING_FACTOR = 0.9
 PROVIDER_FORGETTING_FACTOR = 0.9
 
+# LocalRank rows (or None for unknown nodes) read on the task offer path
+local_rank_cache = RankCache()
+
+
+def _rank_cache() -> RankCache:
+    local_rank_cache.bind(db.database)
+    return local_rank_cache
+
+
+def _cached_local_rank(node_id: str, create: bool = False):
+    rank = _rank_cache().get(
+        node_id,
+        lambda: LocalRank.select().where(LocalRank.node_id == node_id).first(),
+    )
+    if rank is None and create:
+        with db.transaction():
+            rank, _ = LocalRank.get_or_create(node_id=node_id)
+        _rank_cache().put(node_id, rank)
+    return rank
+
 
 def increase_positive_computed(node_id, trust_mod):
     logger.debug('increase_positive_computed. node_id=%r, trust_mod=%r',
@@ -24,6 +45,7 @@ def increase_positive_computed(node_id, trust_mod):
         LocalRank.update(positive_computed=LocalRank.positive_computed + trust_mod,
                          modified_date=str(datetime.datetime.now())) \
             .where(LocalRank.node_id == node_id).execute()
+    _rank_cache().invalidate(node_id)
 
 
 def increase_negative_computed(node_id, trust_mod):
@@ -36,6 +58,7 @@ def increase_negative_computed(node_id, trust_mod):
         LocalRank.update(negative_computed=LocalRank.negative_computed + trust_mod,
                          modified_date=str(datetime.datetime.now())) \
             .where(LocalRank.node_id == node_id).execute()
+    _rank_cache().invalidate(node_id)
 
 
 def increase_wrong_computed(node_id, trust_mod):
@@ -48,6 +71,7 @@ def increase_wrong_computed(node_id, trust_mod):
         LocalRank.update(wrong_computed=LocalRank.wrong_computed + trust_mod,
                          modified_date=str(datetime.datetime.now())) \
             .where(LocalRank.node_id == node_id).execute()
+    _rank_cache().invalidate(node_id)
 
 
 def increase_positive_requested(node_id, trust_mod):
@@ -60,6 +84,7 @@ def increase_positive_requested(node_id, trust_mod):
         LocalRank.update(positive_requested=LocalRank.positive_requested + trust_mod,
                          modified_date=str(datetime.datetime.now())) \
             .where(LocalRank.node_id == node_id).execute()
+    _rank_cache().invalidate(node_id)
 
 
 def increase_negative_requested(node_id, trust_mod):
@@ -72,6 +97,7 @@ def increase_negative_requested(node_id, trust_mod):
         LocalRank.update(negative_requested=LocalRank.negative_requested + trust_mod,
                          modified_date=str(datetime.datetime.now())) \
             .where(LocalRank.node_id == node_id).execute()
+    _rank_cache().invalidate(node_id)
 
 
 def increase_positive_payment(node_id, trust_mod):
@@ -84,6 +110,7 @@ def increase_positive_payment(node_id, trust_mod):
         LocalRank.update(positive_payment=LocalRank.positive_payment + trust_mod,
                          modified_date=str(datetime.datetime.now())) \
             .where(LocalRank.node_id == node_id).execute()
+    _rank_cache().invalidate(node_id)
 
 
 def increase_negative_payment(node_id, trust_mod):
@@ -96,6 +123,7 @@ def increase_negative_payment(node_id, trust_mod):
         LocalRank.update(negative_payment=LocalRank.negative_payment + trust_mod,
                          modified_date=str(datetime.datetime.now())) \
             .where(LocalRank.node_id == node_id).execute()
+    _rank_cache().invalidate(node_id)
 
 
 def increase_positive_resource(node_id, trust_mod):
@@ -108,6 +136,7 @@ def increase_positive_resource(node_id, trust_mod):
         LocalRank.update(positive_resource=LocalRank.positive_resource + trust_mod,
                          modified_date=str(datetime.datetime.now())) \
             .where(LocalRank.node_id == node_id).execute()
+    _rank_cache().invalidate(node_id)
 
 
 def increase_negative_resource(node_id, trust_mod):
@@ -120,6 +149,7 @@ def increase_negative_resource(node_id, trust_mod):
         LocalRank.update(negative_resource=LocalRank.negative_resource + trust_mod,
                          modified_date=str(datetime.datetime.now())) \
             .where(LocalRank.node_id == node_id).execute()
+    _rank_cache().invalidate(node_id)
 
 
 def _calculate_efficiency(efficiency: float,
@@ -135,10 +165,8 @@ def _calculate_efficiency(efficiency: float,
 
 
 def get_requestor_efficiency(node_id: str) -> float:
-    with db.transaction():
-        rank, _ = LocalRank.get_or_create(node_id=node_id)
-        efficiency = rank.requestor_efficiency
-        return efficiency or 1.0
+    rank = _cached_local_rank(node_id, create=True)
+    return rank.requestor_efficiency or 1.0
 
 
 def update_requestor_efficiency(node_id: str,
@@ -159,12 +187,12 @@ def update_requestor_efficiency(node_id: str,
         rank.requestor_efficiency = _calculate_efficiency(
             efficiency, timeout, computation_time, REQUESTOR_FORGETTING_FACTOR)
         rank.save()
+    _rank_cache().put(node_id, rank)
 
 
 def get_requestor_assigned_sum(node_id: str) -> int:
-    with db.transaction():
-        rank, _ = LocalRank.get_or_create(node_id=node_id)
-        return rank.requestor_assigned_sum or 0
+    rank = _cached_local_rank(node_id, create=True)
+    return rank.requestor_assigned_sum or 0
 
 
 def update_requestor_assigned_sum(node_id: str, amount: int) -> None:
@@ -173,6 +201,7 @@ def update_requestor_assigned_sum(node_id: str, amount: int) -> None:
         rank, _ = LocalRank.get_or_create(node_id=node_id)
         rank.requestor_assigned_sum += amount
         rank.save()
+    _rank_cache().put(node_id, rank)
 
 
 def update_requestor_paid_sum(node_id: str, amount: int) -> None:
@@ -180,18 +209,16 @@ def update_requestor_paid_sum(node_id: str, amount: int) -> None:
         rank, _ = LocalRank.get_or_create(node_id=node_id)
         rank.requestor_paid_sum += amount
         rank.save()
+    _rank_cache().put(node_id, rank)
 
 
 def get_requestor_paid_sum(node_id: str) -> int:
-    with db.transaction():
-        rank, _ = LocalRank.get_or_create(node_id=node_id)
-        return rank.requestor_paid_sum or 0
+    rank = _cached_local_rank(node_id, create=True)
+    return rank.requestor_paid_sum or 0
 
 
 def get_provider_efficiency(node_id: str) -> float:
-    with db.transaction():
-        rank, _ = LocalRank.get_or_create(node_id=node_id)
-        return rank.provider_efficiency
+    return _cached_local_rank(node_id, create=True).provider_efficiency
 
 
 def update_provider_efficiency(node_id: str,
@@ -205,12 +232,11 @@ def update_provider_efficiency(node_id: str,
         rank.provider_efficiency = _calculate_efficiency(
             efficiency, timeout, computation_time, PROVIDER_FORGETTING_FACTOR)
         rank.save()
+    _rank_cache().put(node_id, rank)
 
 
 def get_provider_efficacy(node_id: str) -> ProviderEfficacy:
-    with db.transaction():
-        rank, _ = LocalRank.get_or_create(node_id=node_id)
-        return rank.provider_efficacy
+    return _cached_local_rank(node_id, create=True).provider_efficacy
 
 
 def update_provider_efficacy(node_id: str, op: SubtaskOp) -> None:
@@ -219,6 +245,7 @@ def update_provider_efficacy(node_id: str, op: SubtaskOp) -> None:
         rank, _ = LocalRank.get_or_create(node_id=node_id)
         rank.provider_efficacy.update(op)
         rank.save()
+    _rank_cache().put(node_id, rank)
 
 
 def get_global_rank(node_id):
@@ -237,8 +264,45 @@ def upsert_global_rank(node_id, comp_trust, req_trust, comp_weight, req_weight):
             .where(GlobalRank.node_id == node_id).execute()
 
 
+def upsert_global_ranks(ranks, batch_size=100):
+    """ Insert or update GlobalRank rows in a single transaction
+    :param ranks: iterable of (node_id, comp_trust, req_trust, comp_weight,
+                  req_weight) tuples
+    """
+    ranks = list(ranks)
+    now = datetime.datetime.now()
+    with db.atomic():
+        for start in range(0, len(ranks), batch_size):
+            batch = ranks[start:start + batch_size]
+            existing = {
+                rank.node_id for rank in GlobalRank.select(
+                    GlobalRank.node_id,
+                ).where(GlobalRank.node_id.in_([r[0] for r in batch]))
+            }
+            new_rows = []
+            for node_id, comp_trust, req_trust, comp_weight, req_weight \
+                    in batch:
+                values = {
+                    GlobalRank.requesting_trust_value: req_trust,
+                    GlobalRank.computing_trust_value: comp_trust,
+                    GlobalRank.gossip_weight_computing: comp_weight,
+                    GlobalRank.gossip_weight_requesting: req_weight,
+                    GlobalRank.modified_date: now,
+                }
+                if node_id in existing:
+                    GlobalRank.update(values) \
+                        .where(GlobalRank.node_id == node_id).execute()
+                else:
+                    values[GlobalRank.node_id] = node_id
+                    values[GlobalRank.created_date] = now
+                    new_rows.append(values)
+                    existing.add(node_id)
+            if new_rows:
+                GlobalRank.insert_many(new_rows).execute()
+
+
 def get_local_rank(node_id):
-    return LocalRank.select().where(LocalRank.node_id == node_id).first()
+    return _cached_local_rank(node_id)
 
 
 def get_local_rank_for_all():
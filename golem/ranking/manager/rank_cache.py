@@ -0,0 +1,86 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class RankCache:
+    """ LRU cache with expiring entries for values read from the ranking
+    database. Entries are replaced or invalidated by the functions that
+    update them, the TTL only bounds how long a value changed by other
+    means (e.g. a migration) may be served.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 600.0) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = \
+            OrderedDict()
+        self._lock = threading.Lock()
+        self._owner: Optional[Hashable] = None
+        # Bumped on every invalidation, so that a value loaded before
+        # an update is not put back into the cache after it
+        self._version = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def bind(self, owner: Hashable) -> None:
+        """ Drop all entries when the underlying database changes """
+        if owner != self._owner:
+            self.clear()
+            self._owner = owner
+
+    def get(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            version = self._version
+
+        value = load()
+        with self._lock:
+            if version == self._version:
+                self._store(key, value)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._version += 1
+            self._store(key, value)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._version += 1
+            self.invalidations += 1
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        requests = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / requests if requests else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+        }
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
@@ -6,7 +6,8 @@ from threading import Lock
 
 from twisted.internet.task import deferLater
 
-from golem.ranking.helper import min_max_utility as util
+from golem.ranking.helper.rank_vector import NodeIndex, RankVector, \
+    TrustVector
 from golem.ranking.helper.trust_const import UNKNOWN_TRUST
 from golem.ranking.manager import database_manager as dm
 from golem.ranking.manager import trust_manager as tm
@@ -31,8 +32,9 @@ class Ranking(object):
         self.neighbours = []
         self.step = 0
         self.max_steps = max_steps
-        self.working_vec = {}
-        self.prevRank = {}
+        self.node_index = NodeIndex()
+        self.working_vec = RankVector(self.node_index)
+        self.prevRank = TrustVector(self.node_index)
         self.globRank = {}
         self.received_gossip = []
         self.finished = False
@@ -66,14 +68,15 @@ class Ranking(object):
 
     def __init_working_vec(self):
         with self.lock:
-            self.working_vec = {}
-            self.prevRank = {}
+            self.node_index = NodeIndex()
+            self.working_vec = RankVector(self.node_index)
+            self.prevRank = TrustVector(self.node_index)
             for loc_rank in dm.get_local_rank_for_all():
                 comp_trust = tm.computed_trust_local(loc_rank)
                 req_trust = tm.requested_trust_local(loc_rank)
-                self.working_vec[loc_rank.node_id] = \
-                    [[comp_trust, 1.0], [req_trust, 1.0]]
-                self.prevRank[loc_rank.node_id] = [comp_trust, req_trust]
+                self.working_vec.set(loc_rank.node_id,
+                                     [comp_trust, 1.0], [req_trust, 1.0])
+                self.prevRank.set(loc_rank.node_id, comp_trust, req_trust)
 
     def __new_round(self):
         logger.debug("New gossip round")
@@ -98,7 +101,7 @@ class Ranking(object):
             self.received_gossip = \
                 self.client.collect_gossip() + self.received_gossip
             self.__make_prev_rank()
-            self.working_vec = {}
+            self.working_vec = RankVector(self.node_index)
             self.__add_gossip()
             self.__check_finished()
         finally:
@@ -220,23 +223,7 @@ class Ranking(object):
                 set(self.neighbours) <= self.finished_neighbours
 
     def __compare_working_vec_and_prev_rank(self):
-        aggregated_trust = 0.0
-        for node_id, val in list(self.working_vec.items()):
-            try:
-                computing, requesting = val
-            except (TypeError, ValueError):
-                logger.warning("Wrong trust vector element {}".format(val))
-                break
-            comp_trust = util.vec_to_trust(computing)
-            req_trust = util.vec_to_trust(requesting)
-            if node_id in self.prevRank:
-                comp_trust_old = self.prevRank[node_id][0]
-                req_trust_old = self.prevRank[node_id][1]
-            else:
-                comp_trust_old, req_trust_old = 0, 0
-            aggregated_trust += abs(comp_trust - comp_trust_old)
-            aggregated_trust += abs(req_trust - req_trust_old)
-        return aggregated_trust
+        return self.prevRank.distance(self.working_vec)
 
     def __set_k(self):
         degrees = self.__get_neighbours_degree()
@@ -254,63 +241,31 @@ class Ranking(object):
         return degrees
 
     def __make_prev_rank(self):
-        for node_id, val in list(self.working_vec.items()):
-            try:
-                computing, requesting = val
-            except (TypeError, ValueError):
-                logger.warning("Wrong trust vector element {}".format(val))
-                break
-            comp_trust = util.vec_to_trust(computing)
-            req_trust = util.vec_to_trust(requesting)
-            self.prevRank[node_id] = [comp_trust, req_trust]
+        self.prevRank.update(self.working_vec)
 
     def __save_working_vec(self):
-        for node_id, val in list(self.working_vec.items()):
-            try:
-                computing, requesting = val
-            except (TypeError, ValueError):
-                logger.warning("Wrong trust vector element {}".format(val))
-                break
-            comp_trust = util.vec_to_trust(computing)
-            req_trust = util.vec_to_trust(requesting)
-            dm.upsert_global_rank(node_id,
-                                  comp_trust,
-                                  req_trust,
-                                  computing[1],
-                                  requesting[1])
+        rows = self.working_vec.rows()
+        trust = self.working_vec.trust()[rows]
+        weight = self.working_vec.weight[rows]
+        node_ids = self.node_index.node_ids
+        dm.upsert_global_ranks(
+            (node_ids[row], comp_trust, req_trust, comp_weight, req_weight)
+            for row, (comp_trust, req_trust), (comp_weight, req_weight)
+            in zip(rows.tolist(), trust.tolist(), weight.tolist())
+        )
 
     def __prepare_gossip(self):
-        gossip_vec = []
-        for node_id, val in list(self.working_vec.items()):
-            comp_trust = list(map(self.__scale_gossip, val[0]))
-            req_trust = list(map(self.__scale_gossip, val[1]))
-            gossip_vec.append([node_id, [comp_trust, req_trust]])
-        return gossip_vec
-
-    def __scale_gossip(self, val):
-        return val / float(self.k + 1)
+        return self.working_vec.gossip(float(self.k + 1))
 
     def __add_gossip(self):
         for gossip_group in self.received_gossip:
-            for gossip in gossip_group:
-                try:
-                    node_id, [comp, req] = gossip
-                    if node_id in self.working_vec:
-                        [prev_comp, prev_req] = self.working_vec[node_id]
-                        self.working_vec[node_id] = [
-                            self.__sum_gossip(comp, prev_comp),
-                            self.__sum_gossip(req, prev_req)]
-                    else:
-                        self.working_vec[node_id] = [comp, req]
-                except Exception as err:
-                    logger.error("Wrong gossip {}, {}".format(gossip, err))
+            try:
+                self.working_vec.add_gossip(gossip_group)
+            except Exception as err:  # pylint: disable=broad-except
+                logger.error("Wrong gossip {}, {}".format(gossip_group, err))
 
         self.received_gossip = []
 
-    @staticmethod
-    def __sum_gossip(a, b):
-        return list(map(sum, zip(a, b)))
-
     def __send_finished(self):
         self.client.send_stop_gossip()
 
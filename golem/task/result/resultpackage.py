@@ -1,4 +1,7 @@
 import binascii
+import hashlib
+import io
+import shutil
 import uuid
 import zipfile
 from typing import Iterable, Optional, List, Dict
@@ -31,23 +34,53 @@ def backup_rename(file_path, max_iterations=100):
     os.rename(file_path, name)
 
 
+class PackageWriter(io.RawIOBase):
+    """ Write-only stream copying the package to all the targets and
+    computing its sha1 on the way """
+
+    def __init__(self, *targets):
+        super().__init__()
+        self._targets = targets
+        self._position = 0
+        self._sha1 = hashlib.sha1()
+
+    def writable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def write(self, data):
+        self._sha1.update(data)
+        for target in self._targets:
+            target.write(data)
+        self._position += len(data)
+        return len(data)
+
+    def hexdigest(self):
+        return self._sha1.hexdigest()
+
+
 class Packager(object):
 
     def create(self,
                output_path: str,
                disk_files: Iterable[str]):
 
+        self._write_package(output_path, disk_files)
+        pkg_sha1 = self.compute_sha1(output_path)
+        return output_path, pkg_sha1
+
+    def _write_package(self, output, disk_files: Iterable[str]):
+        """ Pack disk_files into output, a file path or a file object """
         if not disk_files:
             raise ValueError('No files to pack')
 
         disk_files = self._prepare_file_dict(disk_files)
-        with self.generator(output_path) as of:
+        with self.generator(output) as of:
             for file_path, file_name in disk_files.items():
                 self.write_disk_file(of, file_path, file_name)
 
-        pkg_sha1 = self.compute_sha1(output_path)
-        return output_path, pkg_sha1
-
     @staticmethod
     def compute_sha1(source_path: str):
         pkg_sha1 = SimpleHash.hash_file(source_path)
@@ -86,6 +119,7 @@ class Packager(object):
 class ZipPackager(Packager):
 
     ZIP_MODE = zipfile.ZIP_STORED  # no compression
+    COPY_BUFFER_SIZE = 2 ** 16
 
     def extract(self, input_path, output_dir=None):
 
@@ -113,6 +147,14 @@ class ZipPackager(Packager):
             return file_path
         return file_path + '.zip'
 
+    @classmethod
+    def zip_write_file(cls, archive, path, arcname):
+        """ ZipFile.write copying the file in larger chunks """
+        zinfo = zipfile.ZipInfo.from_file(path, arcname)
+        zinfo.compress_type = archive.compression
+        with open(path, 'rb') as src, archive.open(zinfo, 'w') as dst:
+            shutil.copyfileobj(src, dst, cls.COPY_BUFFER_SIZE)
+
     @staticmethod
     def zip_append(archive, path, subdirectory=""):
         basename = os.path.basename(path)
@@ -125,11 +167,12 @@ class ZipPackager(Packager):
                     ZipPackager.zip_append(archive, os.path.join(root, d),
                                            os.path.join(subdirectory, d))
                 for f in files:
-                    archive.write(os.path.join(root, f),
-                                  os.path.join(subdirectory, f))
+                    ZipPackager.zip_write_file(archive, os.path.join(root, f),
+                                               os.path.join(subdirectory, f))
                 break
         elif os.path.isfile(path):
-            archive.write(path, os.path.join(subdirectory, basename))
+            ZipPackager.zip_write_file(archive, path,
+                                       os.path.join(subdirectory, basename))
         elif not os.path.exists(path):
             raise RuntimeError(f"{path} does not exist")
         else:
@@ -149,25 +192,30 @@ class EncryptingPackager(Packager):
     def create(self,
                output_path: str,
                disk_files: Iterable[str]):
-
+        """ Zip the files once, hashing and encrypting the package while
+        it is being written. The unencrypted package is kept next to
+        the output (see package_name) """
         tmp_file_path = self.package_name(output_path)
         backup_rename(tmp_file_path)
 
-        pkg_file_path, pkg_sha1 = super().create(tmp_file_path, disk_files)
+        with open(tmp_file_path, 'wb') as plain, \
+                open(output_path, 'wb') as out, \
+                self.encryptor_class.writer(out, self._secret) as encrypted:
+            package = PackageWriter(plain, encrypted)
+            self._write_package(package, disk_files)
 
-        self.encryptor_class.encrypt(pkg_file_path, output_path,
-                                     secret=self._secret)
-        return output_path, pkg_sha1
+        return output_path, package.hexdigest()
 
     def extract(self, input_path, output_dir=None):
-        tmp_file_path = self.package_name(input_path)
-        backup_rename(tmp_file_path)
+        if not output_dir:
+            output_dir = os.path.dirname(input_path)
 
-        self.encryptor_class.decrypt(input_path, tmp_file_path,
-                                     secret=self._secret)
-        os.remove(input_path)
+        with open(input_path, 'rb') as src:
+            decrypted = self.encryptor_class.reader(src, self._secret)
+            result = self._packager.extract(decrypted, output_dir=output_dir)
 
-        return self._packager.extract(tmp_file_path, output_dir=output_dir)
+        os.remove(input_path)
+        return result
 
     def generator(self, output_path):
         return self._packager.generator(output_path)
@@ -4,6 +4,7 @@ from enum import Enum
 from typing import (
     List,
     Optional,
+    Tuple,
     Type,
 )
 
@@ -88,6 +89,10 @@ class TaskEventListener(object):
 
 class Task(abc.ABC):
 
+    # Attributes which change together with subtask states and are stored
+    # in the task persistence journal instead of a full snapshot
+    JOURNALED_ATTRS: Tuple[str, ...] = ()
+
     class ExtraData(object):
         def __init__(self, ctd=None, **kwargs):
             self.ctd = ctd
@@ -1,6 +1,6 @@
 import logging
 from pathlib import Path
-from typing import Any, Dict, Optional, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
 
 import os
 import time
@@ -42,10 +42,33 @@ class CompStats(object):
         self.tasks_requested = 0
 
 
+class ComputeSlot(object):
+    """ Place for a single subtask. Subtasks in different slots are
+    computed at the same time, each with its own share of the resources.
+    """
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.assigned_subtask: Optional['ComputeTaskDef'] = None
+        # TaskThread computing the assigned subtask
+        self.counting_thread: Optional[TaskThread] = None
+        self.computed_tasks = 0
+        self.tasks_with_errors = 0
+        self.tasks_with_timeout = 0
+
+    def is_free(self) -> bool:
+        return self.assigned_subtask is None and self.counting_thread is None
+
+    def is_waiting_for_resources(self, task_id: str) -> bool:
+        return self.counting_thread is None \
+            and self.assigned_subtask is not None \
+            and self.assigned_subtask['task_id'] == task_id
+
+
 class TaskComputer(object):
     """ TaskComputer is responsible for task computations that take
     place in Golem application. Tasks are started
-    in separate threads.
+    in separate threads, up to max_subtasks of them at the same time.
     """
 
     lock = Lock()
@@ -54,8 +77,8 @@ class TaskComputer(object):
     def __init__(self, task_server: 'TaskServer', use_docker_manager=True,
                  finished_cb=None) -> None:
         self.task_server = task_server
-        # Currently computing TaskThread
-        self.counting_thread = None
+        self.slots: List[ComputeSlot] = [ComputeSlot(0)]
+        self.max_subtasks = 1
         # Is task computer currently able to run computation?
         self.runnable = True
         self.listeners = []
@@ -81,8 +104,6 @@ class TaskComputer(object):
 
         self.stats = IntStatsKeeper(CompStats)
 
-        self.assigned_subtask: Optional['ComputeTaskDef'] = None
-
         self.last_task_timeout_checking = None
         self.support_direct_computation = False
         # Should this node behave as provider and compute tasks?
@@ -90,14 +111,44 @@ class TaskComputer(object):
             and not task_server.config_desc.in_shutdown
         self.finished_cb = finished_cb
 
+    @property
+    def assigned_subtask(self) -> Optional['ComputeTaskDef']:
+        """ The first of the assigned subtasks """
+        subtasks = self.assigned_subtasks
+        return subtasks[0] if subtasks else None
+
+    @assigned_subtask.setter
+    def assigned_subtask(self, ctd: Optional['ComputeTaskDef']) -> None:
+        self.slots[0].assigned_subtask = ctd
+
+    @property
+    def assigned_subtasks(self) -> List['ComputeTaskDef']:
+        return [slot.assigned_subtask for slot in self.slots
+                if slot.assigned_subtask is not None]
+
+    @property
+    def counting_thread(self) -> Optional[TaskThread]:
+        """ The first of the running TaskThreads """
+        for slot in self.slots:
+            if slot.counting_thread is not None:
+                return slot.counting_thread
+        return None
+
+    @counting_thread.setter
+    def counting_thread(self, thread: Optional[TaskThread]) -> None:
+        self.slots[0].counting_thread = thread
+
     def task_given(self, ctd: 'ComputeTaskDef'):
-        if self.assigned_subtask is not None:
-            logger.error("Trying to assign a task, when it's already assigned")
+        slot = self._free_slot()
+        if slot is None:
+            logger.error("Trying to assign a task, when all the slots are "
+                         "already assigned")
             return False
 
-        ProviderTimer.start()
+        if not self._busy_slots():
+            ProviderTimer.start()
 
-        self.assigned_subtask = ctd
+        slot.assigned_subtask = ctd
         self.__request_resource(
             ctd['task_id'],
             ctd['subtask_id'],
@@ -106,44 +157,57 @@ class TaskComputer(object):
         return True
 
     def has_assigned_task(self) -> bool:
-        return bool(self.assigned_subtask)
+        return bool(self.assigned_subtasks)
+
+    def has_free_slot(self) -> bool:
+        return self._free_slot() is not None
 
     def resource_collected(self, res_id):
-        subtask = self.assigned_subtask
-        if not subtask or subtask['task_id'] != res_id:
+        slots = [slot for slot in self.slots
+                 if slot.is_waiting_for_resources(res_id)]
+        if not slots:
             logger.error("Resource collected for a wrong task, %s", res_id)
             return False
         self.last_task_timeout_checking = time.time()
-        self.__compute_task(
-            subtask['subtask_id'],
-            subtask['docker_images'],
-            subtask['extra_data'],
-            subtask['deadline'])
+        for slot in slots:
+            subtask = slot.assigned_subtask
+            self.__compute_task(
+                slot,
+                subtask['subtask_id'],
+                subtask['docker_images'],
+                subtask['extra_data'],
+                subtask['deadline'])
         return True
 
     def resource_failure(self, res_id, reason):
-        subtask = self.assigned_subtask
-        if not subtask or subtask['task_id'] != res_id:
+        slots = [slot for slot in self.slots
+                 if slot.is_waiting_for_resources(res_id)]
+        if not slots:
             logger.error("Resource failure for a wrong task, %s", res_id)
             return
-        self.task_server.send_task_failed(
-            subtask['subtask_id'],
-            subtask['task_id'],
-            'Error downloading resources: {}'.format(reason),
-        )
-        self.__task_finished(subtask)
+        for slot in slots:
+            subtask = slot.assigned_subtask
+            self.task_server.send_task_failed(
+                subtask['subtask_id'],
+                subtask['task_id'],
+                'Error downloading resources: {}'.format(reason),
+            )
+            self.__task_finished(slot)
         self.session_closed()
 
     def task_computed(self, task_thread: TaskThread) -> None:
         if task_thread.end_time is None:
             task_thread.end_time = time.time()
 
+        slot = self._slot_computing(task_thread)
+        if slot is None:
+            logger.error("No subtask computed by %r", task_thread)
+            return
+
         work_wall_clock_time = task_thread.end_time - task_thread.start_time
+        subtask = slot.assigned_subtask
+        subtask_id = subtask['subtask_id']
         try:
-            subtask = self.assigned_subtask
-            assert subtask is not None
-            self.assigned_subtask = None
-            subtask_id = subtask['subtask_id']
             # get paid for max working time,
             # thus task withholding won't make profit
             task_header = \
@@ -152,6 +216,7 @@ class TaskComputer(object):
 
         except KeyError:
             logger.error("No subtask with id %r", subtask_id)
+            self.__task_finished(slot)
             return
 
         was_success = False
@@ -160,8 +225,10 @@ class TaskComputer(object):
 
             if "Task timed out" in task_thread.error_msg:
                 self.stats.increase_stat('tasks_with_timeout')
+                slot.tasks_with_timeout += 1
             else:
                 self.stats.increase_stat('tasks_with_errors')
+                slot.tasks_with_errors += 1
                 self.task_server.send_task_failed(
                     subtask_id,
                     subtask['task_id'],
@@ -174,6 +241,7 @@ class TaskComputer(object):
                         subtask_id,
                         str(work_wall_clock_time))
             self.stats.increase_stat('computed_tasks')
+            slot.computed_tasks += 1
 
             try:
                 self.task_server.send_results(
@@ -188,6 +256,7 @@ class TaskComputer(object):
 
         else:
             self.stats.increase_stat('tasks_with_errors')
+            slot.tasks_with_errors += 1
             self.task_server.send_task_failed(
                 subtask_id,
                 subtask['task_id'],
@@ -196,35 +265,74 @@ class TaskComputer(object):
 
         dispatcher.send(signal='golem.monitor', event='computation_time_spent',
                         success=was_success, value=work_time_to_be_paid)
-        self.__task_finished(subtask)
+        self.__task_finished(slot)
 
     def run(self):
         """ Main loop of task computer """
-        if self.counting_thread is not None:
-            self.counting_thread.check_timeout()
-        elif self.compute_tasks and self.runnable:
+        for slot in list(self.slots):
+            if slot.counting_thread is not None:
+                slot.counting_thread.check_timeout()
+
+        if self.compute_tasks and self.runnable and self.has_free_slot():
             last_request = time.time() - self.last_task_request
             if last_request > self.task_request_frequency:
                 self.__request_task()
 
     def get_progress(self) -> Optional[ComputingSubtaskStateSnapshot]:
-        if not self.is_computing() or self.assigned_subtask is None:
+        """ Progress of the first of the computed subtasks """
+        for slot in self.slots:
+            progress = self._get_slot_progress(slot)
+            if progress is not None:
+                return progress
+        return None
+
+    def get_slots_stats(self) -> List[Dict[str, Any]]:
+        """ Assigned subtask, progress and totals of each of the slots """
+        stats = []
+        for slot in self.slots:
+            subtask = slot.assigned_subtask
+            progress = self._get_slot_progress(slot)
+            if slot.counting_thread is not None:
+                state = 'Computing'
+            elif subtask is not None:
+                state = 'Downloading resources'
+            else:
+                state = 'Idle'
+            stats.append({
+                'slot': slot.index,
+                'state': state,
+                'task_id': subtask['task_id'] if subtask else None,
+                'subtask': progress.__dict__ if progress else None,
+                'host_config': self._get_slot_host_config(slot),
+                'computed_tasks': slot.computed_tasks,
+                'tasks_with_errors': slot.tasks_with_errors,
+                'tasks_with_timeout': slot.tasks_with_timeout,
+            })
+        return stats
+
+    def _get_slot_progress(self, slot: ComputeSlot) \
+            -> Optional[ComputingSubtaskStateSnapshot]:
+        with self.lock:
+            c = slot.counting_thread
+        if c is None or slot.assigned_subtask is None:
             return None
 
-        c: TaskThread = self.counting_thread
-        tcss = ComputingSubtaskStateSnapshot(
-            subtask_id=self.assigned_subtask['subtask_id'],
+        return ComputingSubtaskStateSnapshot(
+            subtask_id=slot.assigned_subtask['subtask_id'],
             progress=c.get_progress(),
             seconds_to_timeout=c.task_timeout,
             running_time_seconds=(time.time() - c.start_time),
             **c.extra_data,
         )
 
-        return tcss
+    def _get_slot_host_config(self, slot: ComputeSlot) -> Dict[str, Any]:
+        return self.docker_manager.get_slot_host_config(
+            slot.index, self.max_subtasks)
 
     def is_computing(self) -> bool:
         with self.lock:
-            return self.counting_thread is not None
+            return any(slot.counting_thread is not None
+                       for slot in self.slots)
 
     def get_host_state(self):
         if self.is_computing():
@@ -251,12 +359,46 @@ class TaskComputer(object):
         self.task_request_frequency = config_desc.task_request_interval
         self.compute_tasks = config_desc.accept_tasks \
             and not config_desc.in_shutdown
+        self._resize_slots(config_desc.max_concurrent_subtasks)
         return self.change_docker_config(
             config_desc=config_desc,
             run_benchmarks=run_benchmarks,
             work_dir=Path(self.dir_manager.root_path),
             in_background=in_background)
 
+    def _resize_slots(self, max_subtasks) -> None:
+        """ Slots over the limit are removed once their subtasks finish """
+        try:
+            self.max_subtasks = max(1, int(max_subtasks))
+        except (TypeError, ValueError):
+            self.max_subtasks = 1
+
+        with self.lock:
+            indices = {slot.index for slot in self.slots}
+            for index in range(self.max_subtasks):
+                if index not in indices:
+                    self.slots.append(ComputeSlot(index))
+            self.slots = sorted(
+                (slot for slot in self.slots
+                 if slot.index < self.max_subtasks or not slot.is_free()),
+                key=lambda slot: slot.index)
+
+    def _free_slot(self) -> Optional[ComputeSlot]:
+        for slot in self.slots:
+            if slot.index < self.max_subtasks and slot.is_free():
+                return slot
+        return None
+
+    def _busy_slots(self) -> List[ComputeSlot]:
+        return [slot for slot in self.slots if not slot.is_free()]
+
+    def _slot_computing(self, task_thread: TaskThread) \
+            -> Optional[ComputeSlot]:
+        for slot in self.slots:
+            if slot.counting_thread is task_thread:
+                return slot
+        return None
+
     def config_changed(self):
         for l in self.listeners:
             l.config_changed()
@@ -324,7 +466,7 @@ class TaskComputer(object):
         pass
 
     def __request_task(self):
-        if self.has_assigned_task():
+        if not self.has_free_slot():
             return
 
         self.last_task_request = time.time()
@@ -335,9 +477,9 @@ class TaskComputer(object):
     def __request_resource(self, task_id, subtask_id, resources):
         self.task_server.request_resource(task_id, subtask_id, resources)
 
-    def __compute_task(self, subtask_id, docker_images,
+    def __compute_task(self, slot, subtask_id, docker_images,
                        extra_data, subtask_deadline):
-        task_id = self.assigned_subtask['task_id']
+        task_id = slot.assigned_subtask['task_id']
         task_header = self.task_server.task_keeper.task_headers.get(task_id)
 
         if not task_header:
@@ -369,31 +511,37 @@ class TaskComputer(object):
             dir_mapping = DockerTaskThread.generate_dir_mapping(resource_dir,
                                                                 temp_dir)
             tt = DockerTaskThread(docker_images, extra_data,
-                                  dir_mapping, task_timeout)
+                                  dir_mapping, task_timeout,
+                                  host_config=self._get_slot_host_config(slot))
         elif self.support_direct_computation:
             tt = PyTaskThread(extra_data, resource_dir, temp_dir,
                               task_timeout)
         else:
             logger.error("Cannot run PyTaskThread in this version")
-            subtask = self.assigned_subtask
-            self.assigned_subtask = None
             self.task_server.send_task_failed(
                 subtask_id,
-                subtask['task_id'],
+                task_id,
                 "Host direct task not supported",
             )
 
-            self.__task_finished(subtask)
+            self.__task_finished(slot)
             return
 
         with self.lock:
-            self.counting_thread = tt
+            slot.counting_thread = tt
 
         tt.start().addBoth(lambda _: self.task_computed(tt))
 
-    def __task_finished(self, ctd: 'ComputeTaskDef') -> None:
+    def __task_finished(self, slot: ComputeSlot) -> None:
+        ctd = slot.assigned_subtask
 
-        ProviderTimer.finish()
+        with self.lock:
+            slot.assigned_subtask = None
+            slot.counting_thread = None
+        self._resize_slots(self.max_subtasks)
+
+        if not self._busy_slots():
+            ProviderTimer.finish()
         dispatcher.send(
             signal='golem.taskcomputer',
             event='subtask_finished',
@@ -401,14 +549,14 @@ class TaskComputer(object):
             min_performance=ctd['performance'],
         )
 
-        with self.lock:
-            self.counting_thread = None
         if self.finished_cb:
             self.finished_cb()
 
     def quit(self):
-        if self.counting_thread is not None:
-            self.counting_thread.end_comp()
+        for slot in self.slots:
+            if slot.counting_thread is not None:
+                slot.counting_thread.end_comp()
+        self.stats.flush()
 
 
 class PyTaskThread(TaskThread):
@@ -1,4 +1,5 @@
 import datetime
+import heapq
 import logging
 import pathlib
 import pickle
@@ -314,6 +315,75 @@ class CompTaskKeeper:
         return self.task_package_paths.get(task_id, None)
 
 
+class SupportedTasks:
+    """ Set of supported task ids with O(1) add, discard and random choice.
+
+    Ids are kept in a list for random access and their positions in a dict;
+    a removed id is swapped with the last one.
+    """
+
+    # Random picks made before falling back to filtering the whole pool
+    MAX_RANDOM_PICKS = 8
+
+    def __init__(self) -> None:
+        self._ids: typing.List[str] = []
+        self._positions: typing.Dict[str, int] = {}
+
+    def __contains__(self, task_id) -> bool:
+        return task_id in self._positions
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(list(self._ids))
+
+    def __getitem__(self, index: int) -> str:
+        return self._ids[index]
+
+    def __repr__(self) -> str:
+        return '<SupportedTasks: %r>' % (self._ids,)
+
+    def add(self, task_id: str) -> None:
+        if task_id in self._positions:
+            return
+        self._positions[task_id] = len(self._ids)
+        self._ids.append(task_id)
+
+    def discard(self, task_id: str) -> None:
+        position = self._positions.pop(task_id, None)
+        if position is None:
+            return
+        last_id = self._ids.pop()
+        if last_id != task_id:
+            self._ids[position] = last_id
+            self._positions[last_id] = position
+
+    def clear(self) -> None:
+        self._ids.clear()
+        self._positions.clear()
+
+    def random_choice(
+            self,
+            exclude: typing.Optional[typing.Set[str]] = None
+    ) -> typing.Optional[str]:
+        if not self._ids:
+            return None
+        if not exclude:
+            return random.choice(self._ids)
+
+        for _ in range(self.MAX_RANDOM_PICKS):
+            task_id = random.choice(self._ids)
+            if task_id not in exclude:
+                return task_id
+
+        # Most of the pool is excluded
+        candidates = [t for t in self._ids if t not in exclude]
+        if not candidates:
+            return None
+        return random.choice(candidates)
+
+
 class TaskHeaderKeeper:
     """Keeps information about tasks living in Golem Network. Node may
        choose one of those task to compute or will pass information
@@ -333,7 +403,7 @@ class TaskHeaderKeeper:
         # all computing tasks that this node knows about
         self.task_headers: typing.Dict[str, dt_tasks.TaskHeader] = {}
         # ids of tasks that this node may try to compute
-        self.supported_tasks = []
+        self.supported_tasks = SupportedTasks()
         # results of tasks' support checks
         self.support_status = {}
         # tasks that were removed from network recently, so they won't
@@ -343,6 +413,9 @@ class TaskHeaderKeeper:
         self.tasks_by_owner: typing.Dict[str, set] = {}
         # Keep track which tasks were checked when
         self.last_checking: typing.Dict[str, datetime.datetime] = {}
+        # (deadline, task_id) min-heap; entries of removed or updated
+        # headers are skipped when popped
+        self._deadlines: typing.List[typing.Tuple[int, str]] = []
 
         self.min_price = min_price
         self.verification_timeout = verification_timeout
@@ -424,12 +497,12 @@ class TaskHeaderKeeper:
         if config_desc.min_price == self.min_price:
             return
         self.min_price = config_desc.min_price
-        self.supported_tasks = []
+        self.supported_tasks.clear()
         for id_, th in self.task_headers.items():
             supported = self.check_support(th)
             self.support_status[id_] = supported
             if supported:
-                self.supported_tasks.append(id_)
+                self.supported_tasks.add(id_)
             if self.task_archiver:
                 self.task_archiver.add_support_status(id_, supported)
 
@@ -461,6 +534,7 @@ class TaskHeaderKeeper:
 
             self.task_headers[task_id] = header
             self.last_checking[task_id] = datetime.datetime.now()
+            heapq.heappush(self._deadlines, (header.deadline, task_id))
 
             self._get_tasks_by_owner_set(header.task_owner.key).add(task_id)
 
@@ -485,14 +559,14 @@ class TaskHeaderKeeper:
         self.support_status[task_id] = support
 
         if not support and task_id in self.supported_tasks:
-            self.supported_tasks.remove(task_id)
+            self.supported_tasks.discard(task_id)
         if support and task_id not in self.supported_tasks:
             logger.info(
                 "Adding task %r support=%r",
                 task_id,
                 support
             )
-            self.supported_tasks.append(task_id)
+            self.supported_tasks.add(task_id)
 
     @staticmethod
     def check_owner(task_id: str, owner_id: str) -> None:
@@ -553,27 +627,13 @@ class TaskHeaderKeeper:
         except KeyError:
             pass
 
+        self.supported_tasks.discard(task_id)
         for container in (
                 self.task_headers,
-                self.supported_tasks,
                 self.support_status,
                 self.last_checking
         ):
-            if isinstance(container, list):
-                try:
-                    container.remove(task_id)
-                except ValueError:
-                    pass
-                continue
-            if isinstance(container, dict):
-                try:
-                    del container[task_id]
-                except KeyError:
-                    pass
-                continue
-            raise RuntimeError(
-                "Unknown container type {}".format(type(container)),
-            )
+            container.pop(task_id, None)
 
         self.removed_tasks[task_id] = time.time()
         return True
@@ -596,28 +656,32 @@ class TaskHeaderKeeper:
         :return: None if there are no tasks that this node may want to compute
         """
         logger.debug("`get_task` called. exclude=%r", exclude)
-        tasks = self.supported_tasks
-        if exclude:
-            tasks = [t for t in tasks if t not in exclude]
-        if not tasks:
+        task_id = self.supported_tasks.random_choice(exclude)
+        if task_id is None:
             logger.debug("`get_task`: no potential task candidates found.")
             return None
-        task_id = random.choice(tasks)
         logger.debug("`get_task`: task candidate found. task_id=%r", task_id)
         return self.task_headers[task_id]
 
     def remove_old_tasks(self):
-        for t in list(self.task_headers.values()):
-            cur_time = common.get_timestamp_utc()
-            if cur_time > t.deadline:
-                logger.warning("Task owned by %s dies, task_id: %s",
-                               t.task_owner.key, t.task_id)
-                self.remove_task_header(t.task_id)
-
-        for task_id, remove_time in list(self.removed_tasks.items()):
-            cur_time = time.time()
-            if cur_time - remove_time > self.removed_task_timeout:
-                del self.removed_tasks[task_id]
+        cur_time = common.get_timestamp_utc()
+        while self._deadlines and self._deadlines[0][0] < cur_time:
+            deadline, task_id = heapq.heappop(self._deadlines)
+            t = self.task_headers.get(task_id)
+            # Skip entries of removed headers and of outdated header versions
+            if t is None or t.deadline != deadline:
+                continue
+            logger.warning("Task owned by %s dies, task_id: %s",
+                           t.task_owner.key, t.task_id)
+            self.remove_task_header(t.task_id)
+
+        # removed_tasks is ordered by removal time
+        cur_time = time.time()
+        while self.removed_tasks:
+            task_id, remove_time = next(iter(self.removed_tasks.items()))
+            if cur_time - remove_time <= self.removed_task_timeout:
+                break
+            del self.removed_tasks[task_id]
 
     def get_unsupport_reasons(self):
         """
@@ -1,6 +1,5 @@
 import logging
 import os
-import pickle
 import shutil
 import time
 import uuid
@@ -32,6 +31,8 @@ from golem.task.result.resultmanager import EncryptedResultPackageManager
 from golem.task.taskbase import TaskEventListener, Task, \
     TaskPurpose, AcceptClientVerdict
 from golem.task.taskkeeper import CompTaskKeeper, compute_subtask_value
+from golem.task.taskpersistence import JOURNAL_SUFFIX, SNAPSHOT_SUFFIX, \
+    TaskPersistence
 from golem.task.taskrequestorstats import RequestorTaskStatsManager
 from golem.task.taskstate import TaskState, TaskStatus, SubtaskStatus, \
     SubtaskState, Operation, TaskOp, SubtaskOp, OtherOp
@@ -110,6 +111,11 @@ class TaskManager(TaskEventListener):
         self.tasks_dir = tasks_dir / "tmanager"
         if not self.tasks_dir.is_dir():
             self.tasks_dir.mkdir(parents=True)
+        self.persistence = TaskPersistence(
+            self.tasks_dir,
+            self._get_task_data,
+            coalesce_window=config_desc.task_dump_coalesce_interval,
+        )
         self.root_path = root_path
         self.dir_manager = DirManager(self.get_task_manager_root())
 
@@ -236,35 +242,34 @@ class TaskManager(TaskEventListener):
         logger.info("Task %s started", task_id)
 
     def _dump_filepath(self, task_id):
-        return self.tasks_dir / ('%s.pickle' % (task_id,))
+        return self.persistence.snapshot_path(task_id)
+
+    def _get_task_data(self, task_id):
+        if task_id not in self.tasks:
+            return None
+        return self.tasks[task_id], self.tasks_states[task_id]
 
     def dump_task(self, task_id: str) -> None:
+        """ Take a full snapshot of the task. Serialization is done
+        immediately, the file is written by the persistence writer thread """
         logger.debug('DUMP TASK %r', task_id)
-        filepath = self._dump_filepath(task_id)
         try:
-            data = self.tasks[task_id], self.tasks_states[task_id]
-            logger.debug('DUMPING TASK %r', filepath)
-            with filepath.open('wb') as f:
-                pickle.dump(data, f, protocol=2)
-            logger.debug('TASK %s DUMPED in %r', task_id, filepath)
-        except Exception as e:
+            self.persistence.snapshot(task_id)
+        except Exception:
             logger.exception(
                 'DUMP ERROR task_id: %r task: %r state: %r',
                 task_id, self.tasks.get(task_id, '<not found>'),
                 self.tasks_states.get(task_id, '<not found>'),
             )
-            if filepath.exists():
-                filepath.unlink()
             raise
 
     def remove_dump(self, task_id: str):
-        filepath = self._dump_filepath(task_id)
-        try:
-            filepath.unlink()
-            logger.debug('TASK DUMP with id %s REMOVED from %r',
-                         task_id, filepath)
-        except (FileNotFoundError, OSError) as e:
-            logger.warning("Couldn't remove dump file: %s - %s", filepath, e)
+        self.persistence.remove(task_id)
+
+    def quit(self):
+        """ Write out all pending task changes """
+        if self.task_persistence:
+            self.persistence.quit()
 
     def _create_task_output_dir(self, task_def: TaskDefinition):
         """
@@ -320,35 +325,48 @@ class TaskManager(TaskEventListener):
         logger.debug('SEARCHING FOR TASKS TO RESTORE')
         broken_paths = set()
         for path in self.tasks_dir.iterdir():
-            if not path.suffix == '.pickle':
+            if not path.suffix == SNAPSHOT_SUFFIX:
                 continue
             logger.debug('RESTORE TASKS %r', path)
 
             task_id = None
-            with path.open('rb') as f:
+            try:
+                task: Task
+                state: TaskState
+                task, state, generation = self.persistence.load(path)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Problem restoring task from: %s', path)
+                # On Windows, attempting to remove a file that is in use
+                # causes an exception to be raised, therefore
+                # we'll remove broken files later
+                broken_paths.add(path)
+            else:
+                task_id = task.header.task_id
                 try:
-                    task: Task
-                    state: TaskState
-                    task, state = pickle.load(f)
+                    replayed = self.persistence.replay(task_id, task,
+                                                       state, generation)
                 except Exception:  # pylint: disable=broad-except
-                    logger.exception('Problem restoring task from: %s', path)
-                    # On Windows, attempting to remove a file that is in use
-                    # causes an exception to be raised, therefore
-                    # we'll remove broken files later
-                    broken_paths.add(path)
-                else:
-                    TaskManager._migrate_status_to_enum(state)
+                    logger.exception('Problem replaying journal of: %s',
+                                     task_id)
+                    replayed = 0
+
+                TaskManager._migrate_status_to_enum(state)
 
-                    task.register_listener(self)
+                task.register_listener(self)
 
-                    task_id = task.header.task_id
-                    self.tasks[task_id] = task
-                    self.tasks_states[task_id] = state
+                self.tasks[task_id] = task
+                self.tasks_states[task_id] = state
 
-                    for sub in state.subtask_states.values():
-                        self.subtask2task_mapping[sub.subtask_id] = task_id
+                for sub in state.subtask_states.values():
+                    self.subtask2task_mapping[sub.subtask_id] = task_id
 
-                    logger.debug('TASK %s RESTORED from %r', task_id, path)
+                logger.debug('TASK %s RESTORED from %r (%d journal '
+                             'records)', task_id, path, replayed)
+
+                if self.persistence.has_journal(task_id):
+                    # Compact the journal, it may end with a torn record
+                    # or hold records of an older snapshot
+                    self.dump_task(task_id)
 
             if task_id is not None:
                 self.notice_task_updated(task_id, op=TaskOp.RESTORED,
@@ -356,6 +374,9 @@ class TaskManager(TaskEventListener):
 
         for path in broken_paths:
             path.unlink()
+            journal_path = path.with_suffix(JOURNAL_SUFFIX)
+            if journal_path.exists():
+                journal_path.unlink()
 
     @handle_task_key_error
     def resources_send(self, task_id):
@@ -1135,7 +1156,7 @@ class TaskManager(TaskEventListener):
         )
 
         if persist and self.task_persistence:
-            self.dump_task(task_id)
+            self._persist_task_update(task_id, subtask_id, op)
 
         task_state = self.tasks_states.get(task_id)
         dispatcher.send(
@@ -1154,6 +1175,19 @@ class TaskManager(TaskEventListener):
                 and op.task_related() and op.is_completed():
             self.finished_cb()
 
+    def _persist_task_update(self, task_id: str,
+                             subtask_id: Optional[str] = None,
+                             op: Optional[Operation] = None) -> None:
+        """ Subtask updates are coalesced and journaled; accepted results
+        and task related changes need a full snapshot """
+        if subtask_id and isinstance(op, SubtaskOp):
+            self.persistence.record(task_id, subtask_id,
+                                    snapshot=(op == SubtaskOp.FINISHED))
+        elif subtask_id or op is None:
+            self.persistence.record(task_id)
+        else:
+            self.dump_task(task_id)
+
     def _stop_timers(self, task_id: str,
                      subtask_id: Optional[str] = None,
                      op: Optional[Operation] = None):
@@ -0,0 +1,296 @@
+import logging
+import os
+import pickle
+import struct
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Set, Tuple
+
+from golem.task.taskbase import Task
+from golem.task.taskstate import TaskState
+
+logger = logging.getLogger(__name__)
+
+TaskData = Tuple[Task, TaskState]
+
+SNAPSHOT_SUFFIX = '.pickle'
+JOURNAL_SUFFIX = '.journal'
+
+_RECORD_HEADER = struct.Struct('!I')
+
+
+class TaskPersistence:
+    """ Persists requested tasks as a full snapshot plus an append-only
+    journal of subtask state deltas.
+
+    Subtask updates are coalesced for `coalesce_window` seconds and
+    serialized on the calling (reactor) thread, so that the written data
+    is consistent. All file operations are performed in order by a single
+    writer thread. Once `compact_after` records have been appended to
+    a task's journal, a fresh snapshot is taken and the journal truncated.
+
+    A journal record holds the task status, changed subtask states, their
+    `subtasks_given` entries and the task attributes listed in
+    `Task.JOURNALED_ATTRS`. Changes which are not covered by that (e.g.
+    accepted results) need a snapshot.
+
+    Every snapshot gets the next generation number, written after the
+    pickled task, and records are stamped with the generation of the
+    snapshot they follow. Records left from an older snapshot, e.g. when
+    the journal was not truncated before a crash, are skipped on replay.
+    """
+
+    def __init__(self,
+                 tasks_dir: Path,
+                 get_task_data: Callable[[str], Optional[TaskData]],
+                 coalesce_window: float = 1.0,
+                 compact_after: int = 500) -> None:
+        self.tasks_dir = tasks_dir
+        self.coalesce_window = coalesce_window
+        self.compact_after = compact_after
+
+        self._get_task_data = get_task_data
+        self._dirty: Dict[str, Set[str]] = {}
+        self._dirty_snapshots: Set[str] = set()
+        self._journal_len: Dict[str, int] = {}
+        self._generations: Dict[str, Optional[int]] = {}
+        self._flush_call = None
+        self._writer = ThreadPoolExecutor(max_workers=1)
+
+    def snapshot_path(self, task_id: str) -> Path:
+        return self.tasks_dir / (task_id + SNAPSHOT_SUFFIX)
+
+    def journal_path(self, task_id: str) -> Path:
+        return self.tasks_dir / (task_id + JOURNAL_SUFFIX)
+
+    def snapshot(self, task_id: str) -> Future:
+        """ Serialize the whole task now and schedule writing it to disk.
+        Pending deltas of that task are superseded by the snapshot. """
+        self._dirty.pop(task_id, None)
+        self._dirty_snapshots.discard(task_id)
+        self._journal_len[task_id] = 0
+
+        task_data = self._get_task_data(task_id)
+        if task_data is None:
+            raise KeyError(task_id)
+        generation = (self._generations.get(task_id) or 0) + 1
+        data = pickle.dumps(task_data, protocol=2) + \
+            pickle.dumps(generation, protocol=2)
+        self._generations[task_id] = generation
+        return self._writer.submit(self._write_snapshot, task_id, data)
+
+    def record(self, task_id: str, subtask_id: Optional[str] = None,
+               snapshot: bool = False) -> None:
+        """ Mark a task (subtask) as changed; it will be journaled or
+        snapshotted, if `snapshot` is set, with the next flush """
+        if snapshot or subtask_id is None:
+            self._dirty_snapshots.add(task_id)
+        else:
+            self._dirty.setdefault(task_id, set()).add(subtask_id)
+        self._schedule_flush()
+
+    def flush(self) -> None:
+        """ Serialize all pending deltas and schedule them for writing """
+        if self._flush_call and self._flush_call.active():
+            self._flush_call.cancel()
+        self._flush_call = None
+
+        snapshots, self._dirty_snapshots = self._dirty_snapshots, set()
+        for task_id in snapshots:
+            self._try_snapshot(task_id)
+
+        dirty, self._dirty = self._dirty, {}
+        for task_id, subtask_ids in dirty.items():
+            try:
+                self._flush_task(task_id, subtask_ids)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Cannot journal task %r; taking a snapshot',
+                                 task_id)
+                self._try_snapshot(task_id)
+
+    def remove(self, task_id: str) -> Future:
+        self._dirty.pop(task_id, None)
+        self._dirty_snapshots.discard(task_id)
+        self._journal_len.pop(task_id, None)
+        self._generations.pop(task_id, None)
+        return self._writer.submit(self._remove_files, task_id)
+
+    def wait(self) -> None:
+        """ Block until all scheduled writes are finished """
+        self._writer.submit(lambda: None).result()
+
+    def quit(self) -> None:
+        self.flush()
+        self.wait()
+
+    def pending(self) -> int:
+        return len(self._dirty_snapshots) + sum(map(len, self._dirty.values()))
+
+    @staticmethod
+    def load(path: Path) -> Tuple[Task, TaskState, Optional[int]]:
+        """ Read a snapshot file. The generation is None for snapshots
+        written before generations were introduced. """
+        with path.open('rb') as f:
+            task, state = pickle.load(f)
+            try:
+                generation = pickle.load(f)
+            except EOFError:
+                generation = None
+        return task, state, generation
+
+    def replay(self, task_id: str, task: Task, state: TaskState,
+               generation: Optional[int]) -> int:
+        """ Apply journal records of the snapshot `generation` onto the
+        restored task. Replay stops at the first broken record. Returns
+        the number of applied records. """
+        self._generations[task_id] = generation
+        count = 0
+        for record in self._read_journal(self.journal_path(task_id)):
+            if record.get('generation') != generation:
+                continue
+            try:
+                self._apply_record(record, task, state)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Broken journal record of task %r',
+                                 task_id)
+                break
+            count += 1
+        self._journal_len[task_id] = count
+        return count
+
+    def has_journal(self, task_id: str) -> bool:
+        """ Whether the journal file of a task holds any records """
+        try:
+            return self.journal_path(task_id).stat().st_size > 0
+        except FileNotFoundError:
+            return False
+
+    def _schedule_flush(self) -> None:
+        if self._flush_call and self._flush_call.active():
+            return
+        from twisted.internet import reactor
+        self._flush_call = reactor.callLater(self.coalesce_window, self.flush)
+
+    def _try_snapshot(self, task_id: str) -> None:
+        try:
+            self.snapshot(task_id)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('DUMP ERROR task_id: %r', task_id)
+
+    def _flush_task(self, task_id: str, subtask_ids: Set[str]) -> None:
+        task_data = self._get_task_data(task_id)
+        if task_data is None:
+            return
+        task, state = task_data
+
+        subtasks_given = getattr(task, 'subtasks_given', {})
+        subtasks = {
+            subtask_id: (
+                state.subtask_states.get(subtask_id),
+                subtasks_given.get(subtask_id),
+            ) for subtask_id in subtask_ids
+        }
+        record = {
+            'generation': self._generations.get(task_id),
+            'status': state.status,
+            'task': {attr: getattr(task, attr)
+                     for attr in task.JOURNALED_ATTRS if hasattr(task, attr)},
+            'subtasks': subtasks,
+        }
+        data = pickle.dumps(record, protocol=2)
+
+        self._journal_len[task_id] = self._journal_len.get(task_id, 0) + 1
+        self._writer.submit(self._append_record, task_id, data)
+
+        if self._journal_len[task_id] >= self.compact_after:
+            logger.debug('Compacting journal of task %r', task_id)
+            self.snapshot(task_id)
+
+    @staticmethod
+    def _apply_record(record: dict, task: Task, state: TaskState) -> None:
+        # Unpack the whole record first, so that a malformed one
+        # leaves the task untouched
+        status = record['status']
+        attrs = list(record['task'].items())
+        subtasks = [(subtask_id, subtask_state, given) for
+                    subtask_id, (subtask_state, given)
+                    in record['subtasks'].items()]
+
+        state.status = status
+        for attr, value in attrs:
+            setattr(task, attr, value)
+
+        subtasks_given = getattr(task, 'subtasks_given', None)
+        for subtask_id, subtask_state, given in subtasks:
+            if subtask_state is None:
+                state.subtask_states.pop(subtask_id, None)
+            else:
+                state.subtask_states[subtask_id] = subtask_state
+            if subtasks_given is not None and given is not None:
+                subtasks_given[subtask_id] = given
+
+    @staticmethod
+    def _read_journal(path: Path) -> Iterator[dict]:
+        try:
+            with path.open('rb') as f:
+                while True:
+                    header = f.read(_RECORD_HEADER.size)
+                    if len(header) < _RECORD_HEADER.size:
+                        break
+                    size, = _RECORD_HEADER.unpack(header)
+                    payload = f.read(size)
+                    if len(payload) < size:
+                        logger.warning('Truncated journal record in %r',
+                                       path)
+                        break
+                    try:
+                        record = pickle.loads(payload)
+                    except Exception:  # pylint: disable=broad-except
+                        record = None
+                    if not isinstance(record, dict):
+                        logger.warning('Broken journal record in %r', path)
+                        break
+                    yield record
+        except FileNotFoundError:
+            return
+
+    # Writer thread
+
+    def _write_snapshot(self, task_id: str, data: bytes) -> None:
+        filepath = self.snapshot_path(task_id)
+        tmp_path = filepath.with_suffix(SNAPSHOT_SUFFIX + '.tmp')
+        try:
+            with tmp_path.open('wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(str(tmp_path), str(filepath))
+            # The snapshot includes all the journaled changes
+            with self.journal_path(task_id).open('wb'):
+                pass
+            logger.debug('TASK %s DUMPED in %r', task_id, filepath)
+        except OSError:
+            logger.exception('DUMP ERROR task_id: %r', task_id)
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def _append_record(self, task_id: str, data: bytes) -> None:
+        filepath = self.journal_path(task_id)
+        try:
+            with filepath.open('ab') as f:
+                f.write(_RECORD_HEADER.pack(len(data)) + data)
+        except OSError:
+            logger.exception('JOURNAL ERROR task_id: %r', task_id)
+
+    def _remove_files(self, task_id: str) -> None:
+        for filepath in (self.snapshot_path(task_id),
+                         self.journal_path(task_id)):
+            try:
+                filepath.unlink()
+                logger.debug('TASK DUMP with id %s REMOVED from %r',
+                             task_id, filepath)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning("Couldn't remove dump file: %s - %s",
+                               filepath, e)
@@ -1,6 +1,6 @@
 import logging
 import time
-from collections import defaultdict
+from collections import Counter, defaultdict
 from threading import Lock
 from typing import NamedTuple, Optional
 
@@ -21,6 +21,18 @@ class SubtaskInfo:
     def __init__(self):
         self.latest_status = SubtaskStatus.starting
         self.messages = []
+        # RESULT_DOWNLOADING not yet followed by FINISHED nor NOT_ACCEPTED
+        self.download_in_progress = False
+        # ASSIGNED not yet followed by TIMEOUT, FINISHED, FAILED
+        # nor NOT_ACCEPTED
+        self.assigned = False
+
+    def is_verified(self) -> bool:
+        return self.latest_status == SubtaskStatus.finished
+
+    def is_in_progress(self) -> bool:
+        return self.assigned and self.latest_status not in [
+            SubtaskStatus.finished, SubtaskStatus.failure]
 
 
 class TaskInfo:
@@ -30,6 +42,9 @@ class TaskInfo:
     processes those information to get statistical information. It is probably
     only useful for :py:class:`RequestorTaskStats` objects which fill instances
     of this class with information.
+
+    The counters are updated as the messages arrive, so that reading them
+    does not depend on the number of subtasks and messages.
     """
 
     def __init__(self):
@@ -39,6 +54,14 @@ class TaskInfo:
         self.subtasks = defaultdict(
             SubtaskInfo)  # type: DefaultDict[str, SubtaskInfo]
 
+        self._start_time = 0.0
+        self._finish_time = 0.0
+        self._task_failures = False
+        self._subtask_op_counts = Counter()  # type: Counter[Operation]
+        self._verified_count = 0
+        self._downloading_count = 0
+        self._in_progress_count = 0
+
     def got_want_to_compute(self):
         """Makes note of a received work offer"""
         self._want_to_compute_count += 1
@@ -49,11 +72,48 @@ class TaskInfo:
         self.messages.append(msg)
         self.latest_status = latest_status
 
+        if msg.op in [TaskOp.CREATED, TaskOp.RESTORED]:
+            self._start_time = msg.ts
+        elif msg.op.is_completed():
+            self._finish_time = msg.ts
+        if msg.op in [TaskOp.NOT_ACCEPTED, TaskOp.TIMEOUT]:
+            self._task_failures = True
+
     def got_subtask_message(self, subtask_id: str, msg: TaskMsg,
                             latest_status: SubtaskStatus):
         """Stores information from subtask level message"""
-        self.subtasks[subtask_id].latest_status = latest_status
-        self.subtasks[subtask_id].messages.append(msg)
+        st = self.subtasks[subtask_id]
+        self._count_subtask(st, -1)
+
+        st.latest_status = latest_status
+        st.messages.append(msg)
+        self._subtask_op_counts[msg.op] += 1
+
+        if msg.op == SubtaskOp.RESULT_DOWNLOADING:
+            st.download_in_progress = True
+        elif msg.op in [SubtaskOp.FINISHED,
+                        SubtaskOp.NOT_ACCEPTED]:
+            st.download_in_progress = False
+
+        if msg.op == SubtaskOp.ASSIGNED:
+            st.assigned = True
+        elif msg.op in [SubtaskOp.TIMEOUT,
+                        SubtaskOp.FINISHED,
+                        SubtaskOp.FAILED,
+                        SubtaskOp.NOT_ACCEPTED]:
+            st.assigned = False
+
+        self._count_subtask(st, 1)
+
+    def _count_subtask(self, st: SubtaskInfo, sign: int):
+        """Adds (sign=1) or removes (sign=-1) the subtask from
+        the counters that depend on its latest state"""
+        if st.is_verified():
+            self._verified_count += sign
+        if st.download_in_progress:
+            self._downloading_count += sign
+        if st.is_in_progress():
+            self._in_progress_count += sign
 
     def subtask_count(self) -> int:
         """Number of subtasks of this task"""
@@ -75,19 +135,10 @@ class TaskInfo:
         This is equal to the number of subtasks with the latest state
         ``SubtaskStatus.finished``.
         """
-        cnt = 0
-        for st in self.subtasks.values():
-            if st.latest_status == SubtaskStatus.finished:
-                cnt += 1
-        return cnt
+        return self._verified_count
 
     def _subtasks_count_specific_ops(self, op: Operation):
-        cnt = 0
-        for st in self.subtasks.values():
-            for msg in st.messages:
-                if msg.op == op:
-                    cnt += 1
-        return cnt
+        return self._subtask_op_counts[op]
 
     def not_accepted_results_count(self) -> int:
         """Number of times a subtask failed verification"""
@@ -116,18 +167,7 @@ class TaskInfo:
         also include subtasks that are actively sending results at the moment
         of a call.
         """
-        cnt = 0
-        for st in self.subtasks.values():
-            download_in_progress = False
-            for msg in st.messages:
-                if msg.op == SubtaskOp.RESULT_DOWNLOADING:
-                    download_in_progress = True
-                elif msg.op in [SubtaskOp.FINISHED,
-                                SubtaskOp.NOT_ACCEPTED]:
-                    download_in_progress = False
-            if download_in_progress:
-                cnt += 1
-        return cnt
+        return self._downloading_count
 
     def total_time(self) -> float:
         """Returns total time in seconds spent on the task
@@ -139,19 +179,12 @@ class TaskInfo:
         latter. Note that the time spent paused is also included in
         the total time.
         """
-        start_time = 0.0
-        finish_time = 0.0
+        start_time = self._start_time
+        finish_time = self._finish_time
 
         if not self.is_completed():
             finish_time = time.time()
 
-        for msg in reversed(self.messages):
-            if (msg.op in [TaskOp.CREATED, TaskOp.RESTORED]
-                    and not start_time):
-                start_time = msg.ts
-            elif msg.op.is_completed() and not finish_time:
-                finish_time = msg.ts
-
         assert finish_time >= start_time
         return finish_time - start_time
 
@@ -161,17 +194,12 @@ class TaskInfo:
         Both failure to calculate (SUBTASK_FAILED) and failure to verify
         (SUBTASK_NOT_ACCEPTED) are considered failures in this method.
         """
-        for msg in self.messages:
-            if msg.op in [TaskOp.NOT_ACCEPTED,
-                          TaskOp.TIMEOUT]:
-                return True
-        for st in self.subtasks.values():
-            for msg in st.messages:
-                if msg.op in [SubtaskOp.FAILED,
-                              SubtaskOp.NOT_ACCEPTED,
-                              SubtaskOp.TIMEOUT]:
-                    return True
-        return False
+        if self._task_failures:
+            return True
+        return any(self._subtask_op_counts[op] for op in [
+            SubtaskOp.FAILED,
+            SubtaskOp.NOT_ACCEPTED,
+            SubtaskOp.TIMEOUT])
 
     def is_completed(self) -> bool:
         """Has the task already been completed
@@ -202,24 +230,7 @@ class TaskInfo:
         """
         if self.is_completed():
             return 0
-
-        cnt = 0
-        for st in self.subtasks.values():
-            if st.latest_status in [SubtaskStatus.finished,
-                                    SubtaskStatus.failure]:
-                continue
-            in_progress = False
-            for msg in st.messages:
-                if msg.op == SubtaskOp.ASSIGNED:
-                    in_progress = True
-                elif msg.op in [SubtaskOp.TIMEOUT,
-                                SubtaskOp.FINISHED,
-                                SubtaskOp.FAILED,
-                                SubtaskOp.NOT_ACCEPTED]:
-                    in_progress = False
-            if in_progress:
-                cnt += 1
-        return cnt
+        return self._in_progress_count
 
 
 TaskStats = NamedTuple("TaskStats", [("finished", bool),
@@ -52,6 +52,7 @@ from golem.task.taskbase import Task, AcceptClientVerdict
 from golem.task.taskconnectionshelper import TaskConnectionsHelper
 from golem.task.taskstate import TaskOp
 from golem.utils import decode_hex
+from golem.verificator.blender_verifier import BlenderVerifier
 
 from .result.resultmanager import ExtractedPackage
 from .server import concent
@@ -133,6 +134,13 @@ class TaskServer(
         self.task_sessions_outgoing: weakref.WeakSet = weakref.WeakSet()
 
         OfferPool.change_interval(self.config_desc.offer_pooling_interval)
+        CoreTask.VERIFICATION_QUEUE.get_slot_host_config = \
+            self.task_computer.docker_manager.get_slot_host_config
+        CoreTask.VERIFICATION_QUEUE.set_concurrency(
+            self.config_desc.max_concurrent_verifications,
+            self.config_desc.num_cores)
+        BlenderVerifier.WARM_CONTAINERS.set_idle_timeout(
+            self.config_desc.verifier_container_idle_timeout)
 
         self.max_trust = 1.0
         self.min_trust = 0.0
@@ -315,12 +323,15 @@ class TaskServer(
             price = min(price, theader.max_price)
             self.task_manager.add_comp_task_request(
                 theader=theader, price=price)
+            # Memory is split between the concurrently computed subtasks
+            max_memory_size = self.config_desc.max_memory_size // max(
+                1, self.config_desc.max_concurrent_subtasks)
             wtct = message.tasks.WantToComputeTask(
                 node_name=self.config_desc.node_name,
                 perf_index=performance,
                 price=price,
                 max_resource_size=self.config_desc.max_resource_size,
-                max_memory_size=self.config_desc.max_memory_size,
+                max_memory_size=max_memory_size,
                 concent_enabled=self.client.concent_service.enabled,
                 provider_public_key=self.get_key_id(),
                 provider_ethereum_public_key=self.get_key_id(),
@@ -520,6 +531,11 @@ class TaskServer(
         self.config_desc = config_desc
         self.last_message_time_threshold = config_desc.task_session_timeout
         self.task_keeper.change_config(config_desc)
+        CoreTask.VERIFICATION_QUEUE.set_concurrency(
+            config_desc.max_concurrent_verifications,
+            config_desc.num_cores)
+        BlenderVerifier.WARM_CONTAINERS.set_idle_timeout(
+            config_desc.verifier_container_idle_timeout)
         return self.task_computer.change_config(
             config_desc, run_benchmarks=run_benchmarks)
 
@@ -717,6 +733,7 @@ class TaskServer(
 
     def quit(self):
         self.task_computer.quit()
+        BlenderVerifier.WARM_CONTAINERS.stop()
 
     def remove_responses(self, conn_id):
         self.response_list.pop(conn_id, None)
@@ -719,7 +719,7 @@ class TaskSession(BasicSafeSession, ResourceHandshakeSessionMixin):
 
         reasons = message.tasks.CannotComputeTask.REASON
 
-        if self.task_computer.has_assigned_task():
+        if not self.task_computer.has_free_slot():
             _cannot_compute(reasons.OfferCancelled)
             return
 
@@ -1,6 +1,7 @@
 from datetime import datetime
-from typing import Type
+from typing import Callable, Dict, List, Optional, Tuple, Type
 
+import itertools
 import logging
 import numpy
 import os
@@ -10,15 +11,237 @@ from golem.verificator.verifier import SubtaskVerificationState
 
 from .rendering_verifier import FrameRenderingVerifier
 from twisted.internet.defer import Deferred
+from twisted.internet.task import LoopingCall
+from twisted.python.failure import Failure
 
 logger = logging.getLogger(__name__)
 
 
+class WarmVerifierContainer:
+    """ A verifier container kept running between the verifications of one
+    task. Verifications are written as job files to the jobs directory of
+    its work dir and the jobs waiting together are verified by a single
+    Blender invocation, see verifier_tools/job_server.py in the image. """
+
+    ENTRYPOINT = "python3 /golem/entrypoints/verifier_server_entrypoint.py"
+    CONTAINER_WORK_DIR = '/golem/work'
+    POLL_INTERVAL = 0.5
+    # Job files sort in the order they were submitted in
+    _sequence = itertools.count()
+
+    # pylint: disable=too-many-arguments
+    def __init__(self,
+                 docker_task_cls: Type,
+                 docker_images: List[Tuple[str, str]],
+                 resources: str,
+                 work_dir: str,
+                 idle_timeout: int,
+                 max_batch_size: int,
+                 on_exit: Callable,
+                 host_config: Optional[dict] = None) -> None:
+        self.docker_task_cls = docker_task_cls
+        self.docker_images = docker_images
+        self.resources = resources
+        self.work_dir = work_dir
+        self.jobs_dir = os.path.join(work_dir, 'jobs')
+        self.idle_timeout = idle_timeout
+        self.max_batch_size = max_batch_size
+        self.on_exit = on_exit
+        self.host_config = host_config or dict()
+        self.docker_task = None
+        self.running = False
+        self.pending: Dict[str, Deferred] = dict()
+        # job id -> verdict.json of the job in the work dir
+        self.verdict_paths: Dict[str, str] = dict()
+        self._poller = LoopingCall(self.poll)
+
+    def start(self) -> None:
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        # Leftovers of an earlier container, unless resubmitted
+        for name in os.listdir(self.jobs_dir):
+            if name.split('.')[0] not in self.pending:
+                os.remove(os.path.join(self.jobs_dir, name))
+
+        dir_mapping = self.docker_task_cls.specify_dir_mapping(
+            resources=self.resources,
+            temporary=self.work_dir,
+            work=self.work_dir,
+            output=os.path.join(self.work_dir, "output"),
+            logs=os.path.join(self.work_dir, "logs"),
+        )
+        extra_data = dict(
+            idle_timeout=self.idle_timeout,
+            max_batch_size=self.max_batch_size,
+            entrypoint=self.ENTRYPOINT,
+        )
+        self.docker_task = self.docker_task_cls(
+            docker_images=self.docker_images,
+            extra_data=extra_data,
+            dir_mapping=dir_mapping,
+            timeout=0,
+            host_config=self.host_config)
+
+        from twisted.internet import reactor
+        self.running = True
+        d = self.docker_task.start()
+        d.addBoth(lambda result: reactor.callFromThread(self._exited, result))
+        self._poller.start(self.POLL_INTERVAL, now=False)
+
+    def submit(self, job: dict) -> Tuple[str, Deferred]:
+        """ Queues a job, the deferred fires with its verdict.json """
+        job_id = '{:010d}'.format(next(self._sequence))
+        path = os.path.join(self.jobs_dir, job_id + '.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump(job, f)
+        os.replace(path + '.tmp', path)
+
+        if job.get('output_dir'):
+            self.verdict_paths[job_id] = os.path.join(
+                self.work_dir,
+                os.path.relpath(job['output_dir'], self.CONTAINER_WORK_DIR),
+                'verdict.json')
+
+        deferred = Deferred()
+        self.pending[job_id] = deferred
+        return job_id, deferred
+
+    def cancel(self, job_id: str) -> None:
+        """ Removes the job file, the container skips the jobs without one,
+        and whatever the job has written so far """
+        if self.pending.pop(job_id, None) is None:
+            return
+        paths = [os.path.join(self.jobs_dir, job_id + '.json'),
+                 os.path.join(self.jobs_dir, job_id + '.done')]
+        verdict_path = self.verdict_paths.pop(job_id, None)
+        if verdict_path:
+            paths.append(verdict_path)
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # Not written yet or already removed
+
+    def poll(self) -> None:
+        for job_id in list(self.pending):
+            done_path = os.path.join(self.jobs_dir, job_id + '.done')
+            if not os.path.exists(done_path):
+                continue
+            with open(done_path, 'r') as f:
+                result = json.load(f)
+            os.remove(done_path)
+
+            self.verdict_paths.pop(job_id, None)
+            deferred = self.pending.pop(job_id)
+            if 'error' in result:
+                deferred.errback(Exception(result['error']))
+            else:
+                deferred.callback(result)
+
+    def stop(self) -> None:
+        if self.docker_task:
+            self.docker_task.end_comp()
+
+    def _exited(self, result) -> None:
+        self.running = False
+        if self._poller.running:
+            self._poller.stop()
+        self.poll()
+        pending, self.pending = self.pending, dict()
+        self.on_exit(self, pending, result)
+
+
+class WarmVerifierContainers:
+    """ Warm verifier containers by the resources and the work directory
+    they verify the results of, i.e. one per task. The container renders
+    the crops of the scenes it gets jobs for in separate batches. Disabled
+    while idle_timeout is 0. """
+
+    MAX_BATCH_SIZE = 8
+
+    def __init__(self) -> None:
+        self.idle_timeout = 0
+        self._containers: Dict[Tuple[str, str], WarmVerifierContainer] = dict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.idle_timeout > 0
+
+    def set_idle_timeout(self, idle_timeout: Optional[int]) -> None:
+        """ Seconds a container waits for another verification before it
+        exits, 0 verifies each subtask in a container of its own """
+        self.idle_timeout = max(0, idle_timeout or 0)
+
+    # pylint: disable=too-many-arguments
+    def submit(self,
+               docker_task_cls: Type,
+               docker_images: List[Tuple[str, str]],
+               resources: str,
+               work_dir: str,
+               job: dict,
+               host_config: Optional[dict] = None) \
+            -> Tuple[WarmVerifierContainer, str, Deferred]:
+        """ Queues the job in the container of the task, a new container
+        is started with `host_config` """
+        key = (resources, work_dir)
+        container = self._containers.get(key)
+        if not container or not container.running:
+            container = self._start(key, docker_task_cls, docker_images,
+                                    host_config=host_config)
+        job_id, deferred = container.submit(job)
+        return container, job_id, deferred
+
+    def stop(self) -> None:
+        for container in list(self._containers.values()):
+            container.stop()
+
+    def _start(self,
+               key: Tuple[str, str],
+               docker_task_cls: Type,
+               docker_images: List[Tuple[str, str]],
+               pending: Optional[Dict[str, Deferred]] = None,
+               verdict_paths: Optional[Dict[str, str]] = None,
+               host_config: Optional[dict] = None) \
+            -> WarmVerifierContainer:
+        resources, work_dir = key
+        container = WarmVerifierContainer(
+            docker_task_cls, docker_images, resources, work_dir,
+            self.idle_timeout, self.MAX_BATCH_SIZE,
+            on_exit=lambda *args: self._exited(key, *args),
+            host_config=host_config)
+        container.pending.update(pending or {})
+        container.verdict_paths.update(verdict_paths or {})
+        container.start()
+        self._containers[key] = container
+        return container
+
+    def _exited(self,
+                key: Tuple[str, str],
+                container: WarmVerifierContainer,
+                pending: Dict[str, Deferred],
+                result) -> None:
+        logger.debug("Warm verifier container exited: %r", key)
+        if self._containers.get(key) is container:
+            del self._containers[key]
+        if not pending:
+            return
+
+        if isinstance(result, Failure):
+            for deferred in pending.values():
+                deferred.errback(result)
+        else:
+            # Exited idle right after the jobs were submitted
+            self._start(key, container.docker_task_cls,
+                        container.docker_images, pending,
+                        container.verdict_paths, container.host_config)
+
+
 # FIXME #2086
 # pylint: disable=R0902
 class BlenderVerifier(FrameRenderingVerifier):
     DOCKER_NAME = "golemfactory/blender_verifier"
-    DOCKER_TAG = '1.1'
+    DOCKER_TAG = '1.2'
+
+    WARM_CONTAINERS = WarmVerifierContainers()
 
     def __init__(self, verification_data,
                  docker_task_cls: Type) -> None:
@@ -27,6 +250,7 @@ class BlenderVerifier(FrameRenderingVerifier):
         self.docker_task_cls = docker_task_cls
         self.timeout = 0
         self.docker_task = None
+        self.warm_job: Optional[Tuple[WarmVerifierContainer, str]] = None
 
     def _get_part_size(self, subtask_info):
         if subtask_info['use_frames'] and len(subtask_info['all_frames']) \
@@ -54,6 +278,9 @@ class BlenderVerifier(FrameRenderingVerifier):
     def stop(self):
         if self.docker_task:
             self.docker_task.end_comp()
+        if self.warm_job:
+            container, job_id = self.warm_job
+            container.cancel(job_id)
 
     def start_rendering(self, timeout=0):
         self.timeout = timeout
@@ -100,11 +327,16 @@ class BlenderVerifier(FrameRenderingVerifier):
             entrypoint="python3 /golem/entrypoints/verifier_entrypoint.py",
         )
 
+        if self.WARM_CONTAINERS.enabled:
+            self._start_warm(extra_data, dir_mapping)
+            return
+
         self.docker_task = self.docker_task_cls(
             docker_images=[(self.DOCKER_NAME, self.DOCKER_TAG)],
             extra_data=extra_data,
             dir_mapping=dir_mapping,
-            timeout=self.timeout)
+            timeout=self.timeout,
+            host_config=self.verification_data.get('host_config'))
 
         def error(e):
             logger.warning("Verification process exception %s", e)
@@ -114,18 +346,49 @@ class BlenderVerifier(FrameRenderingVerifier):
             with open(os.path.join(dir_mapping.output, 'verdict.json'), 'r') \
                     as f:
                 verdict = json.load(f)
-
-            logger.info(
-                "Subtask %s verification verdict: %s",
-                subtask_info['subtask_id'],
-                verdict,
-            )
-            if verdict['verdict']:
-                self.finished.callback(True)
-            else:
-                self.finished.errback(
-                    Exception('Verification result negative', verdict))
+            self._verdict_received(verdict)
 
         d = self.docker_task.start()
         d.addErrback(error)
         d.addCallback(callback)
+
+    def _start_warm(self, extra_data, dir_mapping):
+        """ Queues the verification in the warm container of the scene. Its
+        work dir is the parent of the subtask's one. """
+        subtask_dir = '{}/{}'.format(
+            WarmVerifierContainer.CONTAINER_WORK_DIR,
+            os.path.basename(str(dir_mapping.work)))
+        job = dict(
+            extra_data,
+            subtask_paths=['{}/{}'.format(subtask_dir, os.path.basename(i))
+                           for i in self.verification_data['results']],
+            output_dir='{}/output'.format(subtask_dir),
+        )
+        del job['entrypoint']
+
+        container, job_id, d = self.WARM_CONTAINERS.submit(
+            self.docker_task_cls,
+            [(self.DOCKER_NAME, self.DOCKER_TAG)],
+            str(dir_mapping.resources),
+            str(dir_mapping.temporary),
+            job,
+            self.verification_data.get('host_config'))
+        self.warm_job = container, job_id
+
+        def error(e):
+            logger.warning("Verification process exception %s", e)
+            self.finished.errback(e)
+
+        d.addCallbacks(self._verdict_received, error)
+
+    def _verdict_received(self, verdict):
+        logger.info(
+            "Subtask %s verification verdict: %s",
+            self.verification_data['subtask_info']['subtask_id'],
+            verdict,
+        )
+        if verdict['verdict']:
+            self.finished.callback(True)
+        else:
+            self.finished.errback(
+                Exception('Verification result negative', verdict))
@@ -100,6 +100,41 @@ True
         bpy_m.ops.render.render.assert_not_called()
         bpy_m.ops.file.report_missing_files.assert_called_once_with()
 
+    def test_batch_file_generation(self):
+        """Renders every frame of every crop from a single script."""
+        crops = [
+            {'borders_x': (0.0, 0.5), 'borders_y': (0.0, 0.5), 'frames': [1],
+             'filepath': '/golem/output/crop0_'},
+            {'borders_x': (0.5, 1.0), 'borders_y': (0.5, 1.0),
+             'frames': [2, 3], 'filepath': '/golem/work/sub/output/crop1_'},
+        ]
+        path = scenefileeditor.generate_blender_batch_file(
+            'batch.py', (10, 20), crops, False, 5,
+            {'WORK_DIR': self.tempdir})
+
+        scene_m = mock.MagicMock()
+        scene_m.render = mock.NonCallableMock()
+        bpy_m = mock.MagicMock()
+        bpy_m.context.scene = scene_m
+        rendered = []
+        bpy_m.ops.render.render.side_effect = lambda **_: rendered.append(
+            (scene_m.render.filepath, scene_m.render.border_min_x,
+             scene_m.render.border_max_y))
+
+        with open(path) as f:
+            script = f.read().replace('import bpy', '')
+        globs = dict(globals())
+        globs['bpy'] = bpy_m
+        exec(script, globs)
+
+        self.assertEqual(rendered, [
+            ('/golem/output/crop0_0001', 0.0, 0.5),
+            ('/golem/work/sub/output/crop1_0002', 0.5, 1.0),
+            ('/golem/work/sub/output/crop1_0003', 0.5, 1.0),
+        ])
+        bpy_m.ops.render.render.assert_called_with(write_still=True)
+        self.assertEqual(scene_m.render.resolution_x, 10)
+
     def tearDown(self):
         super(TestSceneFileEditor, self).tearDown()
         reload(scenefileeditor)
@@ -0,0 +1,143 @@
+import os
+import random
+import uuid
+from unittest import mock
+
+import numpy
+import pytest
+from golem_messages.factories.datastructures import p2p as dt_p2p_factory
+from twisted.internet.task import Clock
+
+from apps.blender.task.blenderrendertask import (BlenderRendererOptions,
+                                                 BlenderRenderTask)
+from apps.rendering.resources.imgrepr import OpenCVImgRepr
+from apps.rendering.resources.previewcompositor import PreviewCompositor
+from apps.rendering.task.renderingtask import PREVIEW_EXT
+from apps.rendering.task.renderingtaskstate import RenderingTaskDefinition
+from golem.resource.dirmanager import DirManager
+from golem.task.taskstate import SubtaskStatus
+
+RESOLUTION = [1920, 1080]
+FRAMES = [1, 2, 3, 4]
+
+
+def skip_benchmarks():
+    if os.environ.get('benchmarks', False):
+        return False
+    return True
+
+
+class LegacyBlenderRenderTask(BlenderRenderTask):
+    """ The previous preview handling: previews read from and written to
+    disk on every update, areas marked pixel by pixel """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.preview_compositor = PreviewCompositor(PREVIEW_EXT, interval=0)
+
+    @staticmethod
+    def mark_part_on_preview(part, img_task, color, preview_updater):
+        lower = preview_updater.get_offset(part)
+        upper = preview_updater.get_offset(part + 1)
+        for i in range(0, preview_updater.preview_res_x):
+            for j in range(lower, upper):
+                img_task.set_pixel((i, j), color)
+
+
+def build_task(task_cls, root: str, subtasks: int, use_frames: bool,
+               resolution: list = RESOLUTION) -> BlenderRenderTask:
+    task_definition = RenderingTaskDefinition()
+    task_definition.options = BlenderRendererOptions()
+    task_definition.options.use_frames = use_frames
+    task_definition.options.frames = FRAMES if use_frames else [1]
+    task_definition.output_file = os.path.join(root, 'output')
+    task_definition.output_format = 'PNG'
+    task_definition.resolution = resolution
+    task_definition.main_scene_file = os.path.join(root, 'example.blend')
+    task_definition.task_id = str(uuid.uuid4())
+    task = task_cls(
+        owner=dt_p2p_factory.Node(),
+        task_definition=task_definition,
+        total_tasks=subtasks,
+        root_path=root)
+    task.initialize(DirManager(root))
+    return task
+
+
+def give_subtasks(task: BlenderRenderTask, root: str) -> list:
+    """ Every subtask handed out to a provider and its result on disk, in
+    the random order in which the results arrive """
+    parts = task.total_tasks // len(task.frames) if task.use_frames \
+        else task.total_tasks
+    width, height = task.res_x, task.res_y
+    rng = numpy.random.RandomState(0)
+    chunk = os.path.join(root, 'chunk.png')
+    OpenCVImgRepr.empty(width, height // parts, color=tuple(
+        int(c) for c in rng.randint(0, 255, 3))).save(chunk)
+
+    task.accept_client('node')
+    subtask_ids = []
+    for start_task in range(1, task.total_tasks + 1):
+        subtask_id = 'subtask-{}'.format(start_task)
+        frames = [task.frames[(start_task - 1) // parts]] \
+            if task.use_frames else [1]
+        task.subtasks_given[subtask_id] = {
+            'start_task': start_task,
+            'node_id': 'node',
+            'parts': parts,
+            'frames': frames,
+            'status': SubtaskStatus.downloading,
+        }
+        subtask_ids.append(subtask_id)
+    random.Random(0).shuffle(subtask_ids)
+    return [(subtask_id, [chunk]) for subtask_id in subtask_ids]
+
+
+def accept_all(task: BlenderRenderTask, results: list) -> None:
+    """ Accepts the results one by one and reads the preview, as the RPC
+    does, once they are all in. Assembling the output is left out. """
+    with mock.patch('twisted.internet.reactor', Clock(), create=True), \
+            mock.patch.object(task, '_put_image_together'), \
+            mock.patch.object(task, '_put_frame_together'):
+        for subtask_id, result_files in results:
+            task.accept_results(subtask_id, result_files)
+        task.update_task_state(mock.Mock(extra_data={}))
+
+
+def previews(task: BlenderRenderTask) -> list:
+    paths = task.preview_file_path if task.use_frames \
+        else [task.preview_file_path, task.preview_task_file_path]
+    return [OpenCVImgRepr.from_image_file(path).img for path in paths]
+
+
+@pytest.mark.parametrize("use_frames", [False, True])
+def test_same_previews(tmpdir, use_frames):
+    results = []
+    for task_cls in (LegacyBlenderRenderTask, BlenderRenderTask):
+        root = str(tmpdir.mkdir(task_cls.__name__))
+        task = build_task(task_cls, root, 16, use_frames, [320, 180])
+        accept_all(task, give_subtasks(task, root))
+        results.append(previews(task))
+    for legacy, current in zip(*results):
+        assert (legacy == current).all()
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("subtasks", [16, 64])
+@pytest.mark.parametrize("use_frames", [False, True], ids=['image', 'frames'])
+@pytest.mark.parametrize("task_cls", [
+    LegacyBlenderRenderTask,
+    BlenderRenderTask,
+], ids=['legacy', 'in_memory'])
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_accept_results(benchmark, tmpdir, subtasks, use_frames, task_cls):
+    rounds = iter(range(100))
+
+    def setup():
+        root = str(tmpdir.mkdir('round-{}'.format(next(rounds))))
+        task = build_task(task_cls, root, subtasks, use_frames)
+        return (task, give_subtasks(task, root)), {}
+
+    benchmark.pedantic(accept_all, setup=setup, rounds=1)
+    benchmark.extra_info['subtasks_per_second'] = \
+        subtasks / benchmark.stats.stats.mean
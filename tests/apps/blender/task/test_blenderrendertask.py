@@ -495,6 +495,7 @@ class TestBlenderTask(TempDirFixture, LogTestCase):
         img1.close()
 
         bt._update_frame_preview(file1, 1, part=1, final=True)
+        bt.preview_compositor.flush()
         img = cv2.imread(file3)
         self.assertTrue(img.shape[:2] == (200, 300))
         img = cv2.imread(file4)
@@ -0,0 +1,82 @@
+import os
+
+import numpy
+import pytest
+from PIL import Image
+
+pytest.importorskip('OpenEXR')
+pytest.importorskip('sklearn')
+pytest.importorskip('pywt')
+
+# pylint: disable=wrong-import-position
+from apps.blender.resources.images.entrypoints.scripts.verifier_tools import (  # noqa
+    img_metrics_calculator as calculator,
+    mass_center_distance,
+    variance,
+    wavelet,
+)
+
+# Metrics that do not need OpenCV and SciPy
+METRICS = [
+    mass_center_distance.MetricMassCenterDistance,
+    variance.ImageVariance,
+    wavelet.MetricWavelet,
+]
+
+
+def skip_benchmarks():
+    if os.environ.get('benchmarks', False):
+        return False
+    return True
+
+
+@pytest.fixture(scope='module')
+def scene(tmpdir_factory):
+    """ A synthetic 4K frame saved as PNG and the crop of its reference
+    render, with noise so that no offset crop matches """
+    rng = numpy.random.RandomState(0)
+    width, height, size = 3840, 2160, 512
+    gradient = numpy.linspace(0, 200, width)
+    frame = gradient[None, :, None] + rng.randint(0, 55, (height, width, 3))
+    frame = frame.astype(numpy.uint8)
+    x, y = width // 3, height // 3
+    reference = frame[y:y + size, x:x + size] ^ rng.randint(
+        0, 8, (size, size, 3), dtype=numpy.uint8)
+
+    path = tmpdir_factory.mktemp('scene')
+    scene_path = str(path.join('scene.png'))
+    reference_path = str(path.join('reference.png'))
+    Image.fromarray(frame, 'RGB').save(scene_path)
+    Image.fromarray(reference, 'RGB').save(reference_path)
+    return reference_path, scene_path, x, y
+
+
+def score_all(reference_path, scene_path, x, y, processes):
+    """ Scores the offset crops the way calculate_metrics does when the
+    default crop does not match """
+    reference, crops, _ = \
+        calculator._load_and_prepare_images_for_comparison(  # noqa pylint: disable=protected-access
+            reference_path, scene_path, x, y)
+    return [metrics for _, metrics in calculator.score_crops(
+        reference, crops[1:], METRICS,
+        lambda _: calculator.VERIFICATION_FAIL, processes=processes)]
+
+
+def test_same_results(scene):
+    # pylint: disable=redefined-outer-name
+    sequential = score_all(*scene, processes=1)
+    parallel = score_all(*scene, processes=4)
+    assert len(sequential) == len(parallel) == 8
+    for old, new in zip(sequential, parallel):
+        assert old.keys() == new.keys()
+        for key in old:
+            assert old[key] == new[key], key
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("processes", [1, 2, 4, 8])
+@pytest.mark.benchmark(min_rounds=3, warmup=False)
+def test_score_crops(benchmark, scene, processes):
+    # pylint: disable=redefined-outer-name
+    benchmark.pedantic(score_all, args=scene + (processes,), rounds=3)
+    benchmark.extra_info['cpu_count'] = os.cpu_count()
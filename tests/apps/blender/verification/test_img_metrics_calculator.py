@@ -0,0 +1,29 @@
+from unittest import TestCase, mock
+
+from apps.blender.resources.images.entrypoints.scripts.verifier_tools import \
+    img_metrics_calculator as calculator
+
+
+@mock.patch('os.cpu_count', return_value=16)
+class TestAvailableCpus(TestCase):
+
+    @mock.patch('os.sched_getaffinity', return_value={2, 3}, create=True)
+    def test_cpu_set(self, _affinity, _cpu_count):
+        assert calculator.available_cpus() == 2
+
+    @mock.patch('os.sched_getaffinity', side_effect=AttributeError,
+                create=True)
+    def test_without_affinity(self, _affinity, _cpu_count):
+        assert calculator.available_cpus() == 16
+
+    @mock.patch('os.sched_getaffinity', return_value={0}, create=True)
+    def test_score_crops_pool_size(self, _affinity, _cpu_count):
+        with mock.patch.object(calculator, 'compare_images',
+                               side_effect=lambda *_: {}), \
+                mock.patch('multiprocessing.get_context') as get_context:
+            scored = list(calculator.score_crops(
+                'reference', ['crop-0', 'crop-1'], [], lambda _: 'FALSE'))
+        # One available core, the crops are scored in this process
+        get_context.assert_not_called()
+        assert scored == [('crop-0', {'Label': 'FALSE'}),
+                          ('crop-1', {'Label': 'FALSE'})]
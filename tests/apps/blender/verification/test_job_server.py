@@ -0,0 +1,81 @@
+import json
+import os
+from unittest import mock
+
+from golem.testutils import TempDirFixture
+
+from apps.blender.resources.images.entrypoints.scripts.verifier_tools import \
+    job_server
+
+
+def job(scene='/golem/resources/scene.blend'):
+    return {'scene_path': scene, 'resolution': [100, 100], 'samples': 10,
+            'output_format': 'PNG'}
+
+
+class TestJobServer(TempDirFixture):
+
+    def setUp(self):
+        super().setUp()
+        self.jobs_dir = os.path.join(self.tempdir, 'jobs')
+        os.makedirs(self.jobs_dir)
+
+    def _write_job(self, job_id, content):
+        with open(os.path.join(self.jobs_dir, job_id + '.json'), 'w') as f:
+            f.write(content if isinstance(content, str)
+                    else json.dumps(content))
+
+    def _result(self, job_id):
+        with open(os.path.join(self.jobs_dir, job_id + '.done')) as f:
+            return json.load(f)
+
+    def _serve(self, verify_many):
+        with mock.patch.object(job_server, 'verify_many', verify_many):
+            job_server.serve(self.jobs_dir, idle_timeout=0)
+
+    def test_batches(self):
+        self._write_job('0001', job())
+        self._write_job('0002', job(scene='/golem/resources/other.blend'))
+        self._write_job('0003', job())
+        verify_many = mock.Mock(side_effect=lambda jobs, _: [True] * len(jobs))
+
+        self._serve(verify_many)
+
+        assert verify_many.call_count == 2
+        assert [len(c[0][0]) for c in verify_many.call_args_list] == [2, 1]
+        for job_id in ('0001', '0002', '0003'):
+            assert self._result(job_id) == {'verdict': True}
+        assert sorted(os.listdir(self.jobs_dir)) == \
+            ['0001.done', '0002.done', '0003.done']
+
+    def test_broken_job(self):
+        self._write_job('0001', '{"scene_pa')
+        self._write_job('0002', {'scene_path': 'no resolution'})
+        self._write_job('0003', job())
+
+        self._serve(lambda jobs, _: [True] * len(jobs))
+
+        assert 'error' in self._result('0001')
+        assert 'error' in self._result('0002')
+        assert self._result('0003') == {'verdict': True}
+
+    def test_cancelled_job(self):
+        self._write_job('0001', job())
+        self._write_job('0002', job())
+
+        def verify_many(jobs, _):
+            # Cancelled while being verified
+            os.remove(os.path.join(self.jobs_dir, '0002.json'))
+            return [True] * len(jobs)
+
+        self._serve(verify_many)
+
+        assert self._result('0001') == {'verdict': True}
+        assert os.listdir(self.jobs_dir) == ['0001.done']
+
+    def test_cancelled_before_load(self):
+        self._write_job('0001', job())
+        with mock.patch.object(job_server, 'pending_jobs',
+                               return_value=['0000', '0001']):
+            batch = job_server.next_batch(self.jobs_dir, 8)
+        assert [job_id for job_id, _ in batch] == ['0001']
@@ -0,0 +1,172 @@
+import os
+
+import numpy
+import pytest
+from PIL import Image
+
+from apps.blender.resources.images.entrypoints.scripts.verifier_tools \
+    import mass_center_distance
+
+pywt = pytest.importorskip('pywt')
+
+# pylint: disable=wrong-import-position
+from apps.blender.resources.images.entrypoints.scripts.verifier_tools \
+    import wavelet  # noqa
+
+TEST_DATA = os.path.join(os.path.dirname(__file__), 'test_data')
+SAMPLES = [
+    ('GolemTask_10001.png', 'GolemTask_10002.png'),
+    ('GolemTask_10001.png', 'almost_good_image.png'),
+    ('GolemTask_10001.png', 'very_bad_image.png'),
+]
+
+
+def skip_benchmarks():
+    if os.environ.get('benchmarks', False):
+        return False
+    return True
+
+
+def legacy_mass_centers(image):
+    """ The previous MetricMassCenterDistance.compute_mass_centers """
+    image = image.convert('RGB')
+    pixels = image.load()
+    width, height = image.size
+    results = dict()
+    for channel_index in range(len(pixels[0, 0])):
+        mass_center_x = 0
+        mass_center_y = 0
+        total_mass = 0
+        for x in range(width):
+            for y in range(height):
+                mass = pixels[x, y][channel_index]
+                mass_center_x += mass * x
+                mass_center_y += mass * y
+                total_mass += mass
+        divisor_x = (float(total_mass) * width)
+        divisor_y = (float(total_mass) * height)
+        mass_center_x = 0.5 if divisor_x == 0 else mass_center_x / divisor_x
+        mass_center_y = 0.5 if divisor_y == 0 else mass_center_y / divisor_y
+        results[channel_index] = mass_center_x, mass_center_y
+    return results
+
+
+def legacy_mass_center_distance(image1, image2):
+    centers_1 = legacy_mass_centers(image1)
+    centers_2 = legacy_mass_centers(image2)
+    return {
+        'max_x_mass_center_distance': max(
+            abs(centers_1[c][0] - centers_2[c][0]) for c in centers_1),
+        'max_y_mass_center_distance': max(
+            abs(centers_1[c][1] - centers_2[c][1]) for c in centers_1),
+    }
+
+
+def legacy_mse(coeff1, coeff2, low, high):
+    if low == high:
+        if low == 0:
+            high = low + 1
+        else:
+            low = high - 1
+    suma = 0
+    num = 0
+    for i in range(low, high):
+        if isinstance(coeff1[i], tuple):
+            for j in range(3):
+                suma += sum(sum((coeff1[i][j] - coeff2[i][j]) ** 2))
+            num += 3 * coeff1[i][0].size
+        else:
+            suma += sum(sum((coeff1[i] - coeff2[i]) ** 2))
+            num += coeff1[i].size
+    return 0 if num == 0 else suma / num
+
+
+def legacy_wavelet(image1, image2):
+    """ The previous MetricWavelet.compute_metrics: one decomposition per
+    channel, coefficients summed with Python's sum """
+    np_image1 = numpy.array(image1.convert('RGB'))
+    np_image2 = numpy.array(image2.convert('RGB'))
+    result = dict()
+    for name in ('db4', 'sym2', 'haar'):
+        for level in ('base', 'low', 'mid', 'high'):
+            result['wavelet_{}_{}'.format(name, level)] = 0
+        for i in range(3):
+            coeff1 = pywt.wavedec2(np_image1[..., i], name)
+            coeff2 = pywt.wavedec2(np_image2[..., i], name)
+            total = len(coeff1) - 1
+            div_3 = int(total / 3)
+            two_thirds = int(total * 2 / 3)
+            for level, (low, high) in (
+                    ('base', (0, 1)),
+                    ('low', (1, 1 + div_3)),
+                    ('mid', (1 + div_3, 1 + two_thirds)),
+                    ('high', (1 + two_thirds, 1 + total))):
+                result['wavelet_{}_{}'.format(name, level)] += \
+                    legacy_mse(coeff1, coeff2, low, high)
+            if name != 'haar':
+                continue
+            freqs = []
+            for level in range(len(coeff1) - 3, len(coeff1)):
+                sum1 = sum(sum(sum(numpy.absolute(coeff1[level]))))
+                sum2 = sum(sum(sum(numpy.absolute(coeff2[level]))))
+                freqs = [numpy.absolute(sum2 - sum1)
+                         / (3 * coeff1[level][0].size)] + freqs
+            for x, freq in enumerate(freqs, 1):
+                key = 'wavelet_haar_freq_x{}'.format(x)
+                result[key] = result.get(key, 0) + freq
+    return result
+
+
+def load_samples():
+    return [(Image.open(os.path.join(TEST_DATA, a)),
+             Image.open(os.path.join(TEST_DATA, b))) for a, b in SAMPLES]
+
+
+def frame_crops(width: int = 3840, height: int = 2160, size: int = 512):
+    """ The reference crop and the offset crops of a synthetic 4K frame,
+    as compared by img_metrics_calculator """
+    rng = numpy.random.RandomState(0)
+    gradient = numpy.linspace(0, 200, width, dtype=numpy.float64)
+    frame = gradient[None, :, None] + rng.randint(0, 55, (height, width, 3))
+    frame = Image.fromarray(frame.astype(numpy.uint8), 'RGB')
+    x, y = width // 3, height // 3
+    reference = frame.crop((x, y, x + size, y + size))
+    return [(reference, frame.crop((x + dx, y + dy,
+                                    x + dx + size, y + dy + size)))
+            for dx in (0, -1, 1) for dy in (0, -1, 1)]
+
+
+def score(metric, pairs):
+    return [metric(a, b) for a, b in pairs]
+
+
+def assert_same(legacy, current):
+    assert len(legacy) == len(current)
+    for old, new in zip(legacy, current):
+        assert set(old) <= set(new)
+        for key in old:
+            assert numpy.isclose(old[key], new[key], rtol=1e-9, atol=1e-12), \
+                key
+
+
+def test_same_results():
+    pairs = load_samples() + frame_crops(width=640, height=480, size=128)
+    assert_same(score(legacy_mass_center_distance, pairs),
+                score(mass_center_distance.MetricMassCenterDistance
+                      .compute_metrics, pairs))
+    assert_same(score(legacy_wavelet, pairs),
+                score(wavelet.MetricWavelet.compute_metrics, pairs))
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("samples", ['test_data', '4k_crops'])
+@pytest.mark.parametrize("metric", [
+    legacy_mass_center_distance,
+    mass_center_distance.MetricMassCenterDistance.compute_metrics,
+    legacy_wavelet,
+    wavelet.MetricWavelet.compute_metrics,
+], ids=['legacy_mass_center', 'mass_center', 'legacy_wavelet', 'wavelet'])
+@pytest.mark.benchmark(min_rounds=3, warmup=False)
+def test_metric(benchmark, samples, metric):
+    pairs = load_samples() if samples == 'test_data' else frame_crops()
+    benchmark.pedantic(score, args=(metric, pairs), rounds=3)
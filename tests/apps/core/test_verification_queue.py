@@ -0,0 +1,171 @@
+from unittest import TestCase, mock
+
+from twisted.internet.defer import Deferred
+
+from golem.core.common import timeout_to_deadline
+from golem.docker.config import DockerConfigManager
+from golem.verificator.verifier import SubtaskVerificationState
+
+from apps.core.verification_queue import VerificationQueue
+
+
+class PendingVerifier:
+    """ Verification finished by the test through `finish` """
+
+    started: list = []
+
+    def __init__(self, kwargs):
+        self.kwargs = kwargs
+        self.deferred = Deferred()
+
+    @staticmethod
+    def simple_verification(_kwargs):
+        return True
+
+    def start_verification(self, _kwargs):
+        self.started.append(self)
+        return self.deferred
+
+    def verification_completed(self):
+        return (self.kwargs['subtask_info']['subtask_id'],
+                SubtaskVerificationState.VERIFIED, {})
+
+    def finish(self):
+        self.deferred.callback(self.verification_completed())
+
+    def stop(self):
+        pass
+
+
+@mock.patch('twisted.internet.reactor.callFromThread',
+            lambda fn, *args: fn(*args))
+class TestVerificationQueueScheduling(TestCase):
+
+    def setUp(self):
+        PendingVerifier.started = []
+        self.finished = []
+
+    def _submit(self, queue, task_id, subtask_id, timeout=3600, **kwargs):
+        queue.submit(
+            PendingVerifier,
+            subtask_id,
+            timeout_to_deadline(timeout),
+            lambda subtask_id, **_: self.finished.append(subtask_id),
+            task_id=task_id,
+            subtask_info={'subtask_id': subtask_id},
+            **kwargs
+        )
+
+    @staticmethod
+    def _started():
+        return [v.kwargs['subtask_info']['subtask_id']
+                for v in PendingVerifier.started]
+
+    def test_concurrency(self):
+        queue = VerificationQueue(concurrency=2)
+        for i in range(4):
+            self._submit(queue, 'task', 'subtask-{}'.format(i))
+
+        assert self._started() == ['subtask-0', 'subtask-1']
+        assert queue.get_stats()['running'] == 2
+        assert queue.get_stats()['queued'] == 2
+
+        PendingVerifier.started[0].finish()
+        assert self.finished == ['subtask-0']
+        assert self._started() == ['subtask-0', 'subtask-1', 'subtask-2']
+
+    def test_deadline_order(self):
+        queue = VerificationQueue(concurrency=1)
+        self._submit(queue, 'task', 'running')
+        self._submit(queue, 'task', 'late', timeout=7200)
+        self._submit(queue, 'task', 'urgent', timeout=60)
+
+        for _ in range(2):
+            PendingVerifier.started[-1].finish()
+        assert self.finished == ['running', 'urgent']
+        assert self._started()[-1] == 'late'
+
+    def test_fair_share(self):
+        queue = VerificationQueue(concurrency=4)
+        queue.pause()
+        for i in range(10):
+            self._submit(queue, 'big', 'big-{}'.format(i), timeout=60)
+        self._submit(queue, 'small', 'small-0', timeout=7200)
+        self._submit(queue, 'small', 'small-1', timeout=7200)
+        queue.resume()
+
+        assert sorted(self._started()) == \
+            ['big-0', 'big-1', 'small-0', 'small-1']
+        assert queue.get_stats()['running_by_task'] == {'big': 2, 'small': 2}
+
+        # Idle workers are not kept for a task with nothing to verify
+        PendingVerifier.started[-1].finish()
+        assert self._started()[-1] == 'big-2'
+
+    def test_set_concurrency(self):
+        queue = VerificationQueue(concurrency=1)
+        for i in range(3):
+            self._submit(queue, 'task', 'subtask-{}'.format(i))
+        assert len(self._started()) == 1
+
+        queue.set_concurrency(3)
+        assert len(self._started()) == 3
+
+        queue.set_concurrency(0)
+        assert queue.concurrency >= 1
+
+    def test_default_concurrency_from_num_cores(self):
+        queue = VerificationQueue()
+        queue.set_concurrency(0, num_cores=8)
+        assert queue.concurrency == 4
+        queue.set_concurrency(0, num_cores=1)
+        assert queue.concurrency == 1
+        queue.set_concurrency(None)
+        assert queue.concurrency == 1
+
+    @mock.patch('golem.docker.config.hardware.cpus',
+                return_value=list(range(16)))
+    def test_slot_host_configs(self, _cpus):
+        config_manager = DockerConfigManager()
+        config_manager.build_config(mock.Mock(num_cores=4,
+                                              max_memory_size=8 * 1024 ** 2))
+        queue = VerificationQueue()
+        queue.get_slot_host_config = config_manager.get_slot_host_config
+        queue.set_concurrency(0, num_cores=4)
+        for i in range(4):
+            self._submit(queue, 'task', 'subtask-{}'.format(i))
+
+        def host_configs():
+            return [v.kwargs['host_config'] for v in PendingVerifier.started
+                    if not v.deferred.called]
+
+        running = host_configs()
+        assert len(running) == 2
+        assert sum(int(c['mem_limit']) for c in running) <= \
+            8 * 1024 ** 3
+        cores = [c['cpuset_cpus'].split(',') for c in running]
+        assert not set(cores[0]) & set(cores[1])
+        assert set(cores[0]) | set(cores[1]) == {'0', '1', '2', '3'}
+
+        # A finished verification frees its slot for the next one
+        PendingVerifier.started[0].finish()
+        assert sorted(c['cpuset_cpus'] for c in host_configs()) == \
+            sorted(c['cpuset_cpus'] for c in running)
+
+    def test_stats(self):
+        queue = VerificationQueue(concurrency=1)
+        self._submit(queue, 'task-a', 'subtask-0')
+        self._submit(queue, 'task-b', 'subtask-1')
+
+        stats = queue.get_stats()
+        assert stats['queued_by_task'] == {'task-b': 1}
+        assert stats['running_by_task'] == {'task-a': 1}
+
+        PendingVerifier.started[0].finish()
+        PendingVerifier.started[1].finish()
+        stats = queue.get_stats()
+        assert stats['queued'] == stats['running'] == 0
+        assert stats['finished'] == 2
+        assert stats['wait_time']['max'] >= stats['wait_time']['avg'] >= 0
+        assert set(stats['verification_time']) == {'avg', 'p95', 'max'}
+        assert not queue.callbacks
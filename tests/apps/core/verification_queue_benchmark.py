@@ -0,0 +1,200 @@
+import os
+import queue
+import random
+import time
+from functools import partial
+from types import FunctionType
+from typing import Dict, List, NamedTuple
+from unittest import mock
+
+import pytest
+from twisted.internet.defer import Deferred
+from twisted.internet.task import Clock, deferLater
+
+from golem.verificator.verifier import SubtaskVerificationState
+
+from apps.core.verification_queue import VerificationQueue
+from apps.core.verification_task import VerificationTask
+
+
+def skip_benchmarks():
+    if os.environ.get('benchmarks', False):
+        return False
+    return True
+
+
+class SimulatedReactor(Clock):
+    """ Verifications run in simulated time, thousands of them finish in
+    a few seconds of wall clock time """
+
+    def callFromThread(self, fn, *args, **kwargs):
+        self.callLater(0, fn, *args, **kwargs)
+
+    def run_until_idle(self) -> None:
+        # Clock keeps the delayed calls sorted by time
+        while self.calls:
+            self.advance(max(0., self.calls[0].getTime() - self.seconds()))
+
+
+class SyntheticVerifier:
+
+    def __init__(self, kwargs):
+        self.kwargs = kwargs
+
+    @staticmethod
+    def simple_verification(_kwargs):
+        return True
+
+    def start_verification(self, kwargs):
+        return deferLater(kwargs['clock'], kwargs['runtime'],
+                          self.verification_completed)
+
+    def verification_completed(self):
+        return (self.kwargs['subtask_info']['subtask_id'],
+                SubtaskVerificationState.VERIFIED, {})
+
+    def stop(self):
+        pass
+
+
+class Verification(NamedTuple):
+    task_id: str
+    subtask_id: str
+    arrival: float
+    runtime: float
+    deadline: float
+
+
+def generate(count: int, tasks: int = 10, seed: int = 0) \
+        -> List[Verification]:
+    """ Results of a few tasks arriving over time. Task 0 is much larger
+    than the others, verification times are heavy-tailed. """
+    rng = random.Random(seed)
+    weights = [tasks] + [1] * (tasks - 1)
+    verifications = []
+    for i in range(count):
+        task = rng.choices(range(tasks), weights)[0]
+        arrival = rng.uniform(0, count / 2)
+        runtime = rng.lognormvariate(0, 1)
+        verifications.append(Verification(
+            task_id='task-{}'.format(task),
+            subtask_id='subtask-{}'.format(i),
+            arrival=arrival,
+            runtime=runtime,
+            deadline=arrival + rng.uniform(10, 600),
+        ))
+    return verifications
+
+
+class LegacyVerificationQueue:
+    """ The previous queue: a single FIFO, without task fairness """
+
+    def __init__(self, concurrency: int = 1) -> None:
+        self._concurrency = concurrency
+        self._queue: queue.Queue = queue.Queue()
+        self._jobs: Dict[str, Deferred] = dict()
+        self.callbacks: Dict[VerificationTask, FunctionType] = dict()
+
+    def submit(self, verifier_class, subtask_id, deadline, cb, **kwargs):
+        entry = VerificationTask(subtask_id, deadline, kwargs)
+        self.callbacks[entry] = cb
+        self._queue.put((entry, verifier_class))
+        self._process_queue()
+
+    def _process_queue(self) -> None:
+        if len(self._jobs) < self._concurrency:
+            try:
+                entry, verifier_cls = self._queue.get(block=False)
+            except queue.Empty:
+                return
+            self._run(entry, verifier_cls)
+
+    def _run(self, entry, verifier_cls) -> None:
+        from twisted.internet import reactor
+        subtask_id = entry.subtask_id
+
+        def callback(*args):
+            try:
+                self.callbacks[entry](subtask_id=args[0][0],
+                                      verdict=args[0][1],
+                                      result=args[0][2])
+            finally:
+                self._jobs.pop(subtask_id, None)
+                self._process_queue()
+
+        result = entry.start(verifier_cls)
+        result.addCallback(partial(reactor.callFromThread, callback))
+        self._jobs[subtask_id] = result
+
+
+def simulate(verification_queue, verifications: List[Verification]) \
+        -> Dict[str, float]:
+    clock = SimulatedReactor()
+    offset = time.time() + 10 ** 6
+    finished: Dict[str, float] = dict()
+    waits: Dict[str, List[float]] = dict()
+
+    def done(subtask_id, **_):
+        finished[subtask_id] = clock.seconds()
+
+    arrivals = iter(sorted(verifications, key=lambda v: v.arrival))
+
+    def arrive(verification: Verification):
+        # Arrivals are scheduled one at a time, Clock sorts all the pending
+        # calls on every callLater
+        submit(verification, done)
+        following = next(arrivals, None)
+        if following:
+            clock.callLater(following.arrival - clock.seconds(), arrive,
+                            following)
+
+    def submit(verification: Verification, cb: FunctionType):
+        verification_queue.submit(
+            SyntheticVerifier,
+            verification.subtask_id,
+            offset + verification.deadline,
+            cb,
+            task_id=verification.task_id,
+            subtask_info={'subtask_id': verification.subtask_id},
+            clock=clock,
+            runtime=verification.runtime,
+        )
+
+    with mock.patch('twisted.internet.reactor', clock, create=True):
+        first = next(arrivals)
+        clock.callLater(first.arrival, arrive, first)
+        clock.run_until_idle()
+
+    assert len(finished) == len(verifications)
+    for verification in verifications:
+        waits.setdefault(verification.task_id, []).append(
+            finished[verification.subtask_id] - verification.arrival
+            - verification.runtime)
+    small_tasks = [w for task_id, task_waits in waits.items()
+                   if task_id != 'task-0' for w in task_waits]
+    return {
+        'deadline_misses': sum(
+            1 for v in verifications if finished[v.subtask_id] > v.deadline),
+        'mean_wait': sum(sum(w) for w in waits.values()) / len(verifications),
+        'small_tasks_mean_wait': sum(small_tasks) / len(small_tasks),
+        'makespan': max(finished.values()),
+    }
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("count", [1000, 5000, 20000])
+@pytest.mark.parametrize("make_queue", [
+    partial(LegacyVerificationQueue, concurrency=1),
+    partial(VerificationQueue, concurrency=1),
+    partial(VerificationQueue, concurrency=2),
+    partial(VerificationQueue, concurrency=4),
+], ids=['legacy', 'concurrency-1', 'concurrency-2', 'concurrency-4'])
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_load(benchmark, count: int, make_queue):
+    verifications = generate(count)
+
+    def setup():
+        return (make_queue(), verifications), {}
+
+    result = benchmark.pedantic(simulate, setup=setup, rounds=1)
+    benchmark.extra_info.update(result)
@@ -0,0 +1,117 @@
+import os
+import random
+import tracemalloc
+
+import cv2
+import numpy
+import pytest
+
+from apps.rendering.resources.renderingtaskcollector import (
+    RenderingTaskCollector,
+    StreamingTaskCollector,
+)
+
+# A 16K frame
+WIDTH, HEIGHT = 15360, 8640
+
+
+def skip_benchmarks():
+    if os.environ.get('benchmarks', False):
+        return False
+    return True
+
+
+def make_parts(directory: str, parts: int, width: int, height: int) -> list:
+    """ The parts of a frame as Blender renders them, the lower ones one row
+    shorter when the height does not divide evenly """
+    rng = numpy.random.RandomState(0)
+    ceiling_height = -(-height // parts)
+    ceiling_parts = parts - (ceiling_height * parts - height)
+    paths = []
+    for part in range(parts):
+        rows = ceiling_height if part < ceiling_parts else ceiling_height - 1
+        img = numpy.empty((rows, width, 3), numpy.uint8)
+        img[:] = rng.randint(0, 255, 3)
+        path = os.path.join(directory, 'part{}.png'.format(part))
+        cv2.imwrite(path, img)
+        paths.append(path)
+    return paths
+
+
+def legacy_collect(paths: list) -> RenderingTaskCollector:
+    collector = RenderingTaskCollector()
+    for path in paths:
+        collector.add_img_file(path)
+    return collector
+
+
+def streaming_collect(paths: list, mmap_path=None) -> StreamingTaskCollector:
+    """ Adds all the parts but the last, in the random order in which
+    they are accepted """
+    collector = StreamingTaskCollector(len(paths), width=WIDTH,
+                                       height=HEIGHT, mmap_path=mmap_path)
+    order = list(range(len(paths)))
+    random.Random(0).shuffle(order)
+    for position in order[:-1]:
+        collector.add_img_file(paths[position], position)
+    return collector
+
+
+def legacy_finalize(collector: RenderingTaskCollector) -> numpy.ndarray:
+    return collector.finalize().img
+
+
+def streaming_finalize(collector: StreamingTaskCollector,
+                       paths: list) -> numpy.ndarray:
+    """ The last part lands and the frame is assembled """
+    last = next(position for position in range(len(paths))
+                if position not in collector.accepted_img_files)
+    collector.add_img_file(paths[last], last)
+    return collector.finalize().img
+
+
+def test_same_results(tmpdir):
+    paths = make_parts(str(tmpdir), 16, 64, 100)
+    legacy = legacy_finalize(legacy_collect(paths))
+    collector = StreamingTaskCollector(len(paths), width=64, height=100)
+    for position in reversed(range(len(paths))):
+        collector.add_img_file(paths[position], position)
+    assert numpy.array_equal(legacy, collector.finalize().img)
+
+
+@pytest.fixture(scope='module')
+def frame_parts(tmpdir_factory):
+    return make_parts(str(tmpdir_factory.mktemp('parts')), 256, WIDTH, HEIGHT)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("flow", ['legacy', 'streaming', 'mmap'])
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_finalize(benchmark, tmpdir, frame_parts, flow):
+    # pylint: disable=redefined-outer-name
+    mmap_path = str(tmpdir.join('canvas.raw')) if flow == 'mmap' else None
+    collectors = []
+
+    def setup():
+        # Peak memory of collecting the whole frame. numpy reports its
+        # buffers to tracemalloc, OpenCV does not.
+        tracemalloc.start()
+        if flow == 'legacy':
+            return (legacy_collect(frame_parts),), {}
+        collectors.append(streaming_collect(frame_parts, mmap_path))
+        return (collectors[-1], frame_parts), {}
+
+    def run(*args):
+        try:
+            if flow == 'legacy':
+                legacy_finalize(*args)
+            else:
+                streaming_finalize(*args)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info['peak_mb'] = peak / 2 ** 20
+
+    benchmark.pedantic(run, setup=setup, rounds=1)
+    for collector in collectors:
+        collector.close()
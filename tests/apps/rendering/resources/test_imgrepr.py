@@ -164,3 +164,22 @@ class TestImgFunctions(TempDirFixture, LogTestCase):
         assert os.path.isfile("path1.png") is False
         os.remove("path2.png")
         assert os.path.isfile("path2.png") is False
+
+    def test_opencv_fill(self):
+        for channels in (OpenCVImgRepr.RGB, OpenCVImgRepr.RGBA):
+            img = OpenCVImgRepr.empty(width=10, height=20, channels=channels)
+            expected = img.copy()
+            for i in range(2, 7):
+                for j in range(5, 15):
+                    expected.set_pixel((i, j), (10, 20, 30))
+            img.fill(2, 5, 7, 15, (10, 20, 30))
+            assert (img.img == expected.img).all()
+            assert img.get_pixel((2, 5))[-3:] == (10, 20, 30)
+            assert img.get_pixel((7, 5))[-3:] == (0, 0, 0)
+
+    def test_opencv_copy(self):
+        img = OpenCVImgRepr.empty(width=10, height=20)
+        img_copy = img.copy()
+        img_copy.set_pixel((0, 0), (1, 2, 3))
+        assert img.get_pixel((0, 0)) == (0, 0, 0)
+        assert img_copy.get_pixel((0, 0)) == (1, 2, 3)
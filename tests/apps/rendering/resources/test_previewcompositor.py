@@ -0,0 +1,65 @@
+import os
+from unittest import mock
+
+from apps.rendering.resources.imgrepr import OpenCVImgRepr
+from apps.rendering.resources.previewcompositor import PreviewCompositor
+from golem.testutils import TempDirFixture
+
+
+class TestPreviewCompositor(TempDirFixture):
+
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.tempdir, 'preview.png')
+        self.reactor = mock.patch('twisted.internet.reactor',
+                                  create=True).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_changes_are_written_together(self):
+        compositor = PreviewCompositor('PNG', interval=5)
+        compositor.put(self.path, OpenCVImgRepr.empty(10, 10))
+        assert compositor.exists(self.path)
+        assert not os.path.exists(self.path)
+
+        img = compositor.open(self.path)
+        img.set_pixel((1, 1), (0, 0, 255))
+        compositor.changed(self.path)
+        assert self.reactor.callLater.call_count == 1
+        assert compositor.open(self.path) is img
+
+        interval, write = self.reactor.callLater.call_args[0]
+        assert interval == 5
+        write()
+        assert OpenCVImgRepr.from_image_file(self.path).get_pixel((1, 1)) \
+            == (0, 0, 255)
+
+    def test_flush(self):
+        compositor = PreviewCompositor('PNG', interval=5)
+        compositor.put(self.path, OpenCVImgRepr.empty(10, 10))
+        compositor.flush()
+        self.reactor.callLater.return_value.cancel.assert_called_once_with()
+        assert os.path.isfile(self.path)
+
+        # previews without changes are read from disk
+        OpenCVImgRepr.empty(10, 10, color=(0, 255, 0)).save(self.path)
+        assert compositor.open(self.path).get_pixel((0, 0)) == (0, 255, 0)
+
+    def test_no_interval(self):
+        compositor = PreviewCompositor('PNG', interval=0)
+        compositor.put(self.path, OpenCVImgRepr.empty(10, 10))
+        assert not self.reactor.callLater.called
+        assert os.path.isfile(self.path)
+
+    def test_save_error(self):
+        compositor = PreviewCompositor('PNG', interval=0)
+        path = os.path.join(self.tempdir, 'removed', 'preview.png')
+        compositor.put(path, OpenCVImgRepr.empty(10, 10))
+        assert not compositor.exists(path)
+
+    def test_pickle(self):
+        compositor = PreviewCompositor('PNG', interval=5)
+        compositor.put(self.path, OpenCVImgRepr.empty(10, 10))
+        state = compositor.__getstate__()
+        assert state['_buffers'] == {}
+        assert state['_changed'] == set()
+        assert state['_flush_call'] is None
@@ -1,5 +1,7 @@
 import os
+import pickle
 import random
+from unittest import mock
 
 import numpy
 import cv2
@@ -7,7 +9,8 @@ import pytest
 
 from golem.tools.testdirfixture import TestDirFixture
 
-from apps.rendering.resources.renderingtaskcollector import RenderingTaskCollector
+from apps.rendering.resources.renderingtaskcollector import \
+    RenderingTaskCollector, StreamingTaskCollector
 from apps.rendering.resources.imgrepr import OpenCVImgRepr, OpenCVError
 
 
@@ -140,3 +143,105 @@ class TestRenderingTaskCollector(TestDirFixture):
         for img_path in images:
             os.remove(img_path)
             assert os.path.exists(img_path) is False
+
+
+class TestStreamingTaskCollector(TestDirFixture):
+    def _make_parts(self, heights, width=10):
+        parts = []
+        for i, height in enumerate(heights):
+            path = self.temp_file_name("part{}.png".format(i))
+            make_test_img(path, size=(height, width), color=(i * 20, 0, 255))
+            parts.append(path)
+        return parts
+
+    @staticmethod
+    def _legacy(parts):
+        collector = RenderingTaskCollector()
+        for part in parts:
+            collector.add_img_file(part)
+        return collector.finalize().img
+
+    def test_init(self):
+        collector = StreamingTaskCollector(4)
+        assert collector.accepted_img_files == {}
+        assert not collector.finished
+        assert collector.finalize() is None
+
+    def test_out_of_order(self):
+        parts = self._make_parts([3, 4, 3, 5])
+        collector = StreamingTaskCollector(len(parts), width=10, height=15)
+        for position in [2, 0, 3]:
+            collector.add_img_file(parts[position], position)
+            assert not collector.finished
+        assert not collector.holds(parts)
+        collector.add_img_file(parts[1], 1)
+        assert collector.finished
+        assert collector.holds(parts)
+        assert not collector.holds(list(reversed(parts)))
+        assert numpy.array_equal(collector.finalize().img,
+                                 self._legacy(parts))
+
+    def test_finalize_partial(self):
+        parts = self._make_parts([3, 4, 3])
+        collector = StreamingTaskCollector(len(parts), width=10, height=10)
+        collector.add_img_file(parts[0], 0)
+        collector.add_img_file(parts[2], 2)
+        assert numpy.array_equal(collector.finalize().img,
+                                 self._legacy([parts[0], parts[2]]))
+
+    def test_replace_part(self):
+        parts = self._make_parts([3, 4, 3, 2, 4])
+        collector = StreamingTaskCollector(3, width=10, height=10)
+        for position in range(3):
+            collector.add_img_file(parts[position], position)
+
+        # same height, pasted in place
+        collector.add_img_file(parts[2], 0)
+        assert numpy.array_equal(collector.finalize().img,
+                                 self._legacy([parts[2]] + parts[1:3]))
+        # different height, the parts below move
+        collector.add_img_file(parts[4], 0)
+        assert collector.finished
+        assert numpy.array_equal(collector.finalize().img,
+                                 self._legacy([parts[4]] + parts[1:3]))
+
+    def test_mmap(self):
+        parts = self._make_parts([3, 4, 3])
+        mmap_path = self.temp_file_name("canvas.raw")
+        collector = StreamingTaskCollector(len(parts), width=10, height=5,
+                                           mmap_path=mmap_path)
+        with mock.patch('apps.rendering.resources.renderingtaskcollector'
+                        '.MMAP_MIN_BYTES', 0):
+            for position, part in enumerate(parts):
+                collector.add_img_file(part, position)
+        image = collector.finalize()
+        assert isinstance(image.img, numpy.memmap)
+        assert numpy.array_equal(image.img, self._legacy(parts))
+        collector.close()
+        assert not os.path.exists(mmap_path)
+
+    def test_pickle(self):
+        parts = self._make_parts([3, 4, 3])
+        collector = StreamingTaskCollector(len(parts), width=10, height=10)
+        collector.add_img_file(parts[0], 0)
+        collector.add_img_file(parts[2], 2)
+
+        collector = pickle.loads(pickle.dumps(collector))
+        collector.add_img_file(parts[1], 1)
+        assert collector.finished
+        assert numpy.array_equal(collector.finalize().img,
+                                 self._legacy(parts))
+
+    def test_exr(self):
+        collector = StreamingTaskCollector(2, width=10, height=20)
+        collector.add_img_file(_get_test_exr(alt=True), 1)
+        collector.add_img_file(_get_test_exr(), 0)
+        img = collector.finalize().img
+        assert img.dtype == numpy.float32
+        assert img.shape == (20, 10, 3)
+
+    def test_opencv_nonexisting_img(self):
+        collector = StreamingTaskCollector(1)
+        with pytest.raises(OpenCVError):
+            collector.add_img_file("img.png", 0)
+        assert collector.accepted_img_files == {}
@@ -78,6 +78,7 @@ class TestFrameRenderingTask(TestDirFixture, LogTestCase):
         task.accept_results("SUBTASK1", [img_file])
         assert task.num_tasks_received == 1
         assert task.collected_file_names[3] == img_file
+        task.preview_compositor.flush()
         preview_img = OpenCVImgRepr.from_image_file(task.preview_file_path)
         assert preview_img.get_pixel((100, 100)) == (0, 0, 255)
         preview_img = OpenCVImgRepr.from_image_file(task.preview_task_file_path)
@@ -0,0 +1,77 @@
+import os
+import struct
+
+import pytest
+
+from golem.core.databuffer import DataBuffer
+
+
+def skip_benchmarks():
+    if os.environ.get('benchmarks', False):
+        return False
+    return True
+
+
+class BytesDataBuffer:
+    """ The previous, bytes concatenating implementation """
+
+    def __init__(self):
+        self.buffered_data = b""
+
+    def append_bytes(self, data):
+        self.buffered_data += data
+
+    def get_len_prefixed_bytes(self):
+        while len(self.buffered_data) > 4:
+            (num_bytes,) = struct.unpack("!L", self.buffered_data[:4])
+            if len(self.buffered_data) < num_bytes + 4:
+                break
+            self.buffered_data = self.buffered_data[4:]
+            data = self.buffered_data[:num_bytes]
+            self.buffered_data = self.buffered_data[num_bytes:]
+            yield data
+
+
+def stream(frame_size: int, frames: int) -> bytes:
+    frame = os.urandom(frame_size)
+    return (struct.pack("!L", frame_size) + frame) * frames
+
+
+def chunked(data: bytes, chunk_size: int):
+    return [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+
+def receive(buffer_class, chunks):
+    db = buffer_class()
+    received = 0
+    for chunk in chunks:
+        db.append_bytes(chunk)
+        for _ in db.get_len_prefixed_bytes():
+            received += 1
+    return received
+
+
+SCENARIOS = {
+    # one maximum size message delivered in TCP segment sized pieces
+    'fragmented': (2 * 1024 * 1024, 1, 1460),
+    # many small messages delivered in one read
+    'coalesced': (200, 5000, 5000 * 204),
+    # medium messages in 64 KiB reads
+    'mixed': (10 * 1024, 200, 64 * 1024),
+}
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("scenario", sorted(SCENARIOS))
+@pytest.mark.parametrize("buffer_class", [BytesDataBuffer, DataBuffer])
+@pytest.mark.benchmark(min_rounds=5, warmup=False)
+def test_receive_throughput(benchmark, buffer_class, scenario: str):
+    frame_size, frames, chunk_size = SCENARIOS[scenario]
+    data = stream(frame_size, frames)
+    chunks = chunked(data, chunk_size)
+
+    assert benchmark(receive, buffer_class, chunks) == frames
+
+    seconds = benchmark.stats.stats.mean
+    benchmark.extra_info['frames/s'] = frames / seconds
+    benchmark.extra_info['MB/s'] = len(data) / seconds / 2 ** 20
@@ -1,7 +1,10 @@
 import os
+from multiprocessing import cpu_count
+
 import pytest
 
 from golem.core.keysauth import KeysAuth
+from golem.core.simplechallenge import solve_challenge
 
 
 def skip_benchmarks():
@@ -10,12 +13,26 @@ def skip_benchmarks():
     return True
 
 
-def key_gen(d: int):
-    return KeysAuth._generate_keys(difficulty=d)
+def key_gen(d: int, workers: int = 1):
+    return KeysAuth._generate_keys(difficulty=d, workers=workers)
 
 
 @pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("workers", [1, cpu_count()])
 @pytest.mark.parametrize("d", [10, 11, 12, 13, 14, 15, 16])
 @pytest.mark.benchmark(min_rounds=20, warmup=False)
-def test_key_gen_speed(benchmark, d: int):
-    benchmark(key_gen, d)
+def test_key_gen_speed(benchmark, d: int, workers: int):
+    benchmark(key_gen, d, workers)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("workers", [1, cpu_count()])
+@pytest.mark.parametrize("d", [16, 18, 20, 22])
+@pytest.mark.benchmark(min_rounds=10, warmup=False)
+def test_solve_challenge_speed(benchmark, d: int, workers: int):
+    challenges = iter(range(100))
+
+    def setup():
+        return ('challenge{}'.format(next(challenges)), d, workers), {}
+
+    benchmark.pedantic(solve_challenge, setup=setup, rounds=10)
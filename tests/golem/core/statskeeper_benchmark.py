@@ -0,0 +1,53 @@
+import os
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+from golem import model
+from golem.core.statskeeper import IntStatsKeeper
+from golem.database import Database
+from golem.task.taskcomputer import CompStats
+
+INCREMENTS = 1000
+
+
+def skip_benchmarks():
+    if os.environ.get('benchmarks', False):
+        return False
+    return True
+
+
+@pytest.fixture
+def database():
+    with tempfile.TemporaryDirectory() as db_dir:
+        database = Database(model.db, fields=model.DB_FIELDS,
+                            models=model.DB_MODELS, db_dir=db_dir)
+        yield database
+        database.db.close()
+
+
+class WriteThroughStatsKeeper(IntStatsKeeper):
+    """ The previous behaviour: a database write for every increment """
+
+    def increase_stat(self, name, increment=1):
+        super().increase_stat(name, increment)
+        self.flush()
+
+
+def increase(keeper):
+    for _ in range(INCREMENTS):
+        keeper.increase_stat('computed_tasks')
+    keeper.flush()
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("keeper_cls",
+                         [WriteThroughStatsKeeper, IntStatsKeeper])
+@pytest.mark.benchmark(min_rounds=10, warmup=False)
+@patch('twisted.internet.reactor', create=True)
+def test_increase_stat_speed(_reactor, benchmark, database, keeper_cls):
+    # pylint: disable=redefined-outer-name,unused-argument
+    keeper = keeper_cls(CompStats)
+    benchmark(increase, keeper)
+    assert keeper.global_stats.computed_tasks % INCREMENTS == 0
@@ -6,7 +6,7 @@ from unittest.mock import patch, ANY, Mock
 from unittest import TestCase
 
 
-from golem.core.common import to_unicode, retry
+from golem.core.common import to_unicode, retry, summarize
 from golem.core.common import HandleKeyError, HandleAttributeError, \
     config_logging, get_timestamp_utc, timestamp_to_datetime, \
     datetime_to_timestamp, timeout_to_deadline, deadline_to_timeout
@@ -132,3 +132,13 @@ class TestRetry(unittest.TestCase):
 
         with self.assertRaises(ZeroDivisionError):
             retry((IndexError, ImportError), count=10)(func)()
+
+
+class TestSummarize(unittest.TestCase):
+
+    def test_empty(self):
+        assert summarize([]) == {'avg': 0.0, 'p95': 0.0, 'max': 0.0}
+
+    def test_summary(self):
+        summary = summarize(reversed(range(101)))
+        assert summary == {'avg': 50.0, 'p95': 95, 'max': 100}
@@ -0,0 +1,66 @@
+import struct
+import unittest
+
+from golem.core.databuffer import DataBuffer
+
+
+class TestDataBuffer(unittest.TestCase):
+
+    def setUp(self):
+        self.db = DataBuffer()
+
+    def test_ulong(self):
+        assert self.db.peek_ulong() is None
+        with self.assertRaises(ValueError):
+            self.db.read_ulong()
+        with self.assertRaises(AttributeError):
+            self.db.append_ulong(-1)
+
+        assert self.db.append_ulong(1024) == struct.pack("!L", 1024)
+        assert self.db.data_size() == 4
+        assert self.db.peek_ulong() == 1024
+        assert self.db.read_ulong() == 1024
+        assert self.db.data_size() == 0
+
+    def test_bytes(self):
+        self.db.append_bytes(b"abcdef")
+        with self.assertRaises(AttributeError):
+            self.db.peek_bytes(7)
+        assert self.db.peek_bytes(2) == b"ab"
+        assert self.db.read_bytes(2) == b"ab"
+        assert self.db.buffered_data == b"cdef"
+        assert self.db.read_all() == b"cdef"
+        assert self.db.data_size() == 0
+
+    def test_len_prefixed_bytes(self):
+        frames = [b"a" * i for i in range(1, 10)]
+        for frame in frames:
+            self.db.append_len_prefixed_bytes(frame)
+        assert self.db.read_len_prefixed_bytes() == frames[0]
+        assert list(self.db.get_len_prefixed_bytes()) == frames[1:]
+        assert self.db.read_len_prefixed_bytes() is None
+
+    def test_fragmented_frame(self):
+        src = DataBuffer()
+        src.append_len_prefixed_bytes(b"x" * 1000)
+        src.append_len_prefixed_bytes(b"y" * 10)
+        data = src.read_all()
+
+        received = []
+        for i in range(0, len(data), 7):
+            self.db.append_bytes(data[i:i + 7])
+            received.extend(self.db.get_len_prefixed_bytes())
+        assert received == [b"x" * 1000, b"y" * 10]
+        assert self.db.data_size() == 0
+
+    def test_compaction(self):
+        frame = b"z" * 1024
+        count = 2 * DataBuffer.COMPACT_THRESHOLD // len(frame)
+        for _ in range(count):
+            self.db.append_len_prefixed_bytes(frame)
+        self.db.append_bytes(b"tail")
+
+        for _ in range(count):
+            assert self.db.read_len_prefixed_bytes() == frame
+        assert self.db.buffered_data == b"tail"
+        assert self.db._offset < DataBuffer.COMPACT_THRESHOLD
@@ -1,3 +1,4 @@
+import io
 import os
 import random
 
@@ -115,6 +116,56 @@ class TestAESFileEncryptor(TestDirFixture):
         self.assertEqual(len(iv), iv_len)
 
 
+class TestAESStreams(TestDirFixture):
+    """ Test AESEncryptingWriter and AESDecryptingReader against
+    the file based encryption """
+
+    def setUp(self):
+        TestDirFixture.setUp(self)
+        self.secret = FileEncryptor.gen_secret(10, 20)
+        self.plain_path = os.path.join(self.path, 'plain')
+        self.enc_path = os.path.join(self.path, 'plain.enc')
+
+    def test_writer(self):
+        for size in (0, 1, 16, 17, 3 * AESFileEncryptor.stream_buffer_size):
+            data = os.urandom(size)
+            with open(self.enc_path, 'wb') as dst, \
+                    AESFileEncryptor.writer(dst, self.secret) as writer:
+                for i in range(0, size, 1000):
+                    writer.write(data[i:i + 1000])
+                self.assertEqual(writer.tell(), size)
+
+            AESFileEncryptor.decrypt(self.enc_path, self.plain_path,
+                                     self.secret)
+            with open(self.plain_path, 'rb') as f:
+                self.assertEqual(f.read(), data)
+
+    def test_reader(self):
+        size = 2 * AESFileEncryptor.stream_buffer_size + 5
+        data = os.urandom(size)
+        with open(self.plain_path, 'wb') as f:
+            f.write(data)
+        AESFileEncryptor.encrypt(self.plain_path, self.enc_path, self.secret)
+
+        with open(self.enc_path, 'rb') as src:
+            reader = AESFileEncryptor.reader(src, self.secret)
+            self.assertEqual(reader.read(), data)
+            self.assertEqual(reader.read(), b'')
+
+            for offset in (0, 15, 16, size // 2, size - 3):
+                reader.seek(offset)
+                self.assertEqual(reader.read(100), data[offset:offset + 100])
+            reader.seek(-10, io.SEEK_END)
+            self.assertEqual(reader.read(), data[-10:])
+
+    def test_reader_invalid_data(self):
+        with open(self.enc_path, 'wb') as f:
+            f.write(b'0' * 17)
+        with open(self.enc_path, 'rb') as src:
+            with self.assertRaises(ValueError):
+                AESFileEncryptor.reader(src, self.secret)
+
+
 class TestFileHelper(TestDirFixture):
     """ Tests for FileHelper class """
 
@@ -2,7 +2,7 @@ import os
 import shutil
 import time
 from random import random, randint
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from golem_messages import message
 from golem_messages.cryptography import ECCx, privtopub
@@ -22,7 +22,8 @@ class TestKeysAuth(testutils.PEP8MixIn, testutils.TempDirFixture):
             self,
             difficulty=0,
             key_name=None,
-            password='') -> KeysAuth:
+            password='',
+            progress=None) -> KeysAuth:
         if key_name is None:
             key_name = str(random())
         return KeysAuth(
@@ -30,6 +31,7 @@ class TestKeysAuth(testutils.PEP8MixIn, testutils.TempDirFixture):
             private_key_name=key_name,
             password=password,
             difficulty=difficulty,
+            progress=progress,
         )
 
     def test_sha(self):
@@ -74,6 +76,21 @@ class TestKeysAuth(testutils.PEP8MixIn, testutils.TempDirFixture):
         assert KeysAuth.is_pubkey_difficult(ek.public_key, difficulty)
         assert KeysAuth.is_pubkey_difficult(ek.key_id, difficulty)
 
+    def test_generate_keys_in_workers(self):
+        for difficulty in range(0, 9, 2):
+            priv_key, pub_key = KeysAuth._generate_keys(difficulty, workers=2)
+            assert pub_key == privtopub(priv_key)
+            assert KeysAuth.is_pubkey_difficult(pub_key, difficulty)
+
+    @patch('golem.core.powsearch.PROGRESS_INTERVAL', 0)
+    def test_generate_keys_progress(self):
+        progress = Mock()
+        ek = self._create_keysauth(difficulty=6, progress=progress)
+        assert ek.difficulty >= 6
+        tried = [c[0][0] for c in progress.call_args_list]
+        assert tried == sorted(tried)
+        assert all(t % KeysAuth.KEYGEN_CHUNK_SIZE == 0 for t in tried)
+
     def test_exception_difficulty(self):
         # given
         lower_difficulty = 0
@@ -0,0 +1,52 @@
+from functools import partial
+from unittest import TestCase, mock
+
+from golem.core import powsearch
+
+
+def find_multiple(divisor, start, step, count):
+    for candidate in range(start, start + step * count, step):
+        if candidate and candidate % divisor == 0:
+            return candidate
+    return None
+
+
+def find_nothing(_start, _step, _count):
+    return None
+
+
+def fail(_start, _step, _count):
+    raise ValueError()
+
+
+class TestSearch(TestCase):
+
+    def test_in_process(self):
+        assert powsearch.search(partial(find_multiple, 1000), 16) == 1000
+
+    def test_in_workers(self):
+        found = powsearch.search(partial(find_multiple, 1000), 16, workers=3)
+        assert found % 1000 == 0
+
+    def test_abort(self):
+        should_stop = mock.Mock(side_effect=[False, False, True])
+        with self.assertRaises(powsearch.SearchAborted):
+            powsearch.search(find_nothing, 16, should_stop=should_stop)
+        assert should_stop.call_count == 3
+
+    def test_abort_workers(self):
+        should_stop = mock.Mock(side_effect=[False, True])
+        with self.assertRaises(powsearch.SearchAborted):
+            powsearch.search(find_nothing, 16, workers=2,
+                             should_stop=should_stop)
+
+    @mock.patch('golem.core.powsearch.PROGRESS_INTERVAL', 0)
+    def test_progress(self):
+        progress = mock.Mock()
+        powsearch.search(partial(find_multiple, 100), 16, progress=progress)
+        assert [c[0][0] for c in progress.call_args_list] == \
+            [16, 32, 48, 64, 80, 96]
+
+    def test_workers_failed(self):
+        with self.assertRaises(RuntimeError):
+            powsearch.search(fail, 16, workers=2)
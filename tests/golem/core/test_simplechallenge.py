@@ -0,0 +1,28 @@
+from unittest import TestCase
+
+from golem.core.simplechallenge import accept_challenge, create_challenge, \
+    solve_challenge
+
+
+class TestSimpleChallenge(TestCase):
+    challenge = 'deadbeef' * 8
+
+    def test_create_challenge(self):
+        challenge = create_challenge([['ab', 'cd']], 'ef')
+        assert challenge.startswith(('abcd', 'bacd', 'abdc', 'badc'))
+
+    def test_solve_challenge(self):
+        # In a single process the smallest solution is found
+        solution, _ = solve_challenge(self.challenge, 8, workers=1)
+        assert solution == 352
+        assert accept_challenge(self.challenge, solution, 8)
+        assert not any(accept_challenge(self.challenge, smaller, 8)
+                       for smaller in range(solution))
+
+    def test_solve_challenge_in_workers(self):
+        for difficulty in range(1, 11):
+            solution, _ = solve_challenge(self.challenge, difficulty,
+                                          workers=3)
+            assert accept_challenge(self.challenge, solution, difficulty)
+            assert not accept_challenge(self.challenge, solution,
+                                        difficulty + 40)
@@ -1,6 +1,10 @@
 from threading import Thread
+from unittest.mock import patch
+
+from peewee import DatabaseError
 
 from golem.core.statskeeper import IntStatsKeeper
+from golem.model import Stats
 from golem.task.taskcomputer import CompStats
 from golem.tools.testwithdatabase import TestWithDatabase
 
@@ -26,6 +30,7 @@ class TestStatsKeeper(TestWithDatabase):
         self._compare_stats(st, [2, 0, 0] * 2)
         st.increase_stat("computed_tasks")
         self._compare_stats(st, [3, 0, 0] * 2)
+        st.flush()
 
         st2 = IntStatsKeeper(CompStats)
         self._compare_stats(st2, [3] + [0] * 5)
@@ -33,9 +38,88 @@ class TestStatsKeeper(TestWithDatabase):
         self._compare_stats(st2, [4, 0, 0, 1, 0, 0])
         st2.increase_stat("computed_tasks")
         self._compare_stats(st2, [5, 0, 0, 2, 0, 0])
+        st2.flush()
         st.increase_stat("computed_tasks")
+        self._compare_stats(st, [4, 0, 0, 4, 0, 0])
+        # The increments of the other keeper are picked up with the flush
+        st.flush()
         self._compare_stats(st, [6, 0, 0, 4, 0, 0])
 
+    @staticmethod
+    def _stored(name):
+        return Stats.get(Stats.name == name).value
+
+    def test_write_behind(self):
+        st = IntStatsKeeper(CompStats)
+        with patch('golem.core.statskeeper.Stats.update') as update:
+            for _ in range(100):
+                st.increase_stat("computed_tasks")
+            st.increase_stat("tasks_with_errors", 2)
+            st.set_stat("tasks_with_timeout", 5)
+        assert not update.called
+        self._compare_stats(st, [100, 5, 2, 100, 5, 2])
+
+        st.flush()
+        assert self._stored("computed_tasks") == '100'
+        assert self._stored("tasks_with_timeout") == '5'
+        assert self._stored("tasks_with_errors") == '2'
+
+        # Nothing left to write
+        with patch('golem.core.statskeeper.Stats.update') as update:
+            st.flush()
+        assert not update.called
+
+    def test_increase_after_set(self):
+        st = IntStatsKeeper(CompStats)
+        st.increase_stat("computed_tasks")
+        st.set_stat("computed_tasks", 10)
+        st.increase_stat("computed_tasks", 2)
+        st.flush()
+        assert self._stored("computed_tasks") == '12'
+        self._compare_stats(st, [12, 0, 0, 12, 0, 0])
+
+    def test_flush_error(self):
+        st = IntStatsKeeper(CompStats)
+        st.increase_stat("computed_tasks", 2)
+        with patch('golem.core.statskeeper.Stats.update',
+                   side_effect=DatabaseError('locked')):
+            st.flush()
+        assert self._stored("computed_tasks") == '0'
+
+        # The changes are kept until they can be written
+        st.increase_stat("computed_tasks")
+        st.flush()
+        assert self._stored("computed_tasks") == '3'
+        self._compare_stats(st, [3, 0, 0, 3, 0, 0])
+
+    def test_crash_recovery(self):
+        st = IntStatsKeeper(CompStats)
+        st.increase_stat("computed_tasks", 2)
+        st.flush()
+        # Not flushed before the crash
+        st.increase_stat("computed_tasks", 5)
+
+        st2 = IntStatsKeeper(CompStats)
+        self._compare_stats(st2, [2] + [0] * 5)
+
+    @patch('twisted.internet.reactor', create=True)
+    def test_flush_scheduled(self, reactor):
+        st = IntStatsKeeper(CompStats)
+        st.increase_stat("computed_tasks")
+        st.increase_stat("computed_tasks")
+        reactor.callFromThread.assert_called_once_with(st._call_flush_later)
+        st._call_flush_later()
+
+        reactor.callLater.assert_called_once_with(
+            IntStatsKeeper.FLUSH_INTERVAL, st.flush)
+        reactor.addSystemEventTrigger.assert_called_once_with(
+            'before', 'shutdown', st.flush)
+
+        st.flush()
+        reactor.callLater.return_value.cancel.assert_called_once_with()
+        st.increase_stat("computed_tasks")
+        assert reactor.callFromThread.call_count == 2
+
     def test_for_race_conditions(self):
         n_threads = 10
         n_updates = 5
@@ -351,6 +351,29 @@ class TestSavedMigrations(TempDirFixture):
             value = cursor.fetchone()[0]
             self.assertEqual(value, '10')
 
+    @patch('golem.database.Database._create_tables')
+    def test_28_known_host_performance(self, _create_tables_mock):
+        with self.database_context() as database:
+            database._migrate_schema(6, 27)
+            database.db.execute_sql(
+                "INSERT INTO knownhosts ("
+                "ip_address, port, last_connected, is_seed, metadata,"
+                " created_date, modified_date)"
+                " VALUES ('1.2.3.4', 40102, datetime('now'), 0,"
+                "         '{\"performance\": {\"BLENDER\": 200.5}}',"
+                "         datetime('now'), datetime('now')),"
+                "        ('1.2.3.5', 40102, datetime('now'), 0, '{}',"
+                "         datetime('now'), datetime('now'))"
+            )
+            database._migrate_schema(27, 28)
+            cursor = database.db.execute_sql(
+                "SELECT knownhosts.ip_address, environment, value"
+                " FROM knownhostperformance"
+                " JOIN knownhosts ON knownhosts.id = host_id"
+            )
+            self.assertEqual(cursor.fetchall(),
+                             [('1.2.3.4', 'BLENDER', 200.5)])
+
 
 def generate(start, stop):
     return ['{:03}_script'.format(i) for i in range(start, stop + 1)]
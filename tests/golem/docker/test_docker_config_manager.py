@@ -41,3 +41,15 @@ class TestDockerConfigManager(unittest.TestCase):
 
         self.assertFalse('cpuset' in cm._container_host_config)
         self.assertFalse('mem_limit' in cm._container_host_config)
+
+    def test_slot_host_config(self):
+        cm = DockerConfigManager()
+        cm._cpu_set = ['0', '1', '2', '3']
+        cm._mem_limit = 4096
+
+        assert cm.get_slot_host_config(0, 1) == {}
+        assert cm.get_slot_host_config(0, 2) == \
+            dict(cpuset_cpus='0,1', mem_limit='2048')
+        assert cm.get_slot_host_config(1, 2) == \
+            dict(cpuset_cpus='2,3', mem_limit='2048')
+        assert cm.get_slot_host_config(5, 8)['cpuset_cpus'] == '1'
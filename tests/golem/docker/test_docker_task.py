@@ -32,15 +32,9 @@ PathOrStr = Union[Path, AnyStr]
 
 class TaskComputerExt(TaskComputer):
 
-    @property  # type: ignore
-    def counting_thread(self):
-        return getattr(self, '_counting_thread', None)
-
-    @counting_thread.setter
-    def counting_thread(self, value):
-        setattr(self, '_counting_thread', value)
-        if value:
-            setattr(self, 'last_thread', value)
+    def task_computed(self, task_thread):
+        setattr(self, 'last_thread', task_thread)
+        super().task_computed(task_thread)
 
 
 class DockerTaskTestCase(
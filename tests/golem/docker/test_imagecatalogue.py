@@ -0,0 +1,164 @@
+import queue
+import time
+from unittest import TestCase, mock
+
+import requests
+from docker.errors import DockerException
+
+from golem import testutils
+from golem.docker.image import DockerImage
+from golem.docker.imagecatalogue import ImageCatalogue
+
+IMAGE_ID = 'sha256:' + 'ab12' * 16
+OTHER_ID = 'sha256:' + 'cd34' * 16
+
+
+class FakeDockerClient:
+
+    def __init__(self):
+        self.listing = [
+            {'Id': IMAGE_ID,
+             'RepoTags': ['golemfactory/base:1.4', 'golemfactory/base:latest']},
+            {'Id': OTHER_ID, 'RepoTags': None},
+        ]
+        self.images_calls = 0
+        self.images_error = None
+        self.events_error = None
+        self.events_queue = queue.Queue()
+
+    def images(self):
+        self.images_calls += 1
+        if self.images_error:
+            raise self.images_error
+        return list(self.listing)
+
+    def events(self, decode, filters):
+        assert decode
+        assert filters == {'type': 'image'}
+        if self.events_error:
+            raise self.events_error
+
+        def stream():
+            while True:
+                event = self.events_queue.get()
+                if event is None:
+                    return
+                yield event
+        return stream()
+
+    def event(self, action, **kwargs):
+        self.events_queue.put(dict(Type='image', Action=action, **kwargs))
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+class TestImageCatalogue(testutils.PEP8MixIn, TestCase):
+    PEP8_FILES = [
+        'golem/docker/image.py',
+        'golem/docker/imagecatalogue.py',
+    ]
+
+    def setUp(self):
+        self.client = FakeDockerClient()
+        self.catalogue = ImageCatalogue(client_factory=lambda: self.client)
+
+    def tearDown(self):
+        self.client.events_queue.put(None)
+
+    def _watching(self):
+        self.catalogue.is_available('golemfactory/base:1.4')
+        wait_until(lambda: self.catalogue._watching)
+
+    def test_is_available(self):
+        catalogue = self.catalogue
+        assert catalogue.is_available('golemfactory/base:1.4')
+        assert catalogue.is_available('golemfactory/base:latest')
+        assert not catalogue.is_available('golemfactory/base:1.3')
+        assert not catalogue.is_available('golemfactory/blender:1.4')
+
+    def test_is_available_with_id(self):
+        catalogue = self.catalogue
+        assert catalogue.is_available('golemfactory/base:1.4', IMAGE_ID)
+        assert catalogue.is_available('golemfactory/base:1.4',
+                                      IMAGE_ID.split(':')[1])
+        assert catalogue.is_available('golemfactory/base:1.4',
+                                      IMAGE_ID.split(':')[1][:12])
+        assert not catalogue.is_available('golemfactory/base:1.4', OTHER_ID)
+        assert not catalogue.is_available('golemfactory/base:1.3', IMAGE_ID)
+        assert not catalogue.is_available('golemfactory/base:1.4',
+                                          'deadface')
+
+    def test_checks_are_lookups(self):
+        self._watching()
+        self.catalogue.is_available('golemfactory/base:1.4')
+        images_calls = self.client.images_calls
+
+        for _ in range(100):
+            assert self.catalogue.is_available('golemfactory/base:1.4')
+            assert not self.catalogue.is_available('golemfactory/base:1.3')
+        assert self.client.images_calls == images_calls
+
+    def test_events(self):
+        self._watching()
+        assert not self.catalogue.is_available('golemfactory/base:1.3')
+
+        self.client.listing.append(
+            {'Id': 'sha256:ef56', 'RepoTags': ['golemfactory/base:1.3']})
+        self.client.event('pull')
+        wait_until(
+            lambda: self.catalogue.is_available('golemfactory/base:1.3'))
+
+        self.client.listing = []
+        self.client.event('delete')
+        wait_until(
+            lambda: not self.catalogue.is_available('golemfactory/base:1.4'))
+
+    def test_other_events(self):
+        self._watching()
+        self.catalogue.is_available('golemfactory/base:1.4')
+        images_calls = self.client.images_calls
+
+        self.client.event('inspect')
+        self.client.event('tag')
+        wait_until(lambda: self.client.images_calls == images_calls + 1)
+
+    def test_ttl_without_events(self):
+        self.client.events_error = DockerException('events')
+        self.catalogue.ttl = 0.1
+
+        assert self.catalogue.is_available('golemfactory/base:1.4')
+        self.client.listing = []
+        assert self.catalogue.is_available('golemfactory/base:1.4')
+        assert self.client.images_calls == 1
+
+        time.sleep(0.15)
+        assert not self.catalogue.is_available('golemfactory/base:1.4')
+        assert self.client.images_calls == 2
+
+    def test_invalidate(self):
+        self._watching()
+        self.catalogue.is_available('golemfactory/base:1.4')
+        self.client.listing = []
+        self.catalogue.invalidate()
+        assert not self.catalogue.is_available('golemfactory/base:1.4')
+
+    def test_daemon_unavailable(self):
+        self.client.events_error = DockerException('events')
+        self.client.images_error = requests.exceptions.ConnectionError()
+        assert not self.catalogue.is_available('golemfactory/base:1.4')
+
+        self.client.images_error = None
+        assert self.catalogue.is_available('golemfactory/base:1.4')
+
+    def test_docker_image(self):
+        with mock.patch.object(ImageCatalogue, '_instance', self.catalogue):
+            assert DockerImage('golemfactory/base', tag='1.4').is_available()
+            assert DockerImage('golemfactory/base',
+                               image_id=IMAGE_ID).is_available()
+            assert not DockerImage('golemfactory/base', tag='1.4',
+                                   image_id=OTHER_ID).is_available()
@@ -0,0 +1,172 @@
+import datetime
+import os
+import tempfile
+import uuid
+
+import pytest
+
+from golem import model
+from golem.database import Database
+from golem.ethereum import paymentprocessor
+from golem.ethereum.incomeskeeper import IncomesKeeper
+from golem.ethereum.paymentskeeper import PaymentsKeeper
+
+LEDGER_SIZE = 50000
+PAYER_ADDRESS = '0x' + 40 * '3'
+
+
+def skip_benchmarks():
+    if os.environ.get('benchmarks', False):
+        return False
+    return True
+
+
+@pytest.fixture(scope='module')
+def ledger():
+    """ A database with LEDGER_SIZE payments and as many incomes, created
+    a second apart """
+    with tempfile.TemporaryDirectory() as db_dir:
+        database = Database(model.db, fields=model.DB_FIELDS,
+                            models=model.DB_MODELS, db_dir=db_dir)
+        first = datetime.datetime(2018, 1, 1)
+        payments, incomes = [], []
+        for i in range(LEDGER_SIZE):
+            created = first + datetime.timedelta(seconds=i)
+            payments.append({
+                'subtask': str(uuid.uuid4()),
+                'payee': os.urandom(20),
+                'value': 10 ** 18,
+                'details': model.PaymentDetails(),
+                'processed_ts': i,
+                'created_date': created,
+                'modified_date': created,
+            })
+            incomes.append({
+                'sender_node': 64 * 'a',
+                'subtask': str(uuid.uuid4()),
+                'payer_address': PAYER_ADDRESS,
+                'value': 10 ** 18,
+                'created_date': created,
+                'modified_date': created,
+            })
+        with model.db.atomic():
+            for start in range(0, LEDGER_SIZE, 100):
+                model.Payment.insert_many(payments[start:start + 100]) \
+                    .execute()
+                model.Income.insert_many(incomes[start:start + 100]) \
+                    .execute()
+        yield database
+        database.db.close()
+
+
+def legacy_update_payments(payments, status):
+    """ The previous update: one save, and one commit, per payment """
+    for p in payments:
+        p.status = status
+        p.save()
+
+
+def legacy_received_batch_transfer(tx_hash, sender, amount, closure_time):
+    """ The previous IncomesKeeper.received_batch_transfer """
+    expected = model.Income.select().where(
+        model.Income.payer_address == sender,
+        model.Income.accepted_ts > 0,
+        model.Income.accepted_ts <= closure_time,
+        model.Income.transaction.is_null(),
+        model.Income.settled_ts.is_null())
+    amount_left = amount
+    for e in expected:
+        received = min(amount_left, e.value_expected)
+        e.value_received += received
+        amount_left -= received
+        e.transaction = tx_hash[2:]
+        e.save()
+
+
+def legacy_payments_page(page_size, page):
+    """ A page read with OFFSET, formatted as the RPC does """
+    query = model.Payment.select() \
+        .order_by(model.Payment.created_date.desc()) \
+        .offset(page * page_size) \
+        .limit(page_size)
+    keeper = PaymentsKeeper()
+    return [keeper._payment_to_dict(p) for p in query]  # noqa pylint: disable=protected-access
+
+
+def payments_page(page_size, cursor):
+    """ A page read with the cursor the client got with the previous page """
+    return PaymentsKeeper().get_payments_page(page_size, cursor)
+
+
+def page_cursor(page_size, page):
+    if not page:
+        return None
+    last = model.Payment.select() \
+        .order_by(model.Payment.created_date.desc(),
+                  model.Payment.subtask.desc()) \
+        .offset(page * page_size - 1) \
+        .get()
+    return [last.created_date.strftime('%Y-%m-%d %H:%M:%S.%f'), last.subtask]
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("batch", [1000, 10000])
+@pytest.mark.parametrize("update", [
+    legacy_update_payments,
+    paymentprocessor._update_payments,  # pylint: disable=protected-access
+], ids=['legacy', 'bulk'])
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_confirm_payments(benchmark, ledger, batch, update):
+    # pylint: disable=redefined-outer-name,unused-argument
+    statuses = iter([model.PaymentStatus.sent, model.PaymentStatus.confirmed])
+
+    def setup():
+        payments = list(model.Payment.select().limit(batch))
+        for p in payments:
+            p.details.tx = 64 * 'a'
+        return (payments, next(statuses)), {}
+
+    benchmark.pedantic(update, setup=setup, rounds=2)
+    benchmark.extra_info['payments_per_second'] = \
+        batch / benchmark.stats.stats.mean
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("batch", [1000, 10000])
+@pytest.mark.parametrize("received_batch_transfer", [
+    legacy_received_batch_transfer,
+    IncomesKeeper().received_batch_transfer,
+], ids=['legacy', 'bulk'])
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_received_batch_transfer(benchmark, ledger, batch,
+                                 received_batch_transfer):
+    # pylint: disable=redefined-outer-name,unused-argument
+    rounds = iter(range(100))
+
+    def setup():
+        closure_time = next(rounds) + 1
+        model.Income.update(
+            accepted_ts=closure_time, transaction=None, value_received=0,
+        ).where(
+            model.Income.subtask.in_(model.Income.select(
+                model.Income.subtask).limit(batch)),
+        ).execute()
+        return ('0x' + 64 * 'b', PAYER_ADDRESS, batch * 10 ** 18,
+                closure_time), {}
+
+    benchmark.pedantic(received_batch_transfer, setup=setup, rounds=2)
+    benchmark.extra_info['incomes_per_second'] = \
+        batch / benchmark.stats.stats.mean
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("page", [0, 100, 490])
+@pytest.mark.parametrize("flow", ['offset', 'keyset'])
+@pytest.mark.benchmark(min_rounds=5, warmup=False)
+def test_payments_page(benchmark, ledger, page, flow):
+    # pylint: disable=redefined-outer-name,unused-argument
+    if flow == 'offset':
+        read_page, args = legacy_payments_page, (100, page)
+    else:
+        read_page, args = payments_page, (100, page_cursor(100, page))
+    benchmark.pedantic(read_page, args=args, rounds=5)
@@ -190,6 +190,49 @@ class TestIncomesKeeper(TestWithDatabase):
         income2 = Income.get(sender_node=sender_node2, subtask=subtask_id2)
         assert transaction_id2[2:] == income2.transaction
 
+    @mock.patch('golem.ethereum.incomeskeeper.dispatcher')
+    def test_received_batch_transfer_partially(self, dispatcher):
+        payer_address = '0x' + 40 * '9'
+        for i in range(3):
+            self._test_expect_income(
+                sender_node=64 * str(i),
+                subtask_id='subtask{}'.format(i),
+                payer_addr=payer_address,
+                value=MAX_INT + 10,
+                accepted_ts=1337,
+            )
+
+        transaction_id = '0x' + 64 * 'b'
+        self.incomes_keeper.received_batch_transfer(
+            transaction_id,
+            payer_address,
+            2 * (MAX_INT + 10) + 5,
+            1337,
+        )
+        incomes = list(Income.select())
+        assert all(i.transaction == transaction_id[2:] for i in incomes)
+        assert sorted(i.value_received for i in incomes) == \
+            [5, MAX_INT + 10, MAX_INT + 10]
+        assert dispatcher.send.call_count == 2
+
+    def test_get_incomes_page(self):
+        created = datetime(2018, 1, 1)
+        for i in range(5):
+            # The last two are created at the same time
+            self._create_income(
+                sender_node=64 * 'a',
+                subtask='subtask{}'.format(i),
+                created_date=created + timedelta(seconds=min(i, 3)))
+
+        subtasks = []
+        cursor = None
+        for _ in range(3):
+            incomes, cursor = self.incomes_keeper.get_incomes_page(2, cursor)
+            subtasks.extend(i.subtask for i in incomes)
+        assert cursor is None
+        assert subtasks == ['subtask4', 'subtask3', 'subtask2', 'subtask1',
+                            'subtask0']
+
     @staticmethod
     def _create_income(**kwargs):
         income = model_factories.Income(**kwargs)
@@ -14,6 +14,7 @@ from freezegun import freeze_time
 from hexbytes import HexBytes
 
 from golem.core.common import timestamp_to_datetime
+from golem.ethereum import paymentprocessor
 from golem.ethereum.paymentprocessor import (
     PaymentProcessor,
     PAYMENT_MAX_DELAY,
@@ -201,6 +202,23 @@ class PaymentProcessorInternalTest(DatabaseFixture):
         assert self.pp.reserved_gntb == gnt_value
         assert len(self.pp._awaiting) == 1
 
+    @mock.patch('golem.ethereum.paymentprocessor.UPDATE_BATCH_SIZE', 2)
+    def test_update_payments(self):
+        payments = [Payment.create(subtask=str(uuid.uuid4()),
+                                   payee=urandom(20), value=1)
+                    for _ in range(5)]
+        for p in payments[:3]:
+            p.details.tx = 'aa'
+        payments[3].details.tx = 'bb'
+
+        paymentprocessor._update_payments(payments, PaymentStatus.sent)
+
+        for p in payments:
+            stored = Payment.get(subtask=p.subtask)
+            assert stored.status == PaymentStatus.sent
+            assert stored.details == p.details
+            assert p.status == PaymentStatus.sent
+
     def test_payment_timestamp(self):
         self.sci.get_eth_balance.return_value = denoms.ether
 
@@ -1,6 +1,8 @@
-from eth_utils import encode_hex
+from datetime import datetime, timedelta
 from os import urandom
 
+from eth_utils import encode_hex
+
 from golem.model import PaymentStatus
 from golem.ethereum.paymentskeeper import PaymentsDatabase, PaymentsKeeper
 from golem.tools.testwithdatabase import TestWithDatabase
@@ -55,6 +57,22 @@ class TestPaymentsDatabase(TestWithDatabase):
     def _get_ids(payments):
         return [p.subtask for p in payments]
 
+    def test_payments_page(self):
+        pk = PaymentsKeeper()
+        created = datetime(2018, 1, 1)
+        for i in range(5):
+            # The last two are created at the same time
+            self._create_payment(
+                subtask='id{}'.format(i),
+                created_date=created + timedelta(seconds=min(i, 3)))
+
+        page = pk.get_payments_page(3)
+        assert [p['subtask'] for p in page['payments']] == ['id4', 'id3',
+                                                            'id2']
+        page = pk.get_payments_page(3, page['next'])
+        assert [p['subtask'] for p in page['payments']] == ['id1', 'id0']
+        assert page['next'] is None
+
     def test_subtasks_payments(self):
         pd = PaymentsDatabase()
         self._create_payment(subtask='id1')
@@ -1,5 +1,8 @@
 # pylint: disable=protected-access
+import gzip
+import http.server
 import json
+import threading
 import time
 from unittest import mock, TestCase
 from urllib.parse import urljoin
@@ -255,7 +258,170 @@ class TestSystemMonitor(TestCase, testutils.PEP8MixIn):
         )
 
 
+class MonitorHTTPHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        server = self.server
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        server.requests += 1
+        server.bytes += len(body)
+        server.connections.add(self.client_address)
+
+        status = 200
+        if server.failures:
+            server.failures -= 1
+            status = 500
+        elif self.headers.get('Content-Encoding') == 'gzip':
+            server.messages.extend(
+                msg['data'] for msg in json.loads(gzip.decompress(body)))
+        else:
+            server.messages.append(json.loads(body)['data'])
+
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *_):  # pylint: disable=arguments-differ
+        pass
+
+
+class MonitorHTTPServer(http.server.ThreadingHTTPServer):
+    """ Local stand-in for the monitor, counts requests and bytes """
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), MonitorHTTPHandler)
+        self.requests = 0
+        self.bytes = 0
+        self.connections = set()
+        self.messages = []
+        self.failures = 0
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:{}/'.format(self.server_address[1])
+
+
+class Message:
+    def __init__(self, number):
+        self.number = number
+
+    def dict_repr(self):
+        return {'number': self.number, 'padding': 'x' * 100}
+
+
 class TestSenderThread(TestCase):
+    def setUp(self):
+        self.server = MonitorHTTPServer()
+        self.server_thread = threading.Thread(target=self.server.serve_forever)
+        self.server_thread.start()
+        self.sender = None
+
+    def tearDown(self):
+        if self.sender and self.sender.is_alive():
+            self.sender.join(5)
+        self.server.shutdown()
+        self.server.server_close()
+        self.server_thread.join()
+
+    def _sender(self, **kwargs):
+        kwargs.setdefault('batch_max_age', 0.1)
+        self.sender = SenderThread(
+            node_info=Message('ping'),
+            monitor_host=self.server.url,
+            monitor_request_timeout=5,
+            monitor_sender_thread_timeout=60,
+            proto_ver=MONITOR_CONFIG['PROTO_VERSION'],
+            **kwargs
+        )
+        self.sender.RETRY_DELAY = 0.01
+        return self.sender
+
+    def _wait_for(self, count):
+        deadline = time.monotonic() + 5
+        while len(self.server.messages) < count:
+            assert time.monotonic() < deadline, self.server.messages
+            time.sleep(0.01)
+        return [msg['number'] for msg in self.server.messages]
+
+    def test_batch(self):
+        sender = self._sender()
+        for i in range(50):
+            sender.send(Message(i))
+        sender.start()
+
+        assert self._wait_for(50) == list(range(50))
+        assert self.server.requests == 1
+        # Compressed
+        assert self.server.bytes < 50 * 100
+
+        for i in range(50, 60):
+            sender.send(Message(i))
+        assert self._wait_for(60) == list(range(60))
+        assert self.server.requests == 2
+        # Kept alive
+        assert len(self.server.connections) == 1
+
+    def test_batch_max_bytes(self):
+        sender = self._sender(batch_max_bytes=1000)
+        for i in range(50):
+            sender.send(Message(i))
+        sender.start()
+
+        assert self._wait_for(50) == list(range(50))
+        # About 150 bytes per message
+        assert 5 <= self.server.requests <= 10
+
+    def test_retry(self):
+        self.server.failures = 2
+        sender = self._sender()
+        sender.send(Message(0))
+        sender.start()
+
+        assert self._wait_for(1) == [0]
+        assert self.server.requests == 3
+        assert sender.dropped == 0
+
+    def test_retry_limit(self):
+        self.server.failures = SenderThread.MAX_ATTEMPTS
+        sender = self._sender()
+        sender.send(Message(0))
+        sender.start()
+        deadline = time.monotonic() + 5
+        while self.server.requests < SenderThread.MAX_ATTEMPTS:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        sender.send(Message(1))
+
+        assert self._wait_for(1) == [1]
+        assert sender.dropped == 1
+
+    def test_drop_oldest(self):
+        sender = self._sender(max_queued=3)
+        for i in range(5):
+            sender.send(Message(i))
+        assert sender.dropped == 2
+        sender.start()
+
+        assert self._wait_for(3) == [2, 3, 4]
+
+    def test_join_sends_queued(self):
+        sender = self._sender(batch_max_age=60)
+        sender.start()
+        sender.send(Message(0))
+        sender.join(5)
+
+        assert not sender.is_alive()
+        assert self._wait_for(1) == [0]
+
+    def test_ping(self):
+        sender = self._sender()
+        sender.monitor_sender_thread_timeout = 0.01
+        sender.start()
+
+        assert self._wait_for(1) == ['ping']
+
     def test_run_exception(self):
         node_info = mock.Mock()
         node_info.dict_repr.return_value = dict()
@@ -266,8 +432,8 @@ class TestSenderThread(TestCase):
             monitor_sender_thread_timeout=0,
             proto_ver=None
         )
-        sender.stop_request.isSet = mock.Mock(side_effect=[False, True])
-        with mock.patch('requests.post',
+        sender.stop_request.isSet = mock.Mock(side_effect=[False, False, True])
+        with mock.patch('requests.Session.post',
                         side_effect=requests.exceptions.RequestException(
                             "request failed")), \
                 self.assertLogs() as logs:
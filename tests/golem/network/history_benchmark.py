@@ -0,0 +1,89 @@
+import datetime
+import os
+import queue
+import tempfile
+
+import pytest
+from golem_messages.factories import tasks as tasks_factories
+
+from golem import model
+from golem.database import Database
+from golem.network import history
+
+
+def skip_benchmarks():
+    if os.environ.get('benchmarks', False):
+        return False
+    return True
+
+
+@pytest.fixture
+def database():
+    with tempfile.TemporaryDirectory() as db_dir:
+        database = Database(model.db, fields=model.DB_FIELDS,
+                            models=model.DB_MODELS, db_dir=db_dir)
+        yield database
+        database.db.close()
+
+
+class LegacyMessageHistoryService(history.MessageHistoryService):
+    """ The previous writer: one message saved per loop iteration """
+
+    def _loop(self) -> None:
+        try:
+            msg_dict = self._save_queue.get(True, self._queue_timeout)
+        except queue.Empty:
+            pass
+        else:
+            self.add_sync(msg_dict)
+
+    @staticmethod
+    def _to_row(msg_dict: dict) -> dict:
+        return msg_dict
+
+
+def queue_messages(service_cls, msgs):
+    history.MessageHistoryService.instance = None
+    # pylint: disable=protected-access
+    service = service_cls()
+    service._sweep_ts = datetime.datetime.max
+    for msg in msgs:
+        service.add(history.message_to_model(
+            msg, 'node', model.Actor.Requestor, model.Actor.Provider))
+    return service
+
+
+def drain(service):
+    """ Saves the queued messages, as the service thread does """
+    # pylint: disable=protected-access
+    service._queue_timeout = 0
+    while not service._save_queue.empty():
+        service._loop()
+    return service
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("length", [100, 1000, 10000])
+@pytest.mark.parametrize("service_cls", [
+    LegacyMessageHistoryService,
+    history.MessageHistoryService,
+], ids=['legacy', 'batched'])
+@pytest.mark.benchmark(min_rounds=3, warmup=False)
+def test_drain(benchmark, database, length: int, service_cls):
+    # pylint: disable=redefined-outer-name,unused-argument
+    msgs = [tasks_factories.TaskToComputeFactory() for _ in range(length)]
+    services = []
+
+    def setup():
+        services.append(queue_messages(service_cls, msgs))
+        return (services[-1],), {}
+
+    benchmark.pedantic(drain, setup=setup, rounds=3)
+    assert model.NetworkMessage.select().count() == 3 * length
+    stats = services[-1].get_stats()
+    benchmark.extra_info['messages_per_second'] = \
+        length / benchmark.stats.stats.mean
+    benchmark.extra_info['lag_p95'] = stats['lag']['p95']
+    benchmark.extra_info['lag_max'] = stats['lag']['max']
+    benchmark.extra_info['bytes_per_message'] = sum(
+        len(m.msg_data) for m in model.NetworkMessage.select()) / (3 * length)
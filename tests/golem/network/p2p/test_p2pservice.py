@@ -1,6 +1,8 @@
 # pylint: disable=protected-access
 from os import urandom
 import random
+import socket
+from threading import Event
 import time
 import unittest.mock as mock
 from unittest.mock import MagicMock, patch
@@ -12,15 +14,18 @@ from golem_messages.datastructures import p2p as dt_p2p
 from golem_messages.factories.datastructures import p2p as dt_p2p_factory
 from golem_messages.message import Disconnect
 from twisted.internet.tcp import EISCONN
+from twisted.internet.threads import blockingCallFromThread
 
 from golem.clientconfigdescriptor import ClientConfigDescriptor
+from golem.core.deferred import sync_wait
 from golem.core.keysauth import KeysAuth
 from golem.diag.service import DiagnosticsOutputFormat
-from golem.model import KnownHosts
+from golem.model import KnownHostPerformance, KnownHosts
 from golem.network.p2p import peersession
 from golem.network.p2p.p2pservice import HISTORY_LEN, P2PService, \
     RANDOM_DISCONNECT_FRACTION, MAX_STORED_HOSTS
 from golem.network.p2p.peersession import PeerSession
+from golem.network.p2p.seedresolver import SeedResolver
 from golem.network.transport.tcpnetwork import SocketAddress
 from golem.task.taskconnectionshelper import TaskConnectionsHelper
 from golem.tools.testwithreactor import TestDatabaseWithReactor
@@ -42,7 +47,7 @@ class TestSyncSeeds(TestDatabaseWithReactor):
         self.service.seeds = set()
 
     def test_P2P_SEEDS(self):
-        self.service._sync_seeds()
+        sync_wait(self.service._sync_seeds())
         self.assertGreater(len(self.service.bootstrap_seeds), 0)
         self.assertGreaterEqual(
             len(self.service.seeds),
@@ -67,9 +72,70 @@ class TestSyncSeeds(TestDatabaseWithReactor):
         self.service.bootstrap_seeds = frozenset()
         self.service.config_desc.seed_host = 'nosuchaddress'
         self.service.config_desc.seed_port = '31337'
-        self.service._sync_seeds()
+        sync_wait(self.service._sync_seeds())
         self.assertEqual(self.service.seeds, set())
 
+    def test_ip_address(self):
+        self.service.bootstrap_seeds = frozenset()
+        self.service.config_desc.seed_host = '127.0.0.1'
+        self.service.config_desc.seed_port = '31337'
+        # Resolved without a lookup
+        self.service._sync_seeds()
+        self.assertEqual(self.service.seeds, {('127.0.0.1', 31337)})
+
+    def test_keeps_last_known_seeds(self):
+        fail = Event()
+
+        def getaddrinfo(host, port):
+            if fail.is_set():
+                raise socket.gaierror('Temporary failure in name resolution')
+            return [(None, None, None, '', ('10.0.0.1', port))]
+
+        self.service.seed_resolver = SeedResolver(ttl=0,
+                                                  getaddrinfo=getaddrinfo)
+        self.service.bootstrap_seeds = [('seed.example', 40102)]
+        sync_wait(self.service._sync_seeds())
+        self.assertEqual(self.service.seeds, {('10.0.0.1', 40102)})
+
+        fail.set()
+        sync_wait(self.service._sync_seeds())
+        self.assertEqual(self.service.seeds, {('10.0.0.1', 40102)})
+
+    def test_slow_resolver_does_not_block_reactor(self):
+        delay = 0.5
+
+        def slow_getaddrinfo(host, port):
+            time.sleep(delay)
+            ip = '10.0.0.{}'.format(host[len('seed'):-len('.example')])
+            return [(None, None, None, '', (ip, port))]
+
+        self.service.seed_resolver = SeedResolver(
+            getaddrinfo=slow_getaddrinfo)
+        self.service.bootstrap_seeds = [
+            ('seed{}.example'.format(i), 40102)
+            for i in range(SeedResolver.WORKERS)
+        ]
+        reactor = self._get_reactor()
+
+        started = time.monotonic()
+        # Wrapped, so that the call does not wait for the Deferred
+        deferred, = blockingCallFromThread(
+            reactor, lambda: [self.service._sync_seeds()])
+        assert time.monotonic() - started < delay / 2
+
+        # The reactor keeps serving other calls during the lookups
+        while not deferred.called:
+            called = time.monotonic()
+            blockingCallFromThread(reactor, lambda: None)
+            assert time.monotonic() - called < delay / 2
+            time.sleep(delay / 10)
+
+        seeds = sync_wait(deferred)
+        # Resolved in parallel
+        assert time.monotonic() - started < 2 * delay
+        assert seeds == self.service.seeds
+        assert len(seeds) == SeedResolver.WORKERS
+
 
 class TestP2PService(TestDatabaseWithReactor):
 
@@ -522,39 +588,63 @@ class TestP2PService(TestDatabaseWithReactor):
         assert SocketAddress(address, pub_port) in result
 
     def test_get_performance_percentile_rank_single_env(self):
-        def _host(perf):
-            return MagicMock(metadata={'performance': {'env': perf}})
-
-        with patch('golem.network.p2p.p2pservice.KnownHosts') as hosts:
-            hosts.select.return_value = [_host(x) for x in (1, 2, 3, 4)]
-            self.assertEqual(
-                self.service.get_performance_percentile_rank(1, 'env'), 0.0)
-            self.assertEqual(
-                self.service.get_performance_percentile_rank(3, 'env'), 0.5)
-            self.assertEqual(
-                self.service.get_performance_percentile_rank(5, 'env'), 1.0)
+        for host_id, perf in enumerate((1, 2, 3, 4)):
+            self.service.performance_index.update(host_id, {'env': perf})
+
+        self.assertEqual(
+            self.service.get_performance_percentile_rank(1, 'env'), 0.0)
+        self.assertEqual(
+            self.service.get_performance_percentile_rank(3, 'env'), 0.5)
+        self.assertEqual(
+            self.service.get_performance_percentile_rank(5, 'env'), 1.0)
 
     def test_get_performance_percentile_rank_multiple_envs(self):
-        def _host(env, perf):
-            return MagicMock(metadata={'performance': {env: perf}})
-
-        with patch('golem.network.p2p.p2pservice.KnownHosts') as hosts:
-            hosts.select.return_value = [
-                _host('env1', 1),
-                _host('env1', 2),
-                _host('env2', 3),
-                _host('env3', 4),
-            ]
-            self.assertEqual(
-                self.service.get_performance_percentile_rank(0, 'env1'), 0.5)
-            self.assertEqual(
-                self.service.get_performance_percentile_rank(2, 'env1'), 0.75)
+        for host_id, (env, perf) in enumerate((
+                ('env1', 1),
+                ('env1', 2),
+                ('env2', 3),
+                ('env3', 4),
+        )):
+            self.service.performance_index.update(host_id, {env: perf})
+
+        self.assertEqual(
+            self.service.get_performance_percentile_rank(0, 'env1'), 0.5)
+        self.assertEqual(
+            self.service.get_performance_percentile_rank(2, 'env1'), 0.75)
 
     def test_get_performance_percentile_rank_no_hosts(self):
-        with patch('golem.network.p2p.p2pservice.KnownHosts') as hosts:
-            hosts.select.return_value = []
-            self.assertEqual(
-                self.service.get_performance_percentile_rank(1, 'env'), 1.0)
+        self.assertEqual(
+            self.service.get_performance_percentile_rank(1, 'env'), 1.0)
+
+    def test_add_known_peer_performance(self):
+        KnownHosts.delete().execute()
+        self.service.performance_index.load([])
+
+        for i, perf in enumerate((1.0, 2.0, 'invalid')):
+            self.service.add_known_peer(
+                None, '1.2.3.{}'.format(i), 10000,
+                metadata={'performance': {'env': perf}})
+        # Performance reported again replaces the previous one
+        self.service.add_known_peer(
+            None, '1.2.3.0', 10000, metadata={'performance': {'env': 3.0}})
+
+        rows = KnownHostPerformance \
+            .select(KnownHostPerformance.environment,
+                    KnownHostPerformance.value) \
+            .order_by(KnownHostPerformance.value) \
+            .tuples()
+        assert list(rows) == [('env', 2.0), ('env', 3.0)]
+        assert len(self.service.performance_index) == 2
+        assert self.service.get_performance_percentile_rank(2.5, 'env') == 0.5
+
+        # The index is rebuilt from the database
+        service = P2PService(
+            None,
+            ClientConfigDescriptor(),
+            self.keys_auth,
+            connect_to_known_hosts=False)
+        assert len(service.performance_index) == 2
+        assert service.get_performance_percentile_rank(2.5, 'env') == 0.5
 
     def test_disconnect_random_peers_no_peers(self):
         self.service.config_desc.opt_peer_num = 10
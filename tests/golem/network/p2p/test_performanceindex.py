@@ -0,0 +1,101 @@
+import random
+import unittest
+
+from golem import testutils
+from golem.network.p2p.performanceindex import PerformanceIndex
+
+
+def scan_rank(hosts, perf, env_id):
+    """ Percentile rank computed by scanning all the hosts """
+    hosts_perf = [performance.get(env_id, -1.0)
+                  for performance in hosts.values() if performance]
+    return sum(1 for x in hosts_perf if x < perf) / len(hosts_perf)
+
+
+class TestPerformanceIndex(testutils.PEP8MixIn, unittest.TestCase):
+    PEP8_FILES = ['golem/network/p2p/performanceindex.py']
+
+    def setUp(self):
+        self.index = PerformanceIndex()
+
+    def test_no_hosts(self):
+        assert self.index.percentile_rank(1.0, 'env') is None
+        self.index.update(1, {})
+        assert self.index.percentile_rank(1.0, 'env') is None
+        assert not self.index
+
+    def test_update(self):
+        self.index.update(1, {'env': 1.0})
+        self.index.update(2, {'env': 3.0})
+        assert self.index.percentile_rank(2.0, 'env') == 0.5
+
+        self.index.update(1, {'env': 4.0})
+        assert len(self.index) == 2
+        assert self.index.percentile_rank(2.0, 'env') == 0.0
+        assert self.index.percentile_rank(5.0, 'env') == 1.0
+
+    def test_remove(self):
+        self.index.update(1, {'env': 1.0, 'other': 2.0})
+        self.index.update(2, {'env': 3.0})
+        self.index.remove(1)
+        self.index.remove(3)
+        assert len(self.index) == 1
+        assert self.index.percentile_rank(2.0, 'env') == 0.0
+        # The host which supports no environment is counted as -1
+        assert self.index.percentile_rank(2.0, 'other') == 1.0
+
+        self.index.remove(2)
+        assert self.index.percentile_rank(2.0, 'env') is None
+
+    def test_missing_env(self):
+        self.index.update(1, {'env1': 1.0})
+        self.index.update(2, {'env2': 1.0})
+        assert self.index.percentile_rank(0.0, 'env1') == 0.5
+        assert self.index.percentile_rank(-1.0, 'env1') == 0.0
+
+    def test_invalid_values(self):
+        self.index.update(1, {'env': 'fast', 'other': None})
+        assert not self.index
+        self.index.update(2, {'env': float('nan'), 'other': '2.5'})
+        assert self.index.percentile_rank(3.0, 'other') == 1.0
+        assert self.index.percentile_rank(0.0, 'env') == 1.0
+        self.index.update(3, ['env', 1.0])
+        assert len(self.index) == 1
+
+    def test_load(self):
+        self.index.update(5, {'env': 10.0})
+        self.index.load([
+            (1, 'env', 1.0),
+            (2, 'env', 3.0),
+            (1, 'other', 2.0),
+        ])
+        assert len(self.index) == 2
+        assert self.index.percentile_rank(2.0, 'env') == 0.5
+        assert self.index.percentile_rank(3.0, 'other') == 1.0
+
+        self.index.remove(1)
+        assert self.index.percentile_rank(2.0, 'other') == 1.0
+
+    def test_matches_scan(self):
+        hosts = {}
+        for _ in range(500):
+            host_id = random.randrange(100)
+            if random.random() < 0.2:
+                hosts.pop(host_id, None)
+                self.index.remove(host_id)
+                continue
+            performance = {
+                env_id: float(random.randrange(10))
+                for env_id in random.sample(['env1', 'env2', 'env3'],
+                                            random.randrange(3))
+            }
+            hosts[host_id] = performance
+            self.index.update(host_id, performance)
+
+            for env_id in ('env1', 'env2'):
+                for perf in (-1.0, 0.0, 4.0, 9.5):
+                    rank = self.index.percentile_rank(perf, env_id)
+                    if not any(hosts.values()):
+                        assert rank is None
+                    else:
+                        assert rank == scan_rank(hosts, perf, env_id)
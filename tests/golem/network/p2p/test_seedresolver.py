@@ -0,0 +1,89 @@
+import socket
+import threading
+from unittest.mock import patch
+
+from golem import testutils
+from golem.core.deferred import sync_wait
+from golem.network.p2p.seedresolver import SeedResolver
+from golem.tools.testwithreactor import TestWithReactor
+
+
+class FakeGetAddrInfo:
+
+    def __init__(self):
+        self.calls = []
+        self.error = None
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, host, port):
+        self.calls.append((host, port))
+        self.release.wait()
+        if self.error:
+            raise self.error
+        return [
+            (socket.AF_INET, socket.SOCK_STREAM, 6, '', ('10.0.0.1', port)),
+            (socket.AF_INET, socket.SOCK_DGRAM, 17, '', ('10.0.0.1', port)),
+            (socket.AF_INET6, socket.SOCK_STREAM, 6, '',
+             ('fe80::1', port, 0, 0)),
+        ]
+
+
+class TestSeedResolver(testutils.PEP8MixIn, TestWithReactor):
+    PEP8_FILES = ['golem/network/p2p/seedresolver.py']
+
+    def setUp(self):
+        self.getaddrinfo = FakeGetAddrInfo()
+        self.resolver = SeedResolver(workers=2, ttl=60,
+                                     getaddrinfo=self.getaddrinfo)
+
+    def tearDown(self):
+        self.getaddrinfo.release.set()
+        self.resolver.stop()
+
+    def test_ip_address(self):
+        deferred = self.resolver.resolve('127.0.0.1', 40102)
+        assert deferred.called
+        assert sync_wait(deferred) == {('127.0.0.1', 40102)}
+        assert not self.getaddrinfo.calls
+
+    def test_resolve(self):
+        addresses = sync_wait(self.resolver.resolve('seed.example', 40102))
+        assert addresses == {('10.0.0.1', 40102), ('fe80::1', 40102)}
+
+    def test_cached(self):
+        first = sync_wait(self.resolver.resolve('seed.example', 40102))
+        second = self.resolver.resolve('seed.example', 40102)
+        assert second.called
+        assert sync_wait(second) == first
+        assert len(self.getaddrinfo.calls) == 1
+
+    def test_expired(self):
+        self.resolver.ttl = 0
+        sync_wait(self.resolver.resolve('seed.example', 40102))
+        sync_wait(self.resolver.resolve('seed.example', 40102))
+        assert len(self.getaddrinfo.calls) == 2
+
+    def test_lookup_in_progress(self):
+        self.getaddrinfo.release.clear()
+        first = self.resolver.resolve('seed.example', 40102)
+        second = self.resolver.resolve('seed.example', 40102)
+        assert not first.called
+        self.getaddrinfo.release.set()
+        assert sync_wait(first) == sync_wait(second)
+        assert len(self.getaddrinfo.calls) == 1
+
+    def test_error(self):
+        self.getaddrinfo.error = socket.gaierror('Name or service not known')
+        with patch('golem.network.p2p.seedresolver.logger') as logger:
+            addresses = sync_wait(self.resolver.resolve('seed.example', 1))
+        assert addresses == set()
+        assert logger.error.called
+
+    def test_error_last_known_addresses(self):
+        self.resolver.ttl = 0
+        first = sync_wait(self.resolver.resolve('seed.example', 40102))
+        self.getaddrinfo.error = socket.gaierror('Name or service not known')
+        second = sync_wait(self.resolver.resolve('seed.example', 40102))
+        assert len(self.getaddrinfo.calls) == 2
+        assert second == first
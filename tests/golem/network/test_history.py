@@ -83,6 +83,49 @@ class TestMessageHistoryService(DatabaseFixture):
         self.service.add_sync(msg_dict)
         assert message_count() == 1
 
+    def test_add_many_sync(self):
+        msgs = [self._build_dict("task") for _ in range(250)]
+        self.service.add_many_sync(msgs)
+        assert message_count() == 250
+        assert self.service.get_stats()['saved'] == 250
+
+        result = self.service.get_sync(task="task", subtask=msgs[0]['subtask'])
+        assert result[0].msg_data != msgs[0]['msg_data']
+        assert result[0].node == msgs[0]['node']
+
+    def test_add_many_sync_fail(self):
+        msgs = [self._build_dict(), self._build_dict()]
+
+        with mock.patch('peewee.InsertQuery.execute',
+                        side_effect=PeeweeException):
+            self.service.add_many_sync(msgs)
+        assert message_count() == 0
+        assert self.service._save_queue.qsize() == 2
+
+        # The invalid message does not prevent saving the other one
+        self.service._save_queue = queue.Queue()
+        msgs[1]['local_role'] = None
+        self.service.add_many_sync(msgs)
+        assert message_count() == 1
+        assert self.service._save_queue.empty()
+
+    def test_stats(self):
+        stats = self.service.get_stats()
+        assert stats['queued'] == stats['saved'] == 0
+        assert stats['lag']['max'] == 0.
+
+        msg = self._build_dict()
+        msg['msg_date'] -= datetime.timedelta(seconds=10)
+        self.service.add(msg)
+        assert self.service.get_stats()['queued'] == 1
+
+        self.service._queue_timeout = 0
+        self.service._loop()
+        stats = self.service.get_stats()
+        assert stats['queued'] == 0
+        assert stats['saved'] == 1
+        assert stats['lag']['max'] >= 10.
+
     def test_remove(self):
         task = str(uuid.uuid4())
         params = dict(subtask=str(uuid.uuid4()))
@@ -199,6 +242,31 @@ class TestMessageHistoryService(DatabaseFixture):
         self.service._sweep()
         assert message_count() == 2
 
+    @mock.patch(
+        'golem.network.history.MessageHistoryService.SWEEP_BATCH_SIZE', 2)
+    def test_sweep_batches(self):
+        old_date = (
+            datetime.datetime.now()
+            - self.service.MESSAGE_LIFETIME
+            - datetime.timedelta(hours=5)
+        )
+        msgs = [self._build_dict() for _ in range(4)]
+        for msg in msgs[:3]:
+            msg['msg_date'] = old_date
+        self.service.add_many_sync(msgs)
+
+        sweep_ts = self.service._sweep_ts = \
+            datetime.datetime.now() + datetime.timedelta(hours=1)
+        self.service._sweep()
+        assert message_count() == 2
+        # Continue on the next iteration
+        assert self.service._sweep_ts < sweep_ts
+
+        self.service._sweep_ts = sweep_ts
+        self.service._sweep()
+        assert message_count() == 1
+        assert self.service._sweep_ts == sweep_ts
+
     def test_loop_sweep(self):
         self.service._sweep = mock.Mock()
         self.service._queue_timeout = 0.1
@@ -232,6 +300,21 @@ class TestMessageHistoryService(DatabaseFixture):
         self.service._loop()
         assert not self.service.add_sync.called
 
+    def test_loop_add_many_sync(self):
+        self.service._sweep = mock.Mock()
+        self.service._queue_timeout = 0.1
+        self.service.add_many_sync = mock.Mock()
+
+        msgs = [self._build_dict() for _ in range(5)]
+        for msg in msgs:
+            self.service._save_queue.put(msg)
+
+        with mock.patch.object(self.service, 'BATCH_SIZE', 3):
+            self.service._loop()
+            self.service.add_many_sync.assert_called_once_with(msgs[:3])
+            self.service._loop()
+            self.service.add_many_sync.assert_called_with(msgs[3:])
+
     def test_loop_remove_sync(self):
         self.service._sweep = mock.Mock()
         self.service._queue_timeout = 0.1
@@ -379,6 +462,15 @@ class TestNetworkMessage(DatabaseFixture):
             **self.param_kwargs
         ).save()
 
+    def test_as_message(self):
+        msg = msg_factories.tasks.TaskToComputeFactory()
+        msg_data = history.message_to_model(
+            msg, 'node', Actor.Provider, Actor.Requestor)['msg_data']
+
+        for data in (msg_data, NetworkMessage.pack_data(msg_data)):
+            network_msg = NetworkMessage(msg_data=data, **self.param_kwargs)
+            assert network_msg.as_message().task_id == msg.task_id
+
     def test_save_failing_role_constraints(self):
         msg_kwargs = dict(msg_date=datetime.time(),
                           msg_cls='cls',
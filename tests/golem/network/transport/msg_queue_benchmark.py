@@ -0,0 +1,85 @@
+import os
+import tempfile
+import uuid
+
+import pytest
+from golem_messages.factories import tasks as tasks_factories
+
+from golem import model
+from golem.database import Database
+from golem.network.transport import msg_queue
+
+
+def skip_benchmarks():
+    if os.environ.get('benchmarks', False):
+        return False
+    return True
+
+
+@pytest.fixture
+def database():
+    with tempfile.TemporaryDirectory() as db_dir:
+        database = Database(model.db, fields=model.DB_FIELDS,
+                            models=model.DB_MODELS, db_dir=db_dir)
+        yield database
+        database.db.close()
+
+
+def legacy_get(node_id: str):
+    """ The previous msg_queue.get: one SELECT and one DELETE per message """
+    while True:
+        with msg_queue.READ_LOCK:
+            try:
+                db_model = model.QueuedMessage.select().where(
+                    model.QueuedMessage.node == node_id,
+                ).order_by(model.QueuedMessage.created_date).get()
+            except model.QueuedMessage.DoesNotExist:
+                return
+            try:
+                msg = db_model.as_message()
+            finally:
+                db_model.delete_instance()
+        yield msg
+
+
+def fill_one_by_one(node_id, msgs):
+    for msg in msgs:
+        msg_queue.put(node_id, msg)
+
+
+def fill_in_bulk(node_id, msgs):
+    msg_queue.put_many(node_id, msgs)
+
+
+def drain(get, node_id):
+    return sum(1 for _ in get(node_id))
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("length", [10, 100, 1000])
+@pytest.mark.parametrize("get", [legacy_get, msg_queue.get])
+@pytest.mark.benchmark(min_rounds=3, warmup=False)
+def test_drain(benchmark, database, length: int, get):
+    # pylint: disable=redefined-outer-name,unused-argument
+    node_id = str(uuid.uuid4())
+    msgs = [tasks_factories.WantToComputeTaskFactory() for _ in range(length)]
+
+    def setup():
+        msg_queue.put_many(node_id, msgs)
+        return (get, node_id), {}
+
+    drained = benchmark.pedantic(drain, setup=setup, rounds=3)
+    assert drained == length
+    benchmark.extra_info['messages_per_second'] = \
+        length / benchmark.stats.stats.mean
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("length", [10, 100, 1000])
+@pytest.mark.parametrize("fill", [fill_one_by_one, fill_in_bulk])
+@pytest.mark.benchmark(min_rounds=3, warmup=False)
+def test_fill(benchmark, database, length: int, fill):
+    # pylint: disable=redefined-outer-name,unused-argument
+    msgs = [tasks_factories.WantToComputeTaskFactory() for _ in range(length)]
+    benchmark.pedantic(fill, args=(str(uuid.uuid4()), msgs), rounds=3)
+    assert model.QueuedMessage.select().count() == 3 * length
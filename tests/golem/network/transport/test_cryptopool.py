@@ -0,0 +1,251 @@
+import struct
+import unittest
+from unittest import mock
+
+from golem_messages import message
+from twisted.internet.defer import Deferred, maybeDeferred
+
+from golem.network.transport.cryptopool import CryptoPool
+from golem.network.transport.tcpnetwork import SafeProtocol
+
+
+def deliver_inline(_reactor, _pool, fn):
+    return maybeDeferred(fn)
+
+
+class ManualCryptoPool(CryptoPool):
+    """ Keeps the jobs until fired by the test, in any order """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.jobs = []
+
+    def run(self, fn, *args, **kwargs):
+        deferred = Deferred()
+        self._queued += 1
+        self.jobs.append((deferred, fn, args))
+
+        def done(result):
+            self._queued -= 1
+            if self._waiting and self.drained:
+                self._wake()
+            return result
+
+        deferred.addBoth(done)
+        return deferred
+
+    def fire(self, index):
+        deferred, fn, args = self.jobs[index]
+        maybeDeferred(fn, *args).chainDeferred(deferred)
+
+
+class FakeMessage:
+
+    def __init__(self, data):
+        self.data = data
+        self.sig = None
+        self.encrypted = False
+
+    def sign_message(self, private_key):
+        self.sig = private_key
+
+
+@mock.patch('golem.network.transport.cryptopool.deferToThreadPool',
+            deliver_inline)
+class TestCryptoPool(unittest.TestCase):
+
+    def test_run(self):
+        pool = CryptoPool(workers=2)
+        results = []
+        pool.run(lambda x: x * 2, 21).addCallback(results.append)
+
+        assert results == [42]
+        stats = pool.get_stats()
+        assert stats['queue_depth'] == 0
+        assert stats['max_queue_depth'] == 1
+        assert stats['processed'] == 1
+        assert stats['latency']['max'] >= 0.0
+
+    def test_failure(self):
+        pool = CryptoPool(workers=1)
+        errors = []
+        pool.run(lambda: 1 / 0).addErrback(errors.append)
+
+        assert errors[0].check(ZeroDivisionError)
+        assert pool.get_stats()['failed'] == 1
+
+    def test_empty_stats(self):
+        stats = CryptoPool().get_stats()
+        assert stats['latency'] == {'avg': 0.0, 'p95': 0.0, 'max': 0.0}
+
+
+@mock.patch('golem_messages.load', side_effect=lambda data, *_: data)
+class TestSafeProtocolCryptoPool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = ManualCryptoPool(max_queue=100,
+                                     max_pending_per_connection=4)
+        server = mock.Mock(crypto_pool=self.pool)
+        self.protocol = SafeProtocol(server)
+        self.protocol.opened = True
+        self.protocol.transport = mock.Mock()
+        self.protocol.session = mock.Mock()
+        self.protocol.spam_protector.check_msg = mock.Mock(return_value=True)
+
+    @staticmethod
+    def frame(payload: bytes) -> bytes:
+        return struct.pack('!L', len(payload)) + payload
+
+    def test_without_pool(self, _load):
+        protocol = SafeProtocol(mock.MagicMock())
+        assert protocol.crypto_pool is None
+
+    def test_delivery_order(self, _load):
+        self.protocol.dataReceived(self.frame(b'a') + self.frame(b'b'))
+        self.protocol.dataReceived(self.frame(b'c'))
+        interpret = self.protocol.session.interpret
+
+        self.pool.fire(2)
+        self.pool.fire(1)
+        interpret.assert_not_called()
+
+        self.pool.fire(0)
+        assert interpret.call_args_list == [
+            mock.call(b'a'), mock.call(b'b'), mock.call(b'c')]
+
+    def test_hello_in_one_chunk(self, _load):
+        session = self.protocol.session
+        session.theirs_public_key = None
+
+        def interpret(msg):
+            if msg == b'hello':
+                session.theirs_public_key = b'their key'
+
+        session.interpret.side_effect = interpret
+        self.protocol.dataReceived(
+            self.frame(b'hello') + self.frame(b'randval') + self.frame(b'x'))
+        # The key of RandVal comes with Hello
+        assert len(self.pool.jobs) == 1
+        assert self.pool.jobs[0][2][2] is None
+
+        self.pool.fire(0)
+        assert [job[2][2] for job in self.pool.jobs] == \
+            [None, b'their key', b'their key']
+        self.pool.fire(2)
+        self.pool.fire(1)
+        assert session.interpret.call_args_list == [
+            mock.call(b'hello'), mock.call(b'randval'), mock.call(b'x')]
+
+    def test_broken_message_skipped(self, load):
+        from golem_messages.exceptions import MessageError
+
+        def load_or_fail(data, *_):
+            if data == b'bad':
+                raise MessageError('broken')
+            return data
+
+        load.side_effect = load_or_fail
+        self.protocol.dataReceived(self.frame(b'bad') + self.frame(b'ok'))
+        self.pool.fire(1)
+        self.pool.fire(0)
+        self.protocol.session.interpret.assert_called_once_with(b'ok')
+
+    def test_connection_backpressure(self, _load):
+        transport = self.protocol.transport
+        self.protocol.dataReceived(b''.join(
+            self.frame(b'%d' % i) for i in range(4)))
+        transport.pauseProducing.assert_called_once_with()
+
+        self.pool.fire(0)
+        transport.resumeProducing.assert_not_called()
+        self.pool.fire(1)
+        transport.resumeProducing.assert_called_once_with()
+
+    def test_pool_backpressure(self, _load):
+        self.pool.max_queue = 4
+        other = SafeProtocol(mock.Mock(crypto_pool=self.pool))
+        other.opened = True
+        other.transport = mock.Mock()
+        other.session = mock.Mock()
+        other.spam_protector.check_msg = mock.Mock(return_value=True)
+
+        other.dataReceived(self.frame(b'x') * 3)
+        other.transport.pauseProducing.assert_not_called()
+        self.protocol.dataReceived(self.frame(b'y'))
+        self.protocol.transport.pauseProducing.assert_called_once_with()
+
+        self.pool.fire(0)
+        self.protocol.transport.resumeProducing.assert_not_called()
+        self.pool.fire(1)
+        self.protocol.transport.resumeProducing.assert_called_once_with()
+
+    @mock.patch('golem_messages.dump', side_effect=lambda msg, *_: msg.data)
+    def test_ordered_send_and_close(self, _dump, _load):
+        transport = self.protocol.transport
+        assert self.protocol.send_message(FakeMessage(b'first'))
+        assert self.protocol.send_message(FakeMessage(b'second'))
+        self.protocol.close()
+
+        self.pool.fire(1)
+        transport.write.assert_not_called()
+        transport.loseConnection.assert_not_called()
+
+        self.pool.fire(0)
+        assert transport.write.call_args_list == [
+            mock.call(self.frame(b'first')), mock.call(self.frame(b'second'))]
+        transport.loseConnection.assert_called_once_with()
+
+    @mock.patch('golem_messages.dump')
+    def test_send_signs_and_dumps_copy(self, dump, _load):
+        def dump_message(msg, privkey, _pubkey):
+            assert privkey is None
+            msg.encrypted = True
+            return msg.data
+
+        dump.side_effect = dump_message
+        msg = FakeMessage(b'report')
+        assert self.protocol.send_message(msg)
+        # Signed before the caller gets the message back
+        assert msg.sig == self.protocol.session.my_private_key
+
+        self.pool.fire(0)
+        dumped = dump.call_args[0][0]
+        assert dumped is not msg
+        assert dumped.sig == msg.sig
+        assert not msg.encrypted
+        self.protocol.transport.write.assert_called_once_with(
+            self.frame(b'report'))
+
+    @mock.patch('golem_messages.dump')
+    def test_send_unserializable(self, dump, _load):
+        from golem_messages.exceptions import SerializationError
+
+        msg = FakeMessage(b'broken')
+        msg.sign_message = mock.Mock(side_effect=SerializationError('x'))
+        with self.assertRaises(SerializationError):
+            self.protocol.send_message(msg)
+        assert not self.pool.jobs
+        dump.assert_not_called()
+
+    @mock.patch('golem_messages.dump')
+    def test_send_dump_failure_dropped(self, dump, _load):
+        dump.side_effect = [ValueError('encryption failed'), b'second']
+        assert self.protocol.send_message(FakeMessage(b'first'))
+        assert self.protocol.send_message(FakeMessage(b'second'))
+
+        self.pool.fire(0)
+        self.pool.fire(1)
+        self.protocol.transport.write.assert_called_once_with(
+            self.frame(b'second'))
+
+    def test_version_mismatch(self, load):
+        from golem_messages.exceptions import VersionMismatchError
+
+        load.side_effect = VersionMismatchError('old')
+        with mock.patch.object(self.protocol, 'send_message') as send:
+            self.protocol.dataReceived(self.frame(b'a') + self.frame(b'b'))
+            self.pool.fire(0)
+        assert send.call_args[0][0].reason == \
+            message.base.Disconnect.REASON.ProtocolVersion
+        self.protocol.session.interpret.assert_not_called()
+        assert not self.protocol._incoming
@@ -1,5 +1,6 @@
 import datetime
 import uuid
+from unittest import mock
 
 from dateutil.relativedelta import relativedelta
 from freezegun import freeze_time
@@ -36,6 +37,51 @@ class TestMsqQueue(testutils.DatabaseFixture):
         self.assertEqual(msg.slots(), self.msg.slots())
         self.assertEqual(len(list(msg_queue.get(self.node_id))), 0)
 
+    def test_put_many(self):
+        msgs = [
+            tasks_factories.WantToComputeTaskFactory(perf_index=i)
+            for i in range(5)
+        ]
+        msg_queue.put_many(self.node_id, msgs)
+        self.assertEqual(model.QueuedMessage.select().count(), 5)
+        self.assertEqual(
+            [msg.perf_index for msg in msg_queue.get(self.node_id)],
+            list(range(5)),
+        )
+
+    @mock.patch('golem.network.transport.msg_queue.BATCH_SIZE', 2)
+    def test_get_batches(self):
+        msg_queue.put_many(self.node_id, [self.msg] * 5)
+        msgs = msg_queue.get(self.node_id)
+        next(msgs)
+        next(msgs)
+        next(msgs)
+        # Acknowledged with the second batch
+        self.assertEqual(model.QueuedMessage.select().count(), 3)
+        self.assertEqual(len(list(msgs)), 2)
+        self.assertEqual(model.QueuedMessage.select().count(), 0)
+
+    def test_get_unacknowledged(self):
+        msg_queue.put_many(self.node_id, [self.msg] * 3)
+        for _ in msg_queue.get(self.node_id):
+            break
+        self.assertEqual(model.QueuedMessage.select().count(), 3)
+
+        msgs = msg_queue.get(self.node_id)
+        next(msgs)
+        next(msgs)
+        msgs.close()
+        self.assertEqual(model.QueuedMessage.select().count(), 2)
+        self.assertEqual(len(list(msg_queue.get(self.node_id))), 2)
+
+    def test_get_concurrent(self):
+        msg_queue.put(self.node_id, self.msg)
+        msgs = msg_queue.get(self.node_id)
+        next(msgs)
+        self.assertEqual(list(msg_queue.get(self.node_id)), [])
+        self.assertEqual(len(list(msgs)), 0)
+        self.assertEqual(model.QueuedMessage.select().count(), 0)
+
     def test_waiting(self):
         node_id2 = str(uuid.uuid4())
         node_id3 = str(uuid.uuid4())
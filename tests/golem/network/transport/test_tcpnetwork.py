@@ -10,6 +10,8 @@ from golem_messages import exceptions as msg_exceptions
 from golem_messages import message
 from golem_messages import factories as msg_factories
 from golem_messages.factories.datastructures import p2p as dt_p2p_factory
+from twisted.internet.defer import Deferred
+from twisted.internet.task import Clock
 
 from golem import testutils
 from golem.network.transport import tcpnetwork
@@ -194,3 +196,74 @@ class TestTCPNetworkConnections(unittest.TestCase):
         connect_all(TCPConnectInfo(self.addresses, mock.Mock(), mock.Mock()))
         assert not connect.called
         assert call.called
+
+
+class TestConnectionRace(unittest.TestCase):
+
+    def setUp(self):
+        self.addresses = [
+            SocketAddress('192.168.0.1', 40102),
+            SocketAddress('192.168.0.2', 40104),
+            SocketAddress('192.168.0.3', 40106),
+        ]
+        self.attempts = {}
+        self.cancelled = []
+        self.network = TCPNetwork(mock.Mock())
+        self.network.reactor = Clock()
+        self.established = mock.Mock()
+        self.failure = mock.Mock()
+
+        def endpoint(_reactor, address, _port, _timeout):
+            def connect(_factory):
+                self.attempts[address] = Deferred(self.cancelled.append)
+                return self.attempts[address]
+            return mock.Mock(connect=connect)
+
+        patcher = mock.patch(
+            'golem.network.transport.tcpnetwork.TCP4ClientEndpoint',
+            side_effect=endpoint)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def connect(self):
+        self.network.connect(TCPConnectInfo(
+            self.addresses, self.established, self.failure))
+
+    def test_staggered_attempts(self):
+        self.connect()
+        assert list(self.attempts) == ['192.168.0.1']
+
+        self.network.reactor.advance(TCPNetwork.CONNECTION_ATTEMPT_DELAY)
+        assert list(self.attempts) == ['192.168.0.1', '192.168.0.2']
+
+        # A failed attempt starts the next one right away
+        self.attempts['192.168.0.2'].errback(Exception())
+        assert list(self.attempts) == ['192.168.0.1', '192.168.0.2',
+                                       '192.168.0.3']
+        assert not self.network.reactor.getDelayedCalls()
+        assert not self.failure.called
+
+    def test_first_connection_wins(self):
+        self.connect()
+        self.network.reactor.advance(TCPNetwork.CONNECTION_ATTEMPT_DELAY)
+
+        conn = mock.Mock()
+        self.attempts['192.168.0.2'].callback(conn)
+        self.established.assert_called_once_with(conn.session, conn_id=mock.ANY)
+        # The other attempt is cancelled and no more are started
+        assert self.cancelled == [self.attempts['192.168.0.1']]
+        self.network.reactor.advance(TCPNetwork.CONNECTION_ATTEMPT_DELAY)
+        assert '192.168.0.3' not in self.attempts
+        assert not self.failure.called
+
+    def test_all_attempts_fail(self):
+        self.connect()
+        self.network.reactor.pump(
+            [TCPNetwork.CONNECTION_ATTEMPT_DELAY] * len(self.addresses))
+        assert len(self.attempts) == len(self.addresses)
+
+        for attempt in self.attempts.values():
+            assert not self.failure.called
+            attempt.errback(Exception())
+        self.failure.assert_called_once_with(conn_id=mock.ANY)
+        assert not self.established.called
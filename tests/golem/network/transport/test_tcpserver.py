@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from golem.network.transport.tcpnetwork import SocketAddress
 
@@ -241,3 +241,185 @@ class TestPendingConnection(unittest.TestCase):
     def test_init(self):
         pc = PendingConnection(1, "10.10.10.10")
         self.assertIsInstance(pc, PendingConnection)
+
+
+class DialNetwork(object):
+    """ Network which reports the outcome of dials when told to """
+
+    def __init__(self):
+        self.dials = []
+
+    def connect(self, connect_info):
+        self.dials.append(connect_info)
+
+    def fail(self, connect_info):
+        self.dials.remove(connect_info)
+        connect_info.failure_callback()
+
+    def establish(self, connect_info):
+        self.dials.remove(connect_info)
+        connect_info.established_callback(Mock())
+
+
+class TestDialScheduler(unittest.TestCase):
+    # pylint: disable=protected-access
+
+    def setUp(self):
+        self.now = 1000.
+        patcher = patch('golem.network.transport.tcpserver.time.monotonic',
+                        side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.network = DialNetwork()
+        self.server = PendingConnectionsServer(None, self.network)
+        self.server._is_address_accessible = Mock(return_value=True)
+        self.established = Mock()
+        self.failure = Mock()
+        self.final_failure = Mock()
+        self.server.conn_established_for_type[0] = self.established
+        self.server.conn_failure_for_type[0] = self.failure
+        self.server.conn_final_failure_for_type[0] = self.final_failure
+
+    def add(self, key='deadbeef', address='1.2.3.4'):
+        node = Mock(key=key, pub_addr=address, prv_addr=address,
+                    prv_addresses=[])
+        assert self.server._add_pending_request(0, node, 1234, 1234, {})
+        return list(self.server.pending_connections.values())[-1]
+
+    def test_dials_due_connections_in_order(self):
+        first = self.add('a')
+        self.now += 1
+        second = self.add('b')
+        self.now -= 1
+
+        self.server._sync_pending()
+        assert self.network.dials == [first.connect_info]
+        assert second.status == PenConnStatus.Inactive
+
+        self.now += 1
+        self.server._sync_pending()
+        assert self.network.dials == [first.connect_info,
+                                      second.connect_info]
+        assert first.status == second.status == PenConnStatus.Waiting
+
+    def test_concurrent_dials_cap(self):
+        self.server.MAX_CONCURRENT_DIALS = 2
+        conns = [self.add(str(i)) for i in range(3)]
+
+        self.server._sync_pending()
+        assert len(self.network.dials) == 2
+        assert conns[2].status == PenConnStatus.Inactive
+
+        self.network.fail(self.network.dials[0])
+        self.server._sync_pending()
+        assert len(self.network.dials) == 2
+        assert self.network.dials[-1] is conns[2].connect_info
+
+    def test_stale_dials_free_their_slots(self):
+        self.server.MAX_CONCURRENT_DIALS = 1
+        self.add('a')
+        second = self.add('b')
+        self.server._sync_pending()
+        self.now += self.server.DIAL_TIMEOUT + 1
+        self.server._sync_pending()
+        assert self.network.dials[-1] is second.connect_info
+
+    def test_backoff(self):
+        conn = self.add()
+        self.server._sync_pending()
+        with patch('golem.network.transport.tcpserver.random.uniform',
+                   side_effect=lambda low, high: high):
+            self.network.fail(conn.connect_info)
+
+        self.failure.assert_called_once_with(conn_id=conn.id)
+        assert conn.status == PenConnStatus.Failure
+        assert conn.next_attempt == self.now + self.server.BACKOFF_BASE
+
+        # Other connections to the node wait as well
+        other = self.add()
+        self.server._sync_pending()
+        assert not self.network.dials
+        assert other.next_attempt == conn.next_attempt
+
+        self.now += self.server.BACKOFF_BASE
+        self.server._sync_pending()
+        assert self.network.dials == [conn.connect_info, other.connect_info]
+
+        with patch('golem.network.transport.tcpserver.random.uniform',
+                   side_effect=lambda low, high: high):
+            self.network.fail(conn.connect_info)
+        assert conn.next_attempt == self.now + 2 * self.server.BACKOFF_BASE
+
+        # A successful dial clears the backoff of the node
+        self.now += 0.5
+        self.network.establish(other.connect_info)
+        self.established.assert_called_once()
+        assert self.server._node_retry_time('deadbeef') == 0.
+
+        stats = self.server.get_dial_stats()
+        assert stats['dials'] == 3
+        assert stats['success_rate'] == 1 / 3
+        assert stats['latency']['max'] == 0.5
+
+    def test_failure_callback_stops_retries(self):
+        def wait_for_the_peer(conn_id):
+            self.server.pending_connections[conn_id].status = \
+                PenConnStatus.WaitingAlt
+        self.server.conn_failure_for_type[0] = wait_for_the_peer
+
+        conn = self.add()
+        self.server._sync_pending()
+        self.network.fail(conn.connect_info)
+        assert conn.status == PenConnStatus.WaitingAlt
+
+        self.now += self.server.BACKOFF_MAX
+        self.server._sync_pending()
+        assert not self.network.dials
+
+    def test_max_dial_attempts(self):
+        conn = self.add()
+        for _ in range(self.server.MAX_DIAL_ATTEMPTS):
+            self.now += self.server.BACKOFF_MAX
+            self.server._sync_pending()
+            self.network.fail(conn.connect_info)
+
+        self.final_failure.assert_called_once_with(conn_id=conn.id)
+        assert conn.id not in self.server.pending_connections
+        assert self.failure.call_count == self.server.MAX_DIAL_ATTEMPTS
+
+    def test_unreachable_peers(self):
+        """ Thousands of peers which never answer, dialled on every sync
+        of the network until they are all given up """
+        server = self.server
+        peers = 5000
+        sync_interval = 0.5
+        conns = [self.add('{:x}'.format(i),
+                          '1.2.{}.{}'.format(i // 250, i % 250))
+                 for i in range(peers)]
+        dialled_at = {conn.id: [] for conn in conns}
+        max_dialing = 0
+
+        while server.pending_connections:
+            # Dials time out after the network timeout of 5 s
+            for connect_info in list(self.network.dials):
+                if dialled_at[connect_info.id][-1] + 5 <= self.now:
+                    self.network.fail(connect_info)
+
+            dialling = len(self.network.dials)
+            server._sync_pending()
+            for connect_info in self.network.dials[dialling:]:
+                dialled_at[connect_info.id].append(self.now)
+            max_dialing = max(max_dialing, len(self.network.dials))
+            self.now += sync_interval
+
+        assert max_dialing == server.MAX_CONCURRENT_DIALS
+        assert self.final_failure.call_count == peers
+        for times in dialled_at.values():
+            assert len(times) == server.MAX_DIAL_ATTEMPTS
+            # Each retry waits at least half of the backoff after the failure
+            for retry, (prev, cur) in enumerate(zip(times, times[1:])):
+                assert cur - prev - 5 >= server.BACKOFF_BASE * 2 ** retry / 2
+        stats = server.get_dial_stats()
+        assert stats['success_rate'] == 0.
+        assert stats['scheduled'] == stats['dialing'] == 0
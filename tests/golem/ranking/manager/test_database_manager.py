@@ -1,3 +1,5 @@
+from unittest import mock
+
 from golem.ranking.helper.trust import Trust
 from golem.ranking.manager import database_manager as dm
 from golem.testutils import DatabaseFixture
@@ -251,3 +253,30 @@ class TestDatabaseManager(DatabaseFixture):
         """Should throw exception for WRONG_COMPUTED increase."""
         with self.assertRaises(KeyError):
             Trust.WRONG_COMPUTED.increase('alpha', 0.3)
+
+
+class TestLocalRankCache(DatabaseFixture):
+
+    def test_unknown_node_cached(self):
+        assert dm.get_local_rank('alpha') is None
+        assert dm.get_local_rank('alpha') is None
+        assert dm.local_rank_cache.get_stats()['hits'] >= 1
+
+        dm.increase_positive_computed('alpha', 0.5)
+        assert dm.get_local_rank('alpha').positive_computed == 0.5
+
+    def test_offer_path_reads_cache(self):
+        dm.update_provider_efficiency('alpha', 10., 5.)
+        efficiency = dm.get_provider_efficiency('alpha')
+
+        with mock.patch('golem.ranking.manager.database_manager.LocalRank') \
+                as local_rank:
+            assert dm.get_provider_efficiency('alpha') == efficiency
+            assert dm.get_provider_efficacy('alpha').vector == \
+                (0., 0., 0., 0.)
+            local_rank.select.assert_not_called()
+            local_rank.get_or_create.assert_not_called()
+
+    def test_get_creates_rank(self):
+        assert dm.get_provider_efficiency('alpha') == 1.0
+        assert dm.get_local_rank('alpha') is not None
@@ -0,0 +1,74 @@
+import unittest
+from unittest import mock
+
+from golem.ranking.manager.rank_cache import RankCache
+
+
+class TestRankCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = RankCache(max_size=2, ttl=10.0)
+        self.load = mock.Mock(return_value='value')
+
+    def test_hit(self):
+        assert self.cache.get('a', self.load) == 'value'
+        assert self.cache.get('a', self.load) == 'value'
+        assert self.load.call_count == 1
+
+        stats = self.cache.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['hit_rate'] == 0.5
+
+    def test_negative_value_cached(self):
+        self.load.return_value = None
+        assert self.cache.get('a', self.load) is None
+        assert self.cache.get('a', self.load) is None
+        assert self.load.call_count == 1
+
+    @mock.patch('golem.ranking.manager.rank_cache.time.monotonic')
+    def test_expired(self, monotonic):
+        monotonic.return_value = 100.0
+        self.cache.get('a', self.load)
+        monotonic.return_value = 110.0
+        self.cache.get('a', self.load)
+        assert self.load.call_count == 2
+
+    def test_lru_eviction(self):
+        self.cache.get('a', self.load)
+        self.cache.get('b', self.load)
+        self.cache.get('a', self.load)
+        self.cache.get('c', self.load)
+
+        assert self.cache.get_stats()['evictions'] == 1
+        self.cache.get('a', self.load)
+        assert self.load.call_count == 3
+        self.cache.get('b', self.load)
+        assert self.load.call_count == 4
+
+    def test_put_and_invalidate(self):
+        self.cache.put('a', 'new')
+        assert self.cache.get('a', self.load) == 'new'
+        self.cache.invalidate('a')
+        assert self.cache.get('a', self.load) == 'value'
+        assert self.cache.get_stats()['invalidations'] == 1
+
+    def test_stale_load_not_stored(self):
+        def load():
+            # Updated while the old value was being read
+            self.cache.invalidate('a')
+            return 'stale'
+
+        assert self.cache.get('a', load) == 'stale'
+        assert self.cache.get('a', self.load) == 'value'
+
+    def test_bind(self):
+        self.cache.bind('db1')
+        self.cache.get('a', self.load)
+        self.cache.bind('db1')
+        self.cache.get('a', self.load)
+        assert self.load.call_count == 1
+
+        self.cache.bind('db2')
+        self.cache.get('a', self.load)
+        assert self.load.call_count == 2
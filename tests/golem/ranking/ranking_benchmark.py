@@ -0,0 +1,86 @@
+import os
+import random
+
+import pytest
+
+from golem.ranking.helper import min_max_utility as util
+from golem.ranking.helper.rank_vector import NodeIndex, RankVector, \
+    TrustVector
+
+
+def skip_benchmarks():
+    if os.environ.get('benchmarks', False):
+        return False
+    return True
+
+
+def random_pair():
+    return [random.uniform(-1., 1.), random.uniform(0.1, 2.)]
+
+
+def received_gossip(node_ids, groups: int):
+    """ Gossip groups about random subsets of the known nodes """
+    return [
+        [[node_id, [random_pair(), random_pair()]]
+         for node_id in random.sample(node_ids, len(node_ids) // 2)]
+        for _ in range(groups)
+    ]
+
+
+def legacy_round(working_vec: dict, prev_rank: dict, gossip: list, k: int):
+    """ The previous dict and list based Ranking round """
+    for node_id, (computing, requesting) in working_vec.items():
+        prev_rank[node_id] = [util.vec_to_trust(computing),
+                              util.vec_to_trust(requesting)]
+    new_vec = {}
+    for gossip_group in gossip:
+        for node_id, (comp, req) in gossip_group:
+            if node_id in new_vec:
+                prev_comp, prev_req = new_vec[node_id]
+                new_vec[node_id] = [
+                    list(map(sum, zip(comp, prev_comp))),
+                    list(map(sum, zip(req, prev_req)))]
+            else:
+                new_vec[node_id] = [comp, req]
+    aggregated_trust = 0.0
+    for node_id, (computing, requesting) in new_vec.items():
+        comp_old, req_old = prev_rank.get(node_id, (0, 0))
+        aggregated_trust += abs(util.vec_to_trust(computing) - comp_old)
+        aggregated_trust += abs(util.vec_to_trust(requesting) - req_old)
+    return [[node_id, [[v / float(k + 1) for v in val[0]],
+                       [v / float(k + 1) for v in val[1]]]]
+            for node_id, val in new_vec.items()]
+
+
+def vector_round(working_vec: RankVector, prev_rank: TrustVector,
+                 gossip: list, k: int):
+    prev_rank.update(working_vec)
+    new_vec = RankVector(working_vec.index)
+    for gossip_group in gossip:
+        new_vec.add_gossip(gossip_group)
+    prev_rank.distance(new_vec)
+    return new_vec.gossip(float(k + 1))
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("nodes", [1000, 10000, 100000])
+@pytest.mark.benchmark(min_rounds=3, warmup=False)
+def test_legacy_round(benchmark, nodes: int):
+    node_ids = ['node%d' % i for i in range(nodes)]
+    working_vec = {node_id: [random_pair(), random_pair()]
+                   for node_id in node_ids}
+    gossip = received_gossip(node_ids, 3)
+    benchmark(legacy_round, working_vec, {}, gossip, 2)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("nodes", [1000, 10000, 100000])
+@pytest.mark.benchmark(min_rounds=3, warmup=False)
+def test_vector_round(benchmark, nodes: int):
+    node_ids = ['node%d' % i for i in range(nodes)]
+    index = NodeIndex()
+    working_vec = RankVector(index)
+    for node_id in node_ids:
+        working_vec.set(node_id, random_pair(), random_pair())
+    gossip = received_gossip(node_ids, 3)
+    benchmark(vector_round, working_vec, TrustVector(index), gossip, 2)
@@ -0,0 +1,72 @@
+import unittest
+
+from golem.ranking.helper import min_max_utility as util
+from golem.ranking.helper.rank_vector import NodeIndex, RankVector, \
+    TrustVector
+
+
+class TestRankVector(unittest.TestCase):
+
+    def setUp(self):
+        self.index = NodeIndex()
+        self.vec = RankVector(self.index)
+
+    def test_mapping(self):
+        self.vec.set('ABC', [0.5, 1.0], [0.0, 1.0])
+        assert 'ABC' in self.vec
+        assert 'DEF' not in self.vec
+        assert len(self.vec) == 1
+        assert self.vec['ABC'] == [[0.5, 1.0], [0.0, 1.0]]
+        assert list(self.vec) == ['ABC']
+        with self.assertRaises(KeyError):
+            _ = self.vec['DEF']
+
+    def test_add_gossip(self):
+        self.vec.add_gossip([
+            ['ABC', [[0.2, 0.5], [0.1, 0.5]]],
+            ['DEF', [[0.3, 0.5], [0.0, 0.5]]],
+            ['ABC', [[0.2, 0.5], [0.1, 0.5]]],
+        ])
+        assert self.vec['ABC'] == [[0.4, 1.0], [0.2, 1.0]]
+        assert self.vec['DEF'] == [[0.3, 0.5], [0.0, 0.5]]
+
+    def test_add_malformed_gossip(self):
+        with self.assertLogs('golem.ranking.helper.rank_vector', 'ERROR'):
+            self.vec.add_gossip([
+                ['ABC', [[0.2, 0.5], [0.1, 0.5]]],
+                ['DEF'],
+                [['GHI'], [[0.2, 0.5], [0.1, 0.5]]],
+            ])
+        assert self.vec.keys() == ['ABC']
+
+    def test_trust(self):
+        pairs = [[0.5, 2.0], [0.0, 1.0], [0.3, 0.0], [-0.2, 1.0], [3., 1.]]
+        for i, pair in enumerate(pairs):
+            self.vec.set(str(i), pair, [0.0, 0.0])
+        trust = self.vec.trust()
+        for i, pair in enumerate(pairs):
+            assert trust[i][0] == util.vec_to_trust(pair)
+
+    def test_gossip(self):
+        self.vec.set('ABC', [0.4, 1.0], [0.2, 1.0])
+        assert self.vec.gossip(2.0) == [['ABC', [[0.2, 0.5], [0.1, 0.5]]]]
+
+
+class TestTrustVector(unittest.TestCase):
+
+    def test_update_and_distance(self):
+        index = NodeIndex()
+        prev = TrustVector(index)
+        prev.set('ABC', 0.5, 0.5)
+        prev.set('GHI', 0.1, 0.1)
+
+        working = RankVector(index)
+        working.set('ABC', [0.2, 1.0], [0.5, 1.0])
+        working.set('DEF', [0.4, 1.0], [0.0, 1.0])
+        assert abs(prev.distance(working) - (0.3 + 0.4)) < 1e-9
+
+        prev.update(working)
+        assert prev['ABC'] == [0.2, 0.5]
+        assert prev['DEF'] == [0.4, 0.0]
+        assert prev['GHI'] == [0.1, 0.1]
+        assert prev.distance(working) == 0.0
@@ -0,0 +1,67 @@
+import os
+import tempfile
+
+import pytest
+
+from golem.core.fileencrypt import AESFileEncryptor, FileEncryptor
+from golem.task.result.resultpackage import EncryptingPackager, ZipPackager
+
+GB = 2 ** 30
+CHUNK = 2 ** 20
+
+
+def skip_benchmarks():
+    if os.environ.get('benchmarks', False):
+        return False
+    return True
+
+
+@pytest.fixture(scope='module')
+def work_dir():
+    with tempfile.TemporaryDirectory() as path:
+        yield path
+
+
+def write_output(path: str, size: int) -> None:
+    """ Synthetic, incompressible task output """
+    chunk = os.urandom(CHUNK)
+    with open(path, 'wb') as f:
+        for _ in range(size // CHUNK):
+            f.write(chunk)
+
+
+def legacy_create(secret, output_path, disk_files):
+    """ The previous EncryptingPackager.create: zip, read back to hash,
+    read back again to encrypt """
+    zip_path, pkg_sha1 = ZipPackager().create(output_path + '.zip',
+                                              disk_files)
+    AESFileEncryptor.encrypt(zip_path, output_path, secret=secret)
+    return output_path, pkg_sha1
+
+
+def streaming_create(secret, output_path, disk_files):
+    return EncryptingPackager(secret).create(output_path, disk_files)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("size", [1 * GB, 2 * GB, 4 * GB])
+@pytest.mark.parametrize("create", [legacy_create, streaming_create])
+@pytest.mark.benchmark(min_rounds=3, warmup=False)
+def test_create(benchmark, work_dir, size: int, create):
+    # pylint: disable=redefined-outer-name
+    output_file = os.path.join(work_dir, 'result_{}.exr'.format(size))
+    if not os.path.exists(output_file):
+        write_output(output_file, size)
+
+    secret = FileEncryptor.gen_secret(10, 20)
+    package_path = os.path.join(work_dir, 'package')
+
+    def setup():
+        for path in (package_path, package_path + '.zip'):
+            if os.path.exists(path):
+                os.remove(path)
+        return (secret, package_path, [output_file]), {}
+
+    benchmark.pedantic(create, setup=setup, rounds=3)
+    benchmark.extra_info['megabytes_per_second'] = \
+        size / CHUNK / benchmark.stats.stats.mean
@@ -3,7 +3,7 @@ from os import makedirs, listdir
 from os.path import basename, exists, join, relpath
 from pathlib import Path
 
-from golem.core.fileencrypt import FileEncryptor
+from golem.core.fileencrypt import AESFileEncryptor, FileEncryptor
 from golem.resource.dirmanager import DirManager
 from golem.task.result.resultpackage import EncryptingPackager, \
     EncryptingTaskResultPackager, ExtractedPackage, ZipPackager, backup_rename
@@ -148,6 +148,29 @@ class TestEncryptingPackager(PackageDirContentsFixture):
 
         self.assertTrue(len(files) == len(self.all_files))
 
+    def testCreateCompatible(self):
+        ep = EncryptingPackager(self.secret)
+        path, sha1 = ep.create(self.out_path, self.disk_files)
+        zip_path = ep.package_name(self.out_path)
+        decrypted_path = join(self.res_dir, 'decrypted')
+
+        AESFileEncryptor.decrypt(path, decrypted_path, self.secret)
+        with open(decrypted_path, 'rb') as f1, open(zip_path, 'rb') as f2:
+            self.assertEqual(f1.read(), f2.read())
+        self.assertEqual(ep.compute_sha1(zip_path), sha1)
+
+        files, _ = ZipPackager().extract(decrypted_path, self.res_dir)
+        self.assertEqual(len(files), len(self.all_files))
+
+    def testExtractCompatible(self):
+        zip_path, _ = ZipPackager().create(self.out_path + '.zip',
+                                           self.disk_files)
+        AESFileEncryptor.encrypt(zip_path, self.out_path, self.secret)
+
+        files, _ = EncryptingPackager(self.secret).extract(self.out_path)
+        self.assertEqual(len(files), len(self.all_files))
+        self.assertFalse(exists(self.out_path))
+
 
 class TestEncryptingTaskResultPackager(PackageDirContentsFixture):
 
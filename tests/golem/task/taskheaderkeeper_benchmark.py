@@ -0,0 +1,93 @@
+import os
+import random
+import unittest.mock as mock
+
+import pytest
+from golem_messages.factories.datastructures import p2p as dt_p2p_factory
+
+from golem.core.common import get_timestamp_utc
+from golem.environments.environment import SupportStatus
+from golem.task.taskkeeper import TaskHeaderKeeper, SupportedTasks
+from tests.golem.task.test_taskkeeper import get_task_header
+
+
+def skip_benchmarks():
+    if os.environ.get('benchmarks', False):
+        return False
+    return True
+
+
+def header_pool(count: int, owners: int = 100):
+    headers = []
+    now = get_timestamp_utc()
+    for i in range(count):
+        header = get_task_header("owner%d" % (i % owners))
+        header.environment = "ENV%d" % (i % 4)
+        header.deadline = now + random.randint(-600, 600)
+        headers.append(header)
+    return headers
+
+
+def make_keeper() -> TaskHeaderKeeper:
+    keeper = TaskHeaderKeeper(
+        environments_manager=mock.Mock(),
+        node=dt_p2p_factory.Node(),
+        max_tasks_per_requestor=10 ** 6,
+    )
+    # Measure the bookkeeping only
+    keeper.check_support = mock.Mock(return_value=SupportStatus.ok())
+    return keeper
+
+
+def churn(keeper: TaskHeaderKeeper, headers, requested: set):
+    """ Gossip the headers in, pick tasks to compute, expire and remove """
+    for header in headers:
+        keeper.add_task_header(header)
+    for _ in range(len(headers) // 10):
+        keeper.get_task(exclude=requested)
+    keeper.remove_old_tasks()
+    for header in headers[::3]:
+        keeper.remove_task_header(header.task_id)
+
+
+def list_pool_ops(ids, requested: set):
+    """ Operations of the previous list based supported_tasks """
+    pool = []
+    for task_id in ids:
+        if task_id not in pool:
+            pool.append(task_id)
+    for _ in range(len(ids) // 10):
+        random.choice([t for t in pool if t not in requested])
+    for task_id in ids[::3]:
+        pool.remove(task_id)
+
+
+def indexed_pool_ops(ids, requested: set):
+    pool = SupportedTasks()
+    for task_id in ids:
+        pool.add(task_id)
+    for _ in range(len(ids) // 10):
+        pool.random_choice(requested)
+    for task_id in ids[::3]:
+        pool.discard(task_id)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("count", [1000, 10000, 30000])
+@pytest.mark.benchmark(min_rounds=3, warmup=False)
+def test_header_churn(benchmark, count: int):
+    headers = header_pool(count)
+    requested = {h.task_id for h in headers[:count // 100]}
+    benchmark.pedantic(churn, setup=lambda: ((make_keeper(), headers,
+                                              requested), {}),
+                       rounds=3)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("count", [1000, 10000])
+@pytest.mark.parametrize("ops", [list_pool_ops, indexed_pool_ops])
+@pytest.mark.benchmark(min_rounds=3, warmup=False)
+def test_supported_pool(benchmark, count: int, ops):
+    ids = ['task%d' % i for i in range(count)]
+    requested = set(ids[:count // 100])
+    benchmark(ops, ids, requested)
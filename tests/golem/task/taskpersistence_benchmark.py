@@ -0,0 +1,83 @@
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from golem.task.taskpersistence import TaskPersistence
+from golem.task.taskstate import SubtaskState, SubtaskStatus, TaskState
+
+
+def skip_benchmarks():
+    if os.environ.get('benchmarks', False):
+        return False
+    return True
+
+
+class BenchmarkTask:
+    JOURNALED_ATTRS = ('num_tasks_received',)
+
+    def __init__(self, subtasks: int):
+        self.num_tasks_received = 0
+        self.subtasks_given = {}
+        # Stand-in for the remaining task data: definition, previews, etc.
+        self.payload = os.urandom(256 * 1024)
+
+        self.state = TaskState()
+        for i in range(subtasks):
+            subtask_id = 'subtask-%d' % i
+            subtask_state = SubtaskState()
+            subtask_state.subtask_id = subtask_id
+            subtask_state.extra_data = {'start_task': i, 'frames': [1]}
+            self.state.subtask_states[subtask_id] = subtask_state
+            self.subtasks_given[subtask_id] = dict(subtask_state.extra_data)
+
+
+def events(task: BenchmarkTask, count: int):
+    subtask_ids = list(task.state.subtask_states)
+    for i in range(count):
+        subtask_id = subtask_ids[i % len(subtask_ids)]
+        task.state.subtask_states[subtask_id].subtask_status = \
+            SubtaskStatus.downloading
+        yield subtask_id
+
+
+def pickle_every_event(task: BenchmarkTask, tasks_dir: Path, count: int):
+    """ The previous TaskManager.dump_task behaviour """
+    filepath = tasks_dir / 'task.pickle'
+    for _ in events(task, count):
+        with filepath.open('wb') as f:
+            pickle.dump((task, task.state), f, protocol=2)
+
+
+def journal_events(task: BenchmarkTask, tasks_dir: Path, count: int,
+                   burst: int):
+    persistence = TaskPersistence(tasks_dir,
+                                  lambda _: (task, task.state))
+    persistence.snapshot('task')
+    for i, subtask_id in enumerate(events(task, count), start=1):
+        persistence.record('task', subtask_id)
+        if i % burst == 0:
+            # Done by the reactor after the coalescing window
+            persistence.flush()
+    persistence.quit()
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("subtasks", [100, 1000, 5000])
+@pytest.mark.benchmark(min_rounds=5, warmup=False)
+def test_pickle_every_event(benchmark, subtasks: int):
+    task = BenchmarkTask(subtasks)
+    with tempfile.TemporaryDirectory() as tasks_dir:
+        benchmark(pickle_every_event, task, Path(tasks_dir), 200)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("subtasks", [100, 1000, 5000])
+@pytest.mark.parametrize("burst", [1, 20])
+@pytest.mark.benchmark(min_rounds=5, warmup=False)
+def test_journal_events(benchmark, subtasks: int, burst: int):
+    task = BenchmarkTask(subtasks)
+    with tempfile.TemporaryDirectory() as tasks_dir:
+        benchmark(journal_events, task, Path(tasks_dir), 200, burst)
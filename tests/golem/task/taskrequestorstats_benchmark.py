@@ -0,0 +1,123 @@
+import os
+import random
+from typing import List, Tuple
+
+import pytest
+
+from golem.task.taskrequestorstats import RequestorTaskStats, TaskInfo
+from golem.task.taskstate import Operation, SubtaskOp, SubtaskState, \
+    SubtaskStatus, TaskOp, TaskState, TaskStatus
+
+Event = Tuple[str, Operation, SubtaskStatus]
+
+
+def skip_benchmarks():
+    if os.environ.get('benchmarks', False):
+        return False
+    return True
+
+
+class LegacyTaskInfo(TaskInfo):
+    """ The previous TaskInfo: every counter walks all the subtasks and
+    their messages """
+
+    def verified_results_count(self) -> int:
+        return sum(1 for st in self.subtasks.values()
+                   if st.latest_status == SubtaskStatus.finished)
+
+    def _subtasks_count_specific_ops(self, op: Operation):
+        return sum(1 for st in self.subtasks.values()
+                   for msg in st.messages if msg.op == op)
+
+    def not_downloaded_count(self) -> int:
+        cnt = 0
+        for st in self.subtasks.values():
+            download_in_progress = False
+            for msg in st.messages:
+                if msg.op == SubtaskOp.RESULT_DOWNLOADING:
+                    download_in_progress = True
+                elif msg.op in [SubtaskOp.FINISHED,
+                                SubtaskOp.NOT_ACCEPTED]:
+                    download_in_progress = False
+            if download_in_progress:
+                cnt += 1
+        return cnt
+
+    def had_failures_or_timeouts(self) -> bool:
+        for msg in self.messages:
+            if msg.op in [TaskOp.NOT_ACCEPTED, TaskOp.TIMEOUT]:
+                return True
+        for st in self.subtasks.values():
+            for msg in st.messages:
+                if msg.op in [SubtaskOp.FAILED,
+                              SubtaskOp.NOT_ACCEPTED,
+                              SubtaskOp.TIMEOUT]:
+                    return True
+        return False
+
+
+def legacy_stats() -> RequestorTaskStats:
+    stats = RequestorTaskStats()
+    stats.tasks.default_factory = LegacyTaskInfo
+    return stats
+
+
+def record_events(subtasks: int, seed: int = 0) -> List[Event]:
+    """ Subtask events of a task with some timeouts, failed verifications
+    and computations sent again """
+    rng = random.Random(seed)
+    events: List[Event] = []
+    for i in range(subtasks):
+        subtask_id = 'subtask-%d' % i
+        while True:
+            events.append((subtask_id, SubtaskOp.ASSIGNED,
+                           SubtaskStatus.starting))
+            outcome = rng.random()
+            if outcome < 0.05:
+                events.append((subtask_id, SubtaskOp.TIMEOUT,
+                               SubtaskStatus.failure))
+                events.append((subtask_id, SubtaskOp.RESTARTED,
+                               SubtaskStatus.restarted))
+                continue
+            events.append((subtask_id, SubtaskOp.RESULT_DOWNLOADING,
+                           SubtaskStatus.downloading))
+            if outcome < 0.1:
+                events.append((subtask_id, SubtaskOp.NOT_ACCEPTED,
+                               SubtaskStatus.failure))
+                continue
+            events.append((subtask_id, SubtaskOp.FINISHED,
+                           SubtaskStatus.finished))
+            break
+    return events
+
+
+def replay(stats: RequestorTaskStats, events: List[Event]) -> None:
+    task_state = TaskState()
+    task_state.status = TaskStatus.computing
+    for subtask_id, _, _ in events:
+        task_state.subtask_states.setdefault(subtask_id, SubtaskState())
+
+    stats.on_message('task', task_state, None, TaskOp.CREATED)
+    for subtask_id, op, status in events:
+        task_state.subtask_states[subtask_id].subtask_status = status
+        stats.on_message('task', task_state, subtask_id, op)
+
+    task_state.status = TaskStatus.finished
+    stats.on_message('task', task_state, None, TaskOp.FINISHED)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("subtasks", [100, 1000, 10000])
+@pytest.mark.parametrize("make_stats", [legacy_stats, RequestorTaskStats])
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_replay(benchmark, subtasks: int, make_stats):
+    if make_stats is legacy_stats and subtasks > 1000:
+        pytest.skip("quadratic in the number of subtasks")
+    events = record_events(subtasks)
+
+    def setup():
+        return (make_stats(), events), {}
+
+    benchmark.pedantic(replay, setup=setup, rounds=1)
+    benchmark.extra_info['events_per_second'] = \
+        len(events) / benchmark.stats.stats.mean
@@ -43,7 +43,7 @@ class TaskToComputeConcentTestCase(testutils.TempDirFixture):
         self.msg._fake_sign()
         self.msg.want_to_compute_task.sign_message(self.keys.raw_privkey)  # noqa pylint: disable=no-member
         self.task_session = tasksession.TaskSession(mock.MagicMock())
-        self.task_session.task_computer.has_assigned_task.return_value = False
+        self.task_session.task_computer.has_free_slot.return_value = True
         self.task_session.task_server.keys_auth.ecc.raw_pubkey = \
             self.keys.raw_pubkey
         self.task_session.task_server.config_desc.max_resource_size = \
@@ -12,7 +12,8 @@ from golem.clientconfigdescriptor import ClientConfigDescriptor
 from golem.core.common import timeout_to_deadline
 from golem.core.deferred import sync_wait
 from golem.docker.manager import DockerManager
-from golem.task.taskcomputer import TaskComputer, PyTaskThread, logger
+from golem.task.taskcomputer import ComputeSlot, TaskComputer, \
+    PyTaskThread, logger
 from golem.testutils import DatabaseFixture
 from golem.tools.ci import ci_skip
 from golem.tools.assertlogs import LogTestCase
@@ -283,7 +284,8 @@ class TestTaskComputer(DatabaseFixture, LogTestCase):
         task_computer.lock = Lock()
         task_computer.dir_lock = Lock()
 
-        task_computer.assigned_subtask = ComputeTaskDef(
+        slot = ComputeSlot(0)
+        slot.assigned_subtask = ComputeTaskDef(
             task_id=task_id,
             subtask_id=subtask_id,
         )
@@ -291,7 +293,7 @@ class TestTaskComputer(DatabaseFixture, LogTestCase):
             task_id: None
         }
 
-        args = (task_computer, subtask_id)
+        args = (task_computer, slot, subtask_id)
         kwargs = dict(
             docker_images=[],
             extra_data=mock.Mock(),
@@ -309,6 +311,49 @@ class TestTaskComputer(DatabaseFixture, LogTestCase):
         compute_task(*args, **kwargs)
         assert not task_computer.session_closed.called
         assert start.called
+        assert slot.counting_thread is not None
+
+    def test_slots(self):
+        task_server = self.task_server
+        task_server.config_desc.max_concurrent_subtasks = 2
+        tc = TaskComputer(task_server, use_docker_manager=False)
+        assert len(tc.slots) == 2
+        assert tc.has_free_slot()
+
+        for i in range(2):
+            tc.task_given(ComputeTaskDef(
+                task_id='task-{}'.format(i),
+                subtask_id='subtask-{}'.format(i),
+            ))
+        assert tc.has_assigned_task()
+        assert not tc.has_free_slot()
+        assert [st['subtask_id'] for st in tc.assigned_subtasks] == \
+            ['subtask-0', 'subtask-1']
+
+        assert not tc.task_given(ComputeTaskDef(task_id='task-2',
+                                                subtask_id='subtask-2'))
+
+        stats = tc.get_slots_stats()
+        assert [s['slot'] for s in stats] == [0, 1]
+        assert [s['subtask'] for s in stats] == ['subtask-0', 'subtask-1']
+        assert all(s['state'] == 'Downloading resources' for s in stats)
+
+    def test_resize_slots_keeps_busy(self):
+        task_server = self.task_server
+        task_server.config_desc.max_concurrent_subtasks = 3
+        tc = TaskComputer(task_server, use_docker_manager=False)
+        tc.slots[2].assigned_subtask = ComputeTaskDef(task_id='task',
+                                                      subtask_id='subtask')
+
+        tc._resize_slots(1)
+        assert len(tc.slots) == 3
+        assert tc.max_subtasks == 1
+        assert not tc.has_free_slot()
+
+        tc.slots[2].assigned_subtask = None
+        tc._resize_slots(1)
+        assert len(tc.slots) == 1
+        assert tc.has_free_slot()
 
     @staticmethod
     def __wait_for_tasks(tc):
@@ -422,6 +467,7 @@ class TestTaskMonitor(DatabaseFixture):
                 .task_keeper.task_headers[subtask_id].subtask_timeout = duration
 
             task.assigned_subtask = subtask
+            task.counting_thread = task_thread
 
         def check(expected):
             with mock.patch('golem.monitor.monitor.SenderThread.send') \
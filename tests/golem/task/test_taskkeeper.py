@@ -1,8 +1,10 @@
 # pylint: disable=protected-access
+import copy
 from datetime import timedelta
 from pathlib import Path
 import random
 import time
+import unittest
 import unittest.mock as mock
 
 from eth_utils import encode_hex
@@ -21,7 +23,8 @@ from golem.environments.environment import Environment, UnsupportReason,\
 from golem.environments.environmentsmanager import EnvironmentsManager
 from golem.network.hyperdrive.client import HyperdriveClient
 from golem.task import taskkeeper
-from golem.task.taskkeeper import TaskHeaderKeeper, CompTaskKeeper, logger
+from golem.task.taskkeeper import TaskHeaderKeeper, CompTaskKeeper, logger, \
+    SupportedTasks
 from golem.testutils import PEP8MixIn
 from golem.testutils import TempDirFixture
 from golem.tools.assertlogs import LogTestCase
@@ -381,6 +384,52 @@ class TestTaskHeaderKeeper(LogTestCase):
                        'reason': 'environment_not_accepting_tasks',
                        'ntasks': 1}, reasons)
 
+    @freeze_time(as_arg=True)
+    def test_old_tasks_updated_header(  # pylint: disable=no-self-argument
+            frozen_time, _):
+        tk = TaskHeaderKeeper(
+            environments_manager=EnvironmentsManager(),
+            node=dt_p2p_factory.Node(),
+            min_price=10)
+        task_header = get_task_header()
+        task_header.deadline = timeout_to_deadline(1)
+        assert tk.add_task_header(task_header)
+
+        task_header = copy.deepcopy(task_header)
+        task_header.deadline = timeout_to_deadline(10)
+        task_header.timestamp = 1
+        task_header.signature = b'new'
+        assert tk.add_task_header(task_header)
+        assert len(tk._deadlines) == 2
+
+        frozen_time.tick(timedelta(seconds=1.1))  # pylint: disable=no-member
+        tk.remove_old_tasks()
+        assert tk.task_headers.get(task_header.task_id) is not None
+        assert len(tk._deadlines) == 1
+
+        frozen_time.tick(timedelta(seconds=10))  # pylint: disable=no-member
+        tk.remove_old_tasks()
+        assert tk.task_headers.get(task_header.task_id) is None
+        assert tk.removed_tasks.get(task_header.task_id) is not None
+        assert not tk._deadlines
+
+    def test_get_task_exclude(self):
+        tk = TaskHeaderKeeper(
+            environments_manager=EnvironmentsManager(),
+            node=dt_p2p_factory.Node(),
+            min_price=10)
+        e = Environment()
+        e.accept_tasks = True
+        tk.environments_manager.add_environment(e)
+        headers = [get_task_header("t%d" % i) for i in range(3)]
+        for header in headers:
+            assert tk.add_task_header(header)
+
+        exclude = {h.task_id for h in headers[:2]}
+        for _ in range(10):
+            assert tk.get_task(exclude).task_id == headers[2].task_id
+        assert tk.get_task({h.task_id for h in headers}) is None
+
     def test_get_owner(self):
         tk = TaskHeaderKeeper(
             environments_manager=EnvironmentsManager(),
@@ -422,6 +471,35 @@ def get_task_header(key_id_seed="kkk"):
     return dt_tasks.TaskHeader(**th_dict_repr)
 
 
+class TestSupportedTasks(unittest.TestCase):
+    def test_add_discard(self):
+        tasks = SupportedTasks()
+        for i in range(5):
+            tasks.add('task%d' % i)
+        tasks.add('task0')
+        assert len(tasks) == 5
+
+        tasks.discard('task1')
+        tasks.discard('task1')
+        tasks.discard('unknown')
+        assert len(tasks) == 4
+        assert 'task1' not in tasks
+        assert set(tasks) == {'task0', 'task2', 'task3', 'task4'}
+        assert {tasks[i] for i in range(len(tasks))} == set(tasks)
+
+    def test_random_choice(self):
+        tasks = SupportedTasks()
+        assert tasks.random_choice() is None
+
+        ids = ['task%d' % i for i in range(50)]
+        for task_id in ids:
+            tasks.add(task_id)
+        assert tasks.random_choice() in ids
+        for _ in range(20):
+            assert tasks.random_choice(set(ids[1:])) == ids[0]
+        assert tasks.random_choice(set(ids)) is None
+
+
 @mock.patch('golem.task.taskkeeper.ProviderStatsManager', mock.Mock())
 class TestCompTaskKeeper(LogTestCase, PEP8MixIn, TempDirFixture):
     PEP8_FILES = [
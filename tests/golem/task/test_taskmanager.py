@@ -31,6 +31,7 @@ from golem.task.taskbase import Task, \
     TaskEventListener, AcceptClientVerdict
 from golem.task.taskclient import TaskClient
 from golem.task.taskmanager import TaskManager, logger
+from golem.task.taskpersistence import logger as persistence_logger
 from golem.task.taskstate import SubtaskStatus, SubtaskState, TaskState, \
     TaskStatus, TaskOp, SubtaskOp, OtherOp
 from golem.testutils import DatabaseFixture
@@ -199,7 +200,7 @@ class TestTaskManager(LogTestCase, TestDatabaseWithReactor,  # noqa # pylint: di
         task_ids = ["xyz0", "xyz1"]
         tasks = [self._get_test_dummy_task(task_id) for task_id in task_ids]
 
-        with self.assertLogs(logger, level="DEBUG") as log:
+        with self.assertLogs(persistence_logger, level="DEBUG") as log:
             keys_auth = Mock()
             keys_auth._private_key = b'a' * 32
             temp_tm = TaskManager(dt_p2p_factory.Node(),
@@ -213,6 +214,9 @@ class TestTaskManager(LogTestCase, TestDatabaseWithReactor,  # noqa # pylint: di
             for task, task_id in zip(tasks, task_ids):
                 temp_tm.add_new_task(task)
                 temp_tm.start_task(task.header.task_id)
+            temp_tm.quit()
+
+            for task_id in task_ids:
                 assert any(
                     "TASK %s DUMPED" % task_id in log for log in log.output)
 
@@ -382,12 +386,16 @@ class TestTaskManager(LogTestCase, TestDatabaseWithReactor,  # noqa # pylint: di
         with self.assertLogs(logger, level="DEBUG") as log:
             self.tm.add_new_task(task)
             self.tm.start_task(task.header.task_id)
-            assert any("TASK %s DUMPED" % task_id in log for log in log.output)
             assert any("Task %s added" % task_id in log for log in log.output)
 
+        with self.assertLogs(persistence_logger, level="DEBUG") as log:
+            self.tm.persistence.wait()
+            assert any("TASK %s DUMPED" % task_id in log for log in log.output)
+
             paf = self.tm._dump_filepath(task_id)
             assert paf.is_file()
             self.tm.delete_task(task_id)
+            self.tm.persistence.wait()
             assert self.tm.tasks.get(task_id) is None
             assert self.tm.tasks_states.get(task_id) is None
             assert not paf.is_file()
@@ -0,0 +1,199 @@
+import pickle
+
+from golem.task.taskpersistence import TaskPersistence
+from golem.task.taskstate import SubtaskState, SubtaskStatus, TaskState, \
+    TaskStatus
+from golem.testutils import TempDirFixture
+
+
+class JournaledTask:
+    JOURNALED_ATTRS = ('num_tasks_received',)
+
+    def __init__(self):
+        self.num_tasks_received = 0
+        self.subtasks_given = {}
+
+
+def add_subtask(task, state, subtask_id, status=SubtaskStatus.starting):
+    subtask_state = SubtaskState()
+    subtask_state.subtask_id = subtask_id
+    subtask_state.subtask_status = status
+    state.subtask_states[subtask_id] = subtask_state
+    task.subtasks_given[subtask_id] = {'status': status}
+
+
+class TestTaskPersistence(TempDirFixture):
+
+    def setUp(self):
+        super().setUp()
+        self.task = JournaledTask()
+        self.state = TaskState()
+        self.persistence = TaskPersistence(
+            self.new_path,
+            lambda task_id: (self.task, self.state),
+            compact_after=3)
+
+    def _load_snapshot(self, task_id='xyz'):
+        with self.persistence.snapshot_path(task_id).open('rb') as f:
+            return pickle.load(f)
+
+    def _restore(self, task_id='xyz'):
+        """ Load the snapshot and replay the journal; returns the task,
+        its state and the number of replayed records """
+        task, state, generation = self.persistence.load(
+            self.persistence.snapshot_path(task_id))
+        replayed = self.persistence.replay(task_id, task, state, generation)
+        return task, state, replayed
+
+    def test_snapshot(self):
+        add_subtask(self.task, self.state, 'sub1')
+        self.persistence.snapshot('xyz')
+        self.persistence.wait()
+
+        task, state = self._load_snapshot()
+        assert 'sub1' in state.subtask_states
+        assert 'sub1' in task.subtasks_given
+        assert self.persistence.journal_path('xyz').stat().st_size == 0
+
+    def test_journal_replay(self):
+        self.persistence.snapshot('xyz')
+
+        self.state.status = TaskStatus.computing
+        add_subtask(self.task, self.state, 'sub1')
+        self.persistence.record('xyz', 'sub1')
+        self.persistence.flush()
+
+        self.task.num_tasks_received = 1
+        add_subtask(self.task, self.state, 'sub1', SubtaskStatus.finished)
+        add_subtask(self.task, self.state, 'sub2')
+        self.persistence.record('xyz', 'sub1')
+        self.persistence.record('xyz', 'sub2')
+        self.persistence.flush()
+        self.persistence.wait()
+
+        assert not self._load_snapshot()[1].subtask_states
+        task, state, replayed = self._restore()
+        assert replayed == 2
+
+        assert state.status == TaskStatus.computing
+        assert task.num_tasks_received == 1
+        assert state.subtask_states['sub1'].subtask_status == \
+            SubtaskStatus.finished
+        assert task.subtasks_given['sub2']['status'] == SubtaskStatus.starting
+
+    def test_coalesced_updates(self):
+        add_subtask(self.task, self.state, 'sub1')
+        for _ in range(10):
+            self.persistence.record('xyz', 'sub1')
+        assert self.persistence.pending() == 1
+
+        self.persistence.flush()
+        self.persistence.wait()
+        assert self.persistence.pending() == 0
+
+        records = list(self.persistence._read_journal(
+            self.persistence.journal_path('xyz')))
+        assert len(records) == 1
+
+    def test_compaction(self):
+        self.persistence.snapshot('xyz')
+        for i in range(3):
+            add_subtask(self.task, self.state, 'sub%d' % i)
+            self.persistence.record('xyz', 'sub%d' % i)
+            self.persistence.flush()
+        self.persistence.wait()
+
+        assert self.persistence.journal_path('xyz').stat().st_size == 0
+        _, state = self._load_snapshot()
+        assert len(state.subtask_states) == 3
+
+    def test_truncated_record(self):
+        self.persistence.snapshot('xyz')
+        add_subtask(self.task, self.state, 'sub1')
+        self.persistence.record('xyz', 'sub1')
+        self.persistence.flush()
+        self.persistence.wait()
+
+        with self.persistence.journal_path('xyz').open('ab') as f:
+            f.write(b'\x00\x00\x01\x00broken')
+
+        _, state, replayed = self._restore()
+        assert replayed == 1
+        assert 'sub1' in state.subtask_states
+
+    def test_broken_record(self):
+        self.persistence.snapshot('xyz')
+        add_subtask(self.task, self.state, 'sub1')
+        self.persistence.record('xyz', 'sub1')
+        self.persistence.flush()
+        self.persistence.wait()
+
+        broken = pickle.dumps({'generation': 1, 'status': None}, protocol=2)
+        with self.persistence.journal_path('xyz').open('ab') as f:
+            f.write(len(broken).to_bytes(4, 'big') + broken)
+        add_subtask(self.task, self.state, 'sub2')
+        self.persistence.record('xyz', 'sub2')
+        self.persistence.flush()
+        self.persistence.wait()
+
+        _, state, replayed = self._restore()
+        assert replayed == 1
+        assert 'sub1' in state.subtask_states
+        assert 'sub2' not in state.subtask_states
+        assert self.persistence.has_journal('xyz')
+
+    def test_stale_journal(self):
+        self.persistence.snapshot('xyz')
+        add_subtask(self.task, self.state, 'sub1')
+        self.persistence.record('xyz', 'sub1')
+        self.persistence.flush()
+        self.persistence.wait()
+        journal_path = self.persistence.journal_path('xyz')
+        stale_journal = journal_path.read_bytes()
+
+        self.state.subtask_states.clear()
+        self.persistence.snapshot('xyz')
+        self.persistence.wait()
+        # Crash after the snapshot was replaced, before the journal
+        # was truncated
+        journal_path.write_bytes(stale_journal)
+
+        task, state, generation = self.persistence.load(
+            self.persistence.snapshot_path('xyz'))
+        assert generation == 2
+        assert self.persistence.replay('xyz', task, state, generation) == 0
+        assert not state.subtask_states
+        assert self.persistence.has_journal('xyz')
+
+        # Records of the restored snapshot follow the stale ones
+        add_subtask(self.task, self.state, 'sub2')
+        self.persistence.record('xyz', 'sub2')
+        self.persistence.flush()
+        self.persistence.wait()
+        assert self.persistence.replay('xyz', task, state, generation) == 1
+        assert set(state.subtask_states) == {'sub2'}
+
+    def test_load_without_generation(self):
+        with self.persistence.snapshot_path('xyz').open('wb') as f:
+            pickle.dump((self.task, self.state), f, protocol=2)
+        task, state, generation = self.persistence.load(
+            self.persistence.snapshot_path('xyz'))
+        assert isinstance(state, TaskState)
+        assert generation is None
+
+        add_subtask(self.task, self.state, 'sub1')
+        self.persistence.replay('xyz', task, state, generation)
+        self.persistence.record('xyz', 'sub1')
+        self.persistence.flush()
+        self.persistence.wait()
+        assert self.persistence.replay('xyz', task, state, generation) == 1
+
+    def test_remove(self):
+        self.persistence.snapshot('xyz')
+        self.persistence.record('xyz', 'sub1')
+        self.persistence.remove('xyz')
+        self.persistence.wait()
+
+        assert self.persistence.pending() == 0
+        assert not self.persistence.snapshot_path('xyz').exists()
+        assert not self.persistence.journal_path('xyz').exists()
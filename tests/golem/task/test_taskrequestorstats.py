@@ -1,3 +1,4 @@
+import random
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
@@ -260,6 +261,49 @@ class TestTaskInfo(TestCase, testutils.PEP8MixIn):
         self.assertTrue(ti.had_failures_or_timeouts(),
                         "One subtask should have failed")
 
+    def test_counters_match_messages(self):
+        """The incrementally updated counters match the ones counted
+        from the stored messages"""
+        rng = random.Random(0)
+        ops = list(SubtaskOp)
+        statuses = list(SubtaskStatus)
+        ti = TaskInfo()
+        ti.got_task_message(TaskMsg(ts=1.0, op=TaskOp.CREATED),
+                            TaskStatus.computing)
+
+        for i in range(500):
+            ti.got_subtask_message(
+                "st%d" % rng.randrange(20),
+                TaskMsg(ts=float(i), op=rng.choice(ops)),
+                rng.choice(statuses))
+
+            subtasks = ti.subtasks.values()
+            self.assertEqual(
+                ti.verified_results_count(),
+                sum(st.latest_status == SubtaskStatus.finished
+                    for st in subtasks))
+            self.assertEqual(
+                ti.failed_count(),
+                sum(msg.op == SubtaskOp.FAILED
+                    for st in subtasks for msg in st.messages))
+
+            downloading = in_progress = 0
+            for st in subtasks:
+                ops_left = [msg.op for msg in st.messages if msg.op in [
+                    SubtaskOp.RESULT_DOWNLOADING, SubtaskOp.FINISHED,
+                    SubtaskOp.NOT_ACCEPTED]]
+                downloading += bool(
+                    ops_left and ops_left[-1] == SubtaskOp.RESULT_DOWNLOADING)
+                ops_left = [msg.op for msg in st.messages if msg.op in [
+                    SubtaskOp.ASSIGNED, SubtaskOp.TIMEOUT, SubtaskOp.FINISHED,
+                    SubtaskOp.FAILED, SubtaskOp.NOT_ACCEPTED]]
+                in_progress += bool(
+                    ops_left and ops_left[-1] == SubtaskOp.ASSIGNED
+                    and st.latest_status not in [SubtaskStatus.finished,
+                                                 SubtaskStatus.failure])
+            self.assertEqual(ti.not_downloaded_count(), downloading)
+            self.assertEqual(ti.in_progress_subtasks_count(), in_progress)
+
 
 class TestRequestorTaskStats(LogTestCase):
     def compare_task_stats(self, ts1, ts2):
@@ -579,7 +579,7 @@ class TestTaskSession(ConcentMessageMixin, LogTestCase,
         conn = Mock()
         ts = TaskSession(conn)
         ts.key_id = "KEY_ID"
-        ts.task_computer.has_assigned_task.return_value = False
+        ts.task_computer.has_free_slot.return_value = True
         ts.concent_service.enabled = False
         ts.send = Mock(side_effect=lambda msg: print(f"send {msg}"))
 
@@ -165,6 +165,13 @@ class TestClient(TestClientBase):
         self.client.get_incomes_list()
         ets.get_incomes_list.assert_called_once_with()
 
+    def test_get_incomes_page(self, *_):
+        ets = self.client.transaction_system
+        ets.get_incomes_page.return_value = ([], ['cursor'])
+        assert self.client.get_incomes_page(10, ['after']) == \
+            {'incomes': [], 'next': ['cursor']}
+        ets.get_incomes_page.assert_called_once_with(10, ['after'])
+
     def test_withdraw(self, *_):
         ets = self.client.transaction_system
         ets.return_value = ets
@@ -0,0 +1,126 @@
+import os
+import shutil
+import time
+from unittest import mock
+
+import pytest
+
+from golem.core.common import get_golem_path, is_linux
+from golem.core.deferred import sync_wait
+from golem.docker.image import DockerImage
+from golem.docker.manager import DockerManager
+from golem.docker.task_thread import DockerTaskThread
+from golem.verificator.blender_verifier import (
+    BlenderVerifier,
+    WarmVerifierContainer,
+    WarmVerifierContainers,
+)
+
+TEST_DATA = os.path.join(get_golem_path(),
+                         'tests/apps/blender/verification/test_data')
+TIMEOUT = 600
+
+
+def skip_benchmarks():
+    if os.environ.get('benchmarks', False):
+        return False
+    return True
+
+
+@pytest.fixture(scope='module')
+def docker_manager(tmpdir_factory):
+    dm = DockerTaskThread.docker_manager = DockerManager.install()
+    dm.update_config(
+        status_callback=mock.Mock(),
+        done_callback=mock.Mock(),
+        work_dir=str(tmpdir_factory.mktemp('docker')),
+        in_background=True)
+    return dm
+
+
+def verification_data(task_dir: str, index: int) -> dict:
+    """ A subtask of the bmw test scene, with the result stored in a
+    directory of its own, as the task manager does """
+    subtask_dir = os.path.join(task_dir, 'subtask-{}'.format(index))
+    os.makedirs(subtask_dir)
+    result = os.path.join(subtask_dir, 'GolemTask_10001.png')
+    shutil.copy(os.path.join(TEST_DATA, 'GolemTask_10001.png'), result)
+
+    return {
+        'subtask_info': {
+            'subtask_id': 'subtask-{}'.format(index),
+            'scene_file': '/golem/resources/bmw.blend',
+            'path_root': TEST_DATA,
+            'resolution': [150, 150],
+            'samples': 35,
+            'frames': [1],
+            'output_format': 'PNG',
+            'crop_window': [0.0, 1.0, 0.0, 1.0],
+            'use_frames': False,
+            'all_frames': [1],
+            'total_tasks': 1,
+            'crops': [{'borders_x': [0.0, 1.0], 'borders_y': [0.0, 1.0]}],
+        },
+        'results': [result],
+        'reference_data': [],
+        'resources': [os.path.join(TEST_DATA, 'bmw.blend')],
+    }
+
+
+def verify(task_dir: str, subtasks: int, warm: bool, tag: str) -> None:
+    """ Verifies all the subtasks at once, as the verification queue does
+    with enough workers. Warm containers are polled here, there is no
+    reactor running. """
+    containers = WarmVerifierContainers()
+    containers.set_idle_timeout(60 if warm else 0)
+    finished = []
+
+    with mock.patch.object(BlenderVerifier, 'WARM_CONTAINERS', containers), \
+            mock.patch.object(BlenderVerifier, 'DOCKER_TAG', tag):
+        for index in range(subtasks):
+            data = verification_data(task_dir, index)
+            verifier = BlenderVerifier(data, DockerTaskThread)
+            finished.append((verifier, verifier.start_verification(data)))
+
+        deadline = time.time() + TIMEOUT
+        while warm and any(not d.called for _, d in finished):
+            assert time.time() < deadline
+            for verifier, _ in finished:
+                verifier.warm_job[0].poll()
+            time.sleep(WarmVerifierContainer.POLL_INTERVAL)
+
+        for _, d in finished:
+            sync_wait(d, TIMEOUT)
+        containers.stop()
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.skipif(not is_linux(),
+                    reason='Docker is only available on Linux buildbots')
+@pytest.mark.parametrize("subtasks", [1, 4, 8])
+@pytest.mark.parametrize("flow", [
+    # One container per subtask, one Blender process per crop
+    dict(warm=False, tag='1.1'),
+    # One container per subtask, all the crops rendered by one Blender process
+    dict(warm=False, tag=BlenderVerifier.DOCKER_TAG),
+    # One container for the task, the crops of the subtasks waiting together
+    # rendered by one Blender process
+    dict(warm=True, tag=BlenderVerifier.DOCKER_TAG),
+], ids=['legacy', 'batched', 'warm'])
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+@mock.patch('twisted.internet.reactor.callFromThread',
+            lambda fn, *args: fn(*args))
+@mock.patch('golem.verificator.blender_verifier.LoopingCall', mock.Mock())
+def test_verification(benchmark, docker_manager, tmpdir, subtasks, flow):
+    # pylint: disable=redefined-outer-name,unused-argument
+    for tag in ('1.1', BlenderVerifier.DOCKER_TAG):
+        assert DockerImage(BlenderVerifier.DOCKER_NAME, tag=tag).is_available()
+    rounds = iter(range(100))
+
+    def setup():
+        task_dir = str(tmpdir.join('round-{}'.format(next(rounds))))
+        return (task_dir, subtasks), flow
+
+    benchmark.pedantic(verify, setup=setup, rounds=1)
+    benchmark.extra_info['cpu_count'] = os.cpu_count()
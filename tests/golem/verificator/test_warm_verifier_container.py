@@ -0,0 +1,176 @@
+import json
+import os
+from types import SimpleNamespace
+from unittest import mock
+
+from twisted.internet.defer import Deferred
+
+from golem.testutils import TempDirFixture
+from golem.verificator.blender_verifier import (
+    BlenderVerifier,
+    WarmVerifierContainers,
+)
+
+
+class FakeDockerTask:
+    """ Stands in for DockerTaskThread, the test ends the container through
+    `deferred` """
+
+    started: list = []
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, docker_images, extra_data, dir_mapping, timeout,
+                 host_config=None):
+        self.docker_images = docker_images
+        self.extra_data = extra_data
+        self.dir_mapping = dir_mapping
+        self.timeout = timeout
+        self.host_config = host_config
+        self.deferred = Deferred()
+
+    @staticmethod
+    def specify_dir_mapping(resources, temporary, work, output, logs):
+        return SimpleNamespace(resources=resources, temporary=temporary,
+                               work=work, output=output, logs=logs)
+
+    def start(self):
+        self.started.append(self)
+        return self.deferred
+
+    def end_comp(self):
+        self.deferred.errback(Exception('Killed'))
+
+
+@mock.patch('golem.verificator.blender_verifier.LoopingCall', mock.Mock())
+@mock.patch('twisted.internet.reactor.callFromThread',
+            lambda fn, *args: fn(*args))
+class TestWarmVerifierContainers(TempDirFixture):
+
+    def setUp(self):
+        super().setUp()
+        FakeDockerTask.started = []
+        self.containers = WarmVerifierContainers()
+        self.containers.set_idle_timeout(60)
+        self.results = []
+
+    def _submit(self, scene='/golem/resources/scene.blend'):
+        container, job_id, deferred = self.containers.submit(
+            FakeDockerTask, [('image', 'tag')], '/resources', self.tempdir,
+            {'scene_path': scene})
+        deferred.addBoth(self.results.append)
+        return container, job_id
+
+    def _finish(self, job_id, **result):
+        with open(os.path.join(self.tempdir, 'jobs', job_id + '.done'),
+                  'w') as f:
+            json.dump(result, f)
+
+    def _job_files(self):
+        return sorted(os.listdir(os.path.join(self.tempdir, 'jobs')))
+
+    def test_jobs_share_a_container(self):
+        container, first = self._submit()
+        _, second = self._submit(scene='/golem/resources/other.blend')
+        assert len(FakeDockerTask.started) == 1
+        assert FakeDockerTask.started[0].extra_data['idle_timeout'] == 60
+        assert self._job_files() == [first + '.json', second + '.json']
+
+        self._finish(second, verdict=True)
+        container.poll()
+        assert self.results == [{'verdict': True}]
+
+        self._finish(first, error='Blender failed')
+        container.poll()
+        assert str(self.results[1].value) == 'Blender failed'
+        assert not container.pending
+
+    def test_idle_exit_moves_jobs_to_a_new_container(self):
+        container, job_id = self._submit()
+        FakeDockerTask.started[0].deferred.callback(None)
+
+        assert len(FakeDockerTask.started) == 2
+        assert not container.running
+        assert self._job_files() == [job_id + '.json']
+
+        self._finish(job_id, verdict=False)
+        self.containers._containers[('/resources', self.tempdir)].poll()  # noqa pylint: disable=protected-access
+        assert self.results == [{'verdict': False}]
+
+    def test_failure_fails_jobs(self):
+        self._submit()
+        self.containers.stop()
+        assert len(FakeDockerTask.started) == 1
+        assert str(self.results[0].value) == 'Killed'
+
+        # The next job starts another container
+        self._submit()
+        assert len(FakeDockerTask.started) == 2
+
+    def test_host_config(self):
+        host_config = {'cpuset_cpus': '2,3', 'mem_limit': '1024'}
+        self.containers.submit(
+            FakeDockerTask, [('image', 'tag')], '/resources', self.tempdir,
+            {'scene_path': '/golem/resources/scene.blend'}, host_config)
+        assert FakeDockerTask.started[0].host_config == host_config
+
+        # An idle exit restarts the container with the same limits
+        FakeDockerTask.started[0].deferred.callback(None)
+        assert FakeDockerTask.started[1].host_config == host_config
+
+    def test_cancel(self):
+        container, job_id = self._submit()
+        container.cancel(job_id)
+        assert not container.pending
+        assert self._job_files() == []
+
+    def test_cancel_done(self):
+        container, job_id, _ = self.containers.submit(
+            FakeDockerTask, [('image', 'tag')], '/resources', self.tempdir,
+            {'scene_path': '/golem/resources/scene.blend',
+             'output_dir': '/golem/work/subtask/output'})
+        verdict_path = os.path.join(self.tempdir, 'subtask', 'output',
+                                    'verdict.json')
+        os.makedirs(os.path.dirname(verdict_path))
+        with open(verdict_path, 'w') as f:
+            json.dump({'verdict': True}, f)
+        self._finish(job_id, verdict=True)
+
+        container.cancel(job_id)
+        assert not container.pending
+        assert self._job_files() == []
+        assert not os.path.exists(verdict_path)
+
+    def test_blender_verifier(self):
+        subtask_dir = os.path.join(self.tempdir, 'subtask')
+        os.makedirs(subtask_dir)
+        verification_data = {
+            'subtask_info': {
+                'subtask_id': 'subtask',
+                'path_root': '/resources',
+                'crop_window': [0.0, 1.0, 0.0, 0.5],
+                'scene_file': '/golem/resources/scene.blend',
+                'resolution': [100, 100],
+                'samples': 10,
+                'frames': [1],
+                'output_format': 'PNG',
+            },
+            'results': [os.path.join(subtask_dir, 'result.png')],
+            'resources': [],
+        }
+
+        with mock.patch.object(BlenderVerifier, 'WARM_CONTAINERS',
+                               self.containers):
+            verifier = BlenderVerifier(verification_data, FakeDockerTask)
+            finished = verifier.start_verification(verification_data)
+        finished.addBoth(self.results.append)
+
+        job_id = self._job_files()[0][:-len('.json')]
+        with open(os.path.join(self.tempdir, 'jobs', job_id + '.json')) as f:
+            job = json.load(f)
+        assert job['subtask_paths'] == ['/golem/work/subtask/result.png']
+        assert job['output_dir'] == '/golem/work/subtask/output'
+        assert 'entrypoint' not in job
+
+        self._finish(job_id, verdict=False)
+        verifier.warm_job[0].poll()
+        assert 'Verification result negative' in str(self.results[0].value)